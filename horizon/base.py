@@ -28,6 +28,7 @@ import logging
 import operator
 import os
 
+from debtcollector import removals
 from django.conf import settings
 from django.conf.urls import include
 from django.conf.urls import url
@@ -71,10 +72,9 @@ def _decorate_urlconf(urlpatterns, decorator, *args, **kwargs):
             _decorate_urlconf(pattern.url_patterns, decorator, *args, **kwargs)
 
 
-# FIXME(lhcheng): We need to find a better way to cache the result.
-# Rather than storing it in the session, we could leverage the Django
-# session. Currently, this has been causing issue with cookie backend,
-# adding 1600+ in the cookie size.
+@removals.remove(message='The access decisions of the navigation are '
+                 'cached according to the NAVIGATION_CACHE setting',
+                 version='18.2.0')
 def access_cached(func):
     def inner(self, context):
         session = context['request'].session
@@ -145,15 +145,13 @@ class HorizonComponent(object):
                 urlpatterns = []
         return urlpatterns
 
-    # FIXME(lhcheng): Removed the access_cached decorator for now until
-    # a better implementation has been figured out. This has been causing
-    # issue with cookie backend, adding 1600+ in the cookie size.
-    # @access_cached
     def can_access(self, context):
         """Return whether the user has role based access to this component.
 
         This method is not intended to be overridden.
-        The result of the method is stored in per-session cache.
+        The results of the method used to build the navigation are cached
+        per request, and optionally shared between the users with the same
+        navigation fingerprint (see the NAVIGATION_CACHE setting).
         """
         return self.allowed(context)
 
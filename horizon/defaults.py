@@ -54,6 +54,31 @@ SESSION_COOKIE_MAX_SIZE = 4093
 # memory usage when caching. It should at least be 2 x the number of threads
 # with a little bit of extra buffer.
 MEMOIZED_MAX_SIZE_DEFAULT = 25
+# MEMOIZED_SHARED_CACHE controls the cross-request cache tier used by
+# API calls decorated with horizon.utils.memoized.shared_memoized.
+# When cache_alias is None, a per-process local memory cache is used,
+# otherwise the named cache from CACHES.
+MEMOIZED_SHARED_CACHE = {
+    'enabled': False,
+    'cache_alias': None,
+    'default_timeout': 60,
+    'timeouts': {},
+}
+# NAVIGATION_CACHE controls the sharing of the dashboards and panels shown
+# in the navigation between the users with the same navigation fingerprint,
+# as returned by the function NAVIGATION_FINGERPRINT_FUNCTION.
+NAVIGATION_CACHE = {
+    'enabled': False,
+    'cache_alias': 'default',
+    'timeout': 300,
+}
+NAVIGATION_FINGERPRINT_FUNCTION = None
+# PARALLEL_SUBMIT_FUNCTION is the function used to call functions
+# concurrently, for example to load the data of the tabs of a tab group with
+# parallel_load. It takes a function and its arguments and returns a
+# concurrent.futures.Future of its result. When it is None, the functions
+# are called sequentially.
+PARALLEL_SUBMIT_FUNCTION = None
 HORIZON_COMPRESS_OFFLINE_CONTEXT_BASE = {}
 
 SITE_BRANDING = _("Horizon")
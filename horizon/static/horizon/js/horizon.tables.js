@@ -14,6 +14,9 @@
 
 /* Namespace for core functionality related to DataTables. */
 horizon.datatables = {
+  // Maximum number of rows updated by a single request.
+  update_batch_size: 50,
+
   update: function () {
     var $rows_to_update = $('tr.warning.ajax-update');
     var $table = $rows_to_update.closest('table');
@@ -33,111 +36,173 @@ horizon.datatables = {
       return;
     }
 
-    $rows_to_update.each(function() {
-      var $row = $(this);
+    function remove_row($row) {
       var $table = $row.closest('table.datatable');
+      // Update the footer count and reset to default empty row if needed
+      var row_count, colspan, template, params;
+
+      // existing count minus one for the row we're removing
+      row_count = horizon.datatables.update_footer_count($table, -1);
+
+      if(row_count === 0) {
+        colspan = $table.find('.table_column_header th').length;
+        template = horizon.templates.compiled_templates["#empty_row_template"];
+        params = {
+            "colspan": colspan,
+            no_items_label: gettext("No items to display.")
+        };
+        var empty_row = template.render(params);
+        $row.replaceWith(empty_row);
+      } else {
+        $row.remove();
+      }
+      // Reset tablesorter's data cache.
+      $table.trigger("update");
+      // Enable launch action if quota is not exceeded
+      horizon.datatables.update_actions();
+    }
 
-      requests.push(
-        horizon.ajax.queue({
-          url: $row.attr('data-update-url'),
-          error: function (jqXHR) {
-            switch (jqXHR.status) {
-              // A 404 indicates the object is gone, and should be removed from the table
-              case 404:
-                // Update the footer count and reset to default empty row if needed
-                var row_count, colspan, template, params;
-
-                // existing count minus one for the row we're removing
-                row_count = horizon.datatables.update_footer_count($table, -1);
-
-                if(row_count === 0) {
-                  colspan = $table.find('.table_column_header th').length;
-                  template = horizon.templates.compiled_templates["#empty_row_template"];
-                  params = {
-                      "colspan": colspan,
-                      no_items_label: gettext("No items to display.")
-                  };
-                  var empty_row = template.render(params);
-                  $row.replaceWith(empty_row);
-                } else {
-                  $row.remove();
-                }
-                // Reset tablesorter's data cache.
-                $table.trigger("update");
-                // Enable launch action if quota is not exceeded
-                horizon.datatables.update_actions();
-                break;
-              default:
-                console.log(gettext("An error occurred while updating."));
-                $row.removeClass("ajax-update");
-                $row.find("i.ajax-updating").remove();
-                break;
-            }
-          },
-          success: function (data) {
-            var $new_row = $(data);
-
-            if ($new_row.hasClass('warning')) {
-              var $container = $(document.createElement('div'))
-                .addClass('progress-text horizon-loading-bar');
-
-              var $progress = $(document.createElement('div'))
-                .addClass('progress progress-striped active')
-                .appendTo($container);
-
-              // Incomplete progress bar addition
-              $width = $new_row.find('[percent]:first').attr('percent') || "100%";
-
-              $(document.createElement('div'))
-                .addClass('progress-bar')
-                .css("width", $width)
-                .appendTo($progress);
-
-              // if action/confirm is required, show progress-bar with "?"
-              // icon to indicate user action is required
-              if ($new_row.find('.btn-action-required').length > 0) {
-                $(document.createElement('span'))
-                  .addClass('fa fa-question-circle progress-bar-text')
-                  .appendTo($container);
-              }
-              $new_row.find("td.warning:last").prepend($container);
-            }
+    function stop_updating_row($row) {
+      console.log(gettext("An error occurred while updating."));
+      $row.removeClass("ajax-update");
+      $row.find("i.ajax-updating").remove();
+    }
 
-            // Only replace row if the html content has changed
-            if($new_row.html() !== $row.html()) {
-
-              // Directly accessing the checked property of the element
-              // is MUCH faster than using jQuery's helper method
-              var $checkbox = $row.find('.table-row-multi-select');
-              if($checkbox.length && $checkbox[0].checked) {
-                // Preserve the checkbox if it's already clicked
-                $new_row.find('.table-row-multi-select').prop('checked', true);
-              }
-              $row.replaceWith($new_row);
-
-              // TODO(matt-borland, tsufiev): ideally we should solve the
-              // problem with not-working angular actions in a content added
-              // by jQuery via replacing jQuery insert with Angular insert.
-              // Should address this in Newton release
-              recompileAngularContent($table);
-
-              // Reset tablesorter's data cache.
-              $table.trigger("update");
-              // Reset decay constant.
-              $table.removeAttr('decay_constant');
-              // Check that quicksearch is enabled for this table
-              // Reset quicksearch's data cache.
-              if ($table.attr('id') in horizon.datatables.qs) {
-                horizon.datatables.qs[$table.attr('id')].cache();
-              }
-            }
-          },
-          complete: function () {
-            // Revalidate the button check for the updated table
-            horizon.datatables.validate_button();
+    function replace_row($row, data) {
+      var $table = $row.closest('table.datatable');
+      var $new_row = $(data);
+
+      if ($new_row.hasClass('warning')) {
+        var $container = $(document.createElement('div'))
+          .addClass('progress-text horizon-loading-bar');
+
+        var $progress = $(document.createElement('div'))
+          .addClass('progress progress-striped active')
+          .appendTo($container);
+
+        // Incomplete progress bar addition
+        $width = $new_row.find('[percent]:first').attr('percent') || "100%";
+
+        $(document.createElement('div'))
+          .addClass('progress-bar')
+          .css("width", $width)
+          .appendTo($progress);
+
+        // if action/confirm is required, show progress-bar with "?"
+        // icon to indicate user action is required
+        if ($new_row.find('.btn-action-required').length > 0) {
+          $(document.createElement('span'))
+            .addClass('fa fa-question-circle progress-bar-text')
+            .appendTo($container);
+        }
+        $new_row.find("td.warning:last").prepend($container);
+      }
+
+      // Only replace row if the html content has changed
+      if($new_row.html() !== $row.html()) {
+
+        // Directly accessing the checked property of the element
+        // is MUCH faster than using jQuery's helper method
+        var $checkbox = $row.find('.table-row-multi-select');
+        if($checkbox.length && $checkbox[0].checked) {
+          // Preserve the checkbox if it's already clicked
+          $new_row.find('.table-row-multi-select').prop('checked', true);
+        }
+        $row.replaceWith($new_row);
+
+        // TODO(matt-borland, tsufiev): ideally we should solve the
+        // problem with not-working angular actions in a content added
+        // by jQuery via replacing jQuery insert with Angular insert.
+        // Should address this in Newton release
+        recompileAngularContent($table);
+
+        // Reset tablesorter's data cache.
+        $table.trigger("update");
+        // Reset decay constant.
+        $table.removeAttr('decay_constant');
+        // Check that quicksearch is enabled for this table
+        // Reset quicksearch's data cache.
+        if ($table.attr('id') in horizon.datatables.qs) {
+          horizon.datatables.qs[$table.attr('id')].cache();
+        }
+      }
+    }
+
+    function update_row($row) {
+      return horizon.ajax.queue({
+        url: $row.attr('data-update-url'),
+        error: function (jqXHR) {
+          switch (jqXHR.status) {
+            // A 404 indicates the object is gone, and should be removed from the table
+            case 404:
+              remove_row($row);
+              break;
+            default:
+              stop_updating_row($row);
+              break;
           }
-        })
-      );
+        },
+        success: function (data) {
+          replace_row($row, data);
+        },
+        complete: function () {
+          // Revalidate the button check for the updated table
+          horizon.datatables.validate_button();
+        }
+      });
+    }
+
+    // Update several rows with a single request. If it fails, each row
+    // is updated with its own request instead.
+    function update_rows(url, $rows) {
+      var rows = {};
+      $rows.each(function() {
+        rows[$(this).attr('data-object-id')] = $(this);
+      });
+      return horizon.ajax.queue({
+        url: url + '&' + $.param({obj_id: Object.keys(rows)}, true),
+        dataType: 'json',
+        success: function (data) {
+          $.each(rows, function(obj_id, $row) {
+            // Objects missing from the response are gone, and their rows
+            // should be removed from the table
+            if (obj_id in data.rows) {
+              replace_row($row, data.rows[obj_id]);
+            } else {
+              remove_row($row);
+            }
+          });
+        },
+        complete: function () {
+          // Revalidate the button check for the updated table
+          horizon.datatables.validate_button();
+        }
+      }).then(null, function () {
+        return $.when.apply($, $rows.map(function() {
+          return update_row($(this));
+        }).get());
+      });
+    }
+
+    var batches = {};
+    $rows_to_update.each(function() {
+      var $row = $(this);
+      var batch_url = $row.attr('data-update-batch-url');
+      if (!batch_url || !$row.attr('data-object-id')) {
+        requests.push(update_row($row));
+        return;
+      }
+      batches[batch_url] = batches[batch_url] || [];
+      batches[batch_url].push(this);
+    });
+
+    $.each(batches, function(batch_url, rows) {
+      // Limit the number of objects per request to keep URLs short.
+      for (var i = 0; i < rows.length; i += horizon.datatables.update_batch_size) {
+        requests.push(update_rows(
+          batch_url,
+          $(rows.slice(i, i + horizon.datatables.update_batch_size))));
+      }
     });
 
     $.when.apply($, requests).always(function() {
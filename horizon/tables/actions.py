@@ -93,6 +93,7 @@ class BaseAction(html.HTMLElement, metaclass=BaseActionMetaClass):
         self.preempt = kwargs.get('preempt', False)
         self.policy_rules = kwargs.get('policy_rules', None)
         self.action_type = kwargs.get('action_type', 'default')
+        self.cache_key_attrs = kwargs.get('cache_key_attrs', None)
 
     def data_type_matched(self, datum):
         """Method to see if the action is allowed for a certain type of data.
@@ -118,6 +119,21 @@ class BaseAction(html.HTMLElement, metaclass=BaseActionMetaClass):
         """
         return {}
 
+    def get_row_cache_key(self, datum):
+        """Returns a key for the row-dependent state of this action.
+
+        Rows with equal keys share the result of ``allowed`` and the changes
+        made by ``update``, so both are evaluated only once per key when
+        the table renders its row actions. ``None`` disables the caching.
+
+        By default the key is made of the values of the datum attributes
+        named in ``cache_key_attrs``.
+        """
+        if self.cache_key_attrs is None:
+            return None
+        return tuple(getattr(datum, attr, None)
+                     for attr in self.cache_key_attrs)
+
     def allowed(self, request, datum):
         """Determine whether this action is allowed for the current request.
 
@@ -219,6 +235,15 @@ class Action(BaseAction):
         Default to be an empty list (``[]``). When set to empty, the action
         will accept any kind of data.
 
+    .. attribute:: cache_key_attrs
+
+        A list of names of datum attributes which the results of
+        ``allowed``, ``update`` and ``get_policy_target`` depend on, e.g.
+        ``("status", "locked")``. When set, these methods are evaluated once
+        for each distinct combination of values when row actions are
+        rendered, instead of once per row. Defaults to ``None`` (evaluated
+        for every row).
+
     .. attribute:: policy_rules
 
         list of scope and rule tuples to do policy checks on, the
@@ -338,6 +363,15 @@ class LinkAction(BaseAction):
 
         Defaults to be an empty list (``[]``). When set to empty, the action
         will accept any kind of data.
+
+    .. attribute:: cache_key_attrs
+
+        A list of names of datum attributes which the results of
+        ``allowed``, ``update`` and ``get_policy_target`` depend on, e.g.
+        ``("status", "locked")``. When set, these methods are evaluated once
+        for each distinct combination of values when row actions are
+        rendered, instead of once per row. Defaults to ``None`` (evaluated
+        for every row).
     """
     # class attribute name is used for ordering of Actions in table
     name = "link"
@@ -13,6 +13,7 @@
 #    under the License.
 
 import collections
+from collections import abc
 import copy
 import inspect
 import json
@@ -585,6 +586,13 @@ class Row(html.HTMLElement):
         updates. Generally you won't need to change this value.
         Default: ``"row_update"``.
 
+    .. attribute:: ajax_batch_action_name
+
+        String that is used for the query parameter key to request AJAX
+        updates of several rows at once. Generally you won't need to change
+        this value.
+        Default: ``"row_update_batch"``.
+
     .. attribute:: ajax_cell_action_name
 
         String that is used for the query parameter key to request AJAX
@@ -594,6 +602,7 @@ class Row(html.HTMLElement):
     """
     ajax = False
     ajax_action_name = "row_update"
+    ajax_batch_action_name = "row_update_batch"
     ajax_cell_action_name = "cell_update"
 
     def __init__(self, table, datum=None):
@@ -639,6 +648,8 @@ class Row(html.HTMLElement):
             interval = conf.HORIZON_CONFIG['ajax_poll_interval']
             self.attrs['data-update-interval'] = interval
             self.attrs['data-update-url'] = self.get_ajax_update_url()
+            self.attrs['data-update-batch-url'] = \
+                self.get_ajax_batch_update_url()
             self.classes.append("ajax-update")
 
         self.attrs['data-object-id'] = table.get_object_id(datum)
@@ -689,23 +700,36 @@ class Row(html.HTMLElement):
         """Returns the bound cells for this row in order."""
         return list(self.cells.values())
 
-    def get_ajax_update_url(self):
+    def _get_ajax_url(self, request_params):
         table_url = self.table.get_absolute_url()
         marker_name = self.table._meta.pagination_param
         marker = self.table.request.GET.get(marker_name, None)
         if not marker:
             marker_name = self.table._meta.prev_pagination_param
             marker = self.table.request.GET.get(marker_name, None)
-        request_params = [
-            ("action", self.ajax_action_name),
-            ("table", self.table.name),
-            ("obj_id", self.table.get_object_id(self.datum)),
-        ]
         if marker:
             request_params.append((marker_name, marker))
         params = urlencode(collections.OrderedDict(request_params))
         return "%s?%s" % (table_url, params)
 
+    def get_ajax_update_url(self):
+        return self._get_ajax_url([
+            ("action", self.ajax_action_name),
+            ("table", self.table.name),
+            ("obj_id", self.table.get_object_id(self.datum)),
+        ])
+
+    def get_ajax_batch_update_url(self):
+        """Returns the URL to update several rows of the table at once.
+
+        The object IDs of the rows are added to it as ``obj_id`` parameters
+        by the client.
+        """
+        return self._get_ajax_url([
+            ("action", self.ajax_batch_action_name),
+            ("table", self.table.name),
+        ])
+
     def can_be_selected(self, datum):
         """Determines whether the row can be selected.
 
@@ -721,6 +745,29 @@ class Row(html.HTMLElement):
         """
         return {}
 
+    def get_data_batch(self, request, obj_ids):
+        """Fetches the updated data for the rows of the given object IDs.
+
+        Returns a dict mapping each object ID to its data object. The rows
+        of the object IDs missing from the dict are removed from the table,
+        as their objects no longer exist.
+
+        By default, :meth:`~horizon.tables.Row.get_data` is called for each
+        object ID. Subclasses can override it to fetch the data of all the
+        rows with fewer API calls.
+        """
+        data = {}
+        for obj_id in obj_ids:
+            try:
+                data[obj_id] = self.get_data(request, obj_id)
+            except exceptions.NotFound:
+                pass
+            except Exception:
+                error = exceptions.handle(request, ignore=True)
+                if error is not exceptions.NotFound:
+                    raise
+        return data
+
 
 class Cell(html.HTMLElement):
     """Represents a single cell in the table."""
@@ -1297,6 +1344,8 @@ class DataTable(object, metaclass=DataTableMetaclass):
         self.permissions = self._meta.permissions
         self.needs_filter_first = False
         self._filter_first_message = self._meta.filter_first_message
+        self._row_actions_cache = {}
+        self._object_id_index = None
 
         # Create a new set
         columns = []
@@ -1471,6 +1520,41 @@ class DataTable(object, metaclass=DataTableMetaclass):
         """
         return self._filter_first_message
 
+    def _get_object_id_str(self, datum):
+        obj_id = self.get_object_id(datum)
+        if not isinstance(obj_id, str):
+            obj_id = str(obj_id)
+        return obj_id
+
+    def _build_object_id_index(self, data):
+        index = collections.defaultdict(list)
+        for position, datum in enumerate(data):
+            index[self._get_object_id_str(datum)].append((position, datum))
+        self._object_id_index = (data, len(data), dict(index))
+        return self._object_id_index[2]
+
+    def _find_objects_by_id(self, lookup):
+        """Returns the data objects whose string ID is ``lookup``."""
+        data = self.data or []
+        if not isinstance(data, abc.Sequence):
+            # Iterators and other iterables can only be scanned.
+            return [datum for datum in data
+                    if self._get_object_id_str(datum) == lookup]
+        if (self._object_id_index is None or
+                self._object_id_index[0] is not data or
+                self._object_id_index[1] != len(data)):
+            entries = self._build_object_id_index(data).get(lookup, [])
+        else:
+            entries = self._object_id_index[2].get(lookup, [])
+            # The data may have been changed in place: the index is built
+            # again when the matches moved. A lookup without matches is not
+            # checked, so that looking up rows which no longer exist does
+            # not index the data every time.
+            if any(position >= len(data) or data[position] is not datum
+                   for position, datum in entries):
+                entries = self._build_object_id_index(data).get(lookup, [])
+        return [datum for position, datum in entries]
+
     def get_object_by_id(self, lookup):
         """Returns the data object whose ID matches ``loopup`` parameter.
 
@@ -1482,16 +1566,13 @@ class DataTable(object, metaclass=DataTableMetaclass):
         comparison.
 
         Uses :meth:`~horizon.tables.DataTable.get_object_id` internally.
+        When ``data`` is a sequence, the IDs are indexed on the first lookup,
+        and indexed again when ``data`` is replaced, when its length changes
+        or when the object found was replaced in place.
         """
         if not isinstance(lookup, str):
             lookup = str(lookup)
-        matches = []
-        for datum in self.data:
-            obj_id = self.get_object_id(datum)
-            if not isinstance(obj_id, str):
-                obj_id = str(obj_id)
-            if obj_id == lookup:
-                matches.append(datum)
+        matches = self._find_objects_by_id(lookup)
         if len(matches) > 1:
             raise ValueError("Multiple matches were returned for that id: %s."
                              % matches)
@@ -1534,21 +1615,64 @@ class DataTable(object, metaclass=DataTableMetaclass):
         return [action for action in bound_actions if
                 self._filter_action(action, self.request)]
 
+    def _bind_row_action(self, action, datum):
+        # Shallow copy to allow modifying properties per row. This is
+        # cheaper than copy.copy() which matters for tables with many rows.
+        bound_action = action.__class__.__new__(action.__class__)
+        bound_action.__dict__.update(action.__dict__)
+        bound_action.attrs = copy.copy(action.attrs)
+        bound_action.datum = datum
+        return bound_action
+
+    def _evaluate_row_action(self, action, datum):
+        """Returns the action bound to datum, or None if it is not allowed."""
+        bound_action = self._bind_row_action(action, datum)
+        # Remove disallowed actions.
+        if not self._filter_action(bound_action, self.request, datum):
+            return None
+        # Hook for modifying actions based on data. No-op by default.
+        bound_action.update(self.request, datum)
+        return bound_action
+
+    def _get_row_action_cache_key(self, action, datum):
+        try:
+            key = action.get_row_cache_key(datum)
+        except Exception:
+            LOG.exception("Error while computing the cache key of action "
+                          "%s.", action.name)
+            return None
+        if key is None:
+            return None
+        key = (action.name, key)
+        if self._meta.mixed_data_type:
+            key += (getattr(datum, self._meta.data_type_name, None),)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def get_row_actions(self, datum):
-        """Returns a list of the action instances for a specific row."""
+        """Returns a list of the action instances for a specific row.
+
+        The result of ``allowed`` and ``update`` is shared by the rows for
+        which an action returns the same ``get_row_cache_key``.
+        """
         bound_actions = []
         for action in self._meta.row_actions:
-            # Copy to allow modifying properties per row
-            bound_action = copy.copy(self.base_actions[action.name])
-            bound_action.attrs = copy.copy(bound_action.attrs)
-            bound_action.datum = datum
-            # Remove disallowed actions.
-            if not self._filter_action(bound_action,
-                                       self.request,
-                                       datum):
+            action = self.base_actions[action.name]
+            cache_key = self._get_row_action_cache_key(action, datum)
+            if cache_key is None:
+                bound_action = self._evaluate_row_action(action, datum)
+            else:
+                if cache_key not in self._row_actions_cache:
+                    self._row_actions_cache[cache_key] = \
+                        self._evaluate_row_action(action, datum)
+                bound_action = self._row_actions_cache[cache_key]
+                if bound_action is not None:
+                    bound_action = self._bind_row_action(bound_action, datum)
+            if bound_action is None:
                 continue
-            # Hook for modifying actions based on data. No-op by default.
-            bound_action.update(self.request, datum)
             # Pre-create the URL for this link with appropriate parameters
             if issubclass(bound_action.__class__, LinkAction):
                 bound_action.bound_url = bound_action.get_link_url(datum)
@@ -1707,6 +1831,9 @@ class DataTable(object, metaclass=DataTableMetaclass):
                         return HttpResponse(new_row.render())
                     else:
                         return HttpResponse(status=error.status_code)
+            elif new_row.ajax and new_row.ajax_batch_action_name == action_name:
+                if request.is_ajax():
+                    return self._update_rows(request, new_row)
             elif new_row.ajax_cell_action_name == action_name:
                 # inline edit of the cell actions
                 return self.inline_edit_handle(request, table_name,
@@ -1723,6 +1850,30 @@ class DataTable(object, metaclass=DataTableMetaclass):
                             return handled
         return None
 
+    def _update_rows(self, request, new_row):
+        """Renders the rows of the object IDs requested by AJAX.
+
+        The response maps the object IDs to the rendered rows. The objects
+        of the IDs missing from it no longer exist.
+        """
+        obj_ids = [self.sanitize_id(obj_id)
+                   for obj_id in request.GET.getlist("obj_id")]
+        try:
+            data = new_row.get_data_batch(request, obj_ids)
+        except Exception:
+            error = exceptions.handle(request, ignore=True)
+            return HttpResponse(status=error.status_code)
+        rows = {}
+        for datum in data.values():
+            row = self._meta.row_class(self)
+            obj_id = self.get_object_id(datum)
+            if obj_id == self.current_item_id:
+                row.classes.append('current_selected')
+            row.load_cells(datum)
+            rows[str(obj_id)] = row.render()
+        return HttpResponse(json.dumps({"rows": rows}),
+                            content_type="application/json")
+
     def inline_edit_handle(self, request, table_name, action_name, obj_id,
                            new_row):
         """Inline edit handler.
@@ -13,17 +13,31 @@
 #    under the License.
 
 from collections import defaultdict
+import functools
 
 from django import shortcuts
 
+from horizon import exceptions
+from horizon.utils import parallel
 from horizon import views
 
 from horizon.templatetags.horizon import has_permissions
 
 
 class MultiTableMixin(object):
-    """A generic mixin which provides methods for handling DataTables."""
+    """A generic mixin which provides methods for handling DataTables.
+
+    .. attribute:: parallel_load
+
+        Boolean to control whether the data of the tables is retrieved
+        concurrently (see the ``PARALLEL_SUBMIT_FUNCTION`` setting) rather
+        than one table after another. The ``get_{{ table_name }}_data``
+        methods must then not depend on each other. An error raised by one
+        of them is handled by :func:`horizon.exceptions.handle` and leaves
+        its table empty. Default: ``False``
+    """
     data_method_pattern = "get_%s_data"
+    parallel_load = False
 
     def __init__(self, *args, **kwargs):
         super(MultiTableMixin, self).__init__(*args, **kwargs)
@@ -33,17 +47,35 @@ class MultiTableMixin(object):
         self._data_methods = defaultdict(list)
         self.get_data_methods(self.table_classes, self._data_methods)
 
+    def _get_table_data(self, name):
+        data = []
+        func_list = self._data_methods.get(name, [])
+        for func in func_list:
+            data.extend(func())
+        return data
+
     def _get_data_dict(self):
         if not self._data:
-            for table in self.table_classes:
-                data = []
-                name = table._meta.name
-                func_list = self._data_methods.get(name, [])
-                for func in func_list:
-                    data.extend(func())
-                self._data[name] = data
+            names = [table._meta.name for table in self.table_classes]
+            if self.parallel_load and len(names) > 1:
+                self._load_data_parallel(names)
+            else:
+                for name in names:
+                    self._data[name] = self._get_table_data(name)
         return self._data
 
+    def _load_data_parallel(self, names):
+        results = parallel.call_all(
+            {name: functools.partial(self._get_table_data, name)
+             for name in names},
+            trace_name='horizon.tables.get_data')
+        for name in names:
+            try:
+                self._data[name] = results[name].result()
+            except Exception:
+                self._data[name] = []
+                exceptions.handle(self.request)
+
     def get_data_methods(self, table_classes, methods):
         for table in table_classes:
             name = table._meta.name
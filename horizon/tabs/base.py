@@ -13,6 +13,7 @@
 #    under the License.
 
 from collections import OrderedDict
+from concurrent import futures
 import logging
 import operator
 
@@ -23,6 +24,7 @@ from django.utils import module_loading
 
 from horizon import exceptions
 from horizon.utils import html
+from horizon.utils import parallel
 
 LOG = logging.getLogger(__name__)
 
@@ -84,12 +86,29 @@ class TabGroup(html.HTMLElement):
         Read-only property which is set to the value of the current active tab.
         This may not be the same as the value of ``selected`` if no
         specific tab was requested via the ``GET`` parameter.
+
+    .. attribute:: parallel_load
+
+        Boolean to control whether the data of the tabs is loaded
+        concurrently (see the ``PARALLEL_SUBMIT_FUNCTION`` setting) rather
+        than one tab after another. The data of the tabs must not depend
+        on each other. Default: ``False``
+
+    .. attribute:: load_timeout
+
+        The number of seconds to wait for the data of the tabs when it is
+        loaded concurrently. Tabs other than the active one whose data is
+        not loaded in time are loaded when they are selected instead, as
+        if their ``preload`` attribute was ``False``. Default: ``None``
+        (no limit)
     """
     slug = None
     template_name = "horizon/common/_tab_group.html"
     param_name = 'tab'
     sticky = False
     show_single_tab = False
+    parallel_load = False
+    load_timeout = None
     _selected = None
     _active = None
 
@@ -166,13 +185,39 @@ class TabGroup(html.HTMLElement):
 
     def load_tab_data(self):
         """Preload all data that for the tabs that will be displayed."""
-        for tab in self._tabs.values():
-            if tab.load and not tab.data_loaded:
-                try:
-                    tab._data = tab.get_context_data(self.request)
-                except Exception:
-                    tab._data = False
-                    exceptions.handle(self.request)
+        tabs = [tab for tab in self._tabs.values()
+                if tab.load and not tab.data_loaded]
+        if self.parallel_load and len(tabs) > 1:
+            self._load_tab_data_parallel(tabs)
+            return
+        for tab in tabs:
+            try:
+                tab._data = tab.get_context_data(self.request)
+            except Exception:
+                tab._data = False
+                exceptions.handle(self.request)
+
+    def _load_tab_data_parallel(self, tabs):
+        tab_futures = [(tab, parallel.submit(tab.get_context_data,
+                                             self.request))
+                       for tab in tabs]
+        futures.wait([future for tab, future in tab_futures],
+                     timeout=self.load_timeout)
+        for tab, future in tab_futures:
+            if not future.done() and not tab.is_active():
+                LOG.debug('The data of tab %s was not loaded in %s seconds, '
+                          'it is loaded when the tab is selected instead.',
+                          tab.slug, self.load_timeout)
+                future.cancel()
+                tab.preload = False
+                continue
+            # Errors are handled in the thread of the request, which holds
+            # the messages of the user.
+            try:
+                tab._data = future.result()
+            except Exception:
+                tab._data = False
+                exceptions.handle(self.request)
 
     def get_id(self):
         """Returns the id for this tab group.
@@ -467,8 +512,15 @@ class TableTab(Tab):
         :class:`~horizon.tables.MultiTableView`. For each table class you
         need to define a corresponding ``get_{{ table_name }}_data`` method
         as with :class:`~horizon.tables.MultiTableView`.
+
+    .. attribute:: parallel_load
+
+        Boolean to control whether the data of the tables is retrieved
+        concurrently, as with :class:`~horizon.tables.MultiTableView`.
+        Default: ``False``
     """
     table_classes = []
+    parallel_load = False
 
     def __init__(self, tab_group, request):
         super(TableTab, self).__init__(tab_group, request)
@@ -495,7 +547,8 @@ class TableTab(Tab):
         """
         # We only want the data to be loaded once, so we track if we have...
         if not self._table_data_loaded:
-            for table_name, table in self._tables.items():
+            data_funcs = OrderedDict()
+            for table_name in self._tables:
                 # Fetch the data function.
                 func_name = "get_%s_data" % table_name
                 data_func = getattr(self, func_name, None)
@@ -505,9 +558,23 @@ class TableTab(Tab):
                         "You must define a %(func_name)s method on"
                         " %(cls_name)s."
                         % {'func_name': func_name, 'cls_name': cls_name})
+                data_funcs[table_name] = data_func
 
+            if self.parallel_load and len(data_funcs) > 1:
+                results = parallel.call_all(
+                    data_funcs, trace_name='horizon.tabs.get_table_data')
+            else:
+                results = None
+            for table_name, table in self._tables.items():
                 # Load the data.
-                table.data = data_func()
+                if results is None:
+                    table.data = data_funcs[table_name]()
+                else:
+                    try:
+                        table.data = results[table_name].result()
+                    except Exception:
+                        table.data = []
+                        exceptions.handle(self.request)
                 table._meta.has_prev_data = self.has_prev_data(table)
                 table._meta.has_more_data = self.has_more_data(table)
             # Mark our data as loaded so we don't run the loaders again.
@@ -15,8 +15,10 @@
 from __future__ import absolute_import
 
 from collections import OrderedDict
+import hashlib
 
 from django.conf import settings
+from django.core.cache import caches
 from django import template
 from django.template import Node
 from django.utils.encoding import force_text
@@ -25,6 +27,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from horizon.base import Horizon
 from horizon import conf
+from horizon.utils import settings as utils_settings
 
 
 register = template.Library()
@@ -52,6 +55,65 @@ def has_permissions_on_list(components, user):
             in components if has_permissions(user, component)]
 
 
+def _get_navigation_cache(request):
+    """Returns the cache and the key of the access decisions of the request.
+
+    The access decisions are shared by the users with the same navigation
+    fingerprint, as returned by NAVIGATION_FINGERPRINT_FUNCTION.
+    """
+    if not utils_settings.get_dict_config('NAVIGATION_CACHE', 'enabled'):
+        return None, None
+    fingerprint_func = utils_settings.import_setting(
+        'NAVIGATION_FINGERPRINT_FUNCTION')
+    if fingerprint_func is None:
+        return None, None
+    fingerprint = fingerprint_func(request)
+    if fingerprint is None:
+        return None, None
+    cache = caches[utils_settings.get_dict_config('NAVIGATION_CACHE',
+                                                  'cache_alias')]
+    digest = hashlib.sha256(repr(fingerprint).encode('utf-8')).hexdigest()
+    return cache, 'horizon.navigation.%s' % digest
+
+
+def _get_access_decisions(request):
+    decisions = getattr(request, '_horizon_access_decisions', None)
+    if decisions is None:
+        cache, key = _get_navigation_cache(request)
+        decisions = (cache.get(key) if cache else None) or {}
+        request._horizon_access_decisions = decisions
+        request._horizon_access_changed = False
+    return decisions
+
+
+def _can_access(context, dashboard, panel=None):
+    """Returns whether the user can access a dashboard or a panel.
+
+    The decisions are made once per request, and reused by the requests of
+    the users with the same navigation fingerprint when the NAVIGATION_CACHE
+    setting is enabled.
+    """
+    request = context['request']
+    decisions = _get_access_decisions(request)
+    key = (dashboard.slug, panel.slug if panel else None)
+    if key not in decisions:
+        component = panel or dashboard
+        decisions[key] = bool(component.can_access(context))
+        request._horizon_access_changed = True
+    return decisions[key]
+
+
+def _save_access_decisions(request):
+    if not getattr(request, '_horizon_access_changed', False):
+        return
+    cache, key = _get_navigation_cache(request)
+    if cache is not None:
+        cache.set(key, request._horizon_access_decisions,
+                  utils_settings.get_dict_config('NAVIGATION_CACHE',
+                                                 'timeout'))
+    request._horizon_access_changed = False
+
+
 @register.inclusion_tag('horizon/_sidebar.html', takes_context=True)
 def horizon_nav(context):
     if 'request' not in context:
@@ -67,21 +129,22 @@ def horizon_nav(context):
             allowed_panels = []
             for panel in group:
                 if (callable(panel.nav) and panel.nav(context) and
-                        panel.can_access(context)):
+                        _can_access(context, dash, panel)):
                     allowed_panels.append(panel)
                 elif (not callable(panel.nav) and panel.nav and
-                        panel.can_access(context)):
+                        _can_access(context, dash, panel)):
                     allowed_panels.append(panel)
                 if panel == current_panel:
                     current_panel_group = group.slug
             if allowed_panels:
                 non_empty_groups.append((group, allowed_panels))
         if (callable(dash.nav) and dash.nav(context) and
-                dash.can_access(context)):
+                _can_access(context, dash)):
             dashboards.append((dash, OrderedDict(non_empty_groups)))
         elif (not callable(dash.nav) and dash.nav and
-                dash.can_access(context)):
+                _can_access(context, dash)):
             dashboards.append((dash, OrderedDict(non_empty_groups)))
+    _save_access_decisions(context['request'])
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -98,11 +161,12 @@ def horizon_main_nav(context):
     current_dashboard = context['request'].horizon.get('dashboard', None)
     dashboards = []
     for dash in Horizon.get_dashboards():
-        if dash.can_access(context):
+        if _can_access(context, dash):
             if callable(dash.nav) and dash.nav(context):
                 dashboards.append(dash)
             elif dash.nav:
                 dashboards.append(dash)
+    _save_access_decisions(context['request'])
     return {'components': dashboards,
             'user': context['request'].user,
             'current': current_dashboard,
@@ -122,16 +186,17 @@ def horizon_dashboard_nav(context):
         allowed_panels = []
         for panel in group:
             if (callable(panel.nav) and panel.nav(context) and
-                    panel.can_access(context)):
+                    _can_access(context, dashboard, panel)):
                 allowed_panels.append(panel)
             elif (not callable(panel.nav) and panel.nav and
-                    panel.can_access(context)):
+                    _can_access(context, dashboard, panel)):
                 allowed_panels.append(panel)
         if allowed_panels:
             if group.name is None:
                 non_empty_groups.append((dashboard.name, allowed_panels))
             else:
                 non_empty_groups.append((group.name, allowed_panels))
+    _save_access_decisions(context['request'])
 
     return {'components': OrderedDict(non_empty_groups),
             'user': context['request'].user,
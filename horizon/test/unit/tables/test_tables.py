@@ -15,6 +15,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+import json
+import threading
 import unittest
 import uuid
 
@@ -408,6 +411,20 @@ class DisabledActionsTable(tables.DataTable):
         multi_select = True
 
 
+class MyCachedToggleAction(MyToggleAction):
+    name = "cached_toggle"
+    cache_key_attrs = ("status",)
+
+
+class CachedActionsTable(tables.DataTable):
+    id = tables.Column('id')
+    status = tables.Column('status')
+
+    class Meta(object):
+        name = "cached_actions_table"
+        row_actions = (MyCachedToggleAction, MyLinkAction)
+
+
 class DataTableTests(test.TestCase):
     def test_table_instantiation(self):
         """Tests everything that happens when the table is instantiated."""
@@ -506,6 +523,58 @@ class DataTableTests(test.TestCase):
                                  ['<Column: multi_select>',
                                   '<Column: id>'])
 
+    def test_get_object_by_id(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.assertIs(TEST_DATA[1], self.table.get_object_by_id('2'))
+        self.assertIs(TEST_DATA[3], self.table.get_object_by_id(4))
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '5')
+
+    def test_get_object_by_id_multiple_matches(self):
+        self.table = MyTable(self.request, TEST_DATA + TEST_DATA_2)
+        self.assertRaises(ValueError, self.table.get_object_by_id, '1')
+
+    def test_get_object_by_id_indexed_once(self):
+        self.table = MyTable(self.request, list(TEST_DATA))
+        with mock.patch.object(self.table, 'get_object_id',
+                               wraps=self.table.get_object_id) as get_id:
+            for obj in TEST_DATA:
+                self.table.get_object_by_id(obj.id)
+            self.assertEqual(len(TEST_DATA), get_id.call_count)
+
+            # The index is built again when the data changes.
+            new_obj = FakeObject('5', 'object_5', 'value_5', 'up')
+            self.table.data.append(new_obj)
+            self.assertIs(new_obj, self.table.get_object_by_id('5'))
+            self.table.data = TEST_DATA_2
+            self.assertIs(TEST_DATA_2[0], self.table.get_object_by_id('1'))
+            self.assertEqual(len(TEST_DATA) * 2 + 2, get_id.call_count)
+
+    def test_get_object_by_id_data_replaced_in_place(self):
+        self.table = MyTable(self.request, list(TEST_DATA))
+        self.assertIs(TEST_DATA[1], self.table.get_object_by_id('2'))
+
+        new_obj = FakeObject('5', 'object_5', 'value_5', 'up')
+        self.table.data[1] = new_obj
+        # The object found was replaced, so the data is indexed again.
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '2')
+        self.assertIs(new_obj, self.table.get_object_by_id('5'))
+
+    def test_get_object_by_id_missing_not_indexed_again(self):
+        self.table = MyTable(self.request, list(TEST_DATA))
+        with mock.patch.object(self.table, 'get_object_id',
+                               wraps=self.table.get_object_id) as get_id:
+            for i in range(3):
+                self.assertRaises(exceptions.Http302,
+                                  self.table.get_object_by_id, '5')
+            self.assertEqual(len(TEST_DATA), get_id.call_count)
+
+    def test_get_object_by_id_iterator_data(self):
+        self.table = MyTable(self.request,
+                             filter(lambda obj: obj.id != '1', TEST_DATA))
+        self.assertIs(TEST_DATA[2], self.table.get_object_by_id('3'))
+
     def test_table_natural_no_inline_editing(self):
         class TempTable(MyTable):
             name = tables.Column(get_name,
@@ -1048,6 +1117,42 @@ class DataTableTests(test.TestCase):
         self.assertEqual("Delete Me", row_actions[0].verbose_name)
         self.assertEqual("Log In", row_actions[1].verbose_name)
 
+    def test_table_row_update_batch(self):
+        def get_data(request, obj_id):
+            if obj_id == "3":
+                raise exceptions.NotFound()
+            return [datum for datum in TEST_DATA_2 + TEST_DATA_4
+                    if datum.id == obj_id][0]
+
+        params = {"table": "my_table", "action": "row_update_batch",
+                  "obj_id": ["1", "2", "3"]}
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTable(req)
+        with mock.patch.object(MyRow, 'get_data',
+                               side_effect=get_data) as mock_get_data:
+            resp = self.table.maybe_preempt()
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual('application/json', resp['Content-Type'])
+        self.assertEqual(3, mock_get_data.call_count)
+        rows = json.loads(resp.content.decode('utf-8'))['rows']
+        # The row of the deleted object is missing.
+        self.assertEqual({"1", "2"}, set(rows))
+        self.assertIn('id="my_table__row__1"', rows["1"])
+        self.assertIn("status_down", rows["1"])
+        self.assertIn('id="my_table__row__2"', rows["2"])
+
+    def test_table_row_update_batch_error(self):
+        params = {"table": "my_table", "action": "row_update_batch",
+                  "obj_id": ["1", "2"]}
+        req = self.factory.get('/my_url/', params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTable(req)
+        with mock.patch.object(MyRow, 'get_data_batch',
+                               side_effect=exceptions.NotAuthorized()):
+            resp = self.table.maybe_preempt()
+        self.assertEqual(401, resp.status_code)
+
     def test_server_filtering(self):
         filter_value_param = "my_table__filter__q"
         filter_field_param = '%s_field' % filter_value_param
@@ -1150,6 +1255,38 @@ class DataTableTests(test.TestCase):
         res = http.HttpResponse(table.render())
         self.assertContains(res, "multi_select_column hidden")
 
+    def test_row_actions_cached_by_key(self):
+        table = CachedActionsTable(self.request, TEST_DATA)
+        with mock.patch.object(MyCachedToggleAction, 'allowed',
+                               autospec=True,
+                               wraps=MyCachedToggleAction.allowed) as allowed:
+            row_actions = [table.get_row_actions(datum)
+                           for datum in TEST_DATA]
+        # TEST_DATA has three distinct statuses.
+        self.assertEqual(3, allowed.call_count)
+
+        toggles = [actions[0] for actions in row_actions
+                   if actions[0].name == "cached_toggle"]
+        self.assertEqual(["Down Item", "Up Item", "Down Item"],
+                         [str(action.verbose_name) for action in toggles])
+        # The state bound to each row is not shared.
+        self.assertEqual([TEST_DATA[0], TEST_DATA[1], TEST_DATA[2]],
+                         [action.datum for action in toggles])
+        self.assertEqual(
+            "cached_actions_table__row_2__action_cached_toggle",
+            toggles[1].get_final_attrs()["id"])
+        self.assertIsNot(toggles[0].attrs, toggles[2].attrs)
+        # The action is not allowed for the fourth row.
+        self.assertEqual(["login"], [a.name for a in row_actions[3]])
+
+    def test_row_actions_not_cached_without_key(self):
+        table = MyTable(self.request, TEST_DATA)
+        with mock.patch.object(MyToggleAction, 'allowed', autospec=True,
+                               wraps=MyToggleAction.allowed) as allowed:
+            for datum in TEST_DATA:
+                table.get_row_actions(datum)
+        self.assertEqual(len(TEST_DATA), allowed.call_count)
+
     def test_table_action_object_display_is_id(self):
         action_string = "my_table__toggle__1"
         req = self.factory.post('/my_url/', {'action': action_string})
@@ -1303,6 +1440,26 @@ class MultiTableView(tables.MultiTableView):
         return TEST_DATA
 
 
+_executor = futures.ThreadPoolExecutor(max_workers=2)
+
+
+class ParallelMultiTableView(MultiTableView):
+    parallel_load = True
+
+    def __init__(self, *args, **kwargs):
+        super(ParallelMultiTableView, self).__init__(*args, **kwargs)
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def get_table_with_permissions_data(self):
+        # Both tables have to be loading at the same time to pass.
+        self.barrier.wait()
+        return TEST_DATA[:1]
+
+    def get_my_table_data(self):
+        self.barrier.wait()
+        return TEST_DATA
+
+
 class DataTableViewTests(test.TestCase):
     def _prepare_view(self, cls, *args, **kwargs):
         req = self.factory.get('/my_url/')
@@ -1346,6 +1503,28 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(TableWithPermissions,
                          context['table_with_permissions_table'].__class__)
 
+    @override_settings(PARALLEL_SUBMIT_FUNCTION=_executor.submit)
+    def test_multi_table_view_parallel_load(self):
+        view = self._prepare_view(ParallelMultiTableView)
+        data = view._get_data_dict()
+        self.assertEqual({'table_with_permissions': list(TEST_DATA[:1]),
+                          'my_table': list(TEST_DATA)}, data)
+
+    @override_settings(PARALLEL_SUBMIT_FUNCTION=_executor.submit)
+    @mock.patch.object(exceptions, 'handle')
+    @mock.patch.object(ParallelMultiTableView,
+                       'get_table_with_permissions_data',
+                       side_effect=exceptions.AlreadyExists('table', MyTable))
+    def test_multi_table_view_parallel_load_error(self, mock_get_data,
+                                                  mock_handle):
+        view = self._prepare_view(ParallelMultiTableView)
+        view.barrier = threading.Barrier(1)
+        data = view._get_data_dict()
+        # The error only empties the table it happened in.
+        self.assertEqual({'table_with_permissions': [],
+                          'my_table': list(TEST_DATA)}, data)
+        mock_handle.assert_called_once_with(view.request)
+
     fil_value_param = "my_table__filter__q"
     fil_field_param = '%s_field' % fil_value_param
 
@@ -14,11 +14,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 import copy
+import threading
 
 from django.conf import settings
 from django import http
 from django.test.utils import override_settings
+import mock
 
 from horizon import exceptions
 from horizon import middleware
@@ -26,6 +29,7 @@ from horizon import tabs as horizon_tabs
 from horizon.test import helpers as test
 
 from horizon.test.unit.tables.test_tables import MyTable
+from horizon.test.unit.tables.test_tables import TableWithPermissions
 from horizon.test.unit.tables.test_tables import TEST_DATA
 
 
@@ -125,6 +129,75 @@ class TabWithTableView(horizon_tabs.TabbedTableView):
     template_name = "tab_group.html"
 
 
+_executor = futures.ThreadPoolExecutor(max_workers=2)
+
+
+class SlowTab(BaseTestTab):
+    template_name = "_tab.html"
+
+    def get_context_data(self, request):
+        self.tab_group.events[self.slug].wait(5)
+        return {"tab": self, "thread": threading.current_thread()}
+
+
+class SlowTabOne(SlowTab):
+    slug = "slow_tab_one"
+    name = "Slow Tab One"
+
+
+class SlowTabTwo(SlowTab):
+    slug = "slow_tab_two"
+    name = "Slow Tab Two"
+
+
+class ParallelGroup(horizon_tabs.TabGroup):
+    slug = "parallel_tab_group"
+    tabs = (SlowTabOne, SlowTabTwo)
+    parallel_load = True
+
+    def __init__(self, request, **kwargs):
+        self.events = {'slow_tab_one': threading.Event(),
+                       'slow_tab_two': threading.Event()}
+        super(ParallelGroup, self).__init__(request, **kwargs)
+
+
+class TabWithTables(horizon_tabs.TableTab):
+    table_classes = (MyTable, TableWithPermissions)
+    name = "Tab With Tables"
+    slug = "tab_with_tables"
+    template_name = "horizon/common/_detail_table.html"
+    parallel_load = True
+
+    def __init__(self, *args, **kwargs):
+        super(TabWithTables, self).__init__(*args, **kwargs)
+        self.barrier = threading.Barrier(2, timeout=5)
+
+    def get_my_table_data(self):
+        # Both tables have to be loading at the same time to pass.
+        self.barrier.wait()
+        return TEST_DATA
+
+    def get_table_with_permissions_data(self):
+        self.barrier.wait()
+        raise exceptions.AlreadyExists('table', TableWithPermissions)
+
+
+class TablesTabGroup(horizon_tabs.TabGroup):
+    slug = "tab_group"
+    tabs = (TabWithTables,)
+
+
+class ParallelErrorGroup(horizon_tabs.TabGroup):
+    slug = "parallel_tab_group"
+    tabs = (TabOne, RecoverableErrorTab)
+    parallel_load = True
+
+
+class ParallelErrorTabView(horizon_tabs.TabView):
+    tab_group_class = ParallelErrorGroup
+    template_name = "tab_group.html"
+
+
 class TabTests(test.TestCase):
     def test_tab_group_basics(self):
         tg = Group(self.request)
@@ -338,6 +411,71 @@ class TabTests(test.TestCase):
         self.assertRaises(exceptions.Http302, view, req)
 
 
+@override_settings(PARALLEL_SUBMIT_FUNCTION=_executor.submit)
+class ParallelTabTests(test.TestCase):
+
+    def test_load_tab_data(self):
+        tg = ParallelGroup(self.request)
+        # The first tab waits for the second one to be loading.
+        tg.events['slow_tab_two'].set()
+        tg._tabs['slow_tab_two'].get_context_data = lambda request: (
+            tg.events['slow_tab_one'].set(),
+            {'thread': threading.current_thread()})[1]
+
+        tg.load_tab_data()
+
+        threads = {tab.data['thread'] for tab in tg.get_tabs()}
+        self.assertEqual(2, len(threads))
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_load_tab_data_timeout(self):
+        tg = ParallelGroup(self.request)
+        tg.load_timeout = 0.01
+        self.addCleanup(tg.events['slow_tab_two'].set)
+        tg.events['slow_tab_one'].set()
+
+        tg.load_tab_data()
+
+        tab_one = tg.get_tab('slow_tab_one')
+        tab_two = tg.get_tab('slow_tab_two')
+        self.assertTrue(tab_one.is_active())
+        self.assertTrue(tab_one.data_loaded)
+        # The slow tab is loaded when it is selected instead.
+        self.assertFalse(tab_two.data_loaded)
+        self.assertFalse(tab_two.load)
+        self.assertEqual('', tab_two.render())
+
+    def test_load_tab_data_timeout_active_tab(self):
+        self.request.GET['tab'] = 'parallel_tab_group__slow_tab_two'
+        tg = ParallelGroup(self.request)
+        tg.load_timeout = 0.01
+        self.addCleanup(tg.events['slow_tab_one'].set)
+        threading.Timer(0.1, tg.events['slow_tab_two'].set).start()
+
+        tg.load_tab_data()
+
+        # The data of the active tab is waited for.
+        self.assertTrue(tg.get_tab('slow_tab_two').data_loaded)
+        self.assertFalse(tg.get_tab('slow_tab_one').load)
+
+    @override_settings(SESSION_REFRESH=False)
+    def test_load_tab_data_error(self):
+        view = ParallelErrorTabView.as_view()
+        res = view(self.factory.get("/"))
+        self.assertMessageCount(res, error=1)
+
+    @mock.patch.object(exceptions, 'handle')
+    def test_table_tab_parallel_load(self, mock_handle):
+        tab = TablesTabGroup(self.request).get_tab('tab_with_tables')
+
+        tab.load_table_data()
+
+        self.assertEqual(TEST_DATA, tab._tables['my_table'].data)
+        # The error only empties the table it happened in.
+        self.assertEqual([], tab._tables['table_with_permissions'].data)
+        mock_handle.assert_called_once_with(self.request)
+
+
 class TabExceptionTests(test.TestCase):
     def setUp(self):
         super(TabExceptionTests, self).setUp()
@@ -16,12 +16,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import re
 
 from django.conf import settings
+from django.core.cache import cache
 from django.template import Context
 from django.template import Template
+from django.test.utils import override_settings
 from django.utils.text import normalize_newlines
+import mock
 
 from horizon.test import helpers as test
 # The following imports are required to register the dashboards.
@@ -152,3 +156,39 @@ class TemplateTagTests(test.TestCase):
                                             template_text=text,
                                             context={'request': self.request})
         self.assertEqual(single_line(rendered_str), single_line(expected))
+
+    def _render_main_nav(self, fingerprint):
+        request = copy.copy(self.request)
+        with override_settings(
+                NAVIGATION_FINGERPRINT_FUNCTION=lambda r: fingerprint):
+            return self.render_template(tag_require='horizon',
+                                        template_text="{% horizon_main_nav %}",
+                                        context={'request': request})
+
+    @override_settings(NAVIGATION_CACHE={'enabled': True})
+    def test_horizon_main_nav_cached(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        with mock.patch.object(Cats, 'can_access',
+                               return_value=False) as mock_access:
+            first = self._render_main_nav('member')
+            second = self._render_main_nav('member')
+        self.assertEqual(1, mock_access.call_count)
+        self.assertNotIn('/cats/', first)
+        self.assertEqual(first, second)
+
+        # Users with another fingerprint do not share the decisions.
+        with mock.patch.object(Cats, 'can_access',
+                               return_value=True) as mock_access:
+            other = self._render_main_nav('admin')
+            no_fingerprint = self._render_main_nav(None)
+        self.assertEqual(2, mock_access.call_count)
+        self.assertIn('/cats/', other)
+        self.assertIn('/cats/', no_fingerprint)
+
+    def test_horizon_main_nav_not_cached(self):
+        with mock.patch.object(Cats, 'can_access',
+                               return_value=True) as mock_access:
+            self._render_main_nav('member')
+            self._render_main_nav('member')
+        self.assertEqual(2, mock_access.call_count)
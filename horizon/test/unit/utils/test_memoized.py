@@ -10,10 +10,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from django.test.utils import override_settings
+import mock
+
 from horizon.test import helpers as test
 from horizon.utils import memoized
 
 
+SHARED_CACHE_ENABLED = {
+    'enabled': True,
+    'cache_alias': None,
+    'default_timeout': 60,
+    'timeouts': {},
+}
+
+
 class MemoizedTests(test.TestCase):
     def test_memoized_decorator_cache_on_next_call(self):
         values_list = []
@@ -80,3 +91,191 @@ class MemoizedTests(test.TestCase):
         cache_calls(4)
         self.assertEqual(9, len(values_list))
         # 4 is readded, 5 is dropped
+
+
+@override_settings(MEMOIZED_SHARED_CACHE=SHARED_CACHE_ENABLED)
+class SharedMemoizedTests(test.TestCase):
+    def setUp(self):
+        super(SharedMemoizedTests, self).setUp()
+        memoized._get_shared_cache().clear()
+
+    def _make_request(self, project_id='project', user_id='user'):
+        request = mock.Mock()
+        request.user.is_authenticated = True
+        request.user.endpoint = 'http://localhost/identity'
+        request.user.services_region = 'RegionOne'
+        request.user.project_id = project_id
+        request.user.id = user_id
+        request.user.token.id = 'token'
+        return request
+
+    def test_shared_across_requests(self):
+        values_list = []
+
+        @memoized.shared_memoized
+        def cache_calls(request, param):
+            values_list.append(param)
+            return param
+
+        for x in range(0, 5):
+            self.assertEqual(1, cache_calls(self._make_request(), 1))
+        self.assertEqual(1, len(values_list))
+
+        cache_calls(self._make_request(), 2)
+        self.assertEqual(2, len(values_list))
+
+    def test_project_scope(self):
+        values_list = []
+
+        @memoized.shared_memoized(scope='project')
+        def cache_calls(request):
+            values_list.append(request)
+            return True
+
+        cache_calls(self._make_request(project_id='a', user_id='a'))
+        cache_calls(self._make_request(project_id='a', user_id='b'))
+        self.assertEqual(1, len(values_list))
+        cache_calls(self._make_request(project_id='b'))
+        self.assertEqual(2, len(values_list))
+
+    def test_user_scope(self):
+        values_list = []
+
+        @memoized.shared_memoized(scope='user')
+        def cache_calls(request):
+            values_list.append(request)
+            return True
+
+        cache_calls(self._make_request(user_id='a'))
+        cache_calls(self._make_request(user_id='a'))
+        self.assertEqual(1, len(values_list))
+        cache_calls(self._make_request(user_id='b'))
+        self.assertEqual(2, len(values_list))
+
+    def test_unknown_scope(self):
+        self.assertRaises(ValueError, memoized.shared_memoized,
+                          scope='unknown')
+
+    def test_invalidate(self):
+        values_list = []
+
+        @memoized.shared_memoized
+        def cache_calls(request):
+            values_list.append(request)
+            return True
+
+        cache_calls(self._make_request())
+        cache_calls(self._make_request())
+        self.assertEqual(1, len(values_list))
+
+        cache_calls.invalidate()
+        cache_calls(self._make_request())
+        cache_calls(self._make_request())
+        self.assertEqual(2, len(values_list))
+
+    def test_lost_generation_invalidates(self):
+        values_list = []
+
+        @memoized.shared_memoized
+        def cache_calls(request):
+            values_list.append(request)
+            return True
+
+        cache_calls(self._make_request())
+        memoized._get_shared_cache().delete(memoized._get_generation_key(
+            '%s.%s' % (cache_calls.__module__, cache_calls.__name__)))
+        cache_calls(self._make_request())
+        self.assertEqual(2, len(values_list))
+
+    def test_not_shared_with_complex_arguments(self):
+        values_list = []
+
+        @memoized.shared_memoized
+        def cache_calls(request, param):
+            values_list.append(param)
+            return True
+
+        param = object()
+        cache_calls(self._make_request(), param)
+        cache_calls(self._make_request(), param)
+        self.assertEqual(2, len(values_list))
+
+    def test_not_shared_for_anonymous_user(self):
+        values_list = []
+
+        @memoized.shared_memoized
+        def cache_calls(request):
+            values_list.append(request)
+            return True
+
+        request = self._make_request()
+        request.user.is_authenticated = False
+        cache_calls(request)
+        request = self._make_request()
+        request.user.is_authenticated = False
+        cache_calls(request)
+        self.assertEqual(2, len(values_list))
+
+    def test_dumps_and_loads(self):
+        @memoized.shared_memoized(dumps=lambda value: value['data'],
+                                  loads=lambda request, data: {'data': data})
+        def cache_calls(request):
+            return {'data': 'value'}
+
+        self.assertEqual({'data': 'value'}, cache_calls(self._make_request()))
+        self.assertEqual({'data': 'value'}, cache_calls(self._make_request()))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': False})
+    def test_disabled(self):
+        values_list = []
+
+        @memoized.shared_memoized
+        def cache_calls(request):
+            values_list.append(request)
+            return True
+
+        cache_calls(self._make_request())
+        cache_calls(self._make_request())
+        self.assertEqual(2, len(values_list))
+
+    def test_shared_entries(self):
+        memoized.set_shared_entries('entries', self._make_request(), 'user',
+                                    {'a': 1, ('b', 2): [2]})
+        self.assertEqual(
+            {'a': 1, ('b', 2): [2]},
+            memoized.get_shared_entries('entries', self._make_request(),
+                                        'user', ['a', ('b', 2), 'c']))
+        self.assertEqual(
+            {}, memoized.get_shared_entries(
+                'entries', self._make_request(user_id='other'), 'user',
+                ['a']))
+
+        memoized.invalidate_shared('entries')
+        self.assertEqual(
+            {}, memoized.get_shared_entries('entries', self._make_request(),
+                                            'user', ['a']))
+
+    def test_delete_shared_entries(self):
+        memoized.set_shared_entries('entries', self._make_request(), 'user',
+                                    {'a': 1, 'b': 2})
+        memoized.delete_shared_entries('entries', self._make_request(),
+                                       'user', ['a'])
+        self.assertEqual(
+            {'b': 2},
+            memoized.get_shared_entries('entries', self._make_request(),
+                                        'user', ['a', 'b']))
+
+    def test_get_shared_timeout(self):
+        self.assertEqual(60, memoized.get_shared_timeout('entries'))
+        self.assertEqual(10, memoized.get_shared_timeout('entries', 10))
+        with self.settings(MEMOIZED_SHARED_CACHE={
+                'enabled': True, 'timeouts': {'entries': 0}}):
+            self.assertEqual(0, memoized.get_shared_timeout('entries', 10))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': False})
+    def test_shared_entries_disabled(self):
+        memoized.set_shared_entries('entries', self._make_request(), 'user',
+                                    {'a': 1})
+        self.assertEqual(
+            {}, memoized.get_shared_entries('entries', self._make_request(),
+                                            'user', ['a']))
@@ -14,11 +14,18 @@
 
 import collections
 import functools
+import hashlib
+import logging
 import threading
+import uuid
 import warnings
 import weakref
 
 from django.conf import settings
+from django.core.cache.backends import locmem
+from django.core.cache import caches
+
+LOG = logging.getLogger(__name__)
 
 
 class UnhashableKeyWarning(RuntimeWarning):
@@ -132,6 +139,287 @@ def memoized(func=None, max_size=None):
     return decorate
 
 
+# Scopes supported by shared_memoized. Each scope lists the attributes of
+# ``request.user`` which become part of the cache key.
+SHARED_SCOPES = {
+    'region': ('endpoint', 'services_region'),
+    'project': ('endpoint', 'services_region', 'project_id'),
+    'user': ('endpoint', 'services_region', 'project_id', 'id'),
+    'token': ('endpoint', 'services_region', 'project_id', 'id', 'token.id'),
+}
+
+_local_cache = None
+_local_cache_lock = threading.Lock()
+
+
+def _get_shared_config():
+    return getattr(settings, 'MEMOIZED_SHARED_CACHE', {}) or {}
+
+
+def shared_cache_enabled():
+    """Return whether the shared cache tier is enabled."""
+    return bool(_get_shared_config().get('enabled'))
+
+
+def get_shared_timeout(name, timeout=None):
+    """Return the lifetime in seconds of the shared entries of ``name``.
+
+    It is ``MEMOIZED_SHARED_CACHE['timeouts'][name]`` when set, otherwise
+    ``timeout`` or ``MEMOIZED_SHARED_CACHE['default_timeout']``. A lifetime
+    of 0 means that the entries of ``name`` are not cached.
+    """
+    config = _get_shared_config()
+    return config.get('timeouts', {}).get(
+        name, timeout or config.get('default_timeout', 60))
+
+
+def _get_shared_cache():
+    """Return the cache backend used by the shared memoization tier.
+
+    When no cache alias is configured, a process-local memory cache is used.
+    """
+    global _local_cache
+    alias = _get_shared_config().get('cache_alias')
+    if alias:
+        return caches[alias]
+    if _local_cache is None:
+        with _local_cache_lock:
+            if _local_cache is None:
+                _local_cache = locmem.LocMemCache(
+                    'horizon-memoized',
+                    {'OPTIONS': {'MAX_ENTRIES': 1000}})
+    return _local_cache
+
+
+def _freeze(value):
+    """Return a stable string representation of a hashable argument.
+
+    Only simple values are supported, because the representation has to be
+    identical in every process sharing the cache. ``TypeError`` is raised for
+    anything else.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        return '(%s)' % ','.join(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return '{%s}' % ','.join(sorted(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return '{%s}' % ','.join(sorted('%s:%s' % (_freeze(k), _freeze(v))
+                                        for k, v in value.items()))
+    raise TypeError("%r cannot be used in a shared cache key" % (value,))
+
+
+def _get_scope(request, scope):
+    parts = []
+    for attr in SHARED_SCOPES[scope]:
+        value = request.user
+        for name in attr.split('.'):
+            value = getattr(value, name, None)
+        parts.append(value)
+    return parts
+
+
+def _get_shared_key(name, request, scope, args, kwargs):
+    """Calculate the shared cache key, or return None if not cacheable."""
+    try:
+        if not request.user.is_authenticated:
+            return None
+        frozen = _freeze((_get_scope(request, scope), args, kwargs))
+    except (AttributeError, TypeError):
+        return None
+    digest = hashlib.sha1(
+        ('%s:%s' % (name, frozen)).encode('utf-8')).hexdigest()
+    return 'horizon-memoized:%s' % digest
+
+
+def _get_generation_key(name):
+    return 'horizon-memoized-generation:%s' % name
+
+
+def invalidate_shared(name):
+    """Invalidate all shared cache entries of the given function.
+
+    ``name`` is the dotted path of the decorated function. It is usually more
+    convenient to call the ``invalidate()`` attribute of the function
+    decorated with :func:`shared_memoized` instead.
+    """
+    if not _get_shared_config().get('enabled'):
+        return
+    # A new random generation makes all existing entries stale. A random
+    # value (rather than a counter) keeps working if the generation key
+    # itself gets evicted from the cache.
+    _get_shared_cache().set(_get_generation_key(name), uuid.uuid4().hex,
+                            None)
+
+
+def _get_generation(cache, name):
+    generation_key = _get_generation_key(name)
+    generation = cache.get(generation_key)
+    if generation is None:
+        # Use add() so concurrent callers agree on a single value.
+        cache.add(generation_key, uuid.uuid4().hex, None)
+        generation = cache.get(generation_key)
+    return generation
+
+
+def get_shared_entries(name, request, scope, keys):
+    """Return the entries stored by :func:`set_shared_entries`.
+
+    This is a lower level interface to the shared cache tier for callers
+    which fetch many items at once and only want to call the API for the
+    items which are not cached. ``name`` identifies the cached data and can
+    be invalidated with :func:`invalidate_shared`. ``keys`` must be simple
+    values (see :func:`shared_memoized`).
+
+    :returns: a dict mapping the keys found in the cache to their values.
+        It is empty when ``MEMOIZED_SHARED_CACHE['enabled']`` is not set.
+    """
+    config = _get_shared_config()
+    if not config.get('enabled'):
+        return {}
+    cache_keys = {}
+    for key in keys:
+        cache_key = _get_shared_key(name, request, scope, (key,), {})
+        if cache_key is None:
+            return {}
+        cache_keys[cache_key] = key
+    cache = _get_shared_cache()
+    generation_key = _get_generation_key(name)
+    found = cache.get_many(list(cache_keys) + [generation_key])
+    generation = found.pop(generation_key, None)
+    if generation is None:
+        return {}
+    return dict((cache_keys[cache_key], data)
+                for cache_key, (entry_generation, data) in found.items()
+                if entry_generation == generation)
+
+
+def set_shared_entries(name, request, scope, entries, timeout=None):
+    """Store the values of ``entries`` (a dict) in the shared cache.
+
+    ``timeout`` is the lifetime of the entries in seconds and can be
+    overridden in ``MEMOIZED_SHARED_CACHE['timeouts']`` like for
+    :func:`shared_memoized`.
+    """
+    config = _get_shared_config()
+    if not config.get('enabled') or not entries:
+        return
+    data = {}
+    for key, value in entries.items():
+        cache_key = _get_shared_key(name, request, scope, (key,), {})
+        if cache_key is None:
+            return
+        data[cache_key] = value
+    cache = _get_shared_cache()
+    generation = _get_generation(cache, name)
+    ttl = get_shared_timeout(name, timeout)
+    try:
+        cache.set_many(dict((cache_key, (generation, value))
+                            for cache_key, value in data.items()), ttl)
+    except Exception as e:
+        LOG.debug("Unable to store %s in the shared cache: %s", name, e)
+
+
+def delete_shared_entries(name, request, scope, keys):
+    """Remove entries stored by :func:`set_shared_entries`.
+
+    Unlike :func:`invalidate_shared`, the other entries of ``name`` are
+    kept.
+    """
+    if not _get_shared_config().get('enabled'):
+        return
+    cache_keys = []
+    for key in keys:
+        cache_key = _get_shared_key(name, request, scope, (key,), {})
+        if cache_key is None:
+            return
+        cache_keys.append(cache_key)
+    try:
+        _get_shared_cache().delete_many(cache_keys)
+    except Exception as e:
+        LOG.debug("Unable to delete %s from the shared cache: %s", name, e)
+
+
+def shared_memoized(func=None, timeout=None, scope='project', dumps=None,
+                    loads=None, max_size=None):
+    """Decorator that caches API calls across requests.
+
+    The decorated function must accept a request as its first argument. It is
+    memoized per request exactly like :func:`memoized`. In addition, when
+    ``MEMOIZED_SHARED_CACHE['enabled']`` is set, the result is stored in a
+    cache shared by all requests (and by all processes if the configured
+    cache backend is shared), keyed by the request's ``scope`` instead of
+    the request object itself:
+
+    * ``region``: the keystone endpoint and services region,
+    * ``project``: the above plus the project of the user,
+    * ``user``: the above plus the user,
+    * ``token``: the above plus the keystone token.
+
+    The remaining arguments must be simple values (strings, numbers, None
+    and tuples, lists, sets or dicts of those), otherwise only the per
+    request cache is used.
+
+    ``timeout`` is the lifetime of the shared entries in seconds and can be
+    overridden per function in ``MEMOIZED_SHARED_CACHE['timeouts']``.
+
+    ``dumps`` and ``loads`` can be used to convert the result into something
+    which can be pickled (for example dropping references to API clients)
+    and back. ``loads`` is called with the request and the cached data.
+
+    The decorated function gets an ``invalidate()`` attribute which drops
+    all shared entries of the function; mutating API wrappers are expected
+    to call it.
+    """
+    if scope not in SHARED_SCOPES:
+        raise ValueError("Unknown shared memoization scope: %s" % scope)
+
+    def decorate(func):
+        name = '%s.%s' % (func.__module__, func.__name__)
+
+        @functools.wraps(func)
+        def shared(request, *args, **kwargs):
+            config = _get_shared_config()
+            if not config.get('enabled'):
+                return func(request, *args, **kwargs)
+            key = _get_shared_key(name, request, scope, args, kwargs)
+            if key is None:
+                return func(request, *args, **kwargs)
+
+            cache = _get_shared_cache()
+            generation_key = _get_generation_key(name)
+            found = cache.get_many([key, generation_key])
+            generation = found.get(generation_key)
+            entry = found.get(key)
+            if generation is not None and entry is not None:
+                entry_generation, data = entry
+                if entry_generation == generation:
+                    return loads(request, data) if loads else data
+
+            value = func(request, *args, **kwargs)
+
+            if generation is None:
+                # Either the first call ever or the generation was evicted.
+                generation = _get_generation(cache, name)
+            ttl = get_shared_timeout(name, timeout)
+            try:
+                data = dumps(value) if dumps else value
+                cache.set(key, (generation, data), ttl)
+            except Exception as e:
+                # A result which cannot be stored is simply not shared.
+                LOG.debug("Unable to store the result of %s in the shared "
+                          "cache: %s", name, e)
+            return value
+
+        wrapped = memoized(shared, max_size=max_size)
+        wrapped.invalidate = functools.partial(invalidate_shared, name)
+        return wrapped
+    if func and callable(func):
+        return decorate(func)
+    return decorate
+
+
 # We can use @memoized for methods now too, because it uses weakref and so
 # it doesn't keep the instances in memory forever. We might want to separate
 # them in the future, however.
@@ -0,0 +1,69 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Concurrent calls of functions by horizon.
+
+Horizon does not manage threads itself. Functions are run concurrently by
+the function of the PARALLEL_SUBMIT_FUNCTION setting, which is provided by
+the application, and in the calling thread when it is not set.
+"""
+
+from concurrent import futures
+import functools
+
+from osprofiler import profiler
+
+from horizon.utils import settings as utils_settings
+
+
+def submit(func, *args, **kwargs):
+    """Call ``func(*args, **kwargs)`` concurrently when possible.
+
+    :returns: a :class:`concurrent.futures.Future` of the value returned by
+        the function. The function has already been called when
+        PARALLEL_SUBMIT_FUNCTION is not set.
+    """
+    submit_func = utils_settings.import_setting('PARALLEL_SUBMIT_FUNCTION')
+    if submit_func is not None:
+        return submit_func(func, *args, **kwargs)
+    future = futures.Future()
+    try:
+        future.set_result(func(*args, **kwargs))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _call_traced(trace_name, name, func):
+    with profiler.Trace(trace_name, info={'name': name}):
+        return func()
+
+
+def call_all(funcs, trace_name=None):
+    """Call functions concurrently and wait for all of them.
+
+    :param funcs: a dict mapping names to the functions to call, without
+        arguments.
+    :param trace_name: when it is set and the profiler is enabled, each call
+        is recorded as a trace with this name and the name of the function.
+    :returns: a dict mapping the names to the (done) futures of the values
+        returned by the functions. An error of a function is raised when the
+        result of its future is retrieved only, so the errors of the
+        functions can be handled separately.
+    """
+    if (trace_name is not None and
+            utils_settings.get_dict_config('OPENSTACK_PROFILER', 'enabled')):
+        funcs = {name: functools.partial(_call_traced, trace_name, name, func)
+                 for name, func in funcs.items()}
+    results = {name: submit(func) for name, func in funcs.items()}
+    futures.wait(results.values())
+    return results
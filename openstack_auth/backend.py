@@ -13,8 +13,11 @@
 
 """ Module defining the Django auth backend class for the Keystone API. """
 
+import collections
 import datetime
 import logging
+import threading
+import time
 
 import pytz
 
@@ -32,6 +35,50 @@ LOG = logging.getLogger(__name__)
 
 KEYSTONE_CLIENT_ATTR = "_keystoneclient"
 
+# Users built from the tokens of the sessions, by token ID, endpoint and
+# services region. See the USER_CACHE setting. The requests change their
+# user (services region, policy decisions...), so each request gets a copy
+# of the cached user and the cached users are never handed out.
+_USERS = collections.OrderedDict()
+_USERS_LOCK = threading.Lock()
+
+
+def _copy_user(user):
+    # A shallow copy: the attributes set by a request are only set on its
+    # copy. copy.copy() cannot be used because the users are models which
+    # were not initialized by Model.__init__().
+    copied = user.__class__.__new__(user.__class__)
+    copied.__dict__.update(user.__dict__)
+    return copied
+
+
+def _get_cached_user(key):
+    timeout = utils._get_dict_config('USER_CACHE', 'timeout')
+    if not timeout:
+        return None
+    with _USERS_LOCK:
+        entry = _USERS.get(key)
+        if entry is None:
+            return None
+        expires, user = entry
+        if expires < time.time() or not utils.is_token_valid(user.token):
+            del _USERS[key]
+            return None
+        _USERS.move_to_end(key)
+    return _copy_user(user)
+
+
+def _cache_user(key, user):
+    timeout = utils._get_dict_config('USER_CACHE', 'timeout')
+    if not timeout:
+        return
+    max_entries = utils._get_dict_config('USER_CACHE', 'max_entries')
+    with _USERS_LOCK:
+        _USERS[key] = (time.time() + timeout, _copy_user(user))
+        _USERS.move_to_end(key)
+        while len(_USERS) > max_entries:
+            _USERS.popitem(last=False)
+
 
 # TODO(stephenfin): Subclass 'django.contrib.auth.backends.BaseBackend' once we
 # (only) support Django 3.0
@@ -52,7 +99,8 @@ class KeystoneBackend(object):
         """Returns the current user from the session data.
 
         If authenticated, this return the user object based on the user ID
-        and session data.
+        and session data. The user object can be reused by the requests
+        made with the same token, see the ``USER_CACHE`` setting.
 
         .. note::
 
@@ -65,8 +113,18 @@ class KeystoneBackend(object):
             token = self.request.session['token']
             endpoint = self.request.session['region_endpoint']
             services_region = self.request.session['services_region']
+            # Without a services region, the default region depends on the
+            # cookies of the request.
+            key = None
+            if token is not None and services_region:
+                key = (token.id, endpoint, services_region)
+                user = _get_cached_user(key)
+                if user is not None:
+                    return user
             user = auth_user.create_user_from_token(self.request, token,
                                                     endpoint, services_region)
+            if key is not None:
+                _cache_user(key, user)
             return user
         else:
             return None
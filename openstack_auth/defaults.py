@@ -170,3 +170,32 @@ KEYSTONE_PROVIDER_IDP_ID = 'localkeystone'
 POLICY_FILES_PATH = ''
 POLICY_FILES = {}
 POLICY_DIRS = {}
+
+# Policy decisions are cached for the duration of a request. They can also
+# be shared by the requests made with the same token for "timeout" seconds
+# (0 disables it). "max_entries" is the maximum number of tokens whose
+# decisions are kept by each process.
+POLICY_DECISION_CACHE = {
+    'timeout': 0,
+    'max_entries': 1000,
+}
+
+# The User built from the token of a session can be reused by the requests
+# made with the same token for "timeout" seconds (0 disables it), along
+# with the list of projects the user may access. "max_entries" is the
+# maximum number of users kept by each process. The project lists are also
+# stored in the Django cache "cache_alias" when it is set, so that they are
+# shared between processes.
+USER_CACHE = {
+    'timeout': 0,
+    'max_entries': 1000,
+    'cache_alias': None,
+}
+
+# The service catalog of the tokens stored in the sessions can be stored in
+# the Django cache "cache_alias" instead, once for all the tokens with the
+# same catalog, to make the sessions smaller.
+TOKEN_CATALOG_CACHE = {
+    'enabled': False,
+    'cache_alias': 'default',
+}
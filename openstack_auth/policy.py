@@ -13,8 +13,11 @@
 
 """Policy engine for openstack_auth"""
 
+import collections
 import logging
 import os.path
+import threading
+import time
 
 from django.conf import settings
 from oslo_config import cfg
@@ -28,6 +31,14 @@ LOG = logging.getLogger(__name__)
 
 _ENFORCER = None
 _BASE_PATH = settings.POLICY_FILES_PATH
+# Incremented when the policy rules are reloaded, so that decisions
+# cached before are not used anymore.
+_GENERATION = 0
+# Decisions shared by the requests made with the same token, see
+# POLICY_DECISION_CACHE. It maps a token and credentials fingerprint to
+# a tuple of expiration time and decisions, in least recently used order.
+_SHARED_DECISIONS = collections.OrderedDict()
+_SHARED_DECISIONS_LOCK = threading.Lock()
 
 
 def _get_policy_conf(policy_file, policy_dirs=None):
@@ -88,8 +99,86 @@ def _get_enforcer():
 
 
 def reset():
-    global _ENFORCER
+    global _ENFORCER, _GENERATION
     _ENFORCER = None
+    _GENERATION += 1
+    with _SHARED_DECISIONS_LOCK:
+        _SHARED_DECISIONS.clear()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def _get_shared_decisions(user, fingerprint):
+    timeout = auth_utils._get_dict_config('POLICY_DECISION_CACHE', 'timeout')
+    token_id = getattr(getattr(user, 'token', None), 'id', None)
+    if not timeout or not token_id:
+        return {}
+    max_entries = auth_utils._get_dict_config('POLICY_DECISION_CACHE',
+                                              'max_entries')
+    key = (token_id, fingerprint)
+    now = time.time()
+    with _SHARED_DECISIONS_LOCK:
+        entry = _SHARED_DECISIONS.pop(key, None)
+        if entry is None or entry[0] < now:
+            entry = (now + timeout, {})
+        _SHARED_DECISIONS[key] = entry
+        while len(_SHARED_DECISIONS) > max_entries:
+            _SHARED_DECISIONS.popitem(last=False)
+    return entry[1]
+
+
+def _get_decisions(user, credentials, domain_credentials):
+    """Returns the dict caching the policy decisions for the user.
+
+    The decisions are cached on the user object, which lives as long as
+    the request, and optionally shared by the requests made with the
+    same token.
+    """
+    decisions = getattr(user, '_policy_decisions', None)
+    if decisions is None or decisions[0] != _GENERATION:
+        fingerprint = _freeze((_GENERATION, credentials, domain_credentials))
+        decisions = (_GENERATION, _get_shared_decisions(user, fingerprint))
+        user._policy_decisions = decisions
+    return decisions[1]
+
+
+def _set_default_target(user, target):
+    # Several service policy engines default to a project id check for
+    # ownership. Since the user is already scoped to a project, if a
+    # different project id has not been specified use the currently scoped
+    # project's id.
+    #
+    # The reason is the operator can edit the local copies of the service
+    # policy file. If a rule is removed, then the default rule is used. We
+    # don't want to block all actions because the operator did not fully
+    # understand the implication of editing the policy file. Additionally,
+    # the service APIs will correct us if we are too permissive.
+    if target.get('project_id') is None:
+        target['project_id'] = user.project_id
+    if target.get('tenant_id') is None:
+        target['tenant_id'] = target['project_id']
+    # same for user_id
+    if target.get('user_id') is None:
+        target['user_id'] = user.id
+
+    domain_id_keys = [
+        'domain_id',
+        'project.domain_id',
+        'user.domain_id',
+        'group.domain_id'
+    ]
+    # populates domain id keys with user's current domain id
+    for key in domain_id_keys:
+        if target.get(key) is None:
+            target[key] = user.user_domain_id
 
 
 def check(actions, request, target=None):
@@ -130,39 +219,24 @@ def check(actions, request, target=None):
                       {'project_id': object.project_id}
     :returns: boolean if the user has permission or not for the actions.
     """
-    if target is None:
-        target = {}
-    user = auth_utils.get_user(request)
+    return check_batch([(actions, target)], request)[0]
 
-    # Several service policy engines default to a project id check for
-    # ownership. Since the user is already scoped to a project, if a
-    # different project id has not been specified use the currently scoped
-    # project's id.
-    #
-    # The reason is the operator can edit the local copies of the service
-    # policy file. If a rule is removed, then the default rule is used. We
-    # don't want to block all actions because the operator did not fully
-    # understand the implication of editing the policy file. Additionally,
-    # the service APIs will correct us if we are too permissive.
-    if target.get('project_id') is None:
-        target['project_id'] = user.project_id
-    if target.get('tenant_id') is None:
-        target['tenant_id'] = target['project_id']
-    # same for user_id
-    if target.get('user_id') is None:
-        target['user_id'] = user.id
 
-    domain_id_keys = [
-        'domain_id',
-        'project.domain_id',
-        'user.domain_id',
-        'group.domain_id'
-    ]
-    # populates domain id keys with user's current domain id
-    for key in domain_id_keys:
-        if target.get(key) is None:
-            target[key] = user.user_domain_id
+def check_batch(checks, request):
+    """Check user permission for several groups of actions at once.
 
+    The user, its credentials and the policy enforcers are looked up once
+    for all the checks. Decisions are cached per request and, if
+    POLICY_DECISION_CACHE is enabled, shared by the requests made with the
+    same token, so checking the same action and target again is cheap.
+
+    :param checks: iterable of ``(actions, target)`` tuples, where
+        ``actions`` and ``target`` are as described in :func:`check`.
+        ``target`` may be None.
+    :param request: django http request object.
+    :returns: list of booleans, one for each item of ``checks``.
+    """
+    user = auth_utils.get_user(request)
     credentials = _user_to_credentials(user)
     domain_credentials = _domain_to_credentials(request, user)
     # if there is a domain token use the domain_id instead of the user's domain
@@ -170,29 +244,54 @@ def check(actions, request, target=None):
         credentials['domain_id'] = domain_credentials.get('domain_id')
 
     enforcer = _get_enforcer()
+    decisions = _get_decisions(user, credentials, domain_credentials)
 
-    for action in actions:
-        scope, action = action[0], action[1]
-        if scope in enforcer:
-            # this is for handling the v3 policy file and will only be
-            # needed when a domain scoped token is present
-            if scope == 'identity' and domain_credentials:
-                # use domain credentials
-                if not _check_credentials(enforcer[scope],
-                                          action,
-                                          target,
-                                          domain_credentials):
-                    return False
-
-            # use project credentials
-            if not _check_credentials(enforcer[scope],
-                                      action, target, credentials):
-                return False
-
-        # if no policy for scope, allow action, underlying API will
-        # ultimately block the action if not permitted, treat as though
-        # allowed
-    return True
+    results = []
+    for actions, target in checks:
+        if target is None:
+            target = {}
+        _set_default_target(user, target)
+        try:
+            target_key = _freeze(target)
+            hash(target_key)
+        except TypeError:
+            target_key = None
+        results.append(all(
+            _check_action(enforcer, action[0], action[1], target, target_key,
+                          credentials, domain_credentials, decisions)
+            for action in actions))
+    return results
+
+
+# Allow callers which only know the check function, like
+# openstack_dashboard.policy, to find the batch interface.
+check.batch = check_batch
+
+
+def _check_action(enforcer, scope, action, target, target_key, credentials,
+                  domain_credentials, decisions):
+    # if no policy for scope, allow action, underlying API will
+    # ultimately block the action if not permitted, treat as though
+    # allowed
+    if scope not in enforcer:
+        return True
+    key = (scope, action, target_key)
+    if target_key is not None and key in decisions:
+        return decisions[key]
+
+    allowed = True
+    # this is for handling the v3 policy file and will only be
+    # needed when a domain scoped token is present
+    if scope == 'identity' and domain_credentials:
+        # use domain credentials
+        allowed = _check_credentials(enforcer[scope], action, target,
+                                     domain_credentials)
+    # use project credentials
+    allowed = allowed and _check_credentials(enforcer[scope], action,
+                                             target, credentials)
+    if target_key is not None:
+        decisions[key] = allowed
+    return allowed
 
 
 def _check_credentials(enforcer_scope, action, target, credentials):
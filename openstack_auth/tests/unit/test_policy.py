@@ -13,6 +13,7 @@
 
 from django import http
 from django import test
+from django.test.utils import override_settings
 import mock
 
 from openstack_auth import policy
@@ -222,3 +223,75 @@ class PolicyTestCaseV3Admin(PolicyTestCase):
         value = policy.check((("identity", "admin_or_cloud_admin"),),
                              request=self.request)
         self.assertTrue(value)
+
+
+class PolicyDecisionCacheTestCase(PolicyTestCase):
+    _roles = [{'id': '1', 'name': 'member'}]
+
+    def _mock_enforce(self):
+        policy.reset()
+        enforcer = policy._get_enforcer()['compute']
+        patcher = mock.patch.object(enforcer, 'enforce',
+                                    wraps=enforcer.enforce)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def test_check_cached_per_request(self):
+        mock_enforce = self._mock_enforce()
+        for i in range(3):
+            self.assertFalse(policy.check(
+                (("compute", "context_is_admin"),), request=self.request))
+        self.assertEqual(1, mock_enforce.call_count)
+
+        # A different target is evaluated again.
+        policy.check((("compute", "context_is_admin"),),
+                     request=self.request, target={'project_id': 'other'})
+        self.assertEqual(2, mock_enforce.call_count)
+
+    def test_check_cache_cleared_by_reset(self):
+        policy.check((("compute", "context_is_admin"),), request=self.request)
+        mock_enforce = self._mock_enforce()
+        policy.check((("compute", "context_is_admin"),), request=self.request)
+        self.assertEqual(1, mock_enforce.call_count)
+
+    def test_check_batch(self):
+        mock_enforce = self._mock_enforce()
+        results = policy.check_batch(
+            [((("compute", "context_is_admin"),), None),
+             ((("compute", "context_is_admin"),), {}),
+             ((("dummy", "default"),), None),
+             ((), None)],
+            request=self.request)
+        self.assertEqual([False, False, True, True], results)
+        self.assertEqual(1, mock_enforce.call_count)
+
+    def test_check_not_shared_between_requests_by_default(self):
+        token = mock.Mock(id='token-id')
+        mock_enforce = self._mock_enforce()
+        for i in range(2):
+            self.MockClass.return_value = user.User(
+                id=1, token=token, roles=self._roles)
+            policy.check((("compute", "context_is_admin"),),
+                         request=http.HttpRequest())
+        self.assertEqual(2, mock_enforce.call_count)
+
+    @override_settings(POLICY_DECISION_CACHE={'timeout': 60})
+    def test_check_shared_between_requests_of_token(self):
+        mock_enforce = self._mock_enforce()
+        for token_id in ('token-1', 'token-1', 'token-2'):
+            self.MockClass.return_value = user.User(
+                id=1, token=mock.Mock(id=token_id), roles=self._roles)
+            policy.check((("compute", "context_is_admin"),),
+                         request=http.HttpRequest())
+        self.assertEqual(2, mock_enforce.call_count)
+
+    @override_settings(POLICY_DECISION_CACHE={'timeout': 60})
+    def test_check_shared_decisions_expire(self):
+        mock_enforce = self._mock_enforce()
+        for now in (1000, 1030, 1061):
+            self.MockClass.return_value = user.User(
+                id=1, token=mock.Mock(id='token-id'), roles=self._roles)
+            with mock.patch('time.time', return_value=now):
+                policy.check((("compute", "context_is_admin"),),
+                             request=http.HttpRequest())
+        self.assertEqual(2, mock_enforce.call_count)
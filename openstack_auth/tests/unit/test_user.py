@@ -11,9 +11,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pickle
+
+from django.core.cache import caches
+from django import http
 from django import test
+from django.test.utils import override_settings
+from keystoneclient.v3 import projects
 import mock
 
+from openstack_auth import backend
+from openstack_auth.tests import data_v3
 from openstack_auth import user
 
 
@@ -36,3 +44,199 @@ class PermTestCase(test.TestCase):
             # perm1 AND (perm2 OR perm3)
             perm_list = ['perm1', ('perm2', 'perm3')]
             self.assertTrue(testuser.has_perms(perm_list))
+
+
+class UserCacheTestCase(test.TestCase):
+    def setUp(self):
+        super(UserCacheTestCase, self).setUp()
+        self.data = data_v3.generate_test_data()
+        backend._USERS.clear()
+        self.addCleanup(backend._USERS.clear)
+
+    def _get_user(self, token_id='token-1', services_region='RegionOne'):
+        token = user.Token(self.data.scoped_access_info,
+                           unscoped_token='unscoped-token')
+        token.id = token_id
+        request = http.HttpRequest()
+        request.session = {'user_id': token.user['id'],
+                           'token': token,
+                           'region_endpoint': 'http://localhost:5000/v3',
+                           'services_region': services_region}
+        keystone_backend = backend.KeystoneBackend()
+        keystone_backend.request = request
+        return keystone_backend.get_user(token.user['id'])
+
+    def _get_user_builds(self, **kwargs):
+        with mock.patch.object(user, 'create_user_from_token',
+                               wraps=user.create_user_from_token) as create:
+            testuser = self._get_user(**kwargs)
+        return testuser, create.call_count
+
+    def test_user_not_reused_by_default(self):
+        self._get_user()
+        self.assertEqual(1, self._get_user_builds()[1])
+
+    @override_settings(USER_CACHE={'timeout': 60})
+    def test_user_reused_for_token_and_region(self):
+        testuser = self._get_user()
+        reused, builds = self._get_user_builds()
+        self.assertEqual(0, builds)
+        self.assertEqual(testuser.token.id, reused.token.id)
+        self.assertEqual(1, self._get_user_builds(token_id='token-2')[1])
+        self.assertEqual(1, self._get_user_builds(services_region='Other')[1])
+
+    @override_settings(USER_CACHE={'timeout': 60})
+    def test_user_state_not_shared_between_requests(self):
+        testuser = self._get_user()
+        testuser.services_region = 'Other'
+        testuser.authorized_tenants = ['project']
+        testuser._policy_decisions = {'rule': True}
+        testuser._domain_credentials = {'domain_id': 'domain'}
+
+        reused = self._get_user()
+        self.assertIsNot(testuser, reused)
+        self.assertEqual('RegionOne', reused.services_region)
+        self.assertIsNone(reused._authorized_tenants)
+        self.assertFalse(hasattr(reused, '_policy_decisions'))
+        self.assertFalse(hasattr(reused, '_domain_credentials'))
+
+    @override_settings(USER_CACHE={'timeout': 60})
+    def test_user_expires(self):
+        with mock.patch('time.time', return_value=1000):
+            self._get_user()
+        with mock.patch('time.time', return_value=1030):
+            self.assertEqual(0, self._get_user_builds()[1])
+        with mock.patch('time.time', return_value=1061):
+            self.assertEqual(1, self._get_user_builds()[1])
+
+    @override_settings(USER_CACHE={'timeout': 60, 'max_entries': 1})
+    def test_user_max_entries(self):
+        self._get_user()
+        self._get_user(token_id='token-2')
+        self.assertEqual(1, self._get_user_builds()[1])
+
+    @override_settings(USER_CACHE={'timeout': 60})
+    @mock.patch('openstack_auth.utils.get_project_list')
+    def test_authorized_tenants_reused(self, mock_get_project_list):
+        user._local_tenants_cache = None
+        mock_get_project_list.return_value = [
+            projects.Project(None, {'id': 'project-id', 'name': 'project'},
+                             loaded=True)]
+        for i in range(2):
+            testuser = self._get_user()
+            self.assertEqual(['project'],
+                             [t.name for t in testuser.authorized_tenants])
+        mock_get_project_list.assert_called_once_with(
+            user_id=testuser.id, auth_url='http://localhost:5000/v3',
+            token='unscoped-token', is_federated=False)
+
+    @override_settings(USER_CACHE={'timeout': 60, 'cache_alias': 'default'})
+    @mock.patch('openstack_auth.utils.get_project_list')
+    def test_authorized_tenants_shared(self, mock_get_project_list):
+        caches['default'].clear()
+        mock_get_project_list.return_value = [
+            projects.Project(None, {'id': 'project-id', 'name': 'project'},
+                             loaded=True)]
+        testuser = self._get_user()
+        self.assertEqual(['project'],
+                         [t.name for t in testuser.authorized_tenants])
+        self.assertEqual(['project'],
+                         [t.name for t in testuser.authorized_tenants])
+        # Another process, or a token of another project, gets the list
+        # from the shared cache.
+        backend._USERS.clear()
+        testuser = self._get_user(token_id='token-2')
+        self.assertEqual(['project'],
+                         [t.name for t in testuser.authorized_tenants])
+        mock_get_project_list.assert_called_once_with(
+            user_id=testuser.id, auth_url='http://localhost:5000/v3',
+            token='unscoped-token', is_federated=False)
+
+
+@override_settings(TOKEN_CATALOG_CACHE={'enabled': True,
+                                        'cache_alias': 'default'})
+class TokenStateTestCase(test.TestCase):
+    def setUp(self):
+        super(TokenStateTestCase, self).setUp()
+        caches['default'].clear()
+        self.data = data_v3.generate_test_data()
+        self.token = user.Token(self.data.scoped_access_info,
+                                unscoped_token='unscoped-token')
+
+    def _assertTokenEqual(self, token, other):
+        for attr in ('id', 'unscoped_token', 'expires', 'user', 'project',
+                     'tenant', 'domain', 'roles', 'serviceCatalog',
+                     'user_domain_id', 'user_domain_name', 'is_federated'):
+            self.assertEqual(getattr(token, attr), getattr(other, attr))
+        self.assertIs(other.project, other.tenant)
+
+    @override_settings(TOKEN_CATALOG_CACHE={'enabled': False})
+    def test_full_state(self):
+        state = self.token.__getstate__()
+        self.assertEqual(self.token.serviceCatalog, state['serviceCatalog'])
+        self.assertNotIn('version', state)
+        self._assertTokenEqual(self.token,
+                               pickle.loads(pickle.dumps(self.token)))
+
+    def test_compact_state(self):
+        state = self.token.__getstate__()
+        self.assertEqual(user.Token.COMPACT_STATE_VERSION, state['version'])
+        self.assertIsNone(state['_service_catalog'])
+        self.assertEqual(tuple(role['name'] for role in self.token.roles),
+                         state['roles'])
+        self._assertTokenEqual(self.token,
+                               pickle.loads(pickle.dumps(self.token)))
+
+    def test_compact_state_shares_catalog(self):
+        other = user.Token(self.data.scoped_access_info)
+        other.id = 'other-token'
+        pickle.dumps(self.token)
+        pickle.dumps(other)
+        self.assertEqual(self.token._catalog_key, other._catalog_key)
+
+    def test_full_state_loaded_when_compact_enabled(self):
+        with self.settings(TOKEN_CATALOG_CACHE={'enabled': False}):
+            content = pickle.dumps(self.token)
+        self._assertTokenEqual(self.token, pickle.loads(content))
+
+    @mock.patch('openstack_auth.utils.get_session')
+    def test_evicted_catalog_retrieved(self, mock_get_session):
+        catalog = self.token.serviceCatalog
+        token = pickle.loads(pickle.dumps(self.token))
+        caches['default'].clear()
+        mock_get = mock_get_session.return_value.get
+        mock_get.return_value.json.return_value = {'catalog': catalog}
+
+        self.assertEqual(catalog, token.serviceCatalog)
+        mock_get.assert_called_once_with(
+            'http://public.localhost/identity/v3/auth/catalog',
+            headers={'X-Auth-Token': self.token.id})
+
+    def test_session_size(self):
+        # Measures the size of the token stored in the session, with a
+        # catalog of 40 services in 10 regions.
+        regions = ['Region%d' % i for i in range(10)]
+        self.token.serviceCatalog = [
+            {'type': 'service%d' % i, 'name': 'service%d' % i,
+             'id': 'service-id-%d' % i,
+             'endpoints': [
+                 {'id': 'endpoint-%s-%s-%d' % (region, interface, i),
+                  'region': region, 'region_id': region,
+                  'interface': interface,
+                  'url': 'http://%s.service%d.%s.example.com' % (
+                      interface, i, region)}
+                 for region in regions
+                 for interface in ('admin', 'internal', 'public')]}
+            for i in range(40)]
+
+        def measure():
+            content = pickle.dumps({'token': self.token})
+            loaded = pickle.loads(content)['token']
+            self.assertEqual(self.token.serviceCatalog,
+                             loaded.serviceCatalog)
+            return len(content)
+
+        with self.settings(TOKEN_CATALOG_CACHE={'enabled': False}):
+            full_size = measure()
+        compact_size = measure()
+        self.assertLess(compact_size * 20, full_size)
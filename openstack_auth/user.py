@@ -12,9 +12,14 @@
 # limitations under the License.
 
 import datetime
+import hashlib
+import json
 import logging
+import threading
 
 from django.contrib.auth import models
+from django.core.cache.backends import locmem
+from django.core.cache import caches
 from django.db import models as db_models
 from keystoneauth1 import exceptions as keystone_exceptions
 
@@ -23,6 +28,10 @@ from openstack_auth import utils
 
 LOG = logging.getLogger(__name__)
 
+# The lists of projects of the users when USER_CACHE has no cache alias.
+_local_tenants_cache = None
+_local_tenants_cache_lock = threading.Lock()
+
 
 def set_session_from_user(request, user):
     request.session['token'] = user.token
@@ -116,6 +125,132 @@ class Token(object):
         self.roles = [{'name': role} for role in auth_ref.role_names]
         self.serviceCatalog = auth_ref.service_catalog.catalog
 
+    # Version of the compact state stored in the sessions, see
+    # __getstate__(). States without a version are full states.
+    COMPACT_STATE_VERSION = 1
+
+    @property
+    def serviceCatalog(self):
+        if self._service_catalog is None and self._catalog_key:
+            self._service_catalog = _load_catalog(self._catalog_key,
+                                                  self.id,
+                                                  self._catalog_auth_url)
+        return self._service_catalog
+
+    @serviceCatalog.setter
+    def serviceCatalog(self, catalog):
+        self._service_catalog = catalog
+        self._catalog_key = None
+        self._catalog_auth_url = None
+
+    def __getstate__(self):
+        """Returns the state of the token to store in the session.
+
+        When the TOKEN_CATALOG_CACHE setting is enabled, the service catalog
+        is stored in the cache, once for all the tokens with the same
+        catalog, and the state only refers to it. The other attributes are
+        stored as tuples.
+        """
+        state = dict(self.__dict__)
+        if not utils._get_dict_config('TOKEN_CATALOG_CACHE', 'enabled'):
+            del state['_service_catalog']
+            state['serviceCatalog'] = self.serviceCatalog
+            del state['_catalog_key']
+            del state['_catalog_auth_url']
+            return state
+        if self._catalog_key is None:
+            self._catalog_key, self._catalog_auth_url = _store_catalog(
+                self._service_catalog, self.expires)
+        state['_service_catalog'] = None
+        state['_catalog_key'] = self._catalog_key
+        state['_catalog_auth_url'] = self._catalog_auth_url
+        state['user'] = tuple(self.user[key] for key in _TOKEN_USER_KEYS)
+        state['project'] = tuple(self.project[key]
+                                 for key in _TOKEN_PROJECT_KEYS)
+        del state['tenant']
+        state['domain'] = tuple(self.domain[key]
+                                for key in _TOKEN_DOMAIN_KEYS)
+        state['roles'] = tuple(role['name'] for role in self.roles)
+        state['version'] = self.COMPACT_STATE_VERSION
+        return state
+
+    def __setstate__(self, state):
+        state = dict(state)
+        version = state.pop('version', None)
+        if version is None:
+            state['_service_catalog'] = state.pop('serviceCatalog', None)
+            state['_catalog_key'] = None
+            state['_catalog_auth_url'] = None
+        else:
+            state['user'] = dict(zip(_TOKEN_USER_KEYS, state['user']))
+            state['project'] = dict(zip(_TOKEN_PROJECT_KEYS,
+                                        state['project']))
+            state['tenant'] = state['project']
+            state['domain'] = dict(zip(_TOKEN_DOMAIN_KEYS, state['domain']))
+            state['roles'] = [{'name': role} for role in state['roles']]
+        self.__dict__.update(state)
+
+
+_TOKEN_USER_KEYS = ('id', 'name', 'password_expires_at')
+_TOKEN_PROJECT_KEYS = ('id', 'name', 'is_admin_project', 'domain_id')
+_TOKEN_DOMAIN_KEYS = ('id', 'name')
+
+
+def _get_catalog_cache():
+    return caches[utils._get_dict_config('TOKEN_CATALOG_CACHE',
+                                         'cache_alias')]
+
+
+def _get_identity_url(catalog):
+    for service in catalog or []:
+        if service.get('type') != 'identity':
+            continue
+        endpoints = service.get('endpoints', [])
+        for endpoint in endpoints:
+            if endpoint.get('interface') == 'public':
+                return endpoint.get('url')
+        if endpoints:
+            return endpoints[0].get('url') or endpoints[0].get('publicURL')
+    return None
+
+
+def _store_catalog(catalog, expires):
+    """Stores a service catalog in the cache.
+
+    :returns: the cache key of the catalog, derived from its content, and
+        the URL of the identity service to retrieve it from if it is
+        evicted from the cache.
+    """
+    content = json.dumps(catalog, sort_keys=True)
+    key = ('openstack_auth.catalog.%s' %
+           hashlib.sha256(content.encode('utf-8')).hexdigest())
+    timeout = None
+    if expires is not None:
+        timeout = max(int((expires - datetime.datetime.now(
+            expires.tzinfo)).total_seconds()), 1)
+    # The catalog is stored again for each new token, which usually expires
+    # after the previous tokens sharing the same catalog.
+    _get_catalog_cache().set(key, catalog, timeout)
+    return key, _get_identity_url(catalog)
+
+
+def _load_catalog(key, token_id, auth_url):
+    catalog = _get_catalog_cache().get(key)
+    if catalog is not None or not auth_url:
+        return catalog
+    # The catalog was evicted from the cache, retrieve it from Keystone.
+    auth_url, _ = utils.fix_auth_url_version_prefix(auth_url)
+    try:
+        resp = utils.get_session().get(
+            auth_url.rstrip('/') + '/auth/catalog',
+            headers={'X-Auth-Token': token_id})
+        catalog = resp.json()['catalog']
+    except Exception:
+        LOG.exception('Unable to retrieve the service catalog.')
+        return None
+    _get_catalog_cache().set(key, catalog)
+    return catalog
+
 
 class User(models.AbstractBaseUser, models.AnonymousUser):
     """A User class with some extra special sauce for Keystone.
@@ -290,6 +425,8 @@ class User(models.AbstractBaseUser, models.AnonymousUser):
     @property
     def authorized_tenants(self):
         """Returns a memoized list of tenants this user may access."""
+        if self.is_authenticated and self._authorized_tenants is None:
+            self._authorized_tenants = self._get_shared_authorized_tenants()
         if self.is_authenticated and self._authorized_tenants is None:
             endpoint = self.endpoint
             try:
@@ -298,11 +435,58 @@ class User(models.AbstractBaseUser, models.AnonymousUser):
                     auth_url=endpoint,
                     token=self.unscoped_token,
                     is_federated=self.is_federated)
+                self._set_shared_authorized_tenants(self._authorized_tenants)
             except (keystone_exceptions.ClientException,
                     keystone_exceptions.AuthorizationFailure):
                 LOG.exception('Unable to retrieve project list.')
         return self._authorized_tenants or []
 
+    def _get_authorized_tenants_cache(self):
+        """Returns the cache sharing the tenants lists and the cache key.
+
+        The lists are kept in a process-local cache when no cache alias is
+        configured, because each request gets its own copy of the user.
+        """
+        global _local_tenants_cache
+        if (not self.unscoped_token or
+                not utils._get_dict_config('USER_CACHE', 'timeout')):
+            return None, None
+        alias = utils._get_dict_config('USER_CACHE', 'cache_alias')
+        if alias:
+            cache = caches[alias]
+        else:
+            with _local_tenants_cache_lock:
+                if _local_tenants_cache is None:
+                    _local_tenants_cache = locmem.LocMemCache(
+                        'openstack_auth.authorized_tenants',
+                        {'OPTIONS': {'MAX_ENTRIES': utils._get_dict_config(
+                            'USER_CACHE', 'max_entries')}})
+            cache = _local_tenants_cache
+        # The unscoped token is hashed to keep the key short.
+        digest = hashlib.sha256(('%s:%s' % (
+            self.id, self.unscoped_token)).encode('utf-8')).hexdigest()
+        return cache, 'openstack_auth.authorized_tenants.%s' % digest
+
+    def _get_shared_authorized_tenants(self):
+        cache, key = self._get_authorized_tenants_cache()
+        if cache is None:
+            return None
+        tenants = cache.get(key)
+        if tenants is None:
+            return None
+        return [tenant_class(None, info, loaded=True)
+                for tenant_class, info in tenants]
+
+    def _set_shared_authorized_tenants(self, tenants):
+        cache, key = self._get_authorized_tenants_cache()
+        if cache is None:
+            return
+        # keystoneclient resources cannot be pickled, so their class and
+        # attributes are stored instead.
+        timeout = utils._get_dict_config('USER_CACHE', 'timeout')
+        cache.set(key, [(type(tenant), tenant.to_dict())
+                        for tenant in tenants], timeout)
+
     @authorized_tenants.setter
     def authorized_tenants(self, tenant_list):
         self._authorized_tenants = tenant_list
@@ -28,6 +28,7 @@ from openstack_dashboard.api import base
 from openstack_dashboard.api import glance
 from openstack_dashboard.api import microversions
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import connection_pool
 
 
 # Supported compute versions
@@ -47,7 +48,7 @@ class Server(base.APIResourceWrapper):
     _attrs = ['addresses', 'attrs', 'id', 'image', 'links', 'description',
               'metadata', 'name', 'private_ip', 'public_ip', 'status', 'uuid',
               'image_name', 'VirtualInterfaces', 'flavor', 'key_name', 'fault',
-              'tenant_id', 'user_id', 'created', 'locked',
+              'tenant_id', 'user_id', 'created', 'updated', 'locked',
               'OS-EXT-STS:power_state', 'OS-EXT-STS:task_state',
               'OS-EXT-SRV-ATTR:instance_name', 'OS-EXT-SRV-ATTR:host',
               'OS-EXT-AZ:availability_zone', 'OS-DCF:diskConfig']
@@ -123,6 +124,12 @@ def cached_novaclient(request, version=None):
     ) = get_auth_params_from_request(request)
     if version is None:
         version = VERSIONS.get_active_version()['version']
+    if connection_pool.is_enabled():
+        return nova_client.Client(
+            version,
+            session=connection_pool.get_session(request, nova_url, token_id),
+            http_log_debug=settings.DEBUG,
+            endpoint_override=nova_url)
     c = nova_client.Client(version,
                            username,
                            token_id,
@@ -342,40 +342,102 @@ def get_url_for_service(service, region, endpoint_type):
     return None
 
 
+class ServiceCatalogIndex(object):
+    """Index of a service catalog to resolve the URLs of services.
+
+    It gives the same answers as :func:`get_service_from_catalog` and
+    :func:`get_url_for_service`, without walking the catalog: the endpoints
+    are indexed by service type, region and endpoint type (or interface)
+    once, when the index is built.
+    """
+
+    def __init__(self, catalog):
+        # service type -> (identity version, {region: URLs}, all URLs)
+        self._services = {}
+        for service in catalog or []:
+            if 'type' not in service or service['type'] in self._services:
+                continue
+            version = get_version_from_service(service)
+            regions = {}
+            endpoints = service.get('endpoints', [])
+            for endpoint in endpoints:
+                region = _get_endpoint_region(endpoint)
+                regions.setdefault(region, []).append(endpoint)
+            self._services[service['type']] = (
+                version,
+                dict((region, self._get_urls(version, region_endpoints))
+                     for region, region_endpoints in regions.items()),
+                self._get_urls(version, endpoints) if endpoints else None)
+
+    @staticmethod
+    def _get_urls(version, endpoints):
+        if version < 3:
+            # Only the first endpoint is considered with Keystone V2.
+            return endpoints[0]
+        urls = {}
+        for endpoint in endpoints:
+            urls.setdefault(endpoint.get('interface'), endpoint.get('url'))
+        return urls
+
+    def get_url(self, service_type, region, endpoint_type):
+        """Return the URL of a service, or None if there is no such URL."""
+        try:
+            version, regions, all_urls = self._services[service_type]
+        except KeyError:
+            return None
+        urls = regions.get(region)
+        if urls is None:
+            # Identity endpoints can be used from any region.
+            if service_type != 'identity' or all_urls is None:
+                return None
+            urls = all_urls
+        if version < 3:
+            return urls.get(endpoint_type)
+        return urls.get(ENDPOINT_TYPE_TO_INTERFACE.get(endpoint_type, ''))
+
+    def has_service(self, service_type, region):
+        """Return whether a service has an endpoint in the region."""
+        try:
+            version, regions, all_urls = self._services[service_type]
+        except KeyError:
+            return False
+        if service_type == 'identity':
+            return all_urls is not None
+        return region in regions
+
+
+def get_service_catalog_index(user):
+    """Return the index of the service catalog of the user.
+
+    The index is built on first use and kept on the user object. It is
+    built again if the service catalog of the user is replaced.
+    """
+    catalog = user.service_catalog
+    cached = getattr(user, '_service_catalog_index', None)
+    if not isinstance(cached, tuple) or cached[0] is not catalog:
+        cached = (catalog, ServiceCatalogIndex(catalog))
+        user._service_catalog_index = cached
+    return cached[1]
+
+
 def url_for(request, service_type, endpoint_type=None, region=None):
     endpoint_type = endpoint_type or settings.OPENSTACK_ENDPOINT_TYPE
     fallback_endpoint_type = settings.SECONDARY_ENDPOINT_TYPE
 
-    catalog = request.user.service_catalog
-    service = get_service_from_catalog(catalog, service_type)
-    if service:
-        if not region:
-            region = request.user.services_region
-        url = get_url_for_service(service,
-                                  region,
-                                  endpoint_type)
-        if not url and fallback_endpoint_type:
-            url = get_url_for_service(service,
-                                      region,
-                                      fallback_endpoint_type)
-        if url:
-            return url
+    index = get_service_catalog_index(request.user)
+    if not region:
+        region = request.user.services_region
+    url = index.get_url(service_type, region, endpoint_type)
+    if not url and fallback_endpoint_type:
+        url = index.get_url(service_type, region, fallback_endpoint_type)
+    if url:
+        return url
     raise exceptions.ServiceCatalogException(service_type)
 
 
 def is_service_enabled(request, service_type):
-    service = get_service_from_catalog(request.user.service_catalog,
-                                       service_type)
-    if service:
-        region = request.user.services_region
-        for endpoint in service.get('endpoints', []):
-            if 'type' not in service:
-                continue
-            # ignore region for identity
-            if service['type'] == 'identity' or \
-               _get_endpoint_region(endpoint) == region:
-                return True
-    return False
+    index = get_service_catalog_index(request.user)
+    return index.has_service(service_type, request.user.services_region)
 
 
 def _get_endpoint_region(endpoint):
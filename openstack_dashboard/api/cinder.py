@@ -33,11 +33,14 @@ from cinderclient.v2.contrib import list_extensions as cinder_list_extensions
 
 from horizon import exceptions
 from horizon.utils.memoized import memoized
+from horizon.utils.memoized import shared_memoized
 
 from openstack_dashboard.api import _nova
 from openstack_dashboard.api import base
 from openstack_dashboard.api import microversions
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import connection_pool
+from openstack_dashboard.utils import quota_usages
 from openstack_dashboard.utils import settings as utils
 
 
@@ -229,6 +232,14 @@ def _find_cinder_url(request, version=None):
 def cinderclient(request, version=None):
     version, cinder_url = _find_cinder_url(request, version)
 
+    if connection_pool.is_enabled():
+        return cinder_client.Client(
+            version,
+            session=connection_pool.get_session(request, cinder_url),
+            os_endpoint=cinder_url,
+            http_log_debug=settings.DEBUG,
+        )
+
     insecure = settings.OPENSTACK_SSL_NO_VERIFY
     cacert = settings.OPENSTACK_SSL_CACERT
 
@@ -402,17 +413,23 @@ def volume_create(request, size, name, description, volume_type,
             'group_id': group_id}
 
     volume = client.volumes.create(size, **data)
+    quota_usages.update_quota_usages(request, 'volume',
+                                     {'volumes': 1, 'gigabytes': size})
     return Volume(volume)
 
 
 @profiler.trace
 def volume_extend(request, volume_id, new_size):
-    return cinderclient(request).volumes.extend(volume_id, new_size)
+    extended = cinderclient(request).volumes.extend(volume_id, new_size)
+    quota_usages.invalidate_quota_usages(request, 'volume')
+    return extended
 
 
 @profiler.trace
 def volume_delete(request, volume_id):
-    return cinderclient(request).volumes.delete(volume_id)
+    deleted = cinderclient(request).volumes.delete(volume_id)
+    quota_usages.invalidate_quota_usages(request, 'volume')
+    return deleted
 
 
 @profiler.trace
@@ -528,13 +545,18 @@ def volume_snapshot_create(request, volume_id, name,
             'description': description,
             'force': force}
 
-    return VolumeSnapshot(cinderclient(request).volume_snapshots.create(
-        volume_id, **data))
+    snapshot = cinderclient(request).volume_snapshots.create(
+        volume_id, **data)
+    quota_usages.update_quota_usages(
+        request, 'volume', {'snapshots': 1, 'gigabytes': snapshot.size})
+    return VolumeSnapshot(snapshot)
 
 
 @profiler.trace
 def volume_snapshot_delete(request, snapshot_id):
-    return cinderclient(request).volume_snapshots.delete(snapshot_id)
+    deleted = cinderclient(request).volume_snapshots.delete(snapshot_id)
+    quota_usages.invalidate_quota_usages(request, 'volume')
+    return deleted
 
 
 @profiler.trace
@@ -689,6 +711,7 @@ def tenant_quota_update(request, tenant_id, **kwargs):
 
 
 @profiler.trace
+@shared_memoized(scope='region')
 def default_quota_get(request, tenant_id):
     return base.QuotaSet(cinderclient(request).quotas.defaults(tenant_id))
 
@@ -736,6 +759,7 @@ def volume_type_get_with_qos_association(request, volume_type_id):
 @profiler.trace
 def default_quota_update(request, **kwargs):
     cinderclient(request).quota_classes.update(DEFAULT_QUOTA_NAME, **kwargs)
+    default_quota_get.invalidate()
 
 
 @profiler.trace
@@ -922,8 +946,18 @@ def availability_zone_list(request, detailed=False):
     return cinderclient(request).availability_zones.list(detailed=detailed)
 
 
+def _dump_extensions(extensions):
+    return [extension.to_dict() for extension in extensions]
+
+
+def _load_extensions(request, data):
+    return tuple(cinder_list_extensions.ListExtResource(None, info, loaded=True)
+                 for info in data)
+
+
 @profiler.trace
-@memoized
+@shared_memoized(scope='region', dumps=_dump_extensions,
+                 loads=_load_extensions)
 def list_extensions(request):
     cinder_api = cinderclient(request)
     return tuple(cinder_list_extensions.ListExtManager(cinder_api).show_all())
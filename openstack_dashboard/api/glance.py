@@ -19,27 +19,36 @@
 from __future__ import absolute_import
 from __future__ import division
 
-import _thread as thread
 import collections
 from collections import abc
+import functools
 import itertools
 import json
 import logging
 import os
+import threading
+import time
 
 from django.conf import settings
+from django.core.cache import caches
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.utils.translation import ugettext_lazy as _
 
+import futurist
+from futurist import rejection
+from glanceclient.common import utils as glance_utils
 from glanceclient.v2 import client
 
 
 from horizon import messages
+from horizon.utils import memoized as memoized_utils
 from horizon.utils.memoized import memoized
 from openstack_dashboard.api import base
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import connection_pool
+from openstack_dashboard.utils import futurist_utils
 from openstack_dashboard.utils import settings as utils
 
 
@@ -132,6 +141,12 @@ def glanceclient(request):
     api_version = VERSIONS.get_active_version()
 
     url = base.url_for(request, 'image')
+    if connection_pool.is_enabled():
+        url = glance_utils.strip_version(url)[0]
+        return api_version['client'].Client(
+            session=connection_pool.get_session(request, url),
+            endpoint_override=url)
+
     insecure = settings.OPENSTACK_SSL_NO_VERIFY
     cacert = settings.OPENSTACK_SSL_CACERT
 
@@ -190,6 +205,7 @@ def _normalize_list_input(filters, **kwargs):
 
 @profiler.trace
 def image_delete(request, image_id):
+    image_list_detailed_by_ids.invalidate()
     return glanceclient(request).images.delete(image_id)
 
 
@@ -200,19 +216,84 @@ def image_get(request, image_id):
     return Image(image)
 
 
-@profiler.trace
-def image_list_detailed_by_ids(request, ids=None):
-    images = []
-    if not ids:
+class _CachedImage(dict):
+    """Data of an image restored from the shared cache.
+
+    Images returned by glanceclient cannot be pickled, so their data is
+    cached as a dict and wrapped by this class, which gives access to it
+    through attributes like glanceclient does.
+    """
+
+    def __getattr__(self, attr):
+        try:
+            return self[attr]
+        except KeyError:
+            raise AttributeError(attr)
+
+    def __setattr__(self, attr, value):
+        self[attr] = value
+
+
+_IMAGES_BY_IDS_CACHE = (
+    'openstack_dashboard.api.glance.image_list_detailed_by_ids')
+# Images are rarely modified once active, but changes made outside of
+# Horizon are only visible once the cached images expire.
+_IMAGES_BY_IDS_CACHE_TIMEOUT = 30
+
+
+def _image_list_by_ids(request, ids):
+    filters = {'id': 'in:' + ','.join(ids)}
+    images = image_list_detailed(request, filters=filters)[0]
+    if VERSIONS.active < 2:
         return images
-    for i in range(0, len(ids), MAX_IMGAGES_PER_REQUEST):
-        ids_to_filter = ids[i:i + MAX_IMGAGES_PER_REQUEST]
-        filters = {'id': 'in:' + ','.join(ids_to_filter)}
+    # Community images are only listed when their visibility is requested
+    # and older Glance releases do not support the 'all' visibility filter.
+    found = set(image.id for image in images)
+    missing = [image_id for image_id in ids if image_id not in found]
+    if missing:
+        filters = {'id': 'in:' + ','.join(missing),
+                   'visibility': 'community'}
         images.extend(image_list_detailed(request, filters=filters)[0])
+    return images
+
+
+@profiler.trace
+def image_list_detailed_by_ids(request, ids=None):
+    """Returns the images with the given IDs.
 
+    The IDs are split in chunks which fit in the URI of a Glance request
+    and the chunks are retrieved in parallel. When ``MEMOIZED_SHARED_CACHE``
+    is enabled, the images are cached for a short time, and only the images
+    which are not cached are retrieved.
+    """
+    if not ids:
+        return []
+    ids = list(collections.OrderedDict.fromkeys(ids))
+    cached = memoized_utils.get_shared_entries(
+        _IMAGES_BY_IDS_CACHE, request, 'project', ids)
+    ids = [image_id for image_id in ids if image_id not in cached]
+
+    chunks = [(_image_list_by_ids,
+               [request, ids[i:i + MAX_IMGAGES_PER_REQUEST]])
+              for i in range(0, len(ids), MAX_IMGAGES_PER_REQUEST)]
+    if len(chunks) > 1:
+        results = futurist_utils.call_functions_parallel(*chunks)
+    else:
+        results = [func(*args) for func, args in chunks]
+    images = list(itertools.chain.from_iterable(results))
+
+    memoized_utils.set_shared_entries(
+        _IMAGES_BY_IDS_CACHE, request, 'project',
+        dict((image.id, dict(image._apiresource)) for image in images),
+        timeout=_IMAGES_BY_IDS_CACHE_TIMEOUT)
+    images.extend(Image(_CachedImage(data)) for data in cached.values())
     return images
 
 
+image_list_detailed_by_ids.invalidate = functools.partial(
+    memoized_utils.invalidate_shared, _IMAGES_BY_IDS_CACHE)
+
+
 @profiler.trace
 def image_list_detailed(request, marker=None, sort_dir='desc',
                         sort_key='created_at', filters=None, paginate=False,
@@ -323,6 +404,7 @@ def image_list_detailed(request, marker=None, sort_dir='desc',
 @profiler.trace
 def image_update(request, image_id, **kwargs):
     image_data = kwargs.get('data', None)
+    image_list_detailed_by_ids.invalidate()
     try:
         return Image(glanceclient(request).images.update(
             image_id, **kwargs))
@@ -468,6 +550,131 @@ def _handle_unknown_properties(data, properties):
     properties.update(other_props)
 
 
+class ImageUploadRejected(Exception):
+    """Too many legacy image uploads are waiting to be processed."""
+
+
+_upload_executor = None
+_upload_executor_pid = None
+_upload_lock = threading.Lock()
+
+
+def _get_upload_executor():
+    """Return the executor of the legacy image uploads of the process."""
+    global _upload_executor, _upload_executor_pid
+    with _upload_lock:
+        if (_upload_executor is None or
+                _upload_executor_pid != os.getpid()):
+            max_workers = utils.get_dict_config(
+                'HORIZON_IMAGES_LEGACY_UPLOAD', 'max_workers')
+            max_queued = utils.get_dict_config(
+                'HORIZON_IMAGES_LEGACY_UPLOAD', 'max_queued')
+            _upload_executor = futurist.ThreadPoolExecutor(
+                max_workers=max_workers,
+                check_and_reject=rejection.reject_when_reached(max_queued))
+            _upload_executor_pid = os.getpid()
+        return _upload_executor
+
+
+def _get_upload_cache():
+    return caches[utils.get_dict_config('HORIZON_IMAGES_LEGACY_UPLOAD',
+                                        'cache_alias')]
+
+
+def _get_upload_cache_key(image_id):
+    return 'horizon.glance.upload.%s' % image_id
+
+
+class _LegacyImageUpload(object):
+    """Upload of the data of an image through the Horizon server.
+
+    It is passed to glanceclient as a file-like object which reads the
+    uploaded file in chunks of ``chunk_size`` bytes, unless a size is
+    requested, and records the progress of the upload in the cache.
+    """
+
+    def __init__(self, request, image, data):
+        self.request = request
+        self.image_id = image.id
+        self.data = data
+        self.chunk_size = utils.get_dict_config(
+            'HORIZON_IMAGES_LEGACY_UPLOAD', 'chunk_size')
+        self.status = {'id': image.id,
+                       'name': image.name,
+                       'project_id': request.user.project_id,
+                       'status': 'queued',
+                       'size': data.size,
+                       'uploaded': 0,
+                       'error': None}
+        self._saved_at = 0
+        self._save()
+
+    def _save(self, **changes):
+        self.status.update(changes)
+        self._saved_at = time.time()
+        _get_upload_cache().set(
+            _get_upload_cache_key(self.image_id), self.status,
+            utils.get_dict_config('HORIZON_IMAGES_LEGACY_UPLOAD',
+                                  'status_timeout'))
+
+    def read(self, size=-1):
+        chunk = self.data.read(size if size > 0 else self.chunk_size)
+        self.status['uploaded'] += len(chunk)
+        # Limit the writes to the cache to one per second.
+        if time.time() - self._saved_at >= 1:
+            self._save()
+        return chunk
+
+    def _cleanup(self):
+        if not isinstance(self.data, TemporaryUploadedFile):
+            self.data.close()
+            return
+        filename = self.data.temporary_file_path()
+        try:
+            self.data.file.file.close()
+            os.remove(filename)
+        except OSError as e:
+            LOG.warning('Failed to remove temporary image file '
+                        '%(file)s (%(e)s)', {'file': filename, 'e': e})
+
+    def run(self):
+        self._save(status='uploading')
+        try:
+            glanceclient(self.request).images.upload(self.image_id, self)
+        except Exception as e:
+            LOG.warning('Failed to upload the data of image %(id)s (%(e)s)',
+                        {'id': self.image_id, 'e': e})
+            self._save(status='failed', error=str(e))
+        else:
+            self._save(status='finished')
+        finally:
+            self._cleanup()
+
+    def abort(self):
+        """Deletes the image and the uploaded file."""
+        _get_upload_cache().delete(_get_upload_cache_key(self.image_id))
+        try:
+            glanceclient(self.request).images.delete(self.image_id)
+        finally:
+            self._cleanup()
+
+
+@profiler.trace
+def image_upload_status(request, image_id):
+    """Return the status of the legacy upload of the data of an image.
+
+    The status is a dict with the ``id`` and ``name`` of the image, the
+    ``status`` of the upload ("queued", "uploading", "finished" or
+    "failed"), the ``size`` of the data, the number of bytes ``uploaded``
+    and the ``error`` which made the upload fail. None is returned when
+    no upload of the image by the project of the user is known.
+    """
+    status = _get_upload_cache().get(_get_upload_cache_key(image_id))
+    if status is None or status['project_id'] != request.user.project_id:
+        return None
+    return status
+
+
 @profiler.trace
 def image_create(request, **kwargs):
     """Create image.
@@ -483,7 +690,11 @@ def image_create(request, **kwargs):
     asynchronously.
 
     In the case of 'data' the process of uploading the data may take
-    some time and is handed off to a separate thread.
+    some time and is handed off to a pool of threads (see the
+    HORIZON_IMAGES_LEGACY_UPLOAD setting). The progress of the upload
+    is returned by image_upload_status(). ImageUploadRejected is raised
+    and the image is deleted when too many uploads are already waiting
+    for a thread.
     """
     data = kwargs.pop('data', None)
     location = kwargs.pop('location', None)
@@ -507,18 +718,14 @@ def image_create(request, **kwargs):
                                       data.read(),
                                       data.content_type)
 
-        def upload():
-            try:
-                return glanceclient(request).images.upload(image.id, data)
-            finally:
-                filename = str(data.file.name)
-                try:
-                    os.remove(filename)
-                except OSError as e:
-                    LOG.warning('Failed to remove temporary image file '
-                                '%(file)s (%(e)s)',
-                                {'file': filename, 'e': e})
-        thread.start_new_thread(upload, ())
+        upload = _LegacyImageUpload(request, image, data)
+        try:
+            _get_upload_executor().submit(upload.run)
+        except futurist.RejectedSubmission:
+            upload.abort()
+            raise ImageUploadRejected(
+                _('Too many images are being uploaded, please try again '
+                  'later.'))
 
     return Image(image)
 
@@ -526,6 +733,7 @@ def image_create(request, **kwargs):
 @profiler.trace
 def image_update_properties(request, image_id, remove_props=None, **kwargs):
     """Add or update a custom property of an image."""
+    image_list_detailed_by_ids.invalidate()
     return glanceclient(request).images.update(image_id,
                                                remove_props,
                                                **kwargs)
@@ -534,6 +742,7 @@ def image_update_properties(request, image_id, remove_props=None, **kwargs):
 @profiler.trace
 def image_delete_properties(request, image_id, keys):
     """Delete custom properties for an image."""
+    image_list_detailed_by_ids.invalidate()
     return glanceclient(request, '2').images.update(image_id, keys)
 
 
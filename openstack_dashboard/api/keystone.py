@@ -17,8 +17,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
 import collections
+import functools
 import logging
+import threading
+import time
 from urllib import parse
 
 from django.conf import settings
@@ -32,10 +36,14 @@ from openstack_auth import backend
 from openstack_auth import utils as auth_utils
 
 from horizon import exceptions
+from horizon.utils import functions as utils
+from horizon.utils import memoized
 
 from openstack_dashboard.api import base
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard import policy
+from openstack_dashboard.utils import connection_pool
+from openstack_dashboard.utils import futurist_utils
 from openstack_dashboard.utils import settings as setting_utils
 
 
@@ -179,11 +187,15 @@ def keystoneclient(request, admin=False):
         verify = verify and cacert
         LOG.debug("Creating a new keystoneclient connection to %s.", endpoint)
         remote_addr = request.environ.get('REMOTE_ADDR', '')
-        token_auth = token_endpoint.Token(endpoint=endpoint,
-                                          token=token_id)
-        keystone_session = session.Session(auth=token_auth,
-                                           original_ip=remote_addr,
-                                           verify=verify)
+        if connection_pool.is_enabled():
+            keystone_session = connection_pool.get_session(
+                request, endpoint, token_id, original_ip=remote_addr)
+        else:
+            token_auth = token_endpoint.Token(endpoint=endpoint,
+                                              token=token_id)
+            keystone_session = session.Session(auth=token_auth,
+                                               original_ip=remote_addr,
+                                               verify=verify)
         conn = client_version['client'].Client(session=keystone_session,
                                                debug=settings.DEBUG)
         setattr(request, cache_attr, conn)
@@ -247,6 +259,8 @@ def domain_update(request, domain_id, name=None, description=None,
     except Exception:
         LOG.exception("Unable to update Domain: %s", domain_id)
         raise
+    if name is not None:
+        resolve_names.invalidate()
     return response
 
 
@@ -260,6 +274,8 @@ def tenant_create(request, name, description=None, enabled=None,
                               enabled=enabled, **kwargs)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    finally:
+        _invalidate_list_indexes('project')
 
 
 def get_default_domain(request, get_name=True):
@@ -344,6 +360,100 @@ def tenant_get(request, project, admin=True):
 def tenant_delete(request, project):
     manager = VERSIONS.get_project_manager(request, admin=True)
     manager.delete(project)
+    _invalidate_list_indexes('project')
+
+
+# Sorted indexes of the users and projects of the domains, by kind of
+# resource, domain, endpoint, user and project. See the IDENTITY_LIST_INDEX
+# setting.
+_LIST_INDEXES = collections.OrderedDict()
+_LIST_INDEXES_LOCK = threading.Lock()
+# The filters a list index applies itself.
+_LIST_INDEX_FILTERS = ('name', 'name__startswith')
+
+
+class _ListIndex(object):
+    """Users or projects sorted by name.
+
+    It serves the pages of a listing, and the resources with a given name
+    or whose name starts with a given prefix, without calling keystone.
+    """
+
+    def __init__(self, resources):
+        self.resources = sorted(resources,
+                                key=lambda r: (r.name.lower(), r.id))
+        self.keys = [(r.name.lower(), r.id) for r in self.resources]
+        self.positions = dict((r.id, i)
+                              for i, r in enumerate(self.resources))
+
+    def _get_range(self, prefix):
+        if not prefix:
+            return 0, len(self.keys)
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.keys, (prefix,))
+        end = start
+        while end < len(self.keys) and self.keys[end][0].startswith(prefix):
+            end += 1
+        return start, end
+
+    def get_page(self, marker=None, limit=None, filters=None):
+        """Return the page after ``marker`` and whether there are more.
+
+        :param filters: a dict with the "name" or "name__startswith" of the
+            resources to return, if any. Names are compared like keystone
+            does, case-sensitively.
+        """
+        filters = filters or {}
+        name = filters.get('name')
+        prefix = filters.get('name__startswith')
+        start, end = self._get_range(name or prefix)
+        if marker in self.positions:
+            start = max(start, self.positions[marker] + 1)
+        resources = self.resources[start:end]
+        if name is not None:
+            resources = [r for r in resources if r.name == name]
+        elif prefix:
+            resources = [r for r in resources if r.name.startswith(prefix)]
+        if limit is None or len(resources) <= limit:
+            return resources, False
+        return resources[:limit], True
+
+
+def _is_list_index_enabled(filters):
+    return (bool(setting_utils.get_dict_config('IDENTITY_LIST_INDEX',
+                                               'timeout')) and
+            set(filters or {}) <= set(_LIST_INDEX_FILTERS))
+
+
+def _get_list_index(request, kind, domain, list_func):
+    """Return the index of the users or projects returned by list_func.
+
+    The index is built again once it has expired, or once a user or
+    project has been created, updated or deleted in this process.
+    """
+    key = (kind, domain, request.user.endpoint, request.user.id,
+           request.user.project_id)
+    with _LIST_INDEXES_LOCK:
+        entry = _LIST_INDEXES.get(key)
+        if entry is not None and entry[0] > time.time():
+            _LIST_INDEXES.move_to_end(key)
+            return entry[1]
+    index = _ListIndex(list_func())
+    timeout = setting_utils.get_dict_config('IDENTITY_LIST_INDEX', 'timeout')
+    max_entries = setting_utils.get_dict_config('IDENTITY_LIST_INDEX',
+                                                'max_entries')
+    with _LIST_INDEXES_LOCK:
+        _LIST_INDEXES[key] = (time.time() + timeout, index)
+        _LIST_INDEXES.move_to_end(key)
+        while len(_LIST_INDEXES) > max_entries:
+            _LIST_INDEXES.popitem(last=False)
+    return index
+
+
+def _invalidate_list_indexes(kind):
+    with _LIST_INDEXES_LOCK:
+        for key in [k for k in _LIST_INDEXES if k[0] == kind]:
+            del _LIST_INDEXES[key]
 
 
 @profiler.trace
@@ -372,11 +482,94 @@ def tenant_list(request, paginate=False, marker=None, domain=None, user=None,
                 tenants = []
             except Exception:
                 exceptions.handle(request)
+        elif paginate and user is None and _is_list_index_enabled(filters):
+            index = _get_list_index(
+                request, 'project', (domain_id, admin),
+                functools.partial(manager.list, domain=domain_id))
+            tenants, has_more_data = index.get_page(
+                marker, utils.get_page_size(request), filters)
         else:
             tenants = manager.list(**kwargs)
     return tenants, has_more_data
 
 
+_NAMES_CACHE = 'openstack_dashboard.api.keystone.resolve_names'
+_NAMES_TIMEOUT = 300
+# Above this number of names to retrieve, it is cheaper to list all the
+# projects (or domains or users) once.
+_NAMES_LIST_THRESHOLD = 20
+
+
+def _get_name(request, kind, resource_id):
+    getters = {'project': tenant_get, 'domain': domain_get, 'user': user_get}
+    try:
+        return getters[kind](request, resource_id).name
+    except Exception as e:
+        LOG.info("Unable to retrieve the name of %(kind)s %(id)s: %(e)s",
+                 {'kind': kind, 'id': resource_id, 'e': e})
+        return None
+
+
+def _list_names(request, kind):
+    if kind == 'project':
+        resources = tenant_list(request)[0]
+    elif kind == 'domain':
+        resources = domain_list(request)
+    else:
+        resources = user_list(request)
+    return dict((resource.id, resource.name) for resource in resources)
+
+
+@profiler.trace
+def resolve_names(request, ids, kind='project'):
+    """Return the names of the projects, domains or users with given ids.
+
+    Pages showing the project (or domain or user) name of their resources
+    only need the names of the ids on the page, so they are retrieved one by
+    one, in parallel, rather than by listing all the projects of the cloud.
+    The names are kept in the shared cache of
+    :func:`horizon.utils.memoized.shared_memoized` when it is enabled, so
+    they are not retrieved again by other requests and processes until they
+    expire or a project, domain or user is renamed. The cached names are
+    shared by all the users of the region, so it is meant for the admin
+    panels. When the shared cache is disabled, or when more than
+    ``_NAMES_LIST_THRESHOLD`` names are not cached, all the projects (or
+    domains or users) are listed once instead.
+
+    :param ids: the ids to resolve. Empty values are ignored.
+    :param kind: "project", "domain" or "user".
+    :returns: a dict mapping the ids to the names, or to None when they
+        cannot be retrieved (for example because the project was deleted).
+    """
+    ids = set(filter(None, ids))
+    if not ids:
+        return {}
+    cached = memoized.get_shared_entries(_NAMES_CACHE, request, 'region',
+                                         [(kind, i) for i in ids])
+    names = dict((key[1], name) for key, name in cached.items())
+    missing = sorted(ids - set(names))
+    if not missing:
+        return names
+    if (not memoized.shared_cache_enabled() or
+            len(missing) > _NAMES_LIST_THRESHOLD):
+        listed = _list_names(request, kind)
+        found = dict((i, listed.get(i)) for i in missing)
+    else:
+        found = dict(zip(missing, futurist_utils.call_functions_parallel(
+            *[(_get_name, [request, kind, i]) for i in missing])))
+    names.update(found)
+    memoized.set_shared_entries(
+        _NAMES_CACHE, request, 'region',
+        dict(((kind, i), name) for i, name in found.items()
+             if name is not None),
+        timeout=_NAMES_TIMEOUT)
+    return names
+
+
+resolve_names.invalidate = functools.partial(memoized.invalidate_shared,
+                                             _NAMES_CACHE)
+
+
 @profiler.trace
 def tenant_update(request, project, name=None, description=None,
                   enabled=None, domain=None, **kwargs):
@@ -386,6 +579,10 @@ def tenant_update(request, project, name=None, description=None,
                               enabled=enabled, domain=domain, **kwargs)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    finally:
+        _invalidate_list_indexes('project')
+        if name is not None:
+            resolve_names.invalidate()
 
 
 @profiler.trace
@@ -408,6 +605,23 @@ def user_list(request, project=None, domain=None, group=None, filters=None):
     return [VERSIONS.upgrade_v2_user(user) for user in users]
 
 
+@profiler.trace
+def user_list_paged(request, domain=None, marker=None, filters=None):
+    """Return a page of the users of ``domain`` and whether there are more.
+
+    Keystone cannot page through users, so the pages are served from an
+    index of the users of the domain when the IDENTITY_LIST_INDEX setting
+    is enabled and the users are not filtered, or are filtered by name or
+    name prefix only. Otherwise all the users are returned.
+    """
+    if not _is_list_index_enabled(filters):
+        return user_list(request, domain=domain, filters=filters), False
+    index = _get_list_index(request, 'user', domain,
+                            functools.partial(user_list, request,
+                                              domain=domain))
+    return index.get_page(marker, utils.get_page_size(request), filters)
+
+
 @profiler.trace
 def user_create(request, name=None, email=None, password=None, project=None,
                 enabled=None, domain=None, description=None, **data):
@@ -419,11 +633,14 @@ def user_create(request, name=None, email=None, password=None, project=None,
                               **data)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    finally:
+        _invalidate_list_indexes('user')
 
 
 @profiler.trace
 def user_delete(request, user_id):
     keystoneclient(request, admin=True).users.delete(user_id)
+    _invalidate_list_indexes('user')
 
 
 @profiler.trace
@@ -443,12 +660,17 @@ def user_update(request, user, **data):
         user = manager.update(user, **data)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    finally:
+        _invalidate_list_indexes('user')
+        if 'name' in data:
+            resolve_names.invalidate()
 
 
 @profiler.trace
 def user_update_enabled(request, user, enabled):
     manager = keystoneclient(request, admin=True).users
     manager.update(user, enabled=enabled)
+    _invalidate_list_indexes('user')
 
 
 @profiler.trace
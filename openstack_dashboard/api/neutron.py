@@ -22,6 +22,7 @@ from __future__ import absolute_import
 import collections
 from collections.abc import Sequence
 import copy
+import functools
 import logging
 
 import netaddr
@@ -34,11 +35,16 @@ from novaclient import exceptions as nova_exc
 
 from horizon import exceptions
 from horizon import messages
+from horizon.utils import memoized as memoized_utils
 from horizon.utils.memoized import memoized
+from horizon.utils.memoized import shared_memoized
 from openstack_dashboard.api import base
 from openstack_dashboard.api import nova
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard import policy
+from openstack_dashboard.utils import connection_pool
+from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import quota_usages
 from openstack_dashboard.utils import settings as setting_utils
 
 
@@ -49,6 +55,10 @@ IP_VERSION_DICT = {4: 'IPv4', 6: 'IPv6'}
 OFF_STATE = 'OFF'
 ON_STATE = 'ON'
 
+# The maximum length of the filters in a list request learned from the
+# RequestURITooLong errors of each neutron endpoint.
+_FILTER_LENGTH_LIMITS = {}
+
 ROUTER_INTERFACE_OWNERS = (
     'network:router_interface',
     'network:router_interface_distributed',
@@ -401,7 +411,13 @@ class SecurityGroupManager(object):
                                    'description': desc,
                                    'tenant_id': self.request.user.project_id}}
         secgroup = self.client.create_security_group(body)
-        return SecurityGroup(secgroup.get('security_group'))
+        secgroup = secgroup.get('security_group')
+        # The security group is created with default rules.
+        quota_usages.update_quota_usages(
+            self.request, 'network',
+            {'security_group': 1,
+             'security_group_rule': len(secgroup['security_group_rules'])})
+        return SecurityGroup(secgroup)
 
     @profiler.trace
     def update(self, sg_id, name, desc):
@@ -414,6 +430,7 @@ class SecurityGroupManager(object):
     def delete(self, sg_id):
         """Delete the specified security group."""
         self.client.delete_security_group(sg_id)
+        quota_usages.invalidate_quota_usages(self.request, 'network')
 
     @profiler.trace
     def rule_create(self, parent_group_id,
@@ -461,6 +478,9 @@ class SecurityGroupManager(object):
             raise exceptions.Conflict(
                 _('Security group rule already exists.'))
         rule = rule.get('security_group_rule')
+        quota_usages.update_quota_usages(self.request, 'network',
+                                         {'security_group_rule': 1},
+                                         rule.get('tenant_id'))
         sg_dict = self._sg_name_dict(parent_group_id, [rule])
         return SecurityGroupRule(rule, sg_dict)
 
@@ -468,6 +488,7 @@ class SecurityGroupManager(object):
     def rule_delete(self, sgr_id):
         """Delete the specified security group rule."""
         self.client.delete_security_group_rule(sgr_id)
+        quota_usages.invalidate_quota_usages(self.request, 'network')
 
     @profiler.trace
     def list_by_instance(self, instance_id):
@@ -638,6 +659,8 @@ class FloatingIpManager(object):
             create_dict['dns_name'] = params['dns_name']
         fip = self.client.create_floatingip(
             {'floatingip': create_dict}).get('floatingip')
+        quota_usages.update_quota_usages(self.request, 'network',
+                                         {'floatingip': 1}, tenant_id)
         self._set_instance_info(fip)
         return FloatingIp(fip)
 
@@ -645,6 +668,8 @@ class FloatingIpManager(object):
     def release(self, floating_ip_id):
         """Releases a floating IP specified."""
         self.client.delete_floatingip(floating_ip_id)
+        servers_update_addresses.invalidate()
+        quota_usages.invalidate_quota_usages(self.request, 'network')
 
     @profiler.trace
     def associate(self, floating_ip_id, port_id):
@@ -663,6 +688,7 @@ class FloatingIpManager(object):
                        'fixed_ip_address': ip_address}
         self.client.update_floatingip(floating_ip_id,
                                       {'floatingip': update_dict})
+        servers_update_addresses.invalidate()
 
     @profiler.trace
     def disassociate(self, floating_ip_id):
@@ -670,6 +696,7 @@ class FloatingIpManager(object):
         update_dict = {'port_id': None}
         self.client.update_floatingip(floating_ip_id,
                                       {'floatingip': update_dict})
+        servers_update_addresses.invalidate()
 
     def _get_reachable_subnets(self, ports, fetch_router_ports=False):
         if not is_enabled_by_config('enable_fip_topology_check'):
@@ -810,6 +837,11 @@ def get_auth_params_from_request(request):
 @memoized
 def neutronclient(request):
     token_id, neutron_url, auth_url = get_auth_params_from_request(request)
+    if connection_pool.is_enabled():
+        return neutron_client.Client(
+            session=connection_pool.get_session(request, neutron_url,
+                                                token_id),
+            endpoint_override=neutron_url)
     insecure = settings.OPENSTACK_SSL_NO_VERIFY
     cacert = settings.OPENSTACK_SSL_CACERT
     c = neutron_client.Client(token=token_id,
@@ -819,6 +851,46 @@ def neutronclient(request):
     return c
 
 
+def _get_filter_length_limit_key(list_method, params):
+    request = params.get('request')
+    if request is None:
+        # Bound methods such as FloatingIpManager.list
+        request = getattr(getattr(list_method, '__self__', None),
+                          'request', None)
+    try:
+        return base.url_for(request, 'network')
+    except Exception:
+        return None
+
+
+def _get_filter_length(filter_attr, filter_values):
+    # Length of each query filter is:
+    # <key>=<value>& (e.g., id=<uuid>)
+    # The length will be key_len + value_maxlen + 2
+    return sum(len(filter_attr) + len(val) + 2 for val in filter_values)
+
+
+def _list_resources_in_chunks(list_method, filter_attr, filter_values,
+                              allowed_filter_len, params):
+    val_maxlen = max(len(val) for val in filter_values)
+    filter_maxlen = len(filter_attr) + val_maxlen + 2
+    chunk_size = max(allowed_filter_len // filter_maxlen, 1)
+
+    def _list_chunk(chunk):
+        chunk_params = dict(params)
+        chunk_params[filter_attr] = chunk
+        return list_method(**chunk_params)
+
+    chunks = [filter_values[i:i + chunk_size]
+              for i in range(0, len(filter_values), chunk_size)]
+    if len(chunks) == 1:
+        results = [_list_chunk(chunks[0])]
+    else:
+        results = futurist_utils.call_functions_parallel(
+            *[(_list_chunk, [chunk]) for chunk in chunks])
+    return [resource for result in results for resource in result]
+
+
 @profiler.trace
 def list_resources_with_long_filters(list_method,
                                      filter_attr, filter_values, **params):
@@ -827,7 +899,11 @@ def list_resources_with_long_filters(list_method,
     If filter parameters are long, list resources API request leads to
     414 error (URL is too long). For such case, this method split
     list parameters specified by a list_field argument into chunks
-    and call the specified list_method repeatedly.
+    and call the specified list_method for each chunk in parallel.
+
+    The maximum filter length accepted by the neutron endpoint is
+    remembered, so that later calls with long filters are split into
+    chunks without sending a request which is known to fail.
 
     :param list_method: Method used to retrieve resource list.
     :param filter_attr: attribute name to be filtered. The value corresponding
@@ -842,8 +918,28 @@ def list_resources_with_long_filters(list_method,
         without any changes. You can specify more filter conditions
         in addition to a pair of filter_attr and filter_values.
     """
+    if isinstance(filter_values, str):
+        values = [filter_values]
+    elif not isinstance(filter_values, Sequence):
+        values = list(filter_values)
+    else:
+        values = filter_values
+
+    limit_key = _get_filter_length_limit_key(list_method, params)
+    allowed_filter_len = _FILTER_LENGTH_LIMITS.get(limit_key)
+    if (allowed_filter_len is not None and
+            _get_filter_length(filter_attr, values) > allowed_filter_len):
+        try:
+            return _list_resources_in_chunks(list_method, filter_attr,
+                                             values, allowed_filter_len,
+                                             params)
+        except neutron_exc.RequestURITooLong:
+            # Other filter conditions in params make the URI longer than
+            # in the request the limit was learned from. Learn it again.
+            _FILTER_LENGTH_LIMITS.pop(limit_key, None)
+
     try:
-        params[filter_attr] = filter_values
+        params[filter_attr] = values
         return list_method(**params)
     except neutron_exc.RequestURITooLong as uri_len_exc:
         # The URI is too long because of too many filter values.
@@ -853,28 +949,12 @@ def list_resources_with_long_filters(list_method,
         # We consider only the filter condition from (filter_attr,
         # filter_values) and do not consider other filter conditions
         # which may be specified in **params.
-
-        if isinstance(filter_values, str):
-            filter_values = [filter_values]
-        elif not isinstance(filter_values, Sequence):
-            filter_values = list(filter_values)
-
-        # Length of each query filter is:
-        # <key>=<value>& (e.g., id=<uuid>)
-        # The length will be key_len + value_maxlen + 2
-        all_filter_len = sum(len(filter_attr) + len(val) + 2
-                             for val in filter_values)
-        allowed_filter_len = all_filter_len - uri_len_exc.excess
-
-        val_maxlen = max(len(val) for val in filter_values)
-        filter_maxlen = len(filter_attr) + val_maxlen + 2
-        chunk_size = allowed_filter_len // filter_maxlen
-
-        resources = []
-        for i in range(0, len(filter_values), chunk_size):
-            params[filter_attr] = filter_values[i:i + chunk_size]
-            resources.extend(list_method(**params))
-        return resources
+        allowed_filter_len = (_get_filter_length(filter_attr, values) -
+                              uri_len_exc.excess)
+        if limit_key is not None:
+            _FILTER_LENGTH_LIMITS[limit_key] = allowed_filter_len
+        return _list_resources_in_chunks(list_method, filter_attr, values,
+                                         allowed_filter_len, params)
 
 
 @profiler.trace
@@ -1144,6 +1224,8 @@ def network_create(request, **kwargs):
         kwargs['tenant_id'] = request.user.project_id
     body = {'network': kwargs}
     network = neutronclient(request).create_network(body=body).get('network')
+    quota_usages.update_quota_usages(request, 'network', {'network': 1},
+                                     kwargs['tenant_id'])
     return Network(network)
 
 
@@ -1154,6 +1236,7 @@ def network_update(request, network_id, **kwargs):
     body = {'network': kwargs}
     network = neutronclient(request).update_network(network_id,
                                                     body=body).get('network')
+    servers_update_addresses.invalidate()
     return Network(network)
 
 
@@ -1161,6 +1244,7 @@ def network_update(request, network_id, **kwargs):
 def network_delete(request, network_id):
     LOG.debug("network_delete(): netid=%s", network_id)
     neutronclient(request).delete_network(network_id)
+    quota_usages.invalidate_quota_usages(request, 'network')
 
 
 @profiler.trace
@@ -1206,6 +1290,8 @@ def subnet_create(request, network_id, **kwargs):
         kwargs['tenant_id'] = request.user.project_id
     body['subnet'].update(kwargs)
     subnet = neutronclient(request).create_subnet(body=body).get('subnet')
+    quota_usages.update_quota_usages(request, 'network', {'subnet': 1},
+                                     kwargs['tenant_id'])
     return Subnet(subnet)
 
 
@@ -1223,6 +1309,7 @@ def subnet_update(request, subnet_id, **kwargs):
 def subnet_delete(request, subnet_id):
     LOG.debug("subnet_delete(): subnetid=%s", subnet_id)
     neutronclient(request).delete_subnet(subnet_id)
+    quota_usages.invalidate_quota_usages(request, 'network')
 
 
 @profiler.trace
@@ -1387,6 +1474,9 @@ def port_create(request, network_id, **kwargs):
         kwargs['tenant_id'] = request.user.project_id
     body['port'].update(kwargs)
     port = neutronclient(request).create_port(body=body).get('port')
+    servers_update_addresses.invalidate()
+    quota_usages.update_quota_usages(request, 'network', {'port': 1},
+                                     kwargs['tenant_id'])
     return Port(port)
 
 
@@ -1394,6 +1484,8 @@ def port_create(request, network_id, **kwargs):
 def port_delete(request, port_id):
     LOG.debug("port_delete(): portid=%s", port_id)
     neutronclient(request).delete_port(port_id)
+    servers_update_addresses.invalidate()
+    quota_usages.invalidate_quota_usages(request, 'network')
 
 
 @profiler.trace
@@ -1403,6 +1495,7 @@ def port_update(request, port_id, **kwargs):
     kwargs = unescape_port_kwargs(**kwargs)
     body = {'port': kwargs}
     port = neutronclient(request).update_port(port_id, body=body).get('port')
+    servers_update_addresses.invalidate()
     return Port(port)
 
 
@@ -1414,6 +1507,8 @@ def router_create(request, **kwargs):
         kwargs['tenant_id'] = request.user.project_id
     body['router'].update(kwargs)
     router = neutronclient(request).create_router(body=body).get('router')
+    quota_usages.update_quota_usages(request, 'network', {'router': 1},
+                                     kwargs['tenant_id'])
     return Router(router)
 
 
@@ -1451,6 +1546,7 @@ def router_list_on_l3_agent(request, l3_agent_id, **params):
 @profiler.trace
 def router_delete(request, router_id):
     neutronclient(request).delete_router(router_id)
+    quota_usages.invalidate_quota_usages(request, 'network')
 
 
 @profiler.trace
@@ -1543,6 +1639,7 @@ def tenant_quota_detail_get(request, tenant_id=None):
 
 
 @profiler.trace
+@shared_memoized(scope='region')
 def default_quota_get(request, tenant_id=None):
     tenant_id = tenant_id or request.user.tenant_id
     response = neutronclient(request).show_quota_default(tenant_id)
@@ -1685,6 +1782,15 @@ def server_update_security_groups(request, instance_id,
         instance_id, new_security_group_ids)
 
 
+_SERVER_ADDRESSES_CACHE = (
+    'openstack_dashboard.api.neutron.servers_update_addresses')
+# Changes made outside of Horizon, for example floating IPs associated with
+# the CLI, do not change the "updated" timestamp of servers, so the cached
+# addresses are only kept for a short time by default. It can be changed, or
+# set to 0 to disable the cache, in MEMOIZED_SHARED_CACHE['timeouts'].
+_SERVER_ADDRESSES_CACHE_TIMEOUT = 10
+
+
 # TODO(pkarikh) need to uncomment when osprofiler will have no
 # issues with unicode in:
 # openstack_dashboard/test/test_data/nova_data.py#L470 data
@@ -1694,12 +1800,40 @@ def servers_update_addresses(request, servers, all_tenants=False):
 
        Should be used when up to date networking information is required,
        and Nova's networking info caching mechanism is not fast enough.
+
+       When ``MEMOIZED_SHARED_CACHE`` is enabled, the addresses are cached
+       per server for 10 seconds, unless another timeout is set in
+       ``MEMOIZED_SHARED_CACHE['timeouts']`` (0 disables the cache), and
+       only servers whose ``updated`` timestamp changed since then are
+       looked up in Neutron again.
+       Changes made through Horizon to ports and floating IPs invalidate
+       the cache (see ``servers_update_addresses.invalidate``).
     """
 
     # NOTE(e0ne): we don't need to call neutron if we have no instances
     if not servers:
         return
 
+    timeout = memoized_utils.get_shared_timeout(
+        _SERVER_ADDRESSES_CACHE, _SERVER_ADDRESSES_CACHE_TIMEOUT)
+    cache_keys = dict((server.id, (server.id, all_tenants))
+                      for server in servers)
+    cached = {}
+    if timeout:
+        cached = memoized_utils.get_shared_entries(
+            _SERVER_ADDRESSES_CACHE, request, 'user', cache_keys.values())
+    stale_servers = []
+    for server in servers:
+        updated, addresses = cached.get(cache_keys[server.id], (None, None))
+        if updated is not None and updated == getattr(server, 'updated',
+                                                      None):
+            server.addresses = addresses
+        else:
+            stale_servers.append(server)
+    if not stale_servers:
+        return
+    servers = stale_servers
+
     # Get all (filtered for relevant servers) information from Neutron
     try:
         # NOTE(e0ne): we need tuple here to work with @memoized decorator.
@@ -1743,6 +1877,7 @@ def servers_update_addresses(request, servers, all_tenants=False):
     network_names = dict((network.id, network.name_or_id)
                          for network in networks)
 
+    to_cache = {}
     for server in servers:
         try:
             addresses = _server_get_addresses(
@@ -1755,6 +1890,15 @@ def servers_update_addresses(request, servers, all_tenants=False):
             LOG.error(str(e))
         else:
             server.addresses = addresses
+            updated = getattr(server, 'updated', None)
+            if timeout and updated is not None:
+                to_cache[cache_keys[server.id]] = (updated, addresses)
+    memoized_utils.set_shared_entries(
+        _SERVER_ADDRESSES_CACHE, request, 'user', to_cache, timeout=timeout)
+
+
+servers_update_addresses.invalidate = functools.partial(
+    memoized_utils.invalidate_shared, _SERVER_ADDRESSES_CACHE)
 
 
 def _server_get_addresses(request, server, ports, floating_ips, network_names):
@@ -1796,7 +1940,7 @@ def _server_get_addresses(request, server, ports, floating_ips, network_names):
 
 
 @profiler.trace
-@memoized
+@shared_memoized(scope='region')
 def list_extensions(request):
     """List neutron extensions.
 
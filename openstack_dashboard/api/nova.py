@@ -29,6 +29,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from novaclient import api_versions
 from novaclient import exceptions as nova_exceptions
+from novaclient.v2 import flavors as nova_flavors
 from novaclient.v2 import instance_action as nova_instance_action
 from novaclient.v2 import servers as nova_servers
 
@@ -39,6 +40,7 @@ from openstack_dashboard.api import _nova
 from openstack_dashboard.api import base
 from openstack_dashboard.api import cinder
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import quota_usages
 from openstack_dashboard.utils import settings as utils
 
 LOG = logging.getLogger(__name__)
@@ -352,12 +354,14 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                                                       rxtx_factor=rxtx_factor)
     if (metadata):
         flavor_extra_set(request, flavor.id, metadata)
+    flavor_list.invalidate()
     return flavor
 
 
 @profiler.trace
 def flavor_delete(request, flavor_id):
     _nova.novaclient(request).flavors.delete(flavor_id)
+    flavor_list.invalidate()
 
 
 @profiler.trace
@@ -368,8 +372,29 @@ def flavor_get(request, flavor_id, get_extras=False):
     return flavor
 
 
+def _dump_flavors(flavors):
+    # Flavors hold a reference to the nova client, which must not end up
+    # in the shared cache, so only their raw data is stored.
+    return [(flavor.to_dict(), getattr(flavor, 'extras', None))
+            for flavor in flavors]
+
+
+def _load_flavors(request, data):
+    manager = _nova.novaclient(request).flavors
+    flavors = []
+    for info, extras in data:
+        flavor = nova_flavors.Flavor(manager, info, loaded=True)
+        if extras is not None:
+            flavor.extras = extras
+        flavors.append(flavor)
+    return flavors
+
+
+# The flavors listed depend on the roles of the user, which are only known
+# for sure from the token.
 @profiler.trace
-@memoized.memoized
+@memoized.shared_memoized(scope='token', dumps=_dump_flavors,
+                          loads=_load_flavors)
 def flavor_list(request, is_public=True, get_extras=False):
     """Get the list of available instance sizes (flavors)."""
     flavors = _nova.novaclient(request).flavors.list(is_public=is_public)
@@ -441,15 +466,21 @@ def flavor_access_list(request, flavor=None):
 @profiler.trace
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
-    return _nova.novaclient(request).flavor_access.add_tenant_access(
-        flavor=flavor, tenant=tenant)
+    try:
+        return _nova.novaclient(request).flavor_access.add_tenant_access(
+            flavor=flavor, tenant=tenant)
+    finally:
+        flavor_list.invalidate()
 
 
 @profiler.trace
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
-    return _nova.novaclient(request).flavor_access.remove_tenant_access(
-        flavor=flavor, tenant=tenant)
+    try:
+        return _nova.novaclient(request).flavor_access.remove_tenant_access(
+            flavor=flavor, tenant=tenant)
+    finally:
+        flavor_list.invalidate()
 
 
 @profiler.trace
@@ -468,7 +499,10 @@ def flavor_get_extras(request, flavor_id, raw=False, flavor=None):
 def flavor_extra_delete(request, flavor_id, keys):
     """Unset the flavor extra spec keys."""
     flavor = _nova.novaclient(request).flavors.get(flavor_id)
-    return flavor.unset_keys(keys)
+    try:
+        return flavor.unset_keys(keys)
+    finally:
+        flavor_list.invalidate()
 
 
 @profiler.trace
@@ -477,7 +511,10 @@ def flavor_extra_set(request, flavor_id, metadata):
     flavor = _nova.novaclient(request).flavors.get(flavor_id)
     if (not metadata):  # not a way to delete keys
         return None
-    return flavor.set_keys(metadata)
+    try:
+        return flavor.set_keys(metadata)
+    finally:
+        flavor_list.invalidate()
 
 
 @profiler.trace
@@ -542,7 +579,7 @@ def server_create(request, name, image, flavor, key_name, user_data,
     if description is not None:
         kwargs['description'] = description
 
-    return Server(nova_client.servers.create(
+    server = nova_client.servers.create(
         name.strip(), image, flavor, userdata=user_data,
         security_groups=security_groups,
         key_name=key_name, block_device_mapping=block_device_mapping,
@@ -550,12 +587,19 @@ def server_create(request, name, image, flavor, key_name, user_data,
         nics=nics, availability_zone=availability_zone,
         min_count=instance_count, admin_pass=admin_pass,
         disk_config=disk_config, config_drive=config_drive,
-        meta=meta, scheduler_hints=scheduler_hints, **kwargs), request)
+        meta=meta, scheduler_hints=scheduler_hints, **kwargs)
+    # The cores and RAM used by the servers are only known from the flavor,
+    # and the servers may also create volumes and ports.
+    for service in ('compute', 'volume', 'network'):
+        quota_usages.invalidate_quota_usages(request, service)
+    return Server(server, request)
 
 
 @profiler.trace
 def server_delete(request, instance_id):
     _nova.novaclient(request).servers.delete(instance_id)
+    for service in ('compute', 'volume', 'network'):
+        quota_usages.invalidate_quota_usages(request, service)
     # Session is available and consistent for the current view
     # among Horizon django servers even in load-balancing setup,
     # so only the view listing the servers will recognize it as
@@ -797,6 +841,7 @@ def tenant_quota_update(request, tenant_id, **kwargs):
 
 
 @profiler.trace
+@memoized.shared_memoized(scope='region')
 def default_quota_get(request, tenant_id):
     return QuotaSet(_nova.novaclient(request).quotas.defaults(tenant_id))
 
@@ -805,6 +850,7 @@ def default_quota_get(request, tenant_id):
 def default_quota_update(request, **kwargs):
     _nova.novaclient(request).quota_classes.update(DEFAULT_QUOTA_NAME,
                                                    **kwargs)
+    default_quota_get.invalidate()
 
 
 def _get_usage_marker(usage):
@@ -1115,16 +1161,29 @@ def remove_host_from_aggregate(request, aggregate_id, host):
     _nova.novaclient(request).aggregates.remove_host(aggregate_id, host)
 
 
+# The addresses of the servers cached by
+# api.neutron.servers_update_addresses, which imports this module.
+_SERVER_ADDRESSES_CACHE = (
+    'openstack_dashboard.api.neutron.servers_update_addresses')
+
+
 @profiler.trace
 def interface_attach(request,
                      server, port_id=None, net_id=None, fixed_ip=None):
-    return _nova.novaclient(request).servers.interface_attach(
-        server, port_id, net_id, fixed_ip)
+    try:
+        return _nova.novaclient(request).servers.interface_attach(
+            server, port_id, net_id, fixed_ip)
+    finally:
+        memoized.invalidate_shared(_SERVER_ADDRESSES_CACHE)
 
 
 @profiler.trace
 def interface_detach(request, server, port_id):
-    return _nova.novaclient(request).servers.interface_detach(server, port_id)
+    try:
+        return _nova.novaclient(request).servers.interface_detach(server,
+                                                                  port_id)
+    finally:
+        memoized.invalidate_shared(_SERVER_ADDRESSES_CACHE)
 
 
 @profiler.trace
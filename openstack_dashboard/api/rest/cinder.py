@@ -31,7 +31,7 @@ class Volumes(generic.View):
     """API for cinder volumes."""
     url_regex = r'cinder/volumes/$'
 
-    @rest_utils.ajax()
+    @rest_utils.ajax(streaming=True)
     def get(self, request):
         """Get a detailed list of volumes associated with the current project.
 
@@ -69,7 +69,7 @@ class Volumes(generic.View):
                 search_opts=search_opts, **kwargs
             )
         return {
-            'items': [api.cinder.Volume(u).to_dict() for u in result],
+            'items': (api.cinder.Volume(u).to_dict() for u in result),
             'has_more_data': has_more,
             'has_prev_data': has_prev
         }
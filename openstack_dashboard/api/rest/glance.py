@@ -114,6 +114,31 @@ class ImageProperties(generic.View):
         )
 
 
+@urls.register
+class ImageUpload(generic.View):
+    """API for the status of the upload of the data of an image"""
+    url_regex = r'glance/images/(?P<image_id>[^/]+)/upload/$'
+
+    @rest_utils.ajax()
+    def get(self, request, image_id):
+        """Get the status of the upload of the data of an image
+
+        Only the uploads of image data through the Horizon server (when
+        HORIZON_IMAGES_UPLOAD_MODE is 'legacy') are known.
+
+        The result is an object with the "id" and "name" of the image, the
+        "status" of the upload ('queued', 'uploading', 'finished' or
+        'failed'), the "size" of the data, the number of bytes "uploaded"
+        and the "error" which made the upload fail.
+
+        http://localhost/api/glance/images/cc758c90-3d98-4ea1-af44-aab405c9c915/upload/
+        """
+        status = api.glance.image_upload_status(request, image_id)
+        if status is None:
+            raise rest_utils.AjaxError(404, 'Unknown image upload')
+        return status
+
+
 class UploadObjectForm(forms.Form):
     data = forms.FileField(required=False)
 
@@ -123,7 +148,7 @@ class Images(generic.View):
     """API for Glance images."""
     url_regex = r'glance/images/$'
 
-    @rest_utils.ajax()
+    @rest_utils.ajax(streaming=True)
     def get(self, request):
         """Get a list of images.
 
@@ -159,7 +184,7 @@ class Images(generic.View):
             request, filters=filters, **kwargs)
 
         return {
-            'items': [i.to_dict() for i in images],
+            'items': (i.to_dict() for i in images),
             'has_more_data': has_more_data,
             'has_prev_data': has_prev_data,
         }
@@ -177,7 +202,10 @@ class Images(generic.View):
         meta = _create_image_metadata(request.DATA)
         meta['data'] = data['data']
 
-        image = api.glance.image_create(request, **meta)
+        try:
+            image = api.glance.image_create(request, **meta)
+        except api.glance.ImageUploadRejected as e:
+            return rest_utils.JSONResponse(str(e), 503)
         return rest_utils.CreatedResponse(
             '/api/glance/images/%s' % image.name,
             image.to_dict()
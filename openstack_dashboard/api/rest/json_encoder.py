@@ -18,11 +18,51 @@ from django.utils.translation import ugettext_lazy as _
 
 
 class NaNJSONEncoder(json.JSONEncoder):
+    # When True, encode() uses the C-accelerated encoder of the json module
+    # (if available) and only falls back to substituting NaN and infinity
+    # values when the data actually contains them.
+    use_c_encoder = True
+
     def __init__(self, nan_str='NaN', inf_str='1e+999', **kwargs):
         self.nan_str = nan_str
         self.inf_str = inf_str
         super(NaNJSONEncoder, self).__init__(**kwargs)
 
+    def encode(self, o):
+        """Return a JSON string representation of a Python data structure.
+
+        The pure Python encoder used by iterencode() is several times slower
+        than the C-accelerated one, so the data is first encoded with the C
+        encoder refusing non-finite floats. This succeeds for most of the
+        data, and only data which actually contains NaN or infinity values
+        is encoded again with the pure Python encoder.
+        """
+        if (self.use_c_encoder and self.allow_nan and
+                encoder.c_make_encoder is not None and self.indent is None and
+                not isinstance(o, str)):
+            try:
+                return self._c_encode(o)
+            except ValueError:
+                # Either an out of range float or a circular reference,
+                # both are handled by the pure Python encoder.
+                pass
+        return super(NaNJSONEncoder, self).encode(o)
+
+    def _c_encode(self, o):
+        if self.check_circular:
+            markers = {}
+        else:
+            markers = None
+        if self.ensure_ascii:
+            _encoder = encoder.c_encode_basestring_ascii
+        else:
+            _encoder = encoder.c_encode_basestring
+        # The last argument is allow_nan.
+        _iterencode = encoder.c_make_encoder(
+            markers, self.default, _encoder, self.indent, self.key_separator,
+            self.item_separator, self.sort_keys, self.skipkeys, False)
+        return ''.join(_iterencode(o, 0))
+
     def iterencode(self, o, _one_shot=False):
         """JSON encoder with NaN and float inf support.
 
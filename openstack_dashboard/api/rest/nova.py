@@ -324,7 +324,7 @@ class Servers(generic.View):
         'config_drive', 'scheduler_hints', 'description'
     ]
 
-    @rest_utils.ajax()
+    @rest_utils.ajax(streaming=True)
     def get(self, request):
         """Get a list of servers.
 
@@ -335,7 +335,7 @@ class Servers(generic.View):
         http://localhost/api/nova/servers
         """
         servers = api.nova.server_list(request)[0]
-        return {'items': [s.to_dict() for s in servers]}
+        return {'items': (s.to_dict() for s in servers)}
 
     @rest_utils.ajax(data_required=True)
     def post(self, request):
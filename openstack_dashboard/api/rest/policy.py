@@ -34,17 +34,34 @@ class Policy(generic.View):
 
         The action returns an object with one key: "allowed" and the value
         is the result of the policy check, True or False.
+
+        Several groups of rules can be checked at once by supplying an object
+        "checks" mapping names to objects with "rules" and optional
+        "target" keys instead. The value of "allowed" is then an object
+        mapping the same names to the results of the checks.
         '''
 
-        rules = []
+        if 'checks' in request.DATA:
+            try:
+                names = list(request.DATA['checks'])
+                checks = [self._parse_check(request.DATA['checks'][name])
+                          for name in names]
+            except Exception:
+                raise rest_utils.AjaxError(400, 'unexpected parameter format')
+            results = policy.check_batch(checks, request)
+            return {"allowed": dict(zip(names, results))}
+
         try:
-            rules_in = request.DATA['rules']
-            rules = tuple([tuple(rule) for rule in rules_in])
+            rules, policy_target = self._parse_check(request.DATA)
         except Exception:
             raise rest_utils.AjaxError(400, 'unexpected parameter format')
 
-        policy_target = request.DATA.get('target') or {}
-
         result = policy.check(rules, request, policy_target)
 
         return {"allowed": result}
+
+    @staticmethod
+    def _parse_check(data):
+        rules = tuple([tuple(rule) for rule in data['rules']])
+        policy_target = data.get('target') or {}
+        return rules, policy_target
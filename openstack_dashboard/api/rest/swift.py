@@ -15,10 +15,12 @@
 
 import os
 
+from django.conf import settings
+from django.core.files import uploadedfile
+from django.core.files import uploadhandler
 from django import forms
 from django.http import StreamingHttpResponse
 from django.utils.http import urlunquote
-from django.views.decorators.csrf import csrf_exempt
 from django.views import generic
 
 from horizon import exceptions
@@ -26,6 +28,28 @@ from openstack_dashboard import api
 from openstack_dashboard.api.rest import urls
 from openstack_dashboard.api.rest import utils as rest_utils
 from openstack_dashboard.api import swift
+from openstack_dashboard.utils import settings as setting_utils
+
+
+def _get_page_params(request):
+    """Return the marker, limit and full_listing parameters of a listing.
+
+    The ``marker`` parameter is the name of the last item of the previous
+    page, and ``limit`` the maximum number of items of the page
+    (``API_RESULT_LIMIT`` at most). ``has_more`` in the response tells
+    whether there are items after the page. The whole listing is only
+    returned when ``full_listing`` is ``true``, as it can take longer than
+    the request timeout for large accounts and containers.
+    """
+    marker = request.GET.get('marker') or None
+    limit = settings.API_RESULT_LIMIT
+    if request.GET.get('limit'):
+        try:
+            limit = max(1, min(int(request.GET['limit']), limit))
+        except ValueError:
+            raise rest_utils.AjaxError(400, '"limit" must be an integer')
+    full_listing = request.GET.get('full_listing') == 'true'
+    return marker, limit, full_listing
 
 
 @urls.register
@@ -49,17 +73,17 @@ class Containers(generic.View):
     def get(self, request):
         """Get the list of containers for this account
 
+        The containers are listed one page at a time, see
+        :func:`_get_page_params`.
+
         :param prefix: container name prefix value. Named items in the
         response begin with this value
-
-        TODO(neillc): Add pagination
         """
         prefix = request.GET.get('prefix', None)
-        if prefix:
-            containers, has_more = api.swift.\
-                swift_get_containers(request, prefix=prefix)
-        else:
-            containers, has_more = api.swift.swift_get_containers(request)
+        marker, limit, full_listing = _get_page_params(request)
+        containers, has_more = api.swift.swift_get_containers(
+            request, marker=marker, prefix=prefix or None, limit=limit,
+            full_listing=full_listing)
 
         containers = [container.to_dict() for container in containers]
         return {'items': containers, 'has_more': has_more}
@@ -118,6 +142,9 @@ class Objects(generic.View):
     def get(self, request, container):
         """Get object information.
 
+        The objects are listed one page at a time, see
+        :func:`_get_page_params`.
+
         :param request:
         :param container:
         :return:
@@ -125,11 +152,14 @@ class Objects(generic.View):
         path = request.GET.get('path')
         if path is not None:
             path = urlunquote(path)
-
-        objects = api.swift.swift_get_objects(
+        marker, limit, full_listing = _get_page_params(request)
+        objects, has_more = api.swift.swift_get_objects(
             request,
             container,
-            prefix=path
+            prefix=path,
+            marker=marker,
+            limit=limit,
+            full_listing=full_listing
         )
 
         # filter out the folder from the listing if we're filtering for
@@ -141,14 +171,96 @@ class Objects(generic.View):
             'is_subdir': isinstance(o, swift.PseudoFolder),
             'is_object': not isinstance(o, swift.PseudoFolder),
             'content_type': getattr(o, 'content_type', None)
-        } for o in objects[0] if o.name != path]
-        return {'items': contents}
+        } for o in objects if o.name != path]
+        return {'items': contents, 'has_more': has_more}
 
 
 class UploadObjectForm(forms.Form):
     file = forms.FileField(required=False)
 
 
+class SwiftUploadedFile(uploadedfile.UploadedFile):
+    """A file of a request which has been streamed to Swift."""
+
+    def __init__(self, name, size, swift_object):
+        super(SwiftUploadedFile, self).__init__(name=name, size=size)
+        self.swift_object = swift_object
+
+
+class SwiftUploadHandler(uploadhandler.FileUploadHandler):
+    """Upload handler streaming the file of a request to Swift.
+
+    The data of the "file" field is sent to Swift in segments as it is
+    received (see ``api.swift.SegmentedUpload``), instead of being stored
+    in memory or in a temporary file first.
+    """
+
+    def __init__(self, request, container, object_name):
+        super(SwiftUploadHandler, self).__init__(request)
+        self.container = container
+        self.object_name = object_name
+        self.upload = None
+        self.completed = False
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super(SwiftUploadHandler, self).new_file(field_name, file_name,
+                                                 *args, **kwargs)
+        if field_name != 'file' or self.upload is not None:
+            return
+        self.upload = api.swift.SegmentedUpload(
+            self.request, self.container, self.object_name,
+            headers={'X-Object-Meta-Orig-Filename': file_name})
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.field_name != 'file' or self.upload is None:
+            return None
+        try:
+            self.upload.write(raw_data)
+        except Exception:
+            self.upload.abort()
+            raise
+        return None
+
+    def file_complete(self, file_size):
+        if self.field_name != 'file' or self.upload is None:
+            return None
+        swift_object = self.upload.close()
+        self.completed = True
+        return SwiftUploadedFile(self.file_name, file_size, swift_object)
+
+    def upload_interrupted(self):
+        """Deletes the segments uploaded if the file was not complete."""
+        if self.upload is not None and not self.completed:
+            self.upload.abort()
+
+
+def _create_object(request, container, object_name, form):
+    if not form.is_valid():
+        raise rest_utils.AjaxError(500, 'Invalid request')
+
+    data = form.clean()
+
+    if object_name[-1] == '/':
+        result = api.swift.swift_create_pseudo_folder(
+            request,
+            container,
+            object_name
+        )
+    elif isinstance(data['file'], SwiftUploadedFile):
+        result = data['file'].swift_object
+    else:
+        result = api.swift.swift_upload_object(
+            request,
+            container,
+            object_name,
+            data['file']
+        )
+
+    return rest_utils.CreatedResponse(
+        u'/api/swift/containers/%s/object/%s' % (container, result.name)
+    )
+
+
 @urls.register
 class Object(generic.View):
     """API for a single swift object or pseudo-folder"""
@@ -156,7 +268,6 @@ class Object(generic.View):
         '(?P<object_name>.+)$'
 
     # note: not an AJAX request - the body will be raw file content
-    @csrf_exempt
     def post(self, request, container, object_name):
         """Create or replace an object or pseudo-folder
 
@@ -170,33 +281,14 @@ class Object(generic.View):
 
         POST parameter:
 
-        :param file: the file data for the upload.
+        :param file: the file data for the upload. It is stored on the
+            dashboard server before being sent to Swift, see
+            :class:`ObjectUpload` to stream it instead.
 
         :return:
         """
         form = UploadObjectForm(request.POST, request.FILES)
-        if not form.is_valid():
-            raise rest_utils.AjaxError(500, 'Invalid request')
-
-        data = form.clean()
-
-        if object_name[-1] == '/':
-            result = api.swift.swift_create_pseudo_folder(
-                request,
-                container,
-                object_name
-            )
-        else:
-            result = api.swift.swift_upload_object(
-                request,
-                container,
-                object_name,
-                data['file']
-            )
-
-        return rest_utils.CreatedResponse(
-            u'/api/swift/containers/%s/object/%s' % (container, result.name)
-        )
+        return _create_object(request, container, object_name, form)
 
     @rest_utils.ajax()
     def delete(self, request, container, object_name):
@@ -232,6 +324,55 @@ class Object(generic.View):
         return response
 
 
+@urls.register
+class ObjectUpload(generic.View):
+    """API to upload a swift object
+
+    The file is sent in a multipart PUT request. Unlike the data of POST
+    requests, its body is not read by CsrfViewMiddleware to look for the
+    CSRF token, which has to be given in the X-CSRFToken header, so the
+    file can be streamed to Swift as it is received.
+    """
+    url_regex = r'swift/containers/(?P<container>[^/]+)/upload/' \
+        '(?P<object_name>.+)$'
+
+    # note: not an AJAX request - the body will be raw file content
+    def put(self, request, container, object_name):
+        """Create or replace an object
+
+        :param request:
+        :param container:
+        :param object_name:
+
+        PUT parameter:
+
+        :param file: the file data for the upload. When
+            SWIFT_SEGMENTED_UPLOAD is enabled, it is sent to Swift as it is
+            received.
+
+        :return:
+        """
+        if object_name[-1] == '/':
+            return rest_utils.JSONResponse('Folders cannot be uploaded', 400)
+        if request.content_type != 'multipart/form-data':
+            return rest_utils.JSONResponse(
+                'The file must be sent as multipart/form-data', 400)
+
+        handler = None
+        if setting_utils.get_dict_config('SWIFT_SEGMENTED_UPLOAD', 'enabled'):
+            handler = SwiftUploadHandler(request, container, object_name)
+            request.upload_handlers = [handler]
+        try:
+            data, files = request.parse_file_upload(request.META, request)
+        finally:
+            # Django does not tell the upload handlers when the request
+            # could not be read to its end.
+            if handler is not None:
+                handler.upload_interrupted()
+        form = UploadObjectForm(data, files)
+        return _create_object(request, container, object_name, form)
+
+
 @urls.register
 class ObjectMetadata(generic.View):
     """API for a single swift object"""
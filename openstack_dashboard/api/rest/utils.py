@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from collections import abc as collections
 import functools
 import json
 import logging
@@ -18,10 +19,12 @@ import logging
 from django.conf import settings
 from django import http
 from django.utils import decorators
+from django.utils.module_loading import import_string
 
 from oslo_serialization import jsonutils
 
 from horizon import exceptions
+from horizon.utils import memoized
 
 LOG = logging.getLogger(__name__)
 
@@ -58,13 +61,34 @@ class CreatedResponse(_RestResponse):
         self['Location'] = location
 
 
+@memoized.memoized
+def _get_json_serializer(path):
+    return import_string(path)
+
+
+def json_dumps(data, json_encoder=json.JSONEncoder):
+    """Serialize REST API response data to JSON.
+
+    The function configured in REST_API_JSON_SERIALIZER is used when the
+    default JSON encoder is requested. Keys are only sorted (in DEBUG mode)
+    by the standard serializer.
+    """
+    path = settings.REST_API_JSON_SERIALIZER
+    if path and json_encoder is json.JSONEncoder and not settings.DEBUG:
+        try:
+            return _get_json_serializer(path)(data)
+        except (TypeError, ValueError, OverflowError) as e:
+            LOG.debug('%s failed to serialize the response, falling back to '
+                      'the standard serializer: %s', path, e)
+    return jsonutils.dumps(data, sort_keys=settings.DEBUG, cls=json_encoder)
+
+
 class JSONResponse(_RestResponse):
     def __init__(self, data, status=200, json_encoder=json.JSONEncoder):
         if status == 204:
             content = ''
         else:
-            content = jsonutils.dumps(data, sort_keys=settings.DEBUG,
-                                      cls=json_encoder)
+            content = json_dumps(data, json_encoder=json_encoder)
 
         super(JSONResponse, self).__init__(
             status=status,
@@ -73,8 +97,79 @@ class JSONResponse(_RestResponse):
         )
 
 
+class JSONStreamingResponse(http.StreamingHttpResponse):
+    """JSON response which is serialized while it is being sent.
+
+    Lists, tuples and iterators (such as generators) found at the top level
+    of the data or as values of a top level dict are serialized one item at
+    a time, so the whole JSON document is never built in memory.
+    """
+    # Serialized items are sent in chunks of at least this many bytes.
+    chunk_size = 64 * 1024
+
+    def __init__(self, data, status=200, json_encoder=json.JSONEncoder):
+        self.json_encoder = json_encoder
+        super(JSONStreamingResponse, self).__init__(
+            streaming_content=self._chunks(data),
+            status=status,
+            content_type='application/json',
+        )
+
+    @property
+    def json(self):
+        return jsonutils.loads(b''.join(self.streaming_content))
+
+    def _chunks(self, data):
+        buffered = []
+        size = 0
+        try:
+            for piece in self._encode(data):
+                if isinstance(piece, str):
+                    piece = piece.encode('utf-8')
+                buffered.append(piece)
+                size += len(piece)
+                if size >= self.chunk_size:
+                    yield b''.join(buffered)
+                    buffered = []
+                    size = 0
+        except Exception:
+            # The status code has already been sent at this point, so
+            # the best we can do is to log the error and abort the response.
+            LOG.exception('error while streaming JSON response')
+            raise
+        if buffered:
+            yield b''.join(buffered)
+
+    def _encode(self, data):
+        if isinstance(data, dict):
+            keys = sorted(data) if settings.DEBUG else list(data)
+            yield '{'
+            for index, key in enumerate(keys):
+                if index:
+                    yield ', '
+                yield json_dumps(str(key))
+                yield ': '
+                for piece in self._encode_value(data[key]):
+                    yield piece
+            yield '}'
+        else:
+            for piece in self._encode_value(data):
+                yield piece
+
+    def _encode_value(self, value):
+        if isinstance(value, (list, tuple, collections.Iterator)):
+            yield '['
+            for index, item in enumerate(value):
+                if index:
+                    yield ', '
+                yield json_dumps(item, json_encoder=self.json_encoder)
+            yield ']'
+        else:
+            yield json_dumps(value, json_encoder=self.json_encoder)
+
+
 def ajax(authenticated=True, data_required=False,
-         json_encoder=json.JSONEncoder):
+         json_encoder=json.JSONEncoder, streaming=False):
     """Decorator to allow the wrappered view to exist in an AJAX environment.
 
     Provide a decorator to wrap a view method so that it may exist in an
@@ -91,6 +186,11 @@ def ajax(authenticated=True, data_required=False,
     If data_required is true then we'll assert that there is a JSON body
     present.
 
+    If streaming is true then JSON serialisable data returned by the view is
+    sent as a JSONStreamingResponse, which serializes lists item by item
+    instead of building the whole response body in memory. This is meant for
+    views returning large listings.
+
     The wrapped view method should return either:
 
     - JSON serialisable data
@@ -130,6 +230,9 @@ def ajax(authenticated=True, data_required=False,
                     return data
                 elif data is None:
                     return JSONResponse('', status=204)
+                elif streaming:
+                    return JSONStreamingResponse(data,
+                                                 json_encoder=json_encoder)
                 return JSONResponse(data, json_encoder=json_encoder)
             except http_errors as e:
                 # exception was raised with a specific HTTP status
@@ -16,11 +16,20 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 from datetime import datetime
 from urllib import parse
 
 import functools
-
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+import futurist
 import swiftclient
 
 from django.conf import settings
@@ -30,6 +39,10 @@ from horizon import exceptions
 
 from openstack_dashboard.api import base
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import connection_pool
+from openstack_dashboard.utils import settings as utils
+
+LOG = logging.getLogger(__name__)
 
 FOLDER_DELIMITER = "/"
 CHUNK_SIZE = settings.SWIFT_FILE_TRANSFER_CHUNK_SIZE
@@ -117,18 +130,33 @@ def _metadata_to_header(metadata):
     return headers
 
 
+class _PooledConnection(swiftclient.client.Connection):
+    """Swift connection sending its requests through the shared pool."""
+
+    def http_connection(self, url=None):
+        parsed, conn = super(_PooledConnection, self).http_connection(url)
+        conn.request_session.close()
+        conn.request_session = connection_pool.get_shared_requests_session(
+            conn.url, default_headers=False)
+        return parsed, conn
+
+
 def swift_api(request):
     endpoint = base.url_for(request, 'object-store')
     cacert = settings.OPENSTACK_SSL_CACERT
     insecure = settings.OPENSTACK_SSL_NO_VERIFY
-    return swiftclient.client.Connection(None,
-                                         request.user.username,
-                                         None,
-                                         preauthtoken=request.user.token.id,
-                                         preauthurl=endpoint,
-                                         cacert=cacert,
-                                         insecure=insecure,
-                                         auth_version="3")
+    if connection_pool.is_enabled():
+        connection_class = _PooledConnection
+    else:
+        connection_class = swiftclient.client.Connection
+    return connection_class(None,
+                            request.user.username,
+                            None,
+                            preauthtoken=request.user.token.id,
+                            preauthurl=endpoint,
+                            cacert=cacert,
+                            insecure=insecure,
+                            auth_version="3")
 
 
 @profiler.trace
@@ -151,12 +179,16 @@ def swift_object_exists(request, container_name, object_name):
 
 @profiler.trace
 @safe_swift_exception
-def swift_get_containers(request, marker=None, prefix=None):
-    limit = settings.API_RESULT_LIMIT
+def swift_get_containers(request, marker=None, prefix=None, limit=None,
+                         full_listing=False):
+    if full_listing:
+        headers, containers = swift_api(request).get_account(
+            marker=marker, prefix=prefix, full_listing=True)
+        return ([Container(c) for c in containers], False)
+    limit = limit or settings.API_RESULT_LIMIT
     headers, containers = swift_api(request).get_account(limit=limit + 1,
                                                          marker=marker,
-                                                         prefix=prefix,
-                                                         full_listing=True)
+                                                         prefix=prefix)
     container_objs = [Container(c) for c in containers]
     if(len(container_objs) > limit):
         return (container_objs[0:-1], True)
@@ -222,7 +254,7 @@ def swift_update_container(request, name, metadata=None):
 def swift_delete_container(request, name):
     # It cannot be deleted if it's not empty. The batch remove of objects
     # be done in swiftclient instead of Horizon.
-    objects, more = swift_get_objects(request, name)
+    objects, more = swift_get_objects(request, name, limit=1)
     if objects:
         error_msg = _("The container cannot be deleted "
                       "since it is not empty.")
@@ -235,13 +267,17 @@ def swift_delete_container(request, name):
 @profiler.trace
 @safe_swift_exception
 def swift_get_objects(request, container_name, prefix=None, marker=None,
-                      limit=None):
+                      limit=None, full_listing=False):
+    if full_listing:
+        headers, objects = swift_api(request).get_container(
+            container_name, prefix=prefix, marker=marker,
+            delimiter=FOLDER_DELIMITER, full_listing=True)
+        return (_objectify(objects, container_name), False)
     limit = limit or settings.API_RESULT_LIMIT
     kwargs = dict(prefix=prefix,
                   marker=marker,
                   limit=limit + 1,
-                  delimiter=FOLDER_DELIMITER,
-                  full_listing=True)
+                  delimiter=FOLDER_DELIMITER)
     headers, objects = swift_api(request).get_container(container_name,
                                                         **kwargs)
     object_objs = _objectify(objects, container_name)
@@ -252,41 +288,76 @@ def swift_get_objects(request, container_name, prefix=None, marker=None,
         return (object_objs, False)
 
 
-@profiler.trace
 @safe_swift_exception
-def swift_filter_objects(request, filter_string, container_name, prefix=None,
-                         marker=None):
-    # FIXME(kewu): Swift currently has no real filtering API, thus the marker
-    # parameter here won't actually help the pagination. For now I am just
-    # getting the largest number of objects from a container and filtering
-    # based on those objects.
-    limit = 9999
-    objects = swift_get_objects(request,
-                                container_name,
-                                prefix=prefix,
-                                marker=marker,
-                                limit=limit)
-    filter_string_list = filter_string.lower().strip().split(' ')
+def _get_objects_page(connection, container_name, prefix, marker, limit):
+    headers, objects = connection.get_container(container_name,
+                                                prefix=prefix,
+                                                marker=marker,
+                                                limit=limit,
+                                                delimiter=FOLDER_DELIMITER)
+    return objects
+
+
+def swift_iter_objects(request, container_name, prefix=None, marker=None,
+                       page_size=None):
+    """Yields the objects of a container, following their names order.
+
+    The listing is retrieved from Swift one page of ``page_size`` objects
+    (``API_RESULT_LIMIT`` by default) at a time, as the objects are
+    consumed, so only one page is held in memory whatever the size of the
+    container.
+    """
+    page_size = page_size or settings.API_RESULT_LIMIT
+    connection = swift_api(request)
+    while True:
+        objects = _get_objects_page(connection, container_name, prefix,
+                                    marker, page_size)
+        for obj in _objectify(objects, container_name):
+            yield obj
+        if len(objects) < page_size:
+            return
+        last = objects[-1]
+        marker = last.get('subdir') or last['name']
+
 
-    def matches_filter(obj):
-        for q in filter_string_list:
-            return wildcard_search(obj.name.lower(), q)
+# Swift has no filtering API, so the objects are listed and filtered in
+# Horizon. This is the maximum number of objects listed to filter them.
+SWIFT_FILTER_MAX_OBJECTS = 9999
 
-    return filter(matches_filter, objects[0])
+
+@profiler.trace
+def swift_filter_objects(request, filter_string, container_name, prefix=None,
+                         marker=None):
+    """Returns the objects whose name matches the first word of a filter.
+
+    The word is matched anywhere in the lowercased name of the objects, and
+    can include ``*`` wildcards. Since it is not anchored to the start of the
+    names, it cannot be passed as a prefix to Swift: the objects after
+    ``marker`` are listed page by page, up to ``SWIFT_FILTER_MAX_OBJECTS``
+    objects, and the matching objects are returned as they are found.
+    """
+    q = filter_string.lower().strip().split(' ')[0]
+    objects = itertools.islice(
+        swift_iter_objects(request, container_name, prefix=prefix,
+                           marker=marker),
+        SWIFT_FILTER_MAX_OBJECTS)
+    return (obj for obj in objects if wildcard_search(obj.name.lower(), q))
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_wildcard(q):
+    # The parts between the wildcards are searched in order, each one after
+    # the end of the leftmost match of the previous one.
+    return re.compile('.*?'.join(re.escape(part) for part in q.split('*')),
+                      re.DOTALL)
 
 
 def wildcard_search(string, q):
-    q_list = q.split('*')
-    if all(map(lambda x: x == '', q_list)):
-        return True
-    elif q_list[0] not in string:
-        return False
-    else:
-        if q_list[0] == '':
-            tail = string
-        else:
-            head, delimiter, tail = string.partition(q_list[0])
-        return wildcard_search(tail, '*'.join(q_list[1:]))
+    """Returns whether ``q`` matches a part of ``string``.
+
+    ``*`` in ``q`` matches any sequence of characters.
+    """
+    return _compile_wildcard(q).search(string) is not None
 
 
 @profiler.trace
@@ -327,6 +398,146 @@ def swift_upload_object(request, container_name, object_name,
     return StorageObject(obj_info, container_name)
 
 
+_upload_executor = None
+_upload_executor_pid = None
+_upload_lock = threading.Lock()
+
+
+def _get_upload_executor():
+    """Return the executor of the segment uploads of the process.
+
+    The segments are not uploaded by the shared thread pool of
+    ``futurist_utils`` so that long uploads do not delay the API calls
+    made in parallel to render the pages.
+    """
+    global _upload_executor, _upload_executor_pid
+    with _upload_lock:
+        if (_upload_executor is None or
+                _upload_executor_pid != os.getpid()):
+            _upload_executor = futurist.ThreadPoolExecutor(
+                max_workers=utils.get_dict_config('SWIFT_SEGMENTED_UPLOAD',
+                                                  'max_workers'))
+            _upload_executor_pid = os.getpid()
+        return _upload_executor
+
+
+class SegmentedUpload(object):
+    """Upload of an object to Swift in segments, as its data is received.
+
+    The data written is buffered until a segment is complete, and the
+    segments are uploaded by a thread pool dedicated to the uploads, at
+    most ``concurrency`` at a time (see the ``SWIFT_SEGMENTED_UPLOAD``
+    setting). So at most ``concurrency + 1`` segments are held in memory
+    whatever the size of the object.
+
+    Data which fits in a single segment is uploaded as a normal object.
+    Otherwise the segments are stored in the ``<container>_segments``
+    container and the object is a static large object manifest, or a
+    dynamic one if Swift does not support static large objects.
+    """
+
+    def __init__(self, request, container_name, object_name, headers=None):
+        self.request = request
+        self.container_name = container_name
+        self.object_name = object_name
+        self.headers = dict(headers or {})
+        self.segments_container = '%s_segments' % container_name
+        self.segment_size = utils.get_dict_config('SWIFT_SEGMENTED_UPLOAD',
+                                                  'segment_size')
+        self.concurrency = utils.get_dict_config('SWIFT_SEGMENTED_UPLOAD',
+                                                 'concurrency')
+        self.size = 0
+        self._buffer = bytearray()
+        self._segments = []
+        self._prefix = '%s/%.6f/%d/' % (object_name, time.time(),
+                                        self.segment_size)
+
+    def _put_segment(self, name, data):
+        return swift_api(self.request).put_object(self.segments_container,
+                                                  name, data,
+                                                  content_length=len(data))
+
+    def _upload_segment(self, data):
+        if not self._segments:
+            swift_api(self.request).put_container(self.segments_container)
+        pending = [segment[2] for segment in self._segments
+                   if not segment[2].done()]
+        if len(pending) >= self.concurrency:
+            futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+        for segment in self._segments:
+            # Stop as soon as a segment failed.
+            if segment[2].done() and segment[2].exception() is not None:
+                raise segment[2].exception()
+        name = '%s%08d' % (self._prefix, len(self._segments))
+        future = _get_upload_executor().submit(self._put_segment, name, data)
+        self._segments.append((name, len(data), future))
+
+    def write(self, data):
+        self._buffer += data
+        self.size += len(data)
+        while len(self._buffer) >= self.segment_size:
+            segment = bytes(self._buffer[:self.segment_size])
+            del self._buffer[:self.segment_size]
+            self._upload_segment(segment)
+
+    @safe_swift_exception
+    def _close(self):
+        connection = swift_api(self.request)
+        if not self._segments:
+            etag = connection.put_object(self.container_name,
+                                         self.object_name,
+                                         bytes(self._buffer),
+                                         content_length=self.size,
+                                         headers=self.headers)
+            self._buffer = bytearray()
+            return etag
+        if self._buffer:
+            self._upload_segment(bytes(self._buffer))
+            self._buffer = bytearray()
+        manifest = [{'path': '/%s/%s' % (self.segments_container, name),
+                     'etag': future.result(),
+                     'size_bytes': size}
+                    for name, size, future in self._segments]
+        if 'slo' in swift_get_capabilities(self.request):
+            return connection.put_object(self.container_name,
+                                         self.object_name,
+                                         json.dumps(manifest),
+                                         headers=self.headers,
+                                         query_string='multipart-manifest=put')
+        headers = dict(self.headers)
+        headers['X-Object-Manifest'] = parse.quote(
+            '%s/%s' % (self.segments_container, self._prefix))
+        return connection.put_object(self.container_name, self.object_name,
+                                     b'', content_length=0, headers=headers)
+
+    def close(self):
+        """Completes the upload and returns the uploaded StorageObject.
+
+        The segments already uploaded are deleted if the upload fails.
+        """
+        try:
+            etag = self._close()
+        except Exception:
+            self.abort()
+            raise
+        obj_info = {'name': self.object_name, 'bytes': self.size,
+                    'etag': etag}
+        return StorageObject(obj_info, self.container_name)
+
+    def abort(self):
+        """Deletes the segments uploaded so far."""
+        connection = swift_api(self.request)
+        for name, size, future in self._segments:
+            try:
+                future.result()
+                connection.delete_object(self.segments_container, name)
+            except Exception as e:
+                LOG.warning('Unable to delete the segment %s of %s: %s',
+                            name, self.object_name, e)
+        self._segments = []
+        self._buffer = bytearray()
+
+
 @profiler.trace
 @safe_swift_exception
 def swift_create_pseudo_folder(request, container_name, pseudo_folder_name):
@@ -347,10 +558,35 @@ def swift_create_pseudo_folder(request, container_name, pseudo_folder_name):
     return PseudoFolder(obj_info, container_name)
 
 
+def _delete_dlo_segments(connection, object_name, manifest):
+    segments_container, prefix = parse.unquote(manifest).split('/', 1)
+    headers, segments = connection.get_container(segments_container,
+                                                 prefix=prefix,
+                                                 full_listing=True)
+    for segment in segments:
+        try:
+            connection.delete_object(segments_container, segment['name'])
+        except swiftclient.client.ClientException as e:
+            LOG.warning('Unable to delete the segment %s of %s: %s',
+                        segment['name'], object_name, e)
+
+
 @profiler.trace
 @safe_swift_exception
 def swift_delete_object(request, container_name, object_name):
-    swift_api(request).delete_object(container_name, object_name)
+    connection = swift_api(request)
+    kwargs = {}
+    manifest = None
+    if utils.get_dict_config('SWIFT_SEGMENTED_UPLOAD', 'enabled'):
+        # Delete the segments of large objects with them. Swift deletes
+        # those of static large objects, and ignores this for other objects.
+        kwargs['query_string'] = 'multipart-manifest=delete'
+        # The segments of dynamic large objects are found by their prefix.
+        manifest = connection.head_object(
+            container_name, object_name).get('x-object-manifest')
+    connection.delete_object(container_name, object_name, **kwargs)
+    if manifest:
+        _delete_dlo_segments(connection, object_name, manifest)
     return True
 
 
@@ -358,7 +594,7 @@ def swift_delete_object(request, container_name, object_name):
 @safe_swift_exception
 def swift_delete_folder(request, container_name, object_name):
     objects, more = swift_get_objects(request, container_name,
-                                      prefix=object_name)
+                                      prefix=object_name, limit=2)
     # In case the given object is pseudo folder,
     # it can be deleted only if it is empty.
     # swift_get_objects will return at least
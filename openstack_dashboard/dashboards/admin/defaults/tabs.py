@@ -87,3 +87,4 @@ class DefaultsTabs(tabs.TabGroup):
     slug = "defaults"
     tabs = (ComputeQuotasTab, VolumeQuotasTab, NetworkQuotasTab)
     sticky = True
+    parallel_load = True
@@ -26,7 +26,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
 
     @test.create_mocks({
         api.nova: ['server_list'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['resolve_names'],
         api.neutron: ['network_list',
                       'is_extension_supported',
                       'tenant_floating_ip_list']})
@@ -37,7 +37,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
         self.mock_server_list.return_value = [servers, False]
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self.mock_network_list.return_value = self.networks.list()
         self.mock_is_extension_supported.return_value = True
 
@@ -59,7 +60,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(ip.tenant_id for ip in fips))
         params = {"router:external": True}
         self.mock_network_list.assert_called_once_with(
             test.IsHttpRequest(), **params)
@@ -214,7 +216,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
                       'is_extension_supported',
                       'network_list'],
         api.nova: ['server_list'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['resolve_names']})
     def test_admin_disassociate_floatingip(self):
         # Use neutron test data
         fips = self.floating_ips.list()
@@ -223,7 +225,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
         self.mock_server_list.return_value = [servers, False]
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self.mock_network_list.return_value = self.networks.list()
         self.mock_floating_ip_disassociate.return_value = None
         self.mock_is_extension_supported.return_value = True
@@ -240,7 +243,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(ip.tenant_id for ip in fips))
         params = {"router:external": True}
         self.mock_network_list.assert_called_once_with(
             test.IsHttpRequest(), **params)
@@ -254,7 +258,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
                       'is_extension_supported',
                       'network_list'],
         api.nova: ['server_list'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['resolve_names']})
     def test_admin_delete_floatingip(self):
         # Use neutron test data
         fips = self.floating_ips.list()
@@ -263,7 +267,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
         self.mock_server_list.return_value = [servers, False]
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self.mock_network_list.return_value = self.networks.list()
         self.mock_is_extension_supported.return_value = True
 
@@ -279,7 +284,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest(),
             detailed=False,
             search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(ip.tenant_id for ip in fips))
         params = {"router:external": True}
         self.mock_network_list.assert_called_once_with(
             test.IsHttpRequest(), **params)
@@ -291,7 +297,7 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
                       'is_extension_supported',
                       'network_list'],
         api.nova: ['server_list'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['resolve_names']})
     def test_floating_ip_table_actions(self):
         # Use neutron test data
         fips = self.floating_ips.list()
@@ -299,7 +305,8 @@ class AdminFloatingIpViewTest(test.BaseAdminViewTests):
         tenants = self.tenants.list()
         self.mock_tenant_floating_ip_list.return_value = fips
         self.mock_server_list.return_value = [servers, False]
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self.mock_network_list.return_value = self.networks.list()
         self.mock_is_extension_supported.return_value = True
 
@@ -13,8 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from collections import OrderedDict
-
 from django.urls import reverse
 from django.urls import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
@@ -61,6 +59,15 @@ class IndexView(tables.DataTableView):
     table_class = fip_tables.FloatingIPsTable
     page_title = _("Floating IPs")
 
+    def _get_tenant_names(self, tenant_ids):
+        # Gather only the names of the projects of the floating IPs shown
+        try:
+            return api.keystone.resolve_names(self.request, tenant_ids)
+        except Exception:
+            msg = _('Unable to retrieve project list.')
+            exceptions.handle(self.request, msg)
+            return {}
+
     @memoized.memoized_method
     def get_data(self):
         floating_ips = []
@@ -87,8 +94,8 @@ class IndexView(tables.DataTableView):
                     _('Unable to retrieve instance list.'))
             instances_dict = dict((obj.id, obj.name) for obj in instances)
 
-            tenants = get_tenant_list(self.request)
-            tenant_dict = OrderedDict([(t.id, t) for t in tenants])
+            tenant_names = self._get_tenant_names(
+                set(ip.tenant_id for ip in floating_ips))
 
             pools = get_floatingip_pools(self.request)
             pool_dict = dict((obj.id, obj.name) for obj in pools)
@@ -96,8 +103,7 @@ class IndexView(tables.DataTableView):
             for ip in floating_ips:
                 ip.instance_name = instances_dict.get(ip.instance_id)
                 ip.pool_name = pool_dict.get(ip.pool, ip.pool)
-                tenant = tenant_dict.get(ip.tenant_id, None)
-                ip.tenant_name = getattr(tenant, "name", None)
+                ip.tenant_name = tenant_names.get(ip.tenant_id)
 
         return floating_ips
 
@@ -52,6 +52,7 @@ class MigrateInstance(policy.PolicyTargetMixin, tables.BatchAction):
     policy_rules = (("compute", "os_compute_api:os-migrate-server:migrate"),)
     help_text = _("Migrating instances may cause some unrecoverable results.")
     action_type = "danger"
+    cache_key_attrs = project_tables.STATE_ATTRS
 
     @staticmethod
     def action_present(count):
@@ -86,6 +87,7 @@ class LiveMigrateInstance(policy.PolicyTargetMixin,
     classes = ("ajax-modal", "btn-migrate")
     policy_rules = (
         ("compute", "os_compute_api:os-migrate-server:migrate_live"),)
+    cache_key_attrs = project_tables.STATE_ATTRS
 
     def allowed(self, request, instance):
         return (instance.status in project_tables.ACTIVE_STATES and
@@ -93,17 +95,20 @@ class LiveMigrateInstance(policy.PolicyTargetMixin,
 
 
 class AdminUpdateRow(project_tables.UpdateRow):
-    def get_data(self, request, instance_id):
-        instance = super(AdminUpdateRow, self).get_data(request, instance_id)
-        try:
-            tenant = api.keystone.tenant_get(request,
-                                             instance.tenant_id,
-                                             admin=True)
-            instance.tenant_name = getattr(tenant, "name", instance.tenant_id)
-        except keystone_exceptions.NotFound:
-            instance.tenant_name = None
-
-        return instance
+    def _update_instances(self, request, instances):
+        super(AdminUpdateRow, self)._update_instances(request, instances)
+        tenant_names = {}
+        for instance in instances:
+            tenant_id = instance.tenant_id
+            if tenant_id not in tenant_names:
+                try:
+                    tenant = api.keystone.tenant_get(request, tenant_id,
+                                                     admin=True)
+                    tenant_names[tenant_id] = getattr(tenant, "name",
+                                                      tenant_id)
+                except keystone_exceptions.NotFound:
+                    tenant_names[tenant_id] = None
+            instance.tenant_name = tenant_names[tenant_id]
 
 
 class AdminInstanceFilterAction(tables.FilterAction):
@@ -33,7 +33,7 @@ INDEX_TEMPLATE = 'horizon/common/_data_table_view.html'
 class InstanceViewTest(test.BaseAdminViewTests):
     @test.create_mocks({
         api.nova: ['flavor_list', 'server_list_paged', 'extension_supported'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['resolve_names'],
         api.glance: ['image_list_detailed_by_ids'],
     })
     def test_index(self):
@@ -42,7 +42,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         instances_img_ids = [instance.image.get('id') for instance in
                              servers if isinstance(instance.image, dict)]
         self.mock_extension_supported.return_value = True
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in self.tenants.list())
         self.mock_image_list_detailed_by_ids.return_value = self.images.list()
         self.mock_flavor_list.return_value = self.flavors.list()
         self.mock_server_list_paged.return_value = [servers, False, False]
@@ -57,7 +58,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
             mock.call('AdminActions', test.IsHttpRequest()),
             mock.call('Shelve', test.IsHttpRequest())] * 4)
         self.assertEqual(15, self.mock_extension_supported.call_count)
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(s.tenant_id for s in servers))
         self.mock_image_list_detailed_by_ids.assert_called_once_with(
             test.IsHttpRequest(), instances_img_ids)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
@@ -70,7 +72,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
     @test.create_mocks({
         api.nova: ['flavor_list', 'flavor_get', 'server_list_paged',
                    'extension_supported'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['resolve_names'],
         api.glance: ['image_list_detailed_by_ids'],
     })
     def test_index_flavor_list_exception(self):
@@ -82,7 +84,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.mock_server_list_paged.return_value = [servers, False, False]
         self.mock_extension_supported.return_value = True
         self.mock_flavor_list.side_effect = self.exceptions.nova
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in self.tenants.list())
 
         def _get_full_flavor(request, id):
             return full_flavors[id]
@@ -107,7 +110,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
             mock.call('Shelve', test.IsHttpRequest())] * 4)
         self.assertEqual(15, self.mock_extension_supported.call_count)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(s.tenant_id for s in servers))
         self.mock_flavor_get.assert_has_calls(
             [mock.call(test.IsHttpRequest(), s.flavor['id']) for s in servers])
         self.assertEqual(len(servers), self.mock_flavor_get.call_count)
@@ -117,7 +121,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
     @test.create_mocks({
         api.nova: ['flavor_list', 'flavor_get', 'server_list_paged',
                    'extension_supported'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['resolve_names'],
         api.glance: ['image_list_detailed_by_ids'],
     })
     def test_index_flavor_get_exception(self):
@@ -133,7 +137,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.mock_flavor_list.return_value = self.flavors.list()
         self.mock_server_list_paged.return_value = [servers, False, False]
         self.mock_extension_supported.return_value = True
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in self.tenants.list())
         self.mock_flavor_get.side_effect = self.exceptions.nova
 
         res = self.client.get(INDEX_URL)
@@ -158,20 +163,21 @@ class InstanceViewTest(test.BaseAdminViewTests):
             mock.call('AdminActions', test.IsHttpRequest()),
             mock.call('Shelve', test.IsHttpRequest())] * 4)
         self.assertEqual(15, self.mock_extension_supported.call_count)
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(s.tenant_id for s in servers))
         self.mock_flavor_get.assert_has_calls(
             [mock.call(test.IsHttpRequest(), s.flavor['id']) for s in servers])
         self.assertEqual(len(servers), self.mock_flavor_get.call_count)
 
     @test.create_mocks({
         api.nova: ['server_list_paged', 'flavor_list'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['resolve_names'],
         api.glance: ['image_list_detailed_by_ids'],
     })
     def test_index_server_list_exception(self):
         self.mock_server_list_paged.side_effect = self.exceptions.nova
         self.mock_flavor_list.return_value = self.flavors.list()
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_resolve_names.return_value = {}
         self.mock_image_list_detailed_by_ids.return_value = self.images.list()
 
         res = self.client.get(INDEX_URL)
@@ -183,7 +189,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
             test.IsHttpRequest(),
             sort_dir='desc',
             search_opts=search_opts)
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set())
         self.mock_image_list_detailed_by_ids.assert_called_once_with(
             test.IsHttpRequest(), [])
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
@@ -234,14 +241,15 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_mocks({
         api.nova: ['flavor_list', 'server_list_paged', 'extension_supported'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['resolve_names'],
         api.glance: ['image_list_detailed_by_ids'],
     })
     def test_index_options_before_migrate(self):
         servers = self.servers.list()
         instances_img_ids = [instance.image.get('id') for instance in
                              servers if hasattr(instance, 'image')]
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in self.tenants.list())
         self.mock_image_list_detailed_by_ids.return_value = self.images.list()
         self.mock_flavor_list.return_value = self.flavors.list()
         self.mock_server_list_paged.return_value = [
@@ -252,7 +260,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.assertNotContains(res, "instances__confirm")
         self.assertNotContains(res, "instances__revert")
 
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(s.tenant_id for s in servers))
         self.mock_image_list_detailed_by_ids.assert_called_once_with(
             test.IsHttpRequest(), instances_img_ids)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
@@ -269,7 +278,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_mocks({
         api.nova: ['flavor_list', 'server_list_paged', 'extension_supported'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['resolve_names'],
         api.glance: ['image_list_detailed_by_ids'],
     })
     def test_index_options_after_migrate(self):
@@ -280,7 +289,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         server2.status = "VERIFY_RESIZE"
         instances_img_ids = [instance.image.get('id') for instance in
                              servers if hasattr(instance, 'image')]
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in self.tenants.list())
         self.mock_image_list_detailed_by_ids.return_value = self.images.list()
         self.mock_flavor_list.return_value = self.flavors.list()
         self.mock_extension_supported.return_value = True
@@ -291,7 +301,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.assertContains(res, "instances__revert")
         self.assertNotContains(res, "instances__migrate")
 
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(s.tenant_id for s in servers))
         self.mock_image_list_detailed_by_ids.assert_called_once_with(
             test.IsHttpRequest(), instances_img_ids)
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
@@ -306,6 +317,35 @@ class InstanceViewTest(test.BaseAdminViewTests):
             sort_dir='desc',
             search_opts=search_opts)
 
+    @test.create_mocks({
+        api.nova: ['flavor_list', 'server_list_paged', 'extension_supported'],
+        api.keystone: ['tenant_list', 'resolve_names'],
+        api.glance: ['image_list_detailed_by_ids'],
+    })
+    def test_index_filtered_by_project(self):
+        tenant = self.tenants.first()
+        servers = [s for s in self.servers.list()
+                   if s.tenant_id == tenant.id]
+        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_image_list_detailed_by_ids.return_value = self.images.list()
+        self.mock_flavor_list.return_value = self.flavors.list()
+        self.mock_extension_supported.return_value = True
+        self.mock_server_list_paged.return_value = [servers, False, False]
+
+        self.client.post(INDEX_URL,
+                         data={'instances__filter_admin_instances__q_field':
+                               'project',
+                               'instances__filter_admin_instances__q':
+                               tenant.name})
+        res = self.client.get(INDEX_URL)
+
+        self.assertTemplateUsed(res, INDEX_TEMPLATE)
+        self.assertEqual([tenant.name] * len(servers),
+                         [i.tenant_name for i in res.context['table'].data])
+        # Filtering by project name requires all projects.
+        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_not_called()
+
     @test.create_mocks({api.nova: ['service_list',
                                    'server_get']})
     def test_instance_live_migrate_get(self):
@@ -494,7 +534,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
                    'flavor_get',
                    'server_list_paged',
                    'extension_supported'],
-        api.keystone: ['tenant_list'],
+        api.keystone: ['resolve_names'],
         api.glance: ['image_list_detailed_by_ids'],
     })
     def _test_servers_paginate_do(self,
@@ -514,7 +554,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.mock_extension_supported.return_value = True
         self.mock_flavor_list.return_value = flavors
         self.mock_image_list_detailed_by_ids.return_value = images
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self.mock_flavor_get.side_effect = self.exceptions.nova
 
         if marker:
@@ -530,7 +571,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
             mock.call('AdminActions', test.IsHttpRequest()),
             mock.call('Shelve', test.IsHttpRequest())])
         self.assertEqual(3, self.mock_extension_supported.call_count)
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(s.tenant_id for s in servers))
         self.mock_image_list_detailed_by_ids.assert_called_once_with(
             test.IsHttpRequest(),
             [server.image.id for server in servers])
@@ -93,6 +93,15 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
             exceptions.handle(self.request, msg)
             return {}
 
+    def _get_tenant_names(self, tenant_ids):
+        # Gather only the names of the projects of the instances shown
+        try:
+            return api.keystone.resolve_names(self.request, tenant_ids)
+        except Exception:
+            msg = _('Unable to retrieve instance project information.')
+            exceptions.handle(self.request, msg)
+            return {}
+
     def _get_images(self, instances=()):
         # Gather our images to correlate our instances to them
         try:
@@ -152,11 +161,23 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
         self._needs_filter_first = False
 
         instances = self._get_instances(search_opts, sort_dir)
+        # All projects are needed to filter instances by project name only.
+        # Otherwise only the projects of the instances shown are resolved.
+        if 'project' in search_opts:
+            get_tenants = self._get_tenants
+        else:
+            get_tenants = (self._get_tenant_names,
+                           [set(inst.tenant_id for inst in instances)])
         results = futurist_utils.call_functions_parallel(
             (self._get_images, [tuple(instances)]),
             self._get_flavors,
-            self._get_tenants)
+            get_tenants)
         image_dict, flavor_dict, tenant_dict = results
+        if 'project' in search_opts:
+            tenant_names = dict((tenant_id, tenant.name)
+                                for tenant_id, tenant in tenant_dict.items())
+        else:
+            tenant_names, tenant_dict = tenant_dict, {}
 
         non_api_filter_info = (
             ('project', 'tenant_id', tenant_dict.values()),
@@ -191,8 +212,7 @@ class AdminIndexView(tables.PagedTableMixin, tables.DataTableView):
             except Exception:
                 msg = _('Unable to retrieve instance size information.')
                 exceptions.handle(self.request, msg)
-            tenant = tenant_dict.get(inst.tenant_id, None)
-            inst.tenant_name = getattr(tenant, "name", None)
+            inst.tenant_name = tenant_names.get(inst.tenant_id)
         return instances
 
 
@@ -48,14 +48,15 @@ class NetworkTests(test.BaseAdminViewTests):
     @test.create_mocks({api.neutron: ('network_list',
                                       'list_dhcp_agent_hosting_networks',
                                       'is_extension_supported'),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('resolve_names',),
                         usage.quotas: ('tenant_quota_usages',)})
     def test_index(self):
         tenants = self.tenants.list()
         quota_data = self.quota_usages.first()
 
         self.mock_network_list.return_value = self.networks.list()
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self._stub_is_extension_supported(
             {'network_availability_zone': True,
              'dhcp_agent_scheduler': True})
@@ -70,7 +71,8 @@ class NetworkTests(test.BaseAdminViewTests):
         self.assertCountEqual(networks, self.networks.list())
 
         self.mock_network_list.assert_called_once_with(test.IsHttpRequest())
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(n.tenant_id for n in networks))
         self._check_is_extension_supported(
             {'network_availability_zone': 1,
              'dhcp_agent_scheduler': len(self.networks.list()) + 1})
@@ -894,7 +896,7 @@ class NetworkTests(test.BaseAdminViewTests):
                                       'network_delete',
                                       'list_dhcp_agent_hosting_networks',
                                       'is_extension_supported'),
-                        api.keystone: ('tenant_list',)})
+                        api.keystone: ('resolve_names',)})
     def test_delete_network(self):
         tenants = self.tenants.list()
         network = self.networks.first()
@@ -904,7 +906,8 @@ class NetworkTests(test.BaseAdminViewTests):
         self._stub_is_extension_supported(
             {'network_availability_zone': True,
              'dhcp_agent_scheduler': True})
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self.mock_network_list.return_value = [network]
         self.mock_network_delete.return_value = None
 
@@ -918,7 +921,8 @@ class NetworkTests(test.BaseAdminViewTests):
         self._check_is_extension_supported(
             {'network_availability_zone': 1,
              'dhcp_agent_scheduler': 2})
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), {network.tenant_id})
         self.mock_network_list.assert_called_once_with(test.IsHttpRequest())
         self.mock_network_delete.assert_called_once_with(test.IsHttpRequest(),
                                                          network.id)
@@ -927,7 +931,7 @@ class NetworkTests(test.BaseAdminViewTests):
                                       'network_delete',
                                       'list_dhcp_agent_hosting_networks',
                                       'is_extension_supported'),
-                        api.keystone: ('tenant_list',)})
+                        api.keystone: ('resolve_names',)})
     def test_delete_network_exception(self):
         tenants = self.tenants.list()
         network = self.networks.first()
@@ -937,7 +941,8 @@ class NetworkTests(test.BaseAdminViewTests):
         self._stub_is_extension_supported(
             {'network_availability_zone': True,
              'dhcp_agent_scheduler': True})
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self.mock_network_list.return_value = [network]
         self.mock_network_delete.side_effect = self.exceptions.neutron
 
@@ -951,7 +956,8 @@ class NetworkTests(test.BaseAdminViewTests):
         self._check_is_extension_supported(
             {'network_availability_zone': 1,
              'dhcp_agent_scheduler': 2})
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), {network.tenant_id})
         self.mock_network_list.assert_called_once_with(test.IsHttpRequest())
         self.mock_network_delete.assert_called_once_with(test.IsHttpRequest(),
                                                          network.id)
@@ -12,8 +12,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-from collections import OrderedDict
-
 from django.urls import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 
@@ -48,18 +46,15 @@ class IndexView(tables.DataTableView):
                        'router:external': {_("yes"): True, _("no"): False},
                        'admin_state_up': {_("up"): True, _("down"): False}}
 
-    @memoized.memoized_method
-    def _get_tenant_list(self):
+    def _get_tenant_names(self, tenant_ids):
+        # Gather only the names of the projects of the resources shown
         try:
-            tenants, has_more = api.keystone.tenant_list(self.request)
+            return api.keystone.resolve_names(self.request, tenant_ids)
         except Exception:
-            tenants = []
             msg = _("Unable to retrieve information about the "
                     "networks' projects.")
             exceptions.handle(self.request, msg)
-
-        tenant_dict = OrderedDict([(t.id, t) for t in tenants])
-        return tenant_dict
+            return {}
 
     def _get_agents_data(self, network):
         agents = []
@@ -109,11 +104,11 @@ class IndexView(tables.DataTableView):
             exceptions.handle(self.request, msg)
         if networks:
             self.exception = False
-            tenant_dict = self._get_tenant_list()
+            tenant_names = self._get_tenant_names(
+                set(n.tenant_id for n in networks))
             for n in networks:
                 # Set tenant name
-                tenant = tenant_dict.get(n.tenant_id, None)
-                n.tenant_name = getattr(tenant, 'name', None)
+                n.tenant_name = tenant_names.get(n.tenant_id)
                 n.num_agents = self._get_agents_data(n.id)
         return networks
 
@@ -73,14 +73,15 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
     @test.create_mocks({api.neutron: ('router_list',
                                       'network_list',
                                       'is_extension_supported'),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('resolve_names',),
                         quotas: ('tenant_quota_usages',)})
     def test_index(self):
         tenants = self.tenants.list()
         quota_data = self.neutron_quota_usages.first()
         self.mock_router_list.return_value = self.routers.list()
         self.mock_tenant_quota_usages.return_value = quota_data
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self.mock_is_extension_supported.return_value = True
         self._mock_external_network_list()
 
@@ -91,7 +92,8 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
         self.assertCountEqual(routers, self.routers.list())
 
         self.mock_router_list.assert_called_once_with(test.IsHttpRequest())
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(r.tenant_id for r in self.routers.list()))
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_tenant_quota_usages, 2,
             mock.call(test.IsHttpRequest(), targets=('router',)))
@@ -124,7 +126,7 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
                                       'router_list_on_l3_agent',
                                       'network_list',
                                       'is_extension_supported'),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('resolve_names',),
                         quotas: ('tenant_quota_usages',)})
     def test_list_by_l3_agent(self):
         tenants = self.tenants.list()
@@ -132,7 +134,8 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
         agent = self.agents.list()[1]
         self.mock_agent_list.return_value = [agent]
         self.mock_router_list_on_l3_agent.return_value = self.routers.list()
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self.mock_tenant_quota_usages.return_value = quota_data
         self.mock_is_extension_supported.return_value = True
         self._mock_external_network_list()
@@ -149,7 +152,8 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
             test.IsHttpRequest(), id=agent.id)
         self.mock_router_list_on_l3_agent.assert_called_once_with(
             test.IsHttpRequest(), agent.id, search_opts=None)
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), set(r.tenant_id for r in self.routers.list()))
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_tenant_quota_usages, 2,
             mock.call(test.IsHttpRequest(), targets=('router',)))
@@ -160,7 +164,7 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
     @test.create_mocks({api.neutron: ('router_list',
                                       'network_list',
                                       'is_extension_supported'),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('resolve_names',),
                         quotas: ('tenant_quota_usages',)})
     def test_set_external_network_empty(self):
         router = self.routers.first()
@@ -168,7 +172,8 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
         self.mock_router_list.return_value = [router]
         self.mock_tenant_quota_usages.return_value = quota_data
         self.mock_is_extension_supported.return_value = True
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in self.tenants.list())
         self._mock_external_network_list(alter_ids=True)
 
         res = self.client.get(self.INDEX_URL)
@@ -186,7 +191,8 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
             mock.call(test.IsHttpRequest(), targets=('router',)))
         self.mock_is_extension_supported.assert_called_once_with(
             test.IsHttpRequest(), "router_availability_zone")
-        self.mock_tenant_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(), {router.tenant_id})
         self._check_mock_external_network_list()
 
     @test.create_mocks({api.neutron: ('list_l3_agent_hosting_router',)})
@@ -198,7 +204,7 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
                                       'port_list',
                                       'router_delete',
                                       'is_extension_supported'),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('resolve_names',),
                         quotas: ('tenant_quota_usages',)})
     def test_router_delete(self):
         router = self.routers.first()
@@ -206,7 +212,8 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
         quota_data = self.neutron_quota_usages.first()
 
         self.mock_router_list.return_value = self.routers.list()
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self._mock_external_network_list(count=3)
         self.mock_tenant_quota_usages.return_value = quota_data
         self.mock_is_extension_supported.return_value = True
@@ -226,8 +233,9 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
             self.mock_router_list, 3,
             mock.call(test.IsHttpRequest()))
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_tenant_list, 3,
-            mock.call(test.IsHttpRequest()))
+            self.mock_resolve_names, 3,
+            mock.call(test.IsHttpRequest(),
+                      set(r.tenant_id for r in self.routers.list())))
         self._check_mock_external_network_list(count=3)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_tenant_quota_usages, 4,
@@ -246,7 +254,7 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
                                       'router_remove_interface',
                                       'router_delete',
                                       'is_extension_supported'),
-                        api.keystone: ('tenant_list',),
+                        api.keystone: ('resolve_names',),
                         quotas: ('tenant_quota_usages',)})
     def test_router_with_interface_delete(self):
         router = self.routers.first()
@@ -255,7 +263,8 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
         quota_data = self.neutron_quota_usages.first()
 
         self.mock_router_list.return_value = self.routers.list()
-        self.mock_tenant_list.return_value = [tenants, False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in tenants)
         self._mock_external_network_list(count=3)
         self.mock_tenant_quota_usages.return_value = quota_data
         self.mock_is_extension_supported.return_value = True
@@ -276,8 +285,9 @@ class RouterTests(RouterMixin, r_test.RouterTestCase, test.BaseAdminViewTests):
             self.mock_router_list, 3,
             mock.call(test.IsHttpRequest()))
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_tenant_list, 3,
-            mock.call(test.IsHttpRequest()))
+            self.mock_resolve_names, 3,
+            mock.call(test.IsHttpRequest(),
+                      set(r.tenant_id for r in self.routers.list())))
         self._check_mock_external_network_list(count=3)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_tenant_quota_usages, 4,
@@ -67,12 +67,12 @@ class IndexView(r_views.IndexView, n_views.IndexView):
 
     def _set_router_tenant_info(self, routers):
         if routers:
-            tenant_dict = self._get_tenant_list()
+            tenant_names = self._get_tenant_names(
+                set(r.tenant_id for r in routers))
             ext_net_dict = self._list_external_networks()
             for r in routers:
                 # Set tenant name
-                tenant = tenant_dict.get(r.tenant_id, None)
-                r.tenant_name = getattr(tenant, 'name', None)
+                r.tenant_name = tenant_names.get(r.tenant_id)
                 # If name is empty use UUID as name
                 r.name = r.name_or_id
                 # Set external network name
@@ -42,7 +42,7 @@ class VolumeTests(test.BaseAdminViewTests):
     @test.create_mocks({
         api.nova: ['server_list'],
         api.cinder: ['volume_snapshot_list', 'volume_list_paged'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['resolve_names']})
     def _test_index(self, instanceless_volumes):
         volumes = self.cinder_volumes.list()
         if instanceless_volumes:
@@ -55,7 +55,8 @@ class VolumeTests(test.BaseAdminViewTests):
         if not instanceless_volumes:
             self.mock_server_list.return_value = [self.servers.list(), False]
 
-        self.mock_tenant_list.return_value = [[self.tenants.list(), False]]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in self.tenants.list())
 
         res = self.client.get(INDEX_URL)
         if not instanceless_volumes:
@@ -67,7 +68,10 @@ class VolumeTests(test.BaseAdminViewTests):
             search_opts={'all_tenants': True})
         self.mock_volume_snapshot_list.assert_called_once_with(
             test.IsHttpRequest(), search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once()
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(),
+            set(getattr(v, 'os-vol-tenant-attr:tenant_id', None)
+                for v in volumes))
         self.assertTemplateUsed(res, 'horizon/common/_data_table_view.html')
         volumes = res.context['volumes_table'].data
         self.assertCountEqual(volumes, self.cinder_volumes.list())
@@ -81,7 +85,7 @@ class VolumeTests(test.BaseAdminViewTests):
     @test.create_mocks({
         api.nova: ['server_list'],
         api.cinder: ['volume_snapshot_list', 'volume_list_paged'],
-        api.keystone: ['tenant_list']})
+        api.keystone: ['resolve_names']})
     def _test_index_paginated(self, marker, sort_dir, volumes, url,
                               has_more, has_prev):
         vol_snaps = self.cinder_volume_snapshots.list()
@@ -90,7 +94,8 @@ class VolumeTests(test.BaseAdminViewTests):
             [volumes, has_more, has_prev]
         self.mock_volume_snapshot_list.return_value = vol_snaps
         self.mock_server_list.return_value = [self.servers.list(), False]
-        self.mock_tenant_list.return_value = [self.tenants.list(), False]
+        self.mock_resolve_names.return_value = dict(
+            (t.id, t.name) for t in self.tenants.list())
 
         res = self.client.get(urlunquote(url))
 
@@ -104,7 +109,10 @@ class VolumeTests(test.BaseAdminViewTests):
                 'all_tenants': True})
         self.mock_volume_snapshot_list.assert_called_once_with(
             test.IsHttpRequest(), search_opts={'all_tenants': True})
-        self.mock_tenant_list.assert_called_once()
+        self.mock_resolve_names.assert_called_once_with(
+            test.IsHttpRequest(),
+            set(getattr(v, 'os-vol-tenant-attr:tenant_id', None)
+                for v in volumes))
 
         self.assertTemplateUsed(res, 'horizon/common/_data_table_view.html')
         self.assertEqual(res.status_code, 200)
@@ -64,7 +64,7 @@ class VolumesView(tables.PagedTableMixin, volumes_views.VolumeTableMixIn,
         volumes = []
         attached_instance_ids = []
         tenants = []
-        tenant_dict = {}
+        tenant_names = {}
         instances = []
         volume_ids_with_snapshots = []
 
@@ -73,7 +73,18 @@ class VolumesView(tables.PagedTableMixin, volumes_views.VolumeTableMixIn,
             try:
                 tmp_tenants, __ = keystone.tenant_list(self.request)
                 tenants.extend(tmp_tenants)
-                tenant_dict.update([(t.id, t) for t in tenants])
+                tenant_names.update([(t.id, t.name) for t in tenants])
+            except Exception:
+                msg = _('Unable to retrieve volume project information.')
+                exceptions.handle(self.request, msg)
+
+        def _get_tenant_names():
+            # Gather only the names of the projects of the volumes shown
+            tenant_ids = set(getattr(volume, "os-vol-tenant-attr:tenant_id",
+                                     None) for volume in volumes)
+            try:
+                tenant_names.update(
+                    keystone.resolve_names(self.request, tenant_ids))
             except Exception:
                 msg = _('Unable to retrieve volume project information.')
                 exceptions.handle(self.request, msg)
@@ -124,18 +135,17 @@ class VolumesView(tables.PagedTableMixin, volumes_views.VolumeTableMixIn,
         else:
             futurist_utils.call_functions_parallel(
                 _task_get_volumes,
-                _task_get_tenants,
                 _task_get_instances,
                 _task_get_volumes_snapshots
             )
+            _get_tenant_names()
 
         self._set_volume_attributes(
             volumes, instances, volume_ids_with_snapshots)
 
         for volume in volumes:
             tenant_id = getattr(volume, "os-vol-tenant-attr:tenant_id", None)
-            tenant = tenant_dict.get(tenant_id, None)
-            volume.tenant_name = getattr(tenant, "name", None)
+            volume.tenant_name = tenant_names.get(tenant_id)
 
         return volumes
 
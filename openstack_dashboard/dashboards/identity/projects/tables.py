@@ -197,6 +197,8 @@ class DeleteTenantsAction(policy.PolicyTargetMixin, tables.DeleteAction):
 class TenantFilterAction(tables.FilterAction):
     filter_type = "server"
     filter_choices = (('name', _("Project Name ="), True),
+                      ('name__startswith', _("Project Name starts with"),
+                       True),
                       ('id', _("Project ID ="), True),
                       ('enabled', _("Enabled ="), True, _('e.g. Yes/No')))
 
@@ -162,6 +162,8 @@ class UserFilterAction(tables.FilterAction):
     else:
         filter_type = "server"
         filter_choices = (("name", _("User Name ="), True),
+                          ("name__startswith", _("User Name starts with"),
+                           True),
                           ("id", _("User ID ="), True),
                           ("enabled", _("Enabled ="), True, _('e.g. Yes/No')))
 
@@ -220,3 +222,4 @@ class UsersTable(tables.DataTable):
                        DeleteUsersAction)
         table_actions = (UserFilterAction, CreateUserLink, DeleteUsersAction)
         row_class = UpdateRow
+        pagination_param = "user_marker"
@@ -91,6 +91,24 @@ class UsersViewTests(test.BaseAdminViewTests):
                               domain_context_name=domain.name)
         self.test_index(with_domain=True)
 
+    @test.create_mocks({api.keystone: ('user_list_paged',
+                                       'get_effective_domain_id',
+                                       'domain_lookup')})
+    def test_index_paginated(self):
+        domain = self._get_default_domain()
+        users = self._get_users(domain.id)[:2]
+        self.mock_get_effective_domain_id.return_value = domain.id
+        self.mock_user_list_paged.return_value = (users, True)
+        self.mock_domain_lookup.return_value = {domain.id: domain.name}
+
+        res = self.client.get(USERS_INDEX_URL + '?user_marker=1')
+
+        self.assertTemplateUsed(res, 'identity/users/index.html')
+        self.assertCountEqual(users, res.context['table'].data)
+        self.assertContains(res, 'user_marker=%s' % users[-1].id)
+        self.mock_user_list_paged.assert_called_once_with(
+            test.IsHttpRequest(), domain=domain.id, marker='1', filters={})
+
     @override_settings(USER_TABLE_EXTRA_INFO={'phone_num': 'Phone Number'})
     @test.create_mocks({api.keystone: ('user_create',
                                        'get_default_domain',
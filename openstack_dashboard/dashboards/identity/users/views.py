@@ -56,8 +56,14 @@ class IndexView(tables.DataTableView):
     def needs_filter_first(self, table):
         return self._needs_filter_first
 
+    def has_more_data(self, table):
+        return self._more
+
     def get_data(self):
         users = []
+        marker = self.request.GET.get(
+            project_tables.UsersTable._meta.pagination_param, None)
+        self._more = False
         filters = self.get_filters()
 
         self._needs_filter_first = False
@@ -75,9 +81,11 @@ class IndexView(tables.DataTableView):
 
             domain_id = identity.get_domain_id_for_operation(self.request)
             try:
-                users = api.keystone.user_list(self.request,
-                                               domain=domain_id,
-                                               filters=filters)
+                users, self._more = api.keystone.user_list_paged(
+                    self.request,
+                    domain=domain_id,
+                    marker=marker,
+                    filters=filters)
             except Exception:
                 exceptions.handle(self.request,
                                   _('Unable to retrieve user list.'))
@@ -44,6 +44,7 @@ from openstack_dashboard.dashboards.project.instances.workflows \
 from openstack_dashboard.dashboards.project.instances.workflows \
     import update_instance
 from openstack_dashboard import policy
+from openstack_dashboard.utils import futurist_utils
 from openstack_dashboard.views import get_url_with_pagination
 
 LOG = logging.getLogger(__name__)
@@ -74,6 +75,10 @@ SHELVE = 0
 UNSHELVE = 1
 
 
+# Attributes of instances which the availability of most actions depends on.
+STATE_ATTRS = ("status", "OS-EXT-STS:task_state")
+
+
 def is_deleting(instance):
     task_state = getattr(instance, "OS-EXT-STS:task_state", None)
     if not task_state:
@@ -85,6 +90,7 @@ class DeleteInstance(policy.PolicyTargetMixin, tables.DeleteAction):
     policy_rules = (("compute", "os_compute_api:servers:delete"),)
     help_text = _("Deleted instances are not recoverable.")
     default_message_level = "info"
+    cache_key_attrs = STATE_ATTRS
 
     @staticmethod
     def action_present(count):
@@ -119,6 +125,7 @@ class RebootInstance(policy.PolicyTargetMixin, tables.BatchAction):
     help_text = _("Restarted instances will lose any data"
                   " not saved in persistent storage.")
     action_type = "danger"
+    cache_key_attrs = STATE_ATTRS
 
     @staticmethod
     def action_present(count):
@@ -182,6 +189,7 @@ class RescueInstance(policy.PolicyTargetMixin, tables.LinkAction):
     verbose_name = _("Rescue Instance")
     classes = ("btn-rescue", "ajax-modal")
     url = "horizon:project:instances:rescue"
+    cache_key_attrs = STATE_ATTRS
 
     def get_link_url(self, datum):
         instance_id = self.table.get_object_id(datum)
@@ -194,6 +202,7 @@ class RescueInstance(policy.PolicyTargetMixin, tables.LinkAction):
 class UnRescueInstance(tables.BatchAction):
     name = 'unrescue'
     classes = ("btn-unrescue",)
+    cache_key_attrs = ("status",)
 
     @staticmethod
     def action_present(count):
@@ -223,6 +232,7 @@ class UnRescueInstance(tables.BatchAction):
 class TogglePause(tables.BatchAction):
     name = "pause"
     icon = "pause"
+    cache_key_attrs = STATE_ATTRS + ("tenant_id",)
 
     @staticmethod
     def action_present(count):
@@ -290,6 +300,7 @@ class TogglePause(tables.BatchAction):
 class ToggleSuspend(tables.BatchAction):
     name = "suspend"
     classes = ("btn-suspend",)
+    cache_key_attrs = STATE_ATTRS + ("tenant_id",)
 
     @staticmethod
     def action_present(count):
@@ -357,6 +368,7 @@ class ToggleSuspend(tables.BatchAction):
 class ToggleShelve(tables.BatchAction):
     name = "shelve"
     icon = "shelve"
+    cache_key_attrs = STATE_ATTRS + ("tenant_id", "locked")
 
     @staticmethod
     def action_present(count):
@@ -495,6 +507,7 @@ class EditInstance(policy.PolicyTargetMixin, tables.LinkAction):
     classes = ("ajax-modal",)
     icon = "pencil"
     policy_rules = (("compute", "os_compute_api:servers:update"),)
+    cache_key_attrs = STATE_ATTRS
 
     def get_link_url(self, project):
         return self._get_link_url(project, 'instance_info')
@@ -544,6 +557,7 @@ class CreateSnapshot(policy.PolicyTargetMixin, tables.LinkAction):
     classes = ("ajax-modal",)
     icon = "camera"
     policy_rules = (("compute", "os_compute_api:snapshot"),)
+    cache_key_attrs = STATE_ATTRS
 
     def allowed(self, request, instance=None):
         return instance.status in SNAPSHOT_READY_STATES \
@@ -556,6 +570,7 @@ class ConsoleLink(policy.PolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:instances:detail"
     classes = ("btn-console",)
     policy_rules = (("compute", "os_compute_api:os-consoles:index"),)
+    cache_key_attrs = STATE_ATTRS
 
     def allowed(self, request, instance=None):
         # We check if ConsoleLink is allowed only if settings.CONSOLE_TYPE is
@@ -577,6 +592,7 @@ class LogLink(policy.PolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:instances:detail"
     classes = ("btn-log",)
     policy_rules = (("compute", "os_compute_api:os-console-output"),)
+    cache_key_attrs = STATE_ATTRS
 
     def allowed(self, request, instance=None):
         return instance.status in ACTIVE_STATES and not is_deleting(instance)
@@ -595,6 +611,7 @@ class ResizeLink(policy.PolicyTargetMixin, tables.LinkAction):
     classes = ("ajax-modal", "btn-resize")
     policy_rules = (("compute", "os_compute_api:servers:resize"),)
     action_type = "danger"
+    cache_key_attrs = STATE_ATTRS
 
     def get_link_url(self, project):
         return self._get_link_url(project, 'flavor_choice')
@@ -618,6 +635,7 @@ class ConfirmResize(policy.PolicyTargetMixin, tables.Action):
     verbose_name = _("Confirm Resize/Migrate")
     classes = ("btn-confirm", "btn-action-required")
     policy_rules = (("compute", "os_compute_api:servers:confirm_resize"),)
+    cache_key_attrs = ("status",)
 
     def allowed(self, request, instance):
         return instance.status == 'VERIFY_RESIZE'
@@ -632,6 +650,7 @@ class RevertResize(policy.PolicyTargetMixin, tables.Action):
     verbose_name = _("Revert Resize/Migrate")
     classes = ("btn-revert", "btn-action-required")
     policy_rules = (("compute", "os_compute_api:servers:revert_resize"),)
+    cache_key_attrs = ("status",)
 
     def allowed(self, request, instance):
         return instance.status == 'VERIFY_RESIZE'
@@ -647,6 +666,7 @@ class RebuildInstance(policy.PolicyTargetMixin, tables.LinkAction):
     url = "horizon:project:instances:rebuild"
     policy_rules = (("compute", "os_compute_api:servers:rebuild"),)
     action_type = "danger"
+    cache_key_attrs = STATE_ATTRS
 
     def allowed(self, request, instance):
         return ((instance.status in ACTIVE_STATES or
@@ -663,6 +683,7 @@ class DecryptInstancePassword(tables.LinkAction):
     verbose_name = _("Retrieve Password")
     classes = ("btn-decrypt", "ajax-modal")
     url = "horizon:project:instances:decryptpassword"
+    cache_key_attrs = STATE_ATTRS + ("key_name",)
 
     def allowed(self, request, instance):
         return (settings.OPENSTACK_ENABLE_PASSWORD_RETRIEVE and
@@ -738,6 +759,7 @@ class UpdateMetadata(policy.PolicyTargetMixin, tables.LinkAction):
     icon = "pencil"
     attrs = {"ng-controller": "MetadataModalHelperController as modal"}
     policy_rules = (("compute", "os_compute_api:server-metadata:update"),)
+    cache_key_attrs = ("status",)
 
     def __init__(self, attrs=None, **kwargs):
         kwargs['preempt'] = True
@@ -784,31 +806,62 @@ class UpdateRow(tables.Row):
 
     def get_data(self, request, instance_id):
         instance = api.nova.server_get(request, instance_id)
+        self._update_instances(request, [instance])
+        return instance
+
+    def get_data_batch(self, request, instance_ids):
+        instances = futurist_utils.call_functions_parallel(
+            *[(self._get_instance, [request, instance_id])
+              for instance_id in instance_ids])
+        instances = [instance for instance in instances if instance]
+        self._update_instances(request, instances)
+        return dict((instance.id, instance) for instance in instances)
+
+    def _get_instance(self, request, instance_id):
         try:
-            instance.full_flavor = api.nova.flavor_get(request,
-                                                       instance.flavor["id"])
-        except Exception:
-            exceptions.handle(request,
-                              _('Unable to retrieve flavor information '
-                                'for instance "%s".') % instance_id,
-                              ignore=True)
-        try:
-            api.network.servers_update_addresses(request, [instance])
+            return api.nova.server_get(request, instance_id)
         except Exception:
-            exceptions.handle(request,
-                              _('Unable to retrieve Network information '
-                                'for instance "%s".') % instance_id,
-                              ignore=True)
-        error = get_instance_error(instance)
-        if error:
-            messages.error(request, error)
-        return instance
+            error = exceptions.handle(request, ignore=True)
+            if error is not exceptions.NotFound:
+                raise
+            return None
+
+    def _update_instances(self, request, instances):
+        # Instances often share flavors, so each flavor is retrieved once.
+        flavors = {}
+        for instance in instances:
+            flavor_id = instance.flavor["id"]
+            try:
+                if flavor_id not in flavors:
+                    flavors[flavor_id] = api.nova.flavor_get(request,
+                                                             flavor_id)
+                instance.full_flavor = flavors[flavor_id]
+            except Exception:
+                exceptions.handle(request,
+                                  _('Unable to retrieve flavor information '
+                                    'for instance "%s".') % instance.id,
+                                  ignore=True)
+        if instances:
+            try:
+                api.network.servers_update_addresses(request, instances)
+            except Exception:
+                exceptions.handle(request,
+                                  _('Unable to retrieve Network information '
+                                    'for instance "%s".') %
+                                  ", ".join(instance.id
+                                            for instance in instances),
+                                  ignore=True)
+        for instance in instances:
+            error = get_instance_error(instance)
+            if error:
+                messages.error(request, error)
 
 
 class StartInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "start"
     classes = ('btn-confirm',)
     policy_rules = (("compute", "os_compute_api:servers:start"),)
+    cache_key_attrs = ("status",)
 
     @staticmethod
     def action_present(count):
@@ -839,6 +892,7 @@ class StopInstance(policy.PolicyTargetMixin, tables.BatchAction):
     policy_rules = (("compute", "os_compute_api:servers:stop"),)
     help_text = _("The instance(s) will be shut off.")
     action_type = "danger"
+    cache_key_attrs = STATE_ATTRS + ("OS-EXT-STS:power_state",)
 
     @staticmethod
     def action_present(count):
@@ -870,6 +924,7 @@ class StopInstance(policy.PolicyTargetMixin, tables.BatchAction):
 class LockInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "lock"
     policy_rules = (("compute", "os_compute_api:os-lock-server:lock"),)
+    cache_key_attrs = ("locked",)
 
     @staticmethod
     def action_present(count):
@@ -904,6 +959,7 @@ class LockInstance(policy.PolicyTargetMixin, tables.BatchAction):
 class UnlockInstance(policy.PolicyTargetMixin, tables.BatchAction):
     name = "unlock"
     policy_rules = (("compute", "os_compute_api:os-lock-server:unlock"),)
+    cache_key_attrs = ("locked",)
 
     @staticmethod
     def action_present(count):
@@ -942,6 +998,7 @@ class AttachVolume(tables.LinkAction):
     classes = ("ajax-modal",)
     policy_rules = (
         ("compute", "os_compute_api:os-volumes-attachments:create"),)
+    cache_key_attrs = STATE_ATTRS
 
     # This action should be disabled if the instance
     # is not active, or the instance is being deleted
@@ -974,6 +1031,7 @@ class AttachInterface(policy.PolicyTargetMixin, tables.LinkAction):
     classes = ("btn-confirm", "ajax-modal")
     url = "horizon:project:instances:attach_interface"
     policy_rules = (("compute", "os_compute_api:os-attach-interfaces"),)
+    cache_key_attrs = STATE_ATTRS
 
     def allowed(self, request, instance):
         return ((instance.status in ACTIVE_STATES or
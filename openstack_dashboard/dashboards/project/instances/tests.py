@@ -21,6 +21,7 @@ import json
 import logging
 import sys
 
+from cinderclient.v2 import volumes as cinder_volumes
 from django.conf import settings
 from django.forms import widgets
 from django import http
@@ -30,6 +31,10 @@ from django.urls import reverse
 from django.utils.http import urlencode
 import mock
 from novaclient import api_versions
+from novaclient import exceptions as nova_exceptions
+from novaclient.v2 import servers as nova_servers
+
+from openstack_auth import policy
 
 from horizon import exceptions
 from horizon import forms
@@ -39,6 +44,8 @@ from openstack_dashboard.api import cinder
 from openstack_dashboard.dashboards.project.instances import console
 from openstack_dashboard.dashboards.project.instances import tables
 from openstack_dashboard.dashboards.project.instances import tabs
+from openstack_dashboard.dashboards.project.instances \
+    import views as instance_views
 from openstack_dashboard.dashboards.project.instances import workflows
 from openstack_dashboard.test import helpers
 from openstack_dashboard.usage import quotas
@@ -74,30 +81,16 @@ class InstanceTestHelperMixin(object):
 class InstanceTestBase(helpers.ResetImageAPIVersionMixin,
                        InstanceTestHelperMixin,
                        helpers.TestCase):
-    def _assert_mock_image_list_detailed_calls(self):
-        expected_calls = [
-            mock.call(helpers.IsHttpRequest()),
-            mock.call(
-                helpers.IsHttpRequest(),
-                filters={'visibility': 'community'}
-            )
-        ]
-        self.mock_image_list_detailed.assert_has_calls(expected_calls, False)
+    def _assert_mock_image_list_detailed_calls(self, count=1):
+        # Only the images of the instances shown are retrieved, by their IDs.
+        self.assertEqual(count, self.mock_image_list_detailed.call_count)
+        for call in self.mock_image_list_detailed.call_args_list:
+            self.assertEqual(
+                mock.call(helpers.IsHttpRequest(), filters={'id': mock.ANY}),
+                call)
 
     def _assert_mock_image_list_detailed_calls_double(self):
-        expected_calls = [
-            mock.call(helpers.IsHttpRequest()),
-            mock.call(
-                helpers.IsHttpRequest(),
-                filters={'visibility': 'community'}
-            ),
-            mock.call(helpers.IsHttpRequest()),
-            mock.call(
-                helpers.IsHttpRequest(),
-                filters={'visibility': 'community'}
-            )
-        ]
-        self.mock_image_list_detailed.assert_has_calls(expected_calls, False)
+        self._assert_mock_image_list_detailed_calls(count=2)
 
     def setUp(self):
         super(InstanceTestBase, self).setUp()
@@ -226,11 +219,37 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
         self.mock_floating_ip_simple_associate_supported.return_value = True
         return self.client.get(INDEX_URL)
 
+    def _count_row_states(self, action_class, condition=None):
+        # The number of distinct cache keys of a row action for the test
+        # servers which satisfy ``condition``.
+        action = action_class()
+        return len(set(action.get_row_cache_key(server)
+                       for server in self.servers.list()
+                       if condition is None or condition(server)))
+
     def _check_get_index(self, use_servers_update_address=True,
                          multiplier=5):
-        expected_extension_count = {'AdminActions': 4 * multiplier,
-                                    'Shelve': 1 * multiplier}
-        expected_feature_count = 2 * multiplier
+        # Row actions which depend only on the instance state are evaluated
+        # once for each distinct state, however many times the row actions
+        # are retrieved. The lock actions only check the extension and the
+        # feature for the instances they apply to.
+        lock_states = (
+            self._count_row_states(
+                tables.LockInstance,
+                lambda server: not getattr(server, 'locked', False)) +
+            self._count_row_states(
+                tables.UnlockInstance,
+                lambda server: getattr(server, 'locked', True)))
+        expected_extension_count = {
+            'AdminActions': (self._count_row_states(tables.TogglePause) +
+                             self._count_row_states(tables.ToggleSuspend) +
+                             lock_states),
+            'Shelve': self._count_row_states(tables.ToggleShelve),
+        }
+        expected_feature_count = lock_states
+        # The floating IP actions depend on the addresses of the instances
+        # and are evaluated each time the row actions are retrieved, which
+        # is ``multiplier`` times.
         expected_fip_supported_count = 2 * multiplier
         expected_simple_fip_supported = 1 * multiplier
 
@@ -309,7 +328,7 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
         self.assertEqual(len(res.context['instances_table'].data), 0)
         self.assertMessageCount(res, error=1)
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
-        self._assert_mock_image_list_detailed_calls()
+        self._assert_mock_image_list_detailed_calls(count=0)
 
         self.mock_server_list_paged.assert_called_once_with(
             helpers.IsHttpRequest(),
@@ -355,10 +374,10 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
 
         self.assertCountEqual(instances, self.servers.list())
 
-        self._check_extension_supported({'AdminActions': 20,
+        self._check_extension_supported({'AdminActions': 14,
                                          'Shelve': 5})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 10,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_server_list_paged.assert_called_once_with(
             helpers.IsHttpRequest(),
@@ -433,10 +452,10 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
         if expected_image_name:
             self.assertContains(res, expected_image_name)
 
-        self._check_extension_supported({'AdminActions': 20,
+        self._check_extension_supported({'AdminActions': 14,
                                          'Shelve': 5})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 10,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self._assert_mock_image_list_detailed_calls()
@@ -469,6 +488,11 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
         servers = self._test_index_with_instance_booted_from_volume(
             image_metadata, expected_image_name=base_image.name)
         self.assertEqual(base_image.name, servers[0].image.name)
+        # The images of instances booted from volumes are retrieved too.
+        self.mock_image_list_detailed.assert_called_once_with(
+            helpers.IsHttpRequest(), filters={'id': mock.ANY})
+        filters = self.mock_image_list_detailed.call_args[1]['filters']
+        self.assertIn(base_image.id, filters['id'][len('in:'):].split(','))
 
     def test_index_with_instance_booted_from_volume_no_image_info(self):
         # Borrowed from bug #1834747
@@ -481,6 +505,50 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
             image_metadata, expected_image_name=None)
         self.assertEqual('', servers[0].image)
 
+    @helpers.create_mocks({
+        api.nova: ('flavor_list',
+                   'server_list_paged',
+                   'tenant_absolute_limits',
+                   'extension_supported',
+                   'is_feature_available',),
+        api.glance: ('image_list_detailed',),
+        api.neutron: ('floating_ip_simple_associate_supported',
+                      'floating_ip_supported',),
+        api.network: ('servers_update_addresses',),
+        api.cinder: ('volume_list',),
+    })
+    def test_index_filtered_by_image_name(self):
+        image = self.images.get(name='private_image')
+        servers = self.servers.list()
+        self._mock_extension_supported({'AdminActions': True,
+                                        'Shelve': True})
+        self.mock_is_feature_available.return_value = True
+        self.mock_server_list_paged.return_value = [servers, False, False]
+        self.mock_servers_update_addresses.return_value = None
+        self.mock_flavor_list.return_value = self.flavors.list()
+        self.mock_image_list_detailed.return_value = ([image], False, False)
+        self.mock_tenant_absolute_limits.return_value = self.limits['absolute']
+        self.mock_floating_ip_supported.return_value = True
+        self.mock_floating_ip_simple_associate_supported.return_value = True
+        self.mock_volume_list.return_value = self.cinder_volumes.list()
+
+        self.client.post(INDEX_URL,
+                         data={'instances__filter__q_field': 'image_name',
+                               'instances__filter__q': image.name})
+        res = self.client.get(INDEX_URL)
+
+        self.assertTemplateUsed(res, INDEX_TEMPLATE)
+        # Filtering by image name requires all images.
+        self.mock_image_list_detailed.assert_any_call(
+            helpers.IsHttpRequest())
+        self.mock_image_list_detailed.assert_any_call(
+            helpers.IsHttpRequest(), filters={'visibility': 'community'})
+        self.mock_server_list_paged.assert_called_with(
+            helpers.IsHttpRequest(),
+            sort_dir='desc',
+            search_opts={'marker': None, 'paginate': True,
+                         'image': image.id})
+
     def test_index_with_console_link(self):
         res = self._get_index()
 
@@ -1418,6 +1486,135 @@ class InstanceTableTests(InstanceTestBase, InstanceTableTestMixin):
             helpers.IsHttpRequest(), server.id)
 
 
+class InstanceIndexScaleTests(InstanceTestBase):
+    """Benchmark of the instances index with large numbers of volumes."""
+
+    def _scaled_data(self, num_servers, num_volumes):
+        server = self.servers.first()
+        image = self.images.get(name='private_image')
+        volume = self.cinder_volumes.first()
+        servers = []
+        for i in range(num_servers):
+            info = dict(server._info, id='server-%d' % i, image='')
+            servers.append(nova_servers.Server(
+                nova_servers.ServerManager(None), info))
+        volumes = []
+        volumes_per_server = num_volumes // num_servers
+        for i in range(num_volumes):
+            server_id = 'server-%d' % (i // volumes_per_server)
+            device = '/dev/vd%s' % chr(ord('a') + i % volumes_per_server)
+            info = dict(volume._apiresource._info, id='volume-%d' % i,
+                        volume_image_metadata={'image_id': image.id},
+                        attachments=[{'id': 'volume-%d' % i,
+                                      'server_id': server_id,
+                                      'device': device}])
+            volumes.append(api.cinder.Volume(cinder_volumes.Volume(
+                cinder_volumes.VolumeManager(None), info)))
+        return servers, volumes
+
+    def _count_attachment_lookups(self, num_servers, num_volumes):
+        servers, volumes = self._scaled_data(num_servers, num_volumes)
+        lookups = []
+
+        class CountingVolume(object):
+            def __init__(self, volume):
+                self._volume = volume
+
+            def __getattr__(self, name):
+                return getattr(self._volume, name)
+
+            @property
+            def attachments(self):
+                lookups.append(self._volume.id)
+                return self._volume.attachments
+
+        self.mock_server_list_paged.return_value = [servers, False, False]
+        self.mock_volume_list.return_value = [CountingVolume(volume)
+                                              for volume in volumes]
+
+        view = instance_views.IndexView(request=self.request, args=(),
+                                        kwargs={})
+        view.get_table()
+        instances = view.get_data()
+
+        self.assertEqual(num_servers, len(instances))
+        image = self.images.get(name='private_image')
+        for instance in instances:
+            self.assertEqual(image.id, instance.image.id)
+        return len(lookups)
+
+    @override_settings(OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES=False)
+    @helpers.create_mocks({
+        api.nova: ('flavor_list', 'server_list_paged'),
+        api.glance: ('image_list_detailed',),
+        api.cinder: ('volume_list',),
+    })
+    def test_index_boot_volume_lookup_is_linear(self):
+        self.mock_flavor_list.return_value = self.flavors.list()
+        self.mock_image_list_detailed.return_value = (self.images.list(),
+                                                      False, False)
+
+        # The attachments of each volume are read once, whereas the former
+        # nested scan read the attachments of all volumes for each instance.
+        self.assertEqual(200, self._count_attachment_lookups(50, 200))
+        self.assertEqual(800, self._count_attachment_lookups(200, 800))
+
+
+class InstancesTableRenderScaleTests(InstanceTestBase):
+    """Tests of the rendering of the instances table with many rows."""
+
+    def _scaled_servers(self, request, num_servers):
+        servers = self.servers.list()
+        scaled = []
+        for i in range(num_servers):
+            server = servers[i % len(servers)]
+            info = dict(server._info, id='server-%d' % i,
+                        image={'id': 'image-id', 'name': 'image'})
+            scaled.append(api.nova.Server(
+                nova_servers.Server(nova_servers.ServerManager(None), info),
+                request))
+        return scaled
+
+    def _count_render_checks(self, request, servers):
+        table = tables.InstancesTable(request, servers)
+        with mock.patch('openstack_auth.policy.check',
+                        wraps=policy.check) as mock_check:
+            table.render()
+        return mock_check.call_count
+
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    @helpers.create_mocks({
+        api.nova: ('tenant_absolute_limits',
+                   'extension_supported',
+                   'is_feature_available'),
+        api.neutron: ('floating_ip_simple_associate_supported',
+                      'floating_ip_supported'),
+    })
+    def test_render_row_actions_evaluated_per_state(self):
+        self._mock_extension_supported({'AdminActions': True,
+                                        'Shelve': True})
+        self.mock_is_feature_available.return_value = True
+        self.mock_tenant_absolute_limits.return_value = \
+            self.limits['absolute']
+        self.mock_floating_ip_supported.return_value = True
+        self.mock_floating_ip_simple_associate_supported.return_value = True
+        request = self.factory.get(INDEX_URL)
+        request.session = self.request.session
+        servers = self._scaled_servers(request, 100)
+
+        cached_checks = self._count_render_checks(request, servers)
+        # The 100 rows share the five states of the test servers.
+        self._check_extension_supported({'AdminActions': 12, 'Shelve': 5})
+
+        with mock.patch('horizon.tables.actions.BaseAction.'
+                        'get_row_cache_key', return_value=None):
+            uncached_checks = self._count_render_checks(request, servers)
+
+        # Only the actions which depend on the addresses of instances are
+        # still checked for every row.
+        self.assertLess(cached_checks * 5, uncached_checks)
+
+
 class InstanceDetailTests(InstanceTestBase):
 
     @helpers.create_mocks({
@@ -1926,10 +2123,10 @@ class InstanceTests(InstanceTestBase):
             else:
                 self.assertNotContains(res, _action_id)
 
-        self._check_extension_supported({'AdminActions': 20,
+        self._check_extension_supported({'AdminActions': 14,
                                          'Shelve': 5})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 10,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self._assert_mock_image_list_detailed_calls()
@@ -4222,10 +4419,10 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
         self.assertEqual((('compute', 'os_compute_api:servers:create'),),
                          launch_action.policy_rules)
 
-        self._check_extension_supported({'AdminActions': 20,
+        self._check_extension_supported({'AdminActions': 14,
                                          'Shelve': 5})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 10,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self._assert_mock_image_list_detailed_calls()
@@ -4287,10 +4484,10 @@ class InstanceLaunchInstanceTests(InstanceTestBase,
         self.assertEqual('Launch Instance (Quota exceeded)',
                          launch_action.verbose_name)
 
-        self._check_extension_supported({'AdminActions': 20,
+        self._check_extension_supported({'AdminActions': 14,
                                          'Shelve': 5})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 10,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self._assert_mock_image_list_detailed_calls()
@@ -4470,10 +4667,10 @@ class InstanceTests2(InstanceTestBase, InstanceTableTestMixin):
         self.assertContains(res, "instances__confirm")
         self.assertContains(res, "instances__revert")
 
-        self._check_extension_supported({'AdminActions': 20,
+        self._check_extension_supported({'AdminActions': 14,
                                          'Shelve': 5})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 10,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.mock_flavor_list.assert_called_once_with(helpers.IsHttpRequest())
         self._assert_mock_image_list_detailed_calls()
@@ -5062,10 +5259,10 @@ class InstanceTests2(InstanceTestBase, InstanceTableTestMixin):
         # ensure that marker object exists in form action
         self.assertContains(res, form_action, count=1)
 
-        self._check_extension_supported({'AdminActions': 12,
+        self._check_extension_supported({'AdminActions': 10,
                                          'Shelve': 3})
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_is_feature_available, 6,
+            self.mock_is_feature_available, 4,
             mock.call(helpers.IsHttpRequest(), 'locked_attribute'))
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_flavor_list, 2,
@@ -5409,6 +5606,56 @@ class InstanceAjaxTests(helpers.TestCase, InstanceTestHelperMixin):
         self.mock_tenant_absolute_limits.assert_called_once_with(
             helpers.IsHttpRequest(), reserved=True)
 
+    @helpers.create_mocks({api.nova: ("server_get",
+                                      "flavor_get",
+                                      'is_feature_available',
+                                      "extension_supported",
+                                      "tenant_absolute_limits"),
+                           api.network: ('servers_update_addresses',)})
+    def test_row_update_batch(self):
+        servers = self.servers.list()[:2]
+        servers_by_id = dict((server.id, server) for server in servers)
+        deleted_id = 'deleted-instance-id'
+        full_flavors = dict((f.id, f) for f in self.flavors.list())
+
+        def server_get(request, instance_id):
+            if instance_id not in servers_by_id:
+                raise nova_exceptions.NotFound(404)
+            return servers_by_id[instance_id]
+
+        self._mock_extension_supported({'AdminActions': True,
+                                        'Shelve': True})
+        self.mock_is_feature_available.return_value = True
+        self.mock_server_get.side_effect = server_get
+        self.mock_flavor_get.side_effect = \
+            lambda request, flavor_id: full_flavors[flavor_id]
+        self.mock_servers_update_addresses.return_value = None
+        self.mock_tenant_absolute_limits.return_value = self.limits['absolute']
+
+        params = {'action': 'row_update_batch',
+                  'table': 'instances',
+                  'obj_id': [servers[0].id, servers[1].id, deleted_id],
+                  }
+        res = self.client.get('?'.join((INDEX_URL,
+                                        urlencode(params, doseq=True))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(200, res.status_code)
+        rows = json.loads(res.content.decode('utf-8'))['rows']
+        # The row of the deleted instance is missing.
+        self.assertEqual({servers[0].id, servers[1].id}, set(rows))
+        for server in servers:
+            self.assertIn(server.name, rows[server.id])
+
+        self.assertEqual(3, self.mock_server_get.call_count)
+        self.mock_server_get.assert_has_calls(
+            [mock.call(helpers.IsHttpRequest(), instance_id)
+             for instance_id in params['obj_id']], any_order=True)
+        flavor_ids = set(server.flavor['id'] for server in servers)
+        self.assertEqual(len(flavor_ids), self.mock_flavor_get.call_count)
+        # The addresses of all the instances are retrieved at once.
+        self.mock_servers_update_addresses.assert_called_once_with(
+            helpers.IsHttpRequest(), servers)
+
 
 class ConsoleManagerTests(helpers.ResetImageAPIVersionMixin, helpers.TestCase):
 
@@ -102,6 +102,16 @@ class IndexView(tables.PagedTableMixin, tables.DataTableView):
             exceptions.handle(self.request, ignore=True)
             return {}
 
+    def _get_images_by_ids(self, image_ids):
+        # Gather only the images of the instances shown
+        try:
+            images = api.glance.image_list_detailed_by_ids(self.request,
+                                                           image_ids)
+            return dict((image.id, image) for image in images)
+        except Exception:
+            exceptions.handle(self.request, ignore=True)
+            return {}
+
     def _get_instances(self, search_opts, sort_dir):
         try:
             instances, self._more, self._prev = api.nova.server_list_paged(
@@ -123,9 +133,9 @@ class IndexView(tables.PagedTableMixin, tables.DataTableView):
         # and drop the setting OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES.
         # The situation servers_update_addresses() is needed is only
         # when IP address of a server is updated via neutron API and
-        # nova network info cache is not synced. Precisely there is no
-        # need to check IP addresses of all servers. It is sufficient to
-        # fetch IP address information for servers recently updated.
+        # nova network info cache is not synced. When MEMOIZED_SHARED_CACHE
+        # is enabled, servers_update_addresses() only fetches IP address
+        # information for servers recently updated.
         if not settings.OPENSTACK_INSTANCE_RETRIEVE_IP_ADDRESSES:
             return instances
         try:
@@ -151,13 +161,22 @@ class IndexView(tables.PagedTableMixin, tables.DataTableView):
         marker, sort_dir = self._get_marker()
         search_opts = self.get_filters({'marker': marker, 'paginate': True})
 
-        image_dict, flavor_dict, volume_dict = \
-            futurist_utils.call_functions_parallel(
-                self._get_images, self._get_flavors, self._get_volumes
-            )
+        # All images are needed to filter instances by image name only.
+        # Otherwise only the images of the instances shown are retrieved.
+        if 'image_name' in search_opts:
+            image_dict, flavor_dict, volume_dict = \
+                futurist_utils.call_functions_parallel(
+                    self._get_images, self._get_flavors, self._get_volumes
+                )
+        else:
+            image_dict = None
+            flavor_dict, volume_dict = \
+                futurist_utils.call_functions_parallel(
+                    self._get_flavors, self._get_volumes
+                )
 
         non_api_filter_info = (
-            ('image_name', 'image', image_dict.values()),
+            ('image_name', 'image', (image_dict or {}).values()),
             ('flavor_name', 'flavor', flavor_dict.values()),
         )
         if not process_non_api_filters(search_opts, non_api_filter_info):
@@ -166,9 +185,23 @@ class IndexView(tables.PagedTableMixin, tables.DataTableView):
 
         instances = self._get_instances(search_opts, sort_dir)
 
+        # Index volume attachments by server once, so that finding the boot
+        # volume of an instance does not need to scan all volumes.
+        attachment_dict = get_server_attachments(volume_dict.values())
+
+        if image_dict is None:
+            image_ids = set()
+            for instance in instances:
+                image_id = self._get_image_id(instance, volume_dict,
+                                              attachment_dict)
+                if image_id:
+                    image_ids.add(image_id)
+            image_dict = self._get_images_by_ids(sorted(image_ids))
+
         # Loop through instances to get flavor info.
         for instance in instances:
-            self._populate_image_info(instance, image_dict, volume_dict)
+            self._populate_image_info(instance, image_dict, volume_dict,
+                                      attachment_dict)
 
             flavor_id = instance.flavor["id"]
             if flavor_id in flavor_dict:
@@ -181,12 +214,35 @@ class IndexView(tables.PagedTableMixin, tables.DataTableView):
 
         return instances
 
-    def _populate_image_info(self, instance, image_dict, volume_dict):
+    def _get_image_id(self, instance, volume_dict, attachment_dict):
         if not hasattr(instance, 'image'):
-            return
+            return None
         # Instance from image returns dict
         if isinstance(instance.image, dict):
-            image_id = instance.image.get('id')
+            return instance.image.get('id')
+        # Otherwise trying to get image from volume metadata
+        instance_volumes = attachment_dict.get(instance.id)
+        # While instance from volume is being created,
+        # it does not have volumes
+        if not instance_volumes:
+            return None
+        # Getting volume object, which is as attached
+        # as the first device (eg '/dev/sda')
+        boot_attachment = min(instance_volumes,
+                              key=lambda attach: attach['device'])
+        boot_volume = volume_dict[boot_attachment['id']]
+        # There is a case where volume_image_metadata contains
+        # only fields other than 'image_id' (See bug 1834747),
+        # so we try to populate image information only when it is found.
+        volume_metadata = getattr(boot_volume, "volume_image_metadata", {})
+        return volume_metadata.get('image_id')
+
+    def _populate_image_info(self, instance, image_dict, volume_dict,
+                             attachment_dict):
+        image_id = self._get_image_id(instance, volume_dict, attachment_dict)
+        if not hasattr(instance, 'image'):
+            return
+        if isinstance(instance.image, dict):
             if image_id in image_dict:
                 instance.image = image_dict[image_id]
             # In case image not found in image_dict, set name to empty
@@ -194,35 +250,27 @@ class IndexView(tables.PagedTableMixin, tables.DataTableView):
             # until the call is deprecated in api itself
             else:
                 instance.image['name'] = _("-")
-        # Otherwise trying to get image from volume metadata
-        else:
-            instance_volumes = [
-                attachment
-                for volume in volume_dict.values()
-                for attachment in volume.attachments
-                if attachment['server_id'] == instance.id
-            ]
-            # While instance from volume is being created,
-            # it does not have volumes
-            if not instance_volumes:
-                return
-            # Sorting attached volumes by device name (eg '/dev/sda')
-            instance_volumes.sort(key=lambda attach: attach['device'])
-            # Getting volume object, which is as attached
-            # as the first device
-            boot_volume = volume_dict[instance_volumes[0]['id']]
-            # There is a case where volume_image_metadata contains
-            # only fields other than 'image_id' (See bug 1834747),
-            # so we try to populate image information only when it is found.
-            volume_metadata = getattr(boot_volume, "volume_image_metadata", {})
-            image_id = volume_metadata.get('image_id')
-            if image_id:
-                try:
-                    instance.image = image_dict[image_id]
-                except KeyError:
-                    # KeyError occurs when volume was created from image and
-                    # then this image is deleted.
-                    pass
+        elif image_id:
+            try:
+                instance.image = image_dict[image_id]
+            except KeyError:
+                # KeyError occurs when volume was created from image and
+                # then this image is deleted.
+                pass
+
+
+def get_server_attachments(volumes):
+    """Return volume attachments grouped by the ID of the server.
+
+    The result maps a server ID to the list of attachment dicts of all
+    volumes attached to that server.
+    """
+    attachment_dict = {}
+    for volume in volumes:
+        for attachment in volume.attachments:
+            attachment_dict.setdefault(attachment['server_id'],
+                                       []).append(attachment)
+    return attachment_dict
 
 
 def process_non_api_filters(search_opts, non_api_filter_info):
@@ -48,9 +48,11 @@
   function ContainersModel(swiftAPI, apiService, $q) {
     var model = {
       info: {},           // swift installation information
-      containers: [],     // all containers for this account
+      containers: [],     // containers for this account loaded so far
+      containersHasMore: false,
       container: null,    // current active container
-      objects: [],        // current objects list (active container)
+      objects: [],        // current objects list loaded so far (active container)
+      objectsHasMore: false,
       folder: '',         // current folder path
       pseudo_folder_hierarchy: [],
       DELIMETER: '/',    // TODO where is this configured in the current panel
@@ -64,6 +66,8 @@
       recursiveCollect: recursiveCollect,
       recursiveDelete: recursiveDelete,
       getContainers: getContainers,
+      loadMoreContainers: loadMoreContainers,
+      loadMoreObjects: loadMoreObjects,
 
       _recursiveDeleteFiles: recursiveDeleteFiles,
       _recursiveDeleteFolders: recursiveDeleteFolders
@@ -75,6 +79,11 @@
 
     model.getContainersDeferred = $q.defer();
 
+    // the parameters of the listings currently displayed, to get their
+    // following pages
+    var containersParams = {};
+    var objectsSpec = {};
+
     return model;
 
     /**
@@ -90,6 +99,7 @@
         swiftAPI.getContainers().then(function onContainers(data) {
           model.containers.length = 0;
           push.apply(model.containers, data.data.items);
+          model.containersHasMore = data.data.has_more;
         }),
         swiftAPI.getInfo().then(function onInfo(data) {
           model.swift_info = data.info;
@@ -106,10 +116,12 @@
      *
      * @description
      * Sets the currently active container and subfolder path, and
-     * fetches the object listing. Returns the promise for the object
-     * listing fetch.
+     * fetches the first page of the object listing. Returns the promise
+     * for the object listing fetch.
      */
     function selectContainer(name, folder) {
+      // the container may not be in the pages of containers loaded so far
+      model.container = {name: name};
       for (var i = 0; i < model.containers.length; i++) {
         if (model.containers[i].name === name) {
           model.container = model.containers[i];
@@ -117,25 +129,50 @@
         }
       }
       model.objects.length = 0;
+      model.objectsHasMore = false;
       model.pseudo_folder_hierarchy.length = 0;
       model.folder = folder;
 
-      var spec = {
+      objectsSpec = {
         delimiter: model.DELIMETER
       };
       if (folder) {
-        spec.path = encodeURIComponent(folder) + model.DELIMETER;
+        objectsSpec.path = encodeURIComponent(folder) + model.DELIMETER;
       }
 
+      return getObjects(objectsSpec).then(function onObjects() {
+        if (folder) {
+          push.apply(model.pseudo_folder_hierarchy, folder.split(model.DELIMETER) || [folder]);
+        }
+      });
+    }
+
+    /**
+     * @ngdoc method
+     * @name ContainersModel.loadMoreObjects
+     * @returns {promise}
+     *
+     * @description
+     * Fetches the next page of the object listing of the active container
+     * and subfolder path, following the objects loaded so far.
+     */
+    function loadMoreObjects() {
+      var spec = angular.extend({}, objectsSpec);
+      if (model.objects.length) {
+        spec.marker = model.objects[model.objects.length - 1].path;
+      }
+      return getObjects(spec);
+    }
+
+    function getObjects(spec) {
+      var name = model.container.name;
       return swiftAPI.getObjects(name, spec).then(function onObjects(response) {
-        push.apply(model.objects, response.data.items);
         // generate the download URL for each file
-        angular.forEach(model.objects, function setId(object) {
+        angular.forEach(response.data.items, function setId(object) {
           object.url = swiftAPI.getObjectURL(name, model.fullPath(object.name));
         });
-        if (folder) {
-          push.apply(model.pseudo_folder_hierarchy, folder.split(model.DELIMETER) || [folder]);
-        }
+        push.apply(model.objects, response.data.items);
+        model.objectsHasMore = response.data.has_more;
       });
     }
 
@@ -237,7 +274,8 @@
      * @description
      * Recursively collect the names of files and folders under a
      * folder listing. Each item in the listing will be an object
-     * retrieved from swift's getObjects() call.
+     * retrieved from swift's getObjects() call. The listings of the
+     * folders are retrieved one page after the other.
      *
      * The promise will resolve once the recursion is complete.
      *
@@ -280,16 +318,31 @@
           }
           result.push(folder);
           state.counted.folders++;
-          var spec = {
-            delimiter: model.DELIMETER,
-            path: encodeURIComponent(item.path).replace(/%2F/g, '/')
-          };
-          return swiftAPI.getObjects(model.container.name, spec)
-            .then(function objects(response) {
-              return recursiveCollect(state, response.data.items, folder.tree);
-            });
+          return collectFolder(item.path, folder.tree);
         }
       }));
+
+      function collectFolder(path, tree, marker) {
+        var spec = {
+          delimiter: model.DELIMETER,
+          path: encodeURIComponent(path).replace(/%2F/g, '/')
+        };
+        if (marker) {
+          spec.marker = marker;
+        }
+        return swiftAPI.getObjects(model.container.name, spec)
+          .then(function objects(response) {
+            var folderItems = response.data.items;
+            var collected = recursiveCollect(state, folderItems, tree);
+            if (response.data.has_more && folderItems.length && !state.cancel) {
+              return $q.all([
+                collected,
+                collectFolder(path, tree, folderItems[folderItems.length - 1].path)
+              ]);
+            }
+            return collected;
+          });
+      }
     }
 
     /**
@@ -379,19 +432,43 @@
      * @name ContainersModel.getContainers
      *
      * @param {Object} params Search parameters for filtering
+     * @returns {promise}
      * @description
-     * Gets the model containers filtered by the given query. If query is empty
-     * then it returns all of the containers
+     * Gets the first page of the model containers filtered by the given
+     * query. If query is empty then it returns the first page of all of the
+     * containers
      *
        */
     function getContainers(params) {
-      swiftAPI.getContainers(params).then(function onContainers(data) {
+      containersParams = params || {};
+      return swiftAPI.getContainers(params).then(function onContainers(data) {
         model.containers.length = 0;
         push.apply(model.containers, data.data.items);
+        model.containersHasMore = data.data.has_more;
       }).then(function resolve() {
         model.getContainersDeferred.resolve();
       });
     }
 
+    /**
+     * @ngdoc method
+     * @name ContainersModel.loadMoreContainers
+     * @returns {promise}
+     *
+     * @description
+     * Fetches the next page of the containers, following the containers
+     * loaded so far, with the query of the last getContainers() call.
+     */
+    function loadMoreContainers() {
+      var params = angular.extend({}, containersParams);
+      if (model.containers.length) {
+        params.marker = model.containers[model.containers.length - 1].name;
+      }
+      return swiftAPI.getContainers(params).then(function onContainers(data) {
+        push.apply(model.containers, data.data.items);
+        model.containersHasMore = data.data.has_more;
+      });
+    }
+
   }
 })();
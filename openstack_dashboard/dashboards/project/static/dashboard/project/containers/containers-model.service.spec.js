@@ -47,11 +47,12 @@
       expect(swiftAPI.getContainers).toHaveBeenCalled();
 
       infoDeferred.resolve({info: 'spam'});
-      containersDeferred.resolve({data: {items: ['two', 'items']}});
+      containersDeferred.resolve({data: {items: ['two', 'items'], has_more: true}});
       $rootScope.$apply();
 
       expect(service.swift_info).toEqual('spam');
       expect(service.containers).toEqual(['two', 'items']);
+      expect(service.containersHasMore).toBe(true);
     });
 
     it('should select containers and load contents', function test() {
@@ -94,6 +95,45 @@
       expect(service.pseudo_folder_hierarchy).toEqual(['ham']);
     });
 
+    it('should select containers which are not loaded yet', function test() {
+      var deferred = $q.defer();
+      spyOn(swiftAPI, 'getObjects').and.returnValue(deferred.promise);
+      service.containers = [{name: 'not spam'}];
+
+      service.selectContainer('spam');
+
+      expect(service.container).toEqual({name: 'spam'});
+      expect(swiftAPI.getObjects).toHaveBeenCalledWith('spam', {delimiter: '/'});
+    });
+
+    it('should load the next page of objects', function test() {
+      var deferred = $q.defer();
+      spyOn(swiftAPI, 'getObjects').and.returnValue(deferred.promise);
+      service.containers = [{name: 'spam'}];
+
+      service.selectContainer('spam', 'ham');
+      deferred.resolve({data: {items: [{name: 'two', path: 'ham/two'}], has_more: true}});
+      $rootScope.$apply();
+
+      expect(service.objectsHasMore).toBe(true);
+
+      deferred = $q.defer();
+      swiftAPI.getObjects.and.returnValue(deferred.promise);
+      service.loadMoreObjects();
+
+      expect(swiftAPI.getObjects).toHaveBeenCalledWith(
+        'spam', {path: 'ham/', delimiter: '/', marker: 'ham/two'});
+
+      deferred.resolve({data: {items: [{name: 'items', path: 'ham/items'}], has_more: false}});
+      $rootScope.$apply();
+
+      expect(service.objects).toEqual([
+        { name: 'two', path: 'ham/two', url: '/api/swift/containers/spam/object/ham/two' },
+        { name: 'items', path: 'ham/items', url: '/api/swift/containers/spam/object/ham/items' }
+      ]);
+      expect(service.objectsHasMore).toBe(false);
+    });
+
     it('should fetch container detail', function test() {
       var deferred = $q.defer();
       spyOn(swiftAPI, 'getContainer').and.returnValue(deferred.promise);
@@ -208,6 +248,29 @@
       expect(containers).toEqual(['two', 'items']);
     });
 
+    it('should load the next page of containers', function test() {
+      var deferred = $q.defer();
+      spyOn(swiftAPI, 'getContainers').and.returnValue(deferred.promise);
+
+      service.getContainers({prefix: 'sp'});
+      deferred.resolve({data: {items: [{name: 'spam'}], has_more: true}});
+      $rootScope.$apply();
+
+      expect(service.containersHasMore).toBe(true);
+
+      deferred = $q.defer();
+      swiftAPI.getContainers.and.returnValue(deferred.promise);
+      service.loadMoreContainers();
+
+      expect(swiftAPI.getContainers).toHaveBeenCalledWith({prefix: 'sp', marker: 'spam'});
+
+      deferred.resolve({data: {items: [{name: 'spamalot'}], has_more: false}});
+      $rootScope.$apply();
+
+      expect(service.containers).toEqual([{name: 'spam'}, {name: 'spamalot'}]);
+      expect(service.containersHasMore).toBe(false);
+    });
+
     describe('recursive deletion', function describe() {
       // fake up a basic set of object listings to return from our fake getObjects
       // below
@@ -289,6 +352,42 @@
         expect(result).toEqual(fakeTree);
       });
 
+      it('should collect all the pages of the folders', function test() {
+        swiftAPI.getObjects.and.callFake(function fake(container, spec) {
+          var deferred = $q.defer();
+          var items = fakeSwift[spec.path + '/'];
+          // return the listings one item at a time
+          var index = 0;
+          if (spec.marker) {
+            index = items.map(function path(item) {
+              return item.path;
+            }).indexOf(spec.marker) + 1;
+          }
+          deferred.resolve({data: {
+            items: items.slice(index, index + 1),
+            has_more: index + 1 < items.length
+          }});
+          return deferred.promise;
+        });
+        var state = {
+          counted: {files: 0, folders: 0},
+          cancel: false
+        };
+        var result = [];
+        service.recursiveCollect(
+          state,
+          [{path: 'file0', is_object: true}, {path: 'folder', is_object: false}],
+          result
+        );
+        $rootScope.$apply();
+
+        expect(swiftAPI.getObjects).toHaveBeenCalledWith(
+          'spam', {delimiter: '/', path: 'folder', marker: 'folder/subfolder'});
+        expect(state.counted.files).toEqual(5);
+        expect(state.counted.folders).toEqual(4);
+        expect(result).toEqual(fakeTree);
+      });
+
       it('should stop collection on cancel', function test() {
         var state = {
           counted: {files: 0, folders: 0},
@@ -86,6 +86,8 @@ POLICY_DIRS = {
     'volume': ['cinder_policy.d'],
 }
 POLICY_CHECK_FUNCTION = 'openstack_auth.policy.check'
+NAVIGATION_FINGERPRINT_FUNCTION = \
+    'openstack_dashboard.utils.navigation.get_fingerprint'
 
 SITE_BRANDING = 'OpenStack Dashboard'
 NG_TEMPLATE_CACHE_AGE = 2592000
@@ -203,11 +205,33 @@ FILTER_DATA_FIRST = {
     'identity.users': False,
 }
 
+# Keystone cannot page through users and projects. When timeout is not 0,
+# the Identity users and projects panels list them one page at a time, from
+# an index of the users or projects of the domain sorted by name which each
+# process keeps for timeout seconds. max_entries is the maximum number of
+# indexes kept by each process.
+IDENTITY_LIST_INDEX = {
+    'timeout': 0,
+    'max_entries': 20,
+}
+
 # Set to 'legacy' or 'direct' to allow users to upload images to glance via
 # Horizon server. When enabled, a file form field will appear on the create
 # image form. If set to 'off', there will be no file form field on the create
 # image form. See documentation for deployment considerations.
 HORIZON_IMAGES_UPLOAD_MODE = 'legacy'
+# Uploads of image data in 'legacy' mode are processed by a pool of
+# max_workers threads in each process, and rejected when max_queued uploads
+# are already waiting for a thread. The data is sent to glance in chunks of
+# chunk_size bytes, and the progress of the uploads is kept in the cache
+# cache_alias for status_timeout seconds.
+HORIZON_IMAGES_LEGACY_UPLOAD = {
+    'max_workers': 4,
+    'max_queued': 16,
+    'chunk_size': 64 * 1024,
+    'cache_alias': 'default',
+    'status_timeout': 3600,
+}
 # Allow a location to be set when creating or updating Glance images.
 # If using Glance V2, this value should be False unless the Glance
 # configuration and policies allow setting locations.
@@ -321,6 +345,14 @@ SHOW_OPENSTACK_CLOUDS_YAML = True
 
 # The size of chunk in bytes for downloading objects from Swift
 SWIFT_FILE_TRANSFER_CHUNK_SIZE = 512 * 1024
+# Controls the streaming of the objects uploaded through the REST API to
+# Swift in segments of segment_size bytes, uploaded concurrently.
+SWIFT_SEGMENTED_UPLOAD = {
+    'enabled': False,
+    'segment_size': 32 * 1024 * 1024,
+    'concurrency': 4,
+    'max_workers': 8,
+}
 
 # NOTE: The default value of USER_MENU_LINKS will be set after loading
 # local_settings if it is not configured.
@@ -541,6 +573,40 @@ REST_API_REQUIRED_SETTINGS = [
 # may be deprecated in the future without notice.
 REST_API_ADDITIONAL_SETTINGS = []
 
+# Dotted path to a function used to serialize REST API responses which do
+# not need a custom JSON encoder, for example a faster third-party JSON
+# library. The function is called with the data and must return str or
+# bytes. Responses fall back to the standard serializer when it raises
+# TypeError, ValueError or OverflowError. None means the standard serializer.
+REST_API_JSON_SERIALIZER = None
+
+# Thread pool used to call back-end APIs in parallel, shared by all requests
+# served by a process.
+# max_workers: maximum number of worker threads.
+# max_backlog: maximum number of calls waiting for a free worker. Further
+#   calls are run in the thread serving the request. 0 means no limit.
+# timeout: number of seconds to wait for the calls made for a request to
+#   complete. None means no limit.
+PARALLEL_API_CALLS = {
+    'max_workers': 10,
+    'max_backlog': 50,
+    'timeout': None,
+}
+# Horizon runs functions concurrently, for example to load the data of tab
+# groups with parallel_load, on the same thread pool.
+PARALLEL_SUBMIT_FUNCTION = 'openstack_dashboard.utils.futurist_utils.submit'
+
+# OPENSTACK_CONNECTION_POOL controls the HTTP connections to OpenStack
+# services shared by all requests served by a process.
+# enabled: set True to share the connections.
+# pool_maxsize: maximum number of connections kept open per endpoint.
+# tcp_keepalive: enable TCP keepalive on the connections.
+OPENSTACK_CONNECTION_POOL = {
+    'enabled': False,
+    'pool_maxsize': 10,
+    'tcp_keepalive': True,
+}
+
 # Kubernetes clusters can use Keystone as an external identity provider.
 # Horizon can generate a 'kubeconfig' file from the application credentials
 # control panel which can be used for authenticating with a Kubernetes cluster.
@@ -84,7 +84,9 @@ def check_invalid_settings(dummy=None):
         'FILE_UPLOAD_TEMP_DIR', 'FILTER_DATA_FIRST', 'FIRST_DAY_OF_WEEK',
         'FIXTURE_DIRS', 'FORCE_SCRIPT_NAME', 'FORMAT_MODULE_PATH',
         'FORM_RENDERER', 'HORIZON_COMPRESS_OFFLINE_CONTEXT_BASE',
-        'HORIZON_CONFIG', 'HORIZON_IMAGES_UPLOAD_MODE', 'IGNORABLE_404_URLS',
+        'HORIZON_CONFIG', 'HORIZON_IMAGES_LEGACY_UPLOAD',
+        'HORIZON_IMAGES_UPLOAD_MODE', 'IDENTITY_LIST_INDEX',
+        'IGNORABLE_404_URLS',
         'IMAGES_ALLOW_LOCATION', 'IMAGES_LIST_FILTER_TENANTS',
         'IMAGE_CUSTOM_PROPERTY_TITLES', 'IMAGE_RESERVED_CUSTOM_PROPERTIES',
         'INSTALLED_APPS', 'INSTANCE_LOG_LENGTH', 'INTEGRATION_TESTS_SUPPORT',
@@ -97,12 +99,16 @@ def check_invalid_settings(dummy=None):
         'LOCAL_SETTINGS_DIR_PATH', 'LOGGING', 'LOGGING_CONFIG', 'LOGIN_ERROR',
         'LOGIN_REDIRECT_URL', 'LOGIN_URL', 'LOGOUT_REDIRECT_URL', 'LOGOUT_URL',
         'MANAGERS', 'MEDIA_ROOT', 'MEDIA_URL', 'MEMOIZED_MAX_SIZE_DEFAULT',
+        'MEMOIZED_SHARED_CACHE',
         'MESSAGES_PATH', 'MESSAGE_STORAGE', 'MIDDLEWARE',
         'MIDDLEWARE_CLASSES', 'MIGRATION_MODULES',
-        'MONTH_DAY_FORMAT', 'NG_TEMPLATE_CACHE_AGE', 'NUMBER_GROUPING',
+        'MONTH_DAY_FORMAT', 'NAVIGATION_CACHE',
+        'NAVIGATION_FINGERPRINT_FUNCTION', 'NG_TEMPLATE_CACHE_AGE',
+        'NUMBER_GROUPING',
         'OPENRC_CUSTOM_TEMPLATE', 'OPENSTACK_API_VERSIONS',
         'OPENSTACK_CINDER_FEATURES', 'OPENSTACK_CLOUDS_YAML_CUSTOM_TEMPLATE',
         'OPENSTACK_CLOUDS_YAML_NAME', 'OPENSTACK_CLOUDS_YAML_PROFILE',
+        'OPENSTACK_CONNECTION_POOL',
         'OPENSTACK_ENABLE_PASSWORD_RETRIEVE', 'OPENSTACK_ENDPOINT_TYPE',
         'OPENSTACK_HEAT_STACK', 'OPENSTACK_HOST',
         'OPENSTACK_HYPERVISOR_FEATURES', 'OPENSTACK_IMAGE_BACKEND',
@@ -115,11 +121,14 @@ def check_invalid_settings(dummy=None):
         'OPENSTACK_NEUTRON_NETWORK', 'OPENSTACK_PROFILER',
         'OPENSTACK_SSL_CACERT', 'OPENSTACK_SSL_NO_VERIFY',
         'OPERATION_LOG_ENABLED', 'OPERATION_LOG_OPTIONS',
-        'OVERVIEW_DAYS_RANGE', 'PASSWORD_HASHERS',
-        'PASSWORD_RESET_TIMEOUT_DAYS', 'POLICY_CHECK_FUNCTION', 'POLICY_DIRS',
+        'OVERVIEW_DAYS_RANGE', 'PARALLEL_API_CALLS',
+        'PARALLEL_SUBMIT_FUNCTION', 'PASSWORD_HASHERS',
+        'PASSWORD_RESET_TIMEOUT_DAYS', 'POLICY_CHECK_FUNCTION',
+        'POLICY_DECISION_CACHE', 'POLICY_DIRS',
         'POLICY_FILES', 'POLICY_FILES_PATH', 'PREPEND_WWW',
         'PROJECT_TABLE_EXTRA_INFO', 'REST_API_ADDITIONAL_SETTINGS',
-        'REST_API_REQUIRED_SETTINGS', 'ROOT_PATH', 'ROOT_URLCONF',
+        'REST_API_JSON_SERIALIZER', 'REST_API_REQUIRED_SETTINGS',
+        'ROOT_PATH', 'ROOT_URLCONF',
         'SECONDARY_ENDPOINT_TYPE', 'SECRET_KEY', 'SECURE_BROWSER_XSS_FILTER',
         'SECURE_CONTENT_TYPE_NOSNIFF', 'SECURE_HSTS_INCLUDE_SUBDOMAINS',
         'SECURE_HSTS_PRELOAD', 'SECURE_HSTS_SECONDS',
@@ -137,11 +146,14 @@ def check_invalid_settings(dummy=None):
         'SILENCED_SYSTEM_CHECKS', 'SITE_BRANDING', 'SITE_BRANDING_LINK',
         'STATICFILES_DIRS', 'STATICFILES_FINDERS', 'STATICFILES_STORAGE',
         'STATIC_ROOT', 'STATIC_URL', 'SWIFT_FILE_TRANSFER_CHUNK_SIZE',
+        'SWIFT_SEGMENTED_UPLOAD',
         'TEMPLATES', 'TESTSERVER', 'TEST_GLOBAL_MOCKS_ON_PANELS',
         'TEST_NON_SERIALIZED_APPS', 'TEST_RUNNER', 'THEME_COLLECTION_DIR',
         'THEME_COOKIE_NAME', 'THOUSAND_SEPARATOR', 'TIME_FORMAT',
-        'TIME_INPUT_FORMATS', 'TIME_ZONE', 'TOKEN_TIMEOUT_MARGIN',
-        'USER_MENU_LINKS', 'USER_TABLE_EXTRA_INFO', 'USE_ETAGS', 'USE_I18N',
+        'TIME_INPUT_FORMATS', 'TIME_ZONE', 'TOKEN_CATALOG_CACHE',
+        'TOKEN_TIMEOUT_MARGIN',
+        'USER_CACHE', 'USER_MENU_LINKS', 'USER_TABLE_EXTRA_INFO',
+        'USE_ETAGS', 'USE_I18N',
         'USE_L10N', 'USE_THOUSAND_SEPARATOR', 'USE_TZ', 'USE_X_FORWARDED_HOST',
         'USE_X_FORWARDED_PORT', 'WEBROOT', 'WEBSSO_CHOICES',
         'WEBSSO_DEFAULT_REDIRECT', 'WEBSSO_DEFAULT_REDIRECT_LOGOUT',
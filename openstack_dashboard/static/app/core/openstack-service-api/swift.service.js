@@ -94,6 +94,12 @@
      * @description
      * Get the list of containers for this account
      *
+     * The containers are returned one page at a time: use the params
+     * values "marker" (the name of the last container received) and
+     * "limit" to page through them; "has_more" in the result tells
+     * whether there are more containers. The params value "full_listing"
+     * set to "true" returns all the containers at once.
+     *
      * @returns {Object} An object with 'items' and 'has_more' flag.
      *
      */
@@ -198,6 +204,12 @@
      *
      * Use the params value "path" to specify a folder prefix to limit
      * the fetch to a pseudo-folder.
+     *
+     * The objects are returned one page at a time: use the params
+     * values "marker" (the path of the last object received) and "limit"
+     * to page through them; "has_more" in the result tells whether there
+     * are more objects. The params value "full_listing" set to "true"
+     * returns all the objects at once.
      * @returns {Object} The result of the API call
      *
      */
@@ -222,12 +234,15 @@
      * @description
      * Add or replace a file in the specified container with the given objectName
      * (which may include pseudo-folder path), the mimetype and raw file data.
+     *
+     * The file is sent with a PUT request, so that the dashboard server can
+     * stream it to Swift as it is received.
      * @returns {Object} The result of the API call
      *
      */
     function uploadObject(container, objectName, file) {
-      return apiService.post(
-        service.getObjectURL(container, objectName),
+      return apiService.put(
+        service.getObjectURL(container, objectName, 'upload'),
         {file: file}
       )
         .error(function () {
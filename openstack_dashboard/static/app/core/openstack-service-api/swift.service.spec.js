@@ -117,9 +117,9 @@
       },
       {
         func: 'uploadObject',
-        method: 'post',
+        method: 'put',
         call_args: [
-          '/api/swift/containers/spam/object/ham',
+          '/api/swift/containers/spam/upload/ham',
           {file: 'some junk'}
         ],
         error: 'Unable to upload the object.',
@@ -12,6 +12,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from django.core.files import uploadedfile
 import mock
 
 from openstack_dashboard import api
@@ -56,6 +57,44 @@ class ImagesRestTestCase(test.ResetImageAPIVersionMixin, test.TestCase):
         self.assertEqual(response.json, {"a": "1", "b": "2"})
         self.mock_image_get.assert_called_once_with(request, "1")
 
+    @test.create_mocks({api.glance: ['image_upload_status']})
+    def test_image_upload_status(self):
+        request = self.mock_rest_request()
+        self.mock_image_upload_status.return_value = {'id': '1',
+                                                      'status': 'uploading',
+                                                      'size': 10,
+                                                      'uploaded': 4}
+
+        response = glance.ImageUpload().get(request, "1")
+        self.assertStatusCode(response, 200)
+        self.assertEqual(response.json, {'id': '1', 'status': 'uploading',
+                                         'size': 10, 'uploaded': 4})
+        self.mock_image_upload_status.assert_called_once_with(request, "1")
+
+    @test.create_mocks({api.glance: ['image_upload_status']})
+    def test_image_upload_status_unknown(self):
+        request = self.mock_rest_request()
+        self.mock_image_upload_status.return_value = None
+
+        response = glance.ImageUpload().get(request, "1")
+        self.assertStatusCode(response, 404)
+
+    @test.create_mocks({api.glance: ['image_create', 'VERSIONS']})
+    def test_image_create_legacy_upload_rejected(self):
+        upload_file = uploadedfile.SimpleUploadedFile('image.iso', b'data')
+        request = self.mock_rest_request(
+            POST={'name': 'Test', 'disk_format': 'raw'},
+            FILES={'data': upload_file})
+        self.mock_image_create.side_effect = \
+            api.glance.ImageUploadRejected('Too many uploads')
+
+        response = glance.Images().post(request)
+        self.assertStatusCode(response, 503)
+        self.mock_image_create.assert_called_once_with(
+            request, name='Test', disk_format='raw', data=upload_file,
+            container_format='bare', min_disk=0, min_ram=0, protected=False,
+            visibility='private')
+
     @test.create_mocks({api.glance: ['image_update_properties']})
     def test_image_edit_metadata(self):
         request = self.mock_rest_request(
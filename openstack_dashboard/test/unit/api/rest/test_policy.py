@@ -68,6 +68,33 @@ class PolicyRestTestCase(test.TestCase):
             {"rules": [["compute", "non-existing"]]})
         self._test_policy(body, expected=True)
 
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    def test_policy_batch(self):
+        body = json.dumps(
+            {"checks": {
+                "index": {"rules": [["compute",
+                                     "os_compute_api:servers:index"]]},
+                "all_tenants": {
+                    "rules": [["compute",
+                               "os_compute_api:servers:index:"
+                               "get_all_tenants"]],
+                    "target": {"project_id": "1"}},
+                "empty": {"rules": []}}})
+        request = self.mock_rest_request(body=body)
+        response = policy.Policy().post(request)
+        self.assertStatusCode(response, 200)
+        self.assertEqual({"allowed": {"index": True,
+                                      "all_tenants": False,
+                                      "empty": True}},
+                         response.json)
+
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    def test_policy_batch_error(self):
+        request = self.mock_rest_request(
+            body=json.dumps({"checks": {"index": {"bad": "compute"}}}))
+        response = policy.Policy().post(request)
+        self.assertStatusCode(response, 400)
+
     @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
     def test_policy_error(self):
         request = self.mock_rest_request(
@@ -11,12 +11,19 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from django.conf import settings
+from django.core.files import uploadedfile
+from django.test import client
+from django.test.utils import override_settings
 import mock
 
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import swift
 from openstack_dashboard.test import helpers as test
 
+SEGMENTED_UPLOAD = {'enabled': True, 'segment_size': 4, 'concurrency': 2}
+CSRF_TOKEN = 'a' * 64
+
 
 class SwiftRestTestCase(test.TestCase):
 
@@ -47,7 +54,37 @@ class SwiftRestTestCase(test.TestCase):
         self.assertEqual(u'container one%\u6346',
                          response.json['items'][0]['name'])
         self.assertFalse(response.json['has_more'])
-        self.mock_swift_get_containers.assert_called_once_with(request)
+        self.mock_swift_get_containers.assert_called_once_with(
+            request, marker=None, prefix=None,
+            limit=settings.API_RESULT_LIMIT, full_listing=False)
+
+    @test.create_mocks({api.swift: ['swift_get_containers']})
+    def test_containers_get_page(self):
+        request = self.mock_rest_request(GET={'prefix': 'container',
+                                              'marker': 'container one',
+                                              'limit': '1'})
+        self.mock_swift_get_containers.return_value = (
+            self.containers.list()[1:2], True)
+        response = swift.Containers().get(request)
+        self.assertStatusCode(response, 200)
+        self.assertEqual(1, len(response.json['items']))
+        self.assertTrue(response.json['has_more'])
+        self.mock_swift_get_containers.assert_called_once_with(
+            request, marker='container one', prefix='container', limit=1,
+            full_listing=False)
+
+    @test.create_mocks({api.swift: ['swift_get_containers']})
+    def test_containers_get_full_listing(self):
+        request = self.mock_rest_request(GET={'full_listing': 'true'})
+        self.mock_swift_get_containers.return_value = (self.containers.list(),
+                                                       False)
+        response = swift.Containers().get(request)
+        self.assertStatusCode(response, 200)
+        self.assertEqual(len(self.containers.list()),
+                         len(response.json['items']))
+        self.mock_swift_get_containers.assert_called_once_with(
+            request, marker=None, prefix=None,
+            limit=settings.API_RESULT_LIMIT, full_listing=True)
 
     @test.create_mocks({api.swift: ['swift_get_container']})
     def test_container_get(self):
@@ -132,10 +169,57 @@ class SwiftRestTestCase(test.TestCase):
         self.assertFalse(response.json['items'][4]['is_object'])
         self.assertTrue(response.json['items'][4]['is_subdir'])
 
+        self.assertFalse(response.json['has_more'])
+        self.mock_swift_get_objects.assert_called_once_with(
+            request,
+            u'container one%\u6346',
+            prefix=None,
+            marker=None,
+            limit=settings.API_RESULT_LIMIT,
+            full_listing=False)
+
+    @test.create_mocks({api.swift: ['swift_get_objects']})
+    def test_objects_get_page(self):
+        request = self.mock_rest_request(GET={'marker': 'test.txt',
+                                              'limit': '2'})
+        self.mock_swift_get_objects.return_value = (
+            self.objects.list()[:2], True)
+        response = swift.Objects().get(request, u'container one%\u6346')
+        self.assertStatusCode(response, 200)
+        self.assertEqual(2, len(response.json['items']))
+        self.assertTrue(response.json['has_more'])
+        self.mock_swift_get_objects.assert_called_once_with(
+            request,
+            u'container one%\u6346',
+            prefix=None,
+            marker='test.txt',
+            limit=2,
+            full_listing=False)
+
+    @test.create_mocks({api.swift: ['swift_get_objects']})
+    def test_objects_get_full_listing(self):
+        request = self.mock_rest_request(GET={'full_listing': 'true'})
+        self.mock_swift_get_objects.return_value = (self.objects.list(),
+                                                    False)
+        response = swift.Objects().get(request, u'container one%\u6346')
+        self.assertStatusCode(response, 200)
+        self.assertEqual(len(self.objects.list()),
+                         len(response.json['items']))
+        self.assertFalse(response.json['has_more'])
         self.mock_swift_get_objects.assert_called_once_with(
             request,
             u'container one%\u6346',
-            prefix=None)
+            prefix=None,
+            marker=None,
+            limit=settings.API_RESULT_LIMIT,
+            full_listing=True)
+
+    @test.create_mocks({api.swift: ['swift_get_objects']})
+    def test_objects_get_invalid_limit(self):
+        request = self.mock_rest_request(GET={'limit': 'ten'})
+        response = swift.Objects().get(request, u'container one%\u6346')
+        self.assertStatusCode(response, 400)
+        self.mock_swift_get_objects.assert_not_called()
 
     @test.create_mocks({api.swift: ['swift_get_objects']})
     def test_container_get_path_folder(self):
@@ -149,7 +233,8 @@ class SwiftRestTestCase(test.TestCase):
         self.assertFalse(response.json['items'][0]['is_subdir'])
         self.mock_swift_get_objects.assert_called_once_with(
             request,
-            u'container one%\u6346', prefix=u'test folder%\u6346/'
+            u'container one%\u6346', prefix=u'test folder%\u6346/',
+            marker=None, limit=settings.API_RESULT_LIMIT, full_listing=False
         )
 
     @test.create_mocks({api.swift: ['swift_get_object']})
@@ -197,6 +282,108 @@ class SwiftRestTestCase(test.TestCase):
         self.mock_swift_upload_object.assert_called_once_with(
             request, 'spam', u'test_object%\u6346', _file)
 
+    def _put_object_file(self, object_name='eggs', csrf_token=CSRF_TOKEN):
+        # The request goes through the middlewares, with the CSRF checks
+        # enforced, but not through the test client which cannot set the
+        # json attribute of the REST API responses.
+        factory = client.RequestFactory()
+        factory.cookies = self.client.cookies
+        factory.cookies[settings.CSRF_COOKIE_NAME] = CSRF_TOKEN
+        data = client.encode_multipart(client.BOUNDARY, {
+            'file': uploadedfile.SimpleUploadedFile('eggs.txt',
+                                                    b'0123456789')})
+        request = factory.put(
+            '/api/swift/containers/spam/upload/%s' % object_name, data,
+            content_type=client.MULTIPART_CONTENT,
+            HTTP_X_CSRFTOKEN=csrf_token)
+        return client.ClientHandler(enforce_csrf_checks=True)(
+            request.environ)
+
+    @test.create_mocks({api.swift: ['swift_upload_object',
+                                    'SegmentedUpload']})
+    def test_object_upload(self):
+        self.mock_swift_upload_object.return_value = self.objects.first()
+
+        response = self._put_object_file()
+
+        self.assertStatusCode(response, 201)
+        self.mock_swift_upload_object.assert_called_once_with(
+            test.IsHttpRequest(), 'spam', 'eggs', test.IsA(
+                uploadedfile.InMemoryUploadedFile))
+        uploaded = self.mock_swift_upload_object.call_args[0][3]
+        self.assertEqual('eggs.txt', uploaded.name)
+        self.mock_SegmentedUpload.assert_not_called()
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=SEGMENTED_UPLOAD)
+    @test.create_mocks({api.swift: ['swift_upload_object',
+                                    'SegmentedUpload']})
+    def test_object_upload_streamed(self):
+        upload = self.mock_SegmentedUpload.return_value
+        upload.close.return_value = self.objects.first()
+
+        response = self._put_object_file()
+
+        self.assertStatusCode(response, 201)
+        self.mock_SegmentedUpload.assert_called_once_with(
+            test.IsHttpRequest(), 'spam', 'eggs',
+            headers={'X-Object-Meta-Orig-Filename': 'eggs.txt'})
+        self.assertEqual(b'0123456789', b''.join(
+            c[0][0] for c in upload.write.call_args_list))
+        upload.close.assert_called_once_with()
+        upload.abort.assert_not_called()
+        self.mock_swift_upload_object.assert_not_called()
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=SEGMENTED_UPLOAD)
+    @test.create_mocks({api.swift: ['swift_upload_object',
+                                    'SegmentedUpload']})
+    def test_object_upload_csrf_rejected(self):
+        response = self._put_object_file(csrf_token='a' * 32 + 'b' * 32)
+
+        # The request is rejected by CsrfViewMiddleware before the file is
+        # sent to Swift.
+        self.assertStatusCode(response, 403)
+        self.mock_SegmentedUpload.assert_not_called()
+        self.mock_swift_upload_object.assert_not_called()
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=SEGMENTED_UPLOAD)
+    @test.create_mocks({api.swift: ['swift_upload_object',
+                                    'SegmentedUpload']})
+    def test_object_upload_folder(self):
+        response = self._put_object_file(object_name='eggs/')
+
+        self.assertStatusCode(response, 400)
+        self.mock_SegmentedUpload.assert_not_called()
+        self.mock_swift_upload_object.assert_not_called()
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=SEGMENTED_UPLOAD)
+    @test.create_mocks({api.swift: ['SegmentedUpload']})
+    def test_upload_handler_interrupted(self):
+        upload = self.mock_SegmentedUpload.return_value
+        handler = swift.SwiftUploadHandler(self.mock_rest_request(),
+                                           'spam', 'eggs')
+        handler.new_file('file', 'eggs.txt', 'text/plain', 10)
+        handler.receive_data_chunk(b'01234', 0)
+
+        handler.upload_interrupted()
+
+        upload.abort.assert_called_once_with()
+        upload.close.assert_not_called()
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=SEGMENTED_UPLOAD)
+    @test.create_mocks({api.swift: ['SegmentedUpload']})
+    def test_upload_handler_completed(self):
+        upload = self.mock_SegmentedUpload.return_value
+        handler = swift.SwiftUploadHandler(self.mock_rest_request(),
+                                           'spam', 'eggs')
+        handler.new_file('file', 'eggs.txt', 'text/plain', 10)
+        handler.receive_data_chunk(b'0123456789', 0)
+        handler.file_complete(10)
+
+        handler.upload_interrupted()
+
+        upload.close.assert_called_once_with()
+        upload.abort.assert_not_called()
+
     @test.create_mocks({api.swift: ['swift_create_pseudo_folder'],
                         swift: ['UploadObjectForm']})
     def test_folder_create(self):
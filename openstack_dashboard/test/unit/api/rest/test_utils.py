@@ -11,6 +11,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
+
+from django.test.utils import override_settings
+import mock
+
 from openstack_dashboard.api.rest import json_encoder
 from openstack_dashboard.api.rest import utils
 from openstack_dashboard.test import helpers as test
@@ -164,6 +169,68 @@ class RestUtilsTestCase(test.TestCase):
         self.assertDictEqual({}, output_filters)
 
 
+class JSONStreamingResponseTestCase(test.TestCase):
+
+    def test_api_streaming(self):
+        @utils.ajax(streaming=True)
+        def f(self, request):
+            return {'items': ({'id': i} for i in range(3)),
+                    'has_more_data': False}
+        request = self.mock_rest_request()
+        response = f(None, request)
+        self.assertStatusCode(response, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual('application/json', response['content-type'])
+        self.assertEqual({'items': [{'id': 0}, {'id': 1}, {'id': 2}],
+                          'has_more_data': False}, response.json)
+
+    def test_api_streaming_204(self):
+        @utils.ajax(streaming=True)
+        def f(self, request):
+            pass
+        request = self.mock_rest_request()
+        response = f(None, request)
+        self.assertStatusCode(response, 204)
+        self.assertFalse(response.streaming)
+
+    def test_api_streaming_error(self):
+        @utils.ajax(streaming=True)
+        def f(self, request):
+            raise utils.AjaxError(404, 'b0rk')
+        request = self.mock_rest_request()
+        response = f(None, request)
+        self.assertStatusCode(response, 404)
+        self.assertEqual("b0rk", response.json)
+
+    def test_streaming_matches_json_response(self):
+        data = {'items': [{'id': 'one', 'size': 1.5}, {'id': 'two'}],
+                'empty': [], 'name': 'test', 'tuple': (1, 2)}
+        self.assertEqual(utils.JSONResponse(data).json,
+                         utils.JSONStreamingResponse(data).json)
+        self.assertEqual(utils.JSONResponse([1, 2]).json,
+                         utils.JSONStreamingResponse([1, 2]).json)
+        self.assertEqual(utils.JSONResponse('text').json,
+                         utils.JSONStreamingResponse('text').json)
+
+    def test_streaming_custom_encoder(self):
+        response = utils.JSONStreamingResponse(
+            {'items': [float('inf')]},
+            json_encoder=json_encoder.NaNJSONEncoder)
+        self.assertEqual(b'{"items": [1e+999]}',
+                         b''.join(response.streaming_content))
+
+    def test_streaming_chunks(self):
+        class SmallChunkResponse(utils.JSONStreamingResponse):
+            chunk_size = 100
+
+        data = {'items': [{'id': 'server-%d' % i} for i in range(100)]}
+        chunks = list(SmallChunkResponse(data).streaming_content)
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks[:-1]:
+            self.assertLess(len(chunk), 200)
+        self.assertEqual(data, json.loads(b''.join(chunks)))
+
+
 class JSONEncoderTestCase(test.TestCase):
 
     # NOTE(tsufiev): NaN numeric is "conventional" in a sense that the custom
@@ -241,3 +308,84 @@ class JSONEncoderTestCase(test.TestCase):
 
         self.assertNotEqual(default_encoder_response.content,
                             custom_encoder_response.content)
+
+    def test_custom_encoder_on_nested_specials(self):
+        data = {'limits': [1.5, self.data_nan,
+                           {'max': self.data_inf, 'min': self.data_neginf}],
+                'name': 'Infinity'}
+        content = json.dumps(data, cls=json_encoder.NaNJSONEncoder)
+        self.assertEqual('{"limits": [1.5, NaN, {"max": 1e+999, '
+                         '"min": -1e+999}], "name": "Infinity"}', content)
+
+    def test_custom_encoder_c_and_python_paths_are_identical(self):
+        class PythonNaNJSONEncoder(json_encoder.NaNJSONEncoder):
+            use_c_encoder = False
+
+        for data in (self.conventional_data,
+                     {'key': 'string', 'key2': [self.data_inf]},
+                     ['1e+999', "quoted \"NaN\"", None, True]):
+            self.assertEqual(
+                json.dumps(data, cls=PythonNaNJSONEncoder),
+                json.dumps(data, cls=json_encoder.NaNJSONEncoder))
+
+    def test_custom_encoder_circular_reference(self):
+        data = []
+        data.append(data)
+        self.assertRaises(ValueError, json.dumps, data,
+                          cls=json_encoder.NaNJSONEncoder)
+
+    def test_custom_encoder_uses_c_encoder(self):
+        # A server list payload has no NaN or infinity values, so it is
+        # handled by the C encoder without falling back to the pure Python
+        # one.
+        server = {'id': 'server-id', 'name': 'server', 'status': 'ACTIVE',
+                  'addresses': {'private': [{'addr': '10.0.0.1',
+                                             'version': 4}]},
+                  'flavor': {'id': '1'}, 'metadata': {}, 'progress': 0.5}
+        data = {'items': [dict(server, id='server-%d' % i)
+                          for i in range(100)]}
+
+        with mock.patch.object(
+                json_encoder.NaNJSONEncoder, 'iterencode', autospec=True,
+                side_effect=json_encoder.NaNJSONEncoder.iterencode) \
+                as python_iterencode:
+            content = json.dumps(data, cls=json_encoder.NaNJSONEncoder)
+            self.assertEqual(json.dumps(data), content)
+            python_iterencode.assert_not_called()
+
+            content = json.dumps({'key': [self.data_inf]},
+                                 cls=json_encoder.NaNJSONEncoder)
+            self.assertEqual('{"key": [1e+999]}', content)
+            self.assertEqual(1, python_iterencode.call_count)
+
+
+def fake_serializer(data):
+    if data == 'unsupported':
+        raise TypeError('unsupported data')
+    return 'fake:%s' % data
+
+
+class JSONSerializerTestCase(test.TestCase):
+
+    @override_settings(REST_API_JSON_SERIALIZER=None)
+    def test_default_serializer(self):
+        self.assertEqual('"data"', utils.json_dumps('data'))
+
+    @override_settings(REST_API_JSON_SERIALIZER=__name__ + '.fake_serializer',
+                       DEBUG=False)
+    def test_custom_serializer(self):
+        response = utils.JSONResponse('data')
+        self.assertEqual(b'fake:data', response.content)
+
+    @override_settings(REST_API_JSON_SERIALIZER=__name__ + '.fake_serializer',
+                       DEBUG=False)
+    def test_custom_serializer_fallback(self):
+        self.assertEqual('"unsupported"', utils.json_dumps('unsupported'))
+
+    @override_settings(REST_API_JSON_SERIALIZER=__name__ + '.fake_serializer',
+                       DEBUG=False)
+    def test_custom_serializer_not_used_with_custom_encoder(self):
+        self.assertEqual(
+            '1e+999',
+            utils.json_dumps(float('inf'),
+                             json_encoder=json_encoder.NaNJSONEncoder))
@@ -19,6 +19,7 @@
 from __future__ import absolute_import
 
 from django.conf import settings
+import mock
 
 from horizon import exceptions
 
@@ -321,6 +322,60 @@ class ApiHelperTests(test.APITestCase):
         with self.assertRaises(exceptions.ServiceCatalogException):
             url = api_base.url_for(self.request, 'image')
 
+    def test_service_catalog_index_per_catalog(self):
+        with mock.patch.object(api_base, 'ServiceCatalogIndex',
+                               wraps=api_base.ServiceCatalogIndex) as index:
+            api_base.url_for(self.request, 'compute')
+            api_base.url_for(self.request, 'image')
+            self.assertTrue(api_base.is_service_enabled(self.request,
+                                                        'volumev3'))
+            self.assertEqual(1, index.call_count)
+
+            # The index is built again for a new service catalog.
+            self.request.user.service_catalog = [
+                service for service in self.request.user.service_catalog
+                if service['type'] != 'compute']
+            self.assertFalse(api_base.is_service_enabled(self.request,
+                                                         'compute'))
+            with self.assertRaises(exceptions.ServiceCatalogException):
+                api_base.url_for(self.request, 'compute')
+            self.assertEqual(2, index.call_count)
+
+    def test_service_catalog_index_walks_catalog_once(self):
+        # Every URL of a catalog with 40 services in 10 regions is resolved
+        # with the index built by a single walk of the catalog.
+        regions = ['Region%d' % i for i in range(10)]
+        catalog = [
+            {'type': 'service%d' % i, 'name': 'service%d' % i,
+             'endpoints': [
+                 {'region': region, 'region_id': region,
+                  'interface': interface,
+                  'url': 'http://%s.service%d.%s.example.com' % (
+                      interface, i, region)}
+                 for region in regions
+                 for interface in ('admin', 'internal', 'public')]}
+            for i in range(40)]
+        lookups = [(service['type'], region, endpoint_type)
+                   for service in catalog
+                   for region in regions
+                   for endpoint_type in api_base.ENDPOINT_TYPE_TO_INTERFACE]
+        walk_urls = [api_base.get_url_for_service(
+            api_base.get_service_from_catalog(catalog, service_type),
+            region, endpoint_type)
+            for service_type, region, endpoint_type in lookups]
+        self.request.user.service_catalog = catalog
+
+        with mock.patch.object(api_base, '_get_endpoint_region',
+                               wraps=api_base._get_endpoint_region) as walk:
+            urls = [api_base.url_for(self.request, service_type,
+                                     endpoint_type=endpoint_type,
+                                     region=region)
+                    for service_type, region, endpoint_type in lookups]
+
+        self.assertEqual(walk_urls, urls)
+        # Each endpoint is only looked at once, to build the index.
+        self.assertEqual(40 * 10 * 3, walk.call_count)
+
 
 class QuotaSetTests(test.TestCase):
 
@@ -16,13 +16,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+import threading
+
 from django.conf import settings
+from django.core.files import uploadedfile
 from django.test.utils import override_settings
+import futurist
 import mock
 
+from horizon.utils import memoized
 from openstack_dashboard import api
 from openstack_dashboard.api import base
 from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import futurist_utils
+
+BOUNDED_LEGACY_UPLOAD = {'max_workers': 1, 'max_queued': 1}
 
 
 class GlanceApiTests(test.APIMockTestCase):
@@ -63,6 +72,90 @@ class GlanceApiTests(test.APIMockTestCase):
                                                        instances_img_ids)
         self.assertEqual(images, expected_images)
 
+    def _fake_image_list_detailed(self, request, filters=None):
+        ids = filters['id'][len('in:'):].split(',')
+        return ([image for image in self.images.list() if image.id in ids],
+                False, False)
+
+    @mock.patch.object(api.glance, 'MAX_IMGAGES_PER_REQUEST', 2)
+    @mock.patch.object(futurist_utils, 'call_functions_parallel',
+                       wraps=futurist_utils.call_functions_parallel)
+    @mock.patch.object(api.glance, 'image_list_detailed')
+    def test_image_list_detailed_by_ids_chunks_in_parallel(
+            self, mock_image_list, mock_parallel):
+        mock_image_list.side_effect = self._fake_image_list_detailed
+        ids = [image.id for image in self.images.list()][:5]
+
+        images = api.glance.image_list_detailed_by_ids(self.request,
+                                                       ids + ids[:2])
+
+        self.assertCountEqual(ids, [image.id for image in images])
+        self.assertEqual(1, mock_parallel.call_count)
+        mock_image_list.assert_has_calls([
+            mock.call(self.request, filters={'id': 'in:' + ','.join(chunk)})
+            for chunk in (ids[:2], ids[2:4], ids[4:])], any_order=True)
+        self.assertEqual(3, mock_image_list.call_count)
+
+    @mock.patch.object(api.glance, 'image_list_detailed')
+    def test_image_list_detailed_by_ids_community(self, mock_image_list):
+        def fake_image_list_detailed(request, filters=None):
+            ids = filters['id'][len('in:'):].split(',')
+            # Community images are only listed when explicitly requested.
+            visibility = filters.get('visibility')
+            return ([image for image in self.images.list()
+                     if image.id in ids and
+                     (image.visibility == 'community') ==
+                     (visibility == 'community')],
+                    False, False)
+
+        mock_image_list.side_effect = fake_image_list_detailed
+        community_ids = [image.id for image in self.images.list()
+                         if image.visibility == 'community']
+        other_ids = [image.id for image in self.images.list()
+                     if image.visibility != 'community'][:2]
+        self.assertTrue(community_ids)
+
+        images = api.glance.image_list_detailed_by_ids(
+            self.request, other_ids + community_ids)
+
+        self.assertCountEqual(other_ids + community_ids,
+                              [image.id for image in images])
+        mock_image_list.assert_has_calls([
+            mock.call(self.request, filters={
+                'id': 'in:' + ','.join(other_ids + community_ids)}),
+            mock.call(self.request, filters={
+                'id': 'in:' + ','.join(community_ids),
+                'visibility': 'community'}),
+        ])
+        self.assertEqual(2, mock_image_list.call_count)
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api.glance, 'glanceclient')
+    @mock.patch.object(api.glance, 'image_list_detailed')
+    def test_image_list_detailed_by_ids_cached(self, mock_image_list,
+                                               mock_glanceclient):
+        memoized._get_shared_cache().clear()
+        mock_image_list.side_effect = self._fake_image_list_detailed
+        ids = [image.id for image in self.images.list()][:3]
+
+        api.glance.image_list_detailed_by_ids(self.request, ids[:2])
+        images = api.glance.image_list_detailed_by_ids(self.request, ids)
+
+        # Only the image which is not cached is retrieved again.
+        self.assertCountEqual(ids, [image.id for image in images])
+        self.assertEqual(self.images.get(id=ids[0]).name,
+                         [image for image in images
+                          if image.id == ids[0]][0].name)
+        mock_image_list.assert_called_with(
+            self.request, filters={'id': 'in:' + ids[2]})
+        self.assertEqual(2, mock_image_list.call_count)
+
+        # Updating an image invalidates the cache.
+        api.glance.image_update(self.request, ids[0], name='new name')
+        api.glance.image_list_detailed_by_ids(self.request, ids)
+        mock_image_list.assert_called_with(
+            self.request, filters={'id': 'in:' + ','.join(ids)})
+
     @override_settings(API_RESULT_PAGE_SIZE=2)
     @mock.patch.object(api.glance, 'glanceclient')
     def test_image_list_detailed_no_pagination(self, mock_glanceclient):
@@ -397,6 +490,110 @@ class GlanceApiTests(test.APIMockTestCase):
     def test_image_create_v2_external_upload(self):
         self._test_image_create_external_upload()
 
+    def _create_uploaded_file(self, data):
+        upload_file = uploadedfile.TemporaryUploadedFile(
+            'image.iso', 'application/octet-stream', len(data), None)
+        upload_file.write(data)
+        upload_file.seek(0)
+        return upload_file
+
+    @override_settings(HORIZON_IMAGES_LEGACY_UPLOAD={'chunk_size': 4})
+    @mock.patch.object(api.glance, '_get_upload_executor')
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_legacy_upload(self, mock_glanceclient,
+                                        mock_get_upload_executor):
+        image = self.images.first()
+        mock_get_upload_executor.return_value = futurist.SynchronousExecutor()
+        glanceclient = mock_glanceclient.return_value
+        glanceclient.images.create.return_value = image
+        chunks = []
+
+        def upload(image_id, data):
+            # The size requested is honoured, and chunk_size is read when
+            # there is none.
+            chunks.append(data.read(3))
+            chunks.extend(iter(data.read, b''))
+        glanceclient.images.upload.side_effect = upload
+        upload_file = self._create_uploaded_file(b'0123456789')
+        filename = upload_file.temporary_file_path()
+
+        api.glance.image_create(self.request, name=image.name,
+                                data=upload_file)
+
+        glanceclient.images.upload.assert_called_once_with(image.id,
+                                                           mock.ANY)
+        self.assertEqual([b'012', b'3456', b'789'], chunks)
+        self.assertFalse(os.path.exists(filename))
+        self.assertEqual(
+            {'id': image.id, 'name': image.name,
+             'project_id': self.request.user.project_id,
+             'status': 'finished', 'size': 10, 'uploaded': 10,
+             'error': None},
+            api.glance.image_upload_status(self.request, image.id))
+
+    @mock.patch.object(api.glance, '_get_upload_executor')
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_legacy_upload_failed(self, mock_glanceclient,
+                                               mock_get_upload_executor):
+        image = self.images.first()
+        mock_get_upload_executor.return_value = futurist.SynchronousExecutor()
+        glanceclient = mock_glanceclient.return_value
+        glanceclient.images.create.return_value = image
+        glanceclient.images.upload.side_effect = self.exceptions.glance
+        upload_file = self._create_uploaded_file(b'0123456789')
+        filename = upload_file.temporary_file_path()
+
+        api.glance.image_create(self.request, name=image.name,
+                                data=upload_file)
+
+        self.assertFalse(os.path.exists(filename))
+        status = api.glance.image_upload_status(self.request, image.id)
+        self.assertEqual('failed', status['status'])
+        self.assertEqual(str(self.exceptions.glance), status['error'])
+
+    @mock.patch.object(api.glance, '_get_upload_executor')
+    @mock.patch.object(api.glance, 'glanceclient')
+    def test_image_create_legacy_upload_rejected(self, mock_glanceclient,
+                                                 mock_get_upload_executor):
+        image = self.images.first()
+        executor = mock_get_upload_executor.return_value
+        executor.submit.side_effect = futurist.RejectedSubmission
+        glanceclient = mock_glanceclient.return_value
+        glanceclient.images.create.return_value = image
+        upload_file = self._create_uploaded_file(b'0123456789')
+        filename = upload_file.temporary_file_path()
+
+        self.assertRaises(api.glance.ImageUploadRejected,
+                          api.glance.image_create, self.request,
+                          name=image.name, data=upload_file)
+
+        glanceclient.images.delete.assert_called_once_with(image.id)
+        glanceclient.images.upload.assert_not_called()
+        self.assertFalse(os.path.exists(filename))
+        self.assertIsNone(api.glance.image_upload_status(self.request,
+                                                         image.id))
+
+    @override_settings(HORIZON_IMAGES_LEGACY_UPLOAD=BOUNDED_LEGACY_UPLOAD)
+    def test_upload_executor_bounded(self):
+        api.glance._upload_executor = None
+        self.addCleanup(setattr, api.glance, '_upload_executor', None)
+        executor = api.glance._get_upload_executor()
+        self.addCleanup(executor.shutdown)
+        self.assertIs(executor, api.glance._get_upload_executor())
+        started = threading.Event()
+        finish = threading.Event()
+        self.addCleanup(finish.set)
+
+        def upload():
+            started.set()
+            finish.wait(10)
+        executor.submit(upload)
+        started.wait(10)
+        # One upload is being processed and one can wait for it.
+        executor.submit(upload)
+        self.assertRaises(futurist.RejectedSubmission,
+                          executor.submit, upload)
+
     def test_create_image_metadata_docker_v2(self):
         form_data = {
             'name': u'Docker image',
@@ -18,8 +18,10 @@
 
 from __future__ import absolute_import
 
+from django.test.utils import override_settings
 import mock
 
+from horizon.utils import memoized
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -113,3 +115,183 @@ class APIVersionTests(test.APIMockTestCase):
         keystoneclient.session.get_endpoint_data.assert_called_once_with(
             service_type='identity')
         self.assertEqual((3, 10), api_version)
+
+
+class ResolveNamesTests(test.APIMockTestCase):
+    def _fake_tenant_get(self, request, project, admin=True):
+        return self.tenants.get(id=project)
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api.keystone, 'tenant_get')
+    def test_resolve_names(self, mock_tenant_get):
+        memoized._get_shared_cache().clear()
+        mock_tenant_get.side_effect = self._fake_tenant_get
+        tenants = self.tenants.list()[:2]
+        ids = [t.id for t in tenants]
+
+        names = api.keystone.resolve_names(self.request, ids + ids + [None])
+
+        self.assertEqual(dict((t.id, t.name) for t in tenants), names)
+        mock_tenant_get.assert_has_calls(
+            [mock.call(self.request, i) for i in ids], any_order=True)
+        self.assertEqual(2, mock_tenant_get.call_count)
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api.keystone, 'domain_get')
+    def test_resolve_names_not_found(self, mock_domain_get):
+        memoized._get_shared_cache().clear()
+        mock_domain_get.side_effect = self.exceptions.keystone
+
+        names = api.keystone.resolve_names(self.request, ['unknown'],
+                                           kind='domain')
+
+        self.assertEqual({'unknown': None}, names)
+        mock_domain_get.assert_called_once_with(self.request, 'unknown')
+
+    @mock.patch.object(api.keystone, 'tenant_list')
+    @mock.patch.object(api.keystone, 'tenant_get')
+    def test_resolve_names_shared_cache_disabled(self, mock_tenant_get,
+                                                 mock_tenant_list):
+        mock_tenant_list.return_value = (self.tenants.list(), False)
+        tenants = self.tenants.list()[:2]
+        ids = [t.id for t in tenants]
+
+        names = api.keystone.resolve_names(self.request, ids + ['unknown'])
+
+        # The projects are listed once rather than retrieved one by one.
+        expected = dict((t.id, t.name) for t in tenants)
+        expected['unknown'] = None
+        self.assertEqual(expected, names)
+        mock_tenant_list.assert_called_once_with(self.request)
+        mock_tenant_get.assert_not_called()
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api.keystone, '_NAMES_LIST_THRESHOLD', 1)
+    @mock.patch.object(api.keystone, 'tenant_list')
+    @mock.patch.object(api.keystone, 'tenant_get')
+    def test_resolve_names_many(self, mock_tenant_get, mock_tenant_list):
+        memoized._get_shared_cache().clear()
+        mock_tenant_list.return_value = (self.tenants.list(), False)
+        tenants = self.tenants.list()[:2]
+        ids = [t.id for t in tenants]
+
+        names = api.keystone.resolve_names(self.request, ids)
+
+        self.assertEqual(dict((t.id, t.name) for t in tenants), names)
+        mock_tenant_list.assert_called_once_with(self.request)
+        mock_tenant_get.assert_not_called()
+
+        # The names listed are cached.
+        api.keystone.resolve_names(self.request, ids)
+        mock_tenant_list.assert_called_once_with(self.request)
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    @mock.patch.object(api.keystone, 'tenant_get')
+    def test_resolve_names_cached(self, mock_tenant_get,
+                                  mock_keystoneclient):
+        memoized._get_shared_cache().clear()
+        mock_tenant_get.side_effect = self._fake_tenant_get
+        tenants = self.tenants.list()[:3]
+        ids = [t.id for t in tenants]
+
+        api.keystone.resolve_names(self.request, ids[:2])
+        names = api.keystone.resolve_names(self.request, ids)
+
+        # Only the project which is not cached is retrieved again.
+        self.assertEqual(dict((t.id, t.name) for t in tenants), names)
+        mock_tenant_get.assert_called_with(self.request, ids[2])
+        self.assertEqual(3, mock_tenant_get.call_count)
+
+        # Renaming a project invalidates the cache.
+        api.keystone.tenant_update(self.request, ids[0], name='new name')
+        api.keystone.resolve_names(self.request, ids)
+        self.assertEqual(6, mock_tenant_get.call_count)
+
+
+@override_settings(IDENTITY_LIST_INDEX={'timeout': 60, 'max_entries': 2},
+                   API_RESULT_PAGE_SIZE=2)
+class ListIndexTests(test.APIMockTestCase):
+    def setUp(self):
+        super(ListIndexTests, self).setUp()
+        api.keystone._LIST_INDEXES.clear()
+        self.addCleanup(api.keystone._LIST_INDEXES.clear)
+
+    def _get_names(self, resources):
+        return [r.name for r in resources]
+
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_user_list_paged(self, mock_keystoneclient):
+        keystoneclient = mock_keystoneclient.return_value
+        keystoneclient.users.list.return_value = self.users.list()
+
+        pages = [api.keystone.user_list_paged(self.request, domain='1',
+                                              marker=marker)
+                 for marker in (None, '5', '3')]
+
+        self.assertEqual([(['test_user', 'user_five'], True),
+                          (['user_four', 'user_three'], True),
+                          (['user_two'], False)],
+                         [(self._get_names(users), more)
+                          for users, more in pages])
+        # The users are listed once, without filters.
+        keystoneclient.users.list.assert_called_once_with(
+            project=None, domain='1', group=None)
+
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_user_list_paged_filtered_by_name(self, mock_keystoneclient):
+        keystoneclient = mock_keystoneclient.return_value
+        keystoneclient.users.list.return_value = self.users.list()
+
+        for filters, names in (({'name__startswith': 'user_t'},
+                                ['user_three', 'user_two']),
+                               ({'name__startswith': 'User'}, []),
+                               ({'name': 'user_two'}, ['user_two'])):
+            users, more = api.keystone.user_list_paged(self.request,
+                                                       filters=filters)
+            self.assertEqual(names, self._get_names(users))
+            self.assertFalse(more)
+        self.assertEqual(1, keystoneclient.users.list.call_count)
+
+    @override_settings(IDENTITY_LIST_INDEX={'timeout': 0})
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_user_list_paged_disabled(self, mock_keystoneclient):
+        keystoneclient = mock_keystoneclient.return_value
+        keystoneclient.users.list.return_value = self.users.list()
+
+        users, more = api.keystone.user_list_paged(
+            self.request, filters={'name__startswith': 'user_t'})
+
+        self.assertEqual(5, len(users))
+        self.assertFalse(more)
+        keystoneclient.users.list.assert_called_once_with(
+            project=None, domain=None, group=None, name__startswith='user_t')
+
+    @mock.patch.object(api.keystone, 'get_effective_domain_id')
+    @mock.patch.object(api.keystone, 'keystoneclient')
+    def test_tenant_list_paginated(self, mock_keystoneclient,
+                                   mock_get_effective_domain_id):
+        mock_get_effective_domain_id.return_value = None
+        keystoneclient = mock_keystoneclient.return_value
+        keystoneclient.projects.list.return_value = self.tenants.list()
+
+        tenants, more = api.keystone.tenant_list(self.request, paginate=True)
+        self.assertEqual(['disabled_tenant', 'test_tenant'],
+                         self._get_names(tenants))
+        self.assertTrue(more)
+        tenants, more = api.keystone.tenant_list(self.request, paginate=True,
+                                                 marker=tenants[-1].id)
+        self.assertEqual(['云规则'], self._get_names(tenants))
+        self.assertFalse(more)
+        self.assertEqual(1, keystoneclient.projects.list.call_count)
+
+        # Updating a project rebuilds the index.
+        api.keystone.tenant_update(self.request, '1', enabled=False)
+        api.keystone.tenant_list(self.request, paginate=True)
+        self.assertEqual(2, keystoneclient.projects.list.call_count)
+
+        # Other filters are applied by keystone.
+        api.keystone.tenant_list(self.request, paginate=True,
+                                 filters={'enabled': False})
+        keystoneclient.projects.list.assert_called_with(
+            domain=None, user=None, enabled=False)
@@ -19,6 +19,7 @@ import netaddr
 
 from django.test.utils import override_settings
 
+from horizon.utils import memoized
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -131,8 +132,10 @@ class NetworkApiNeutronTests(test.APIMockTestCase):
         else:
             self.assertEqual(0, self.qclient.list_floatingips.call_count)
         self.qclient.list_ports.assert_has_calls(expected_list_ports)
-        self.qclient.list_networks.assert_called_once_with(
-            id=frozenset(server_network_ids))
+        self.qclient.list_networks.assert_called_once_with(id=mock.ANY)
+        self.assertEqual(
+            set(server_network_ids),
+            set(self.qclient.list_networks.call_args[1]['id']))
         self.qclient.list_subnets.assert_called_once_with()
 
     @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': True})
@@ -142,3 +145,75 @@ class NetworkApiNeutronTests(test.APIMockTestCase):
     @override_settings(OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
     def test_servers_update_addresses_router_disabled(self):
         self._test_servers_update_addresses(router_enabled=False)
+
+    def _new_request(self):
+        request = self.mock_rest_request()
+        request.user = self.request.user
+        return request
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True},
+                       OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    def test_servers_update_addresses_cached(self):
+        memoized._get_shared_cache().clear()
+        self._test_servers_update_addresses(router_enabled=False)
+        servers = self.servers.list()
+        expected = [server.addresses for server in servers]
+        server_ports = [p for p in self.api_ports.list()
+                        if p['device_id'] == servers[1].id]
+
+        # Nothing changed: the addresses come from the cache.
+        self.qclient.reset_mock()
+        for server in servers:
+            server.addresses = {}
+        api.network.servers_update_addresses(self._new_request(), servers)
+        self.assertEqual(expected, [server.addresses for server in servers])
+        self.assertEqual(0, self.qclient.list_ports.call_count)
+        self.assertEqual(0, self.qclient.list_networks.call_count)
+
+        # Only the updated server is looked up again.
+        self.qclient.list_ports.side_effect = [{'ports': server_ports}]
+        servers[1].updated = '2012-02-28T20:51:27Z'
+        api.network.servers_update_addresses(self._new_request(), servers)
+        self.assertEqual(expected, [server.addresses for server in servers])
+        self.qclient.list_ports.assert_called_once_with(
+            device_id=(servers[1].id,))
+
+        # Changes to floating IPs invalidate the cache.
+        self.qclient.reset_mock()
+        self.qclient.list_ports.side_effect = [{'ports': []}]
+        api.neutron.FloatingIpManager(self.request).disassociate('fip-id')
+        api.network.servers_update_addresses(self._new_request(), servers)
+        self.qclient.list_ports.assert_called_once_with(
+            device_id=tuple(server.id for server in servers))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={
+        'enabled': True,
+        'timeouts': {api.neutron._SERVER_ADDRESSES_CACHE: 300}},
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    @mock.patch.object(memoized, 'set_shared_entries',
+                       wraps=memoized.set_shared_entries)
+    def test_servers_update_addresses_cache_timeout(self, mock_set):
+        memoized._get_shared_cache().clear()
+        self._test_servers_update_addresses(router_enabled=False)
+        mock_set.assert_called_once_with(
+            api.neutron._SERVER_ADDRESSES_CACHE, mock.ANY, 'user', mock.ANY,
+            timeout=300)
+        self.assertEqual(len(self.servers.list()),
+                         len(mock_set.call_args[0][3]))
+
+    @override_settings(MEMOIZED_SHARED_CACHE={
+        'enabled': True,
+        'timeouts': {api.neutron._SERVER_ADDRESSES_CACHE: 0}},
+        OPENSTACK_NEUTRON_NETWORK={'enable_router': False})
+    @mock.patch.object(memoized, 'get_shared_entries')
+    def test_servers_update_addresses_cache_disabled(self, mock_get):
+        memoized._get_shared_cache().clear()
+        self._test_servers_update_addresses(router_enabled=False)
+        servers = self.servers.list()
+        mock_get.assert_not_called()
+
+        self.qclient.reset_mock()
+        self.qclient.list_ports.side_effect = [{'ports': []}]
+        api.network.servers_update_addresses(self._new_request(), servers)
+        self.qclient.list_ports.assert_called_once_with(
+            device_id=tuple(server.id for server in servers))
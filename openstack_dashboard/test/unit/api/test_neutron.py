@@ -1048,16 +1048,29 @@ class NeutronApiTests(test.APIMockTestCase):
     def test_get_router_ha_permission_without_l3_ha_extension(self):
         self._test_get_router_ha_permission_with_policy_check(False)
 
+    def _mock_list_ports_uri_limit(self, neutronclient, ports, max_ids):
+        # Simulate a neutron server which accepts at most max_ids port IDs
+        # in a request. Chunks are requested in parallel, so ports are
+        # returned based on the requested IDs instead of the call order.
+        def list_ports(id):
+            if len(id) > max_ids:
+                raise neutron_exc.RequestURITooLong(
+                    excess=40 * (len(id) - max_ids))
+            return {'ports': [p for p in ports if p['id'] in id]}
+        neutronclient.list_ports.side_effect = list_ports
+
     @mock.patch.object(api.neutron, 'neutronclient')
     def test_list_resources_with_long_filters(self, mock_neutronclient):
         # In this tests, port_list is called with id=[10 port ID]
         # filter. It generates about 40*10 char length URI.
         # Each port ID is converted to "id=<UUID>&" in URI and
         # it means 40 chars (len(UUID)=36).
-        # If excess length is 220, it means 400-220=180 chars
+        # If excess length is 280, it means 400-280=120 chars
         # can be sent in the first request.
-        # As a result three API calls with 4, 4, 2 port ID
+        # As a result four API calls with 3, 3, 3, 1 port ID
         # are expected.
+        api.neutron._FILTER_LENGTH_LIMITS.clear()
+        self.addCleanup(api.neutron._FILTER_LENGTH_LIMITS.clear)
 
         ports = [{'id': uuidutils.generate_uuid(),
                   'name': 'port%s' % i,
@@ -1066,11 +1079,7 @@ class NeutronApiTests(test.APIMockTestCase):
         port_ids = tuple([port['id'] for port in ports])
 
         neutronclient = mock_neutronclient.return_value
-        uri_len_exc = neutron_exc.RequestURITooLong(excess=220)
-        list_ports_retval = [uri_len_exc]
-        for i in range(0, 10, 4):
-            list_ports_retval.append({'ports': ports[i:i + 4]})
-        neutronclient.list_ports.side_effect = list_ports_retval
+        self._mock_list_ports_uri_limit(neutronclient, ports, 3)
 
         ret_val = api.neutron.list_resources_with_long_filters(
             api.neutron.port_list, 'id', tuple(port_ids),
@@ -1080,9 +1089,83 @@ class NeutronApiTests(test.APIMockTestCase):
 
         expected_calls = []
         expected_calls.append(mock.call(id=tuple(port_ids)))
-        for i in range(0, 10, 4):
-            expected_calls.append(mock.call(id=tuple(port_ids[i:i + 4])))
-        neutronclient.list_ports.assert_has_calls(expected_calls)
+        for i in range(0, 10, 3):
+            expected_calls.append(mock.call(id=tuple(port_ids[i:i + 3])))
+        self.assertEqual(len(expected_calls),
+                         neutronclient.list_ports.call_count)
+        self.assertEqual(expected_calls[0],
+                         neutronclient.list_ports.call_args_list[0])
+        neutronclient.list_ports.assert_has_calls(expected_calls,
+                                                  any_order=True)
+
+    def _new_request(self):
+        # port_list() is memoized per request.
+        request = self.mock_rest_request()
+        request.user = self.request.user
+        return request
+
+    @mock.patch.object(api.neutron, 'neutronclient')
+    def test_list_resources_with_long_filters_learned_limit(
+            self, mock_neutronclient):
+        api.neutron._FILTER_LENGTH_LIMITS.clear()
+        self.addCleanup(api.neutron._FILTER_LENGTH_LIMITS.clear)
+
+        ports = [{'id': uuidutils.generate_uuid(),
+                  'name': 'port%s' % i,
+                  'admin_state_up': True}
+                 for i in range(10)]
+        port_ids = tuple([port['id'] for port in ports])
+
+        neutronclient = mock_neutronclient.return_value
+        self._mock_list_ports_uri_limit(neutronclient, ports, 4)
+        api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids[:5],
+            request=self._new_request())
+        self.assertEqual(3, neutronclient.list_ports.call_count)
+
+        # The limit is known now, so no request is rejected.
+        neutronclient.list_ports.reset_mock()
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids,
+            request=self._new_request())
+        self.assertEqual(port_ids, tuple([p.id for p in ret_val]))
+        neutronclient.list_ports.assert_has_calls(
+            [mock.call(id=port_ids[i:i + 4]) for i in range(0, 10, 4)],
+            any_order=True)
+        self.assertEqual(3, neutronclient.list_ports.call_count)
+
+        # Short filters are still sent in a single request.
+        neutronclient.list_ports.reset_mock()
+        api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids[:2],
+            request=self._new_request())
+        neutronclient.list_ports.assert_called_once_with(id=port_ids[:2])
+
+        # A limit which is too high is learned again.
+        self._mock_list_ports_uri_limit(neutronclient, ports, 2)
+        neutronclient.list_ports.reset_mock()
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', port_ids,
+            request=self._new_request())
+        self.assertEqual(port_ids, tuple([p.id for p in ret_val]))
+        neutronclient.list_ports.assert_has_calls(
+            [mock.call(id=port_ids[i:i + 2]) for i in range(0, 10, 2)],
+            any_order=True)
+
+    @mock.patch.object(api.neutron, 'neutronclient')
+    def test_list_resources_with_long_filters_iterable(self,
+                                                       mock_neutronclient):
+        ports = self.api_ports.list()
+        port_ids = [port['id'] for port in ports]
+        neutronclient = mock_neutronclient.return_value
+        neutronclient.list_ports.return_value = {'ports': ports}
+
+        ret_val = api.neutron.list_resources_with_long_filters(
+            api.neutron.port_list, 'id', (i for i in port_ids),
+            request=self.request)
+
+        self.assertEqual(port_ids, [p.id for p in ret_val])
+        neutronclient.list_ports.assert_called_once_with(id=port_ids)
 
     @mock.patch.object(api.neutron, 'neutronclient')
     def test_qos_policies_list(self, mock_neutronclient):
@@ -30,6 +30,7 @@ from novaclient.v2 import quotas
 from novaclient.v2 import servers
 
 from horizon import exceptions as horizon_exceptions
+from horizon.utils import memoized
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -506,6 +507,93 @@ class ComputeApiTests(test.APIMockTestCase):
         self.assertEqual(len(flavors), len(api_flavors))
         novaclient.flavors.list.assert_called_once_with(is_public=True)
 
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_flavor_list_shared_cache(self, mock_novaclient):
+        memoized._get_shared_cache().clear()
+        flavors = self.flavors.list()
+        novaclient = mock_novaclient.return_value
+        novaclient.flavors.list.return_value = flavors
+        novaclient.flavors.delete.return_value = None
+
+        api.nova.flavor_list(self.request)
+        request = self.mock_rest_request()
+        request.user = self.request.user
+        api_flavors = api.nova.flavor_list(request)
+
+        self.assertEqual([f.id for f in flavors], [f.id for f in api_flavors])
+        self.assertEqual([novaclient.flavors] * len(flavors),
+                         [f.manager for f in api_flavors])
+        novaclient.flavors.list.assert_called_once_with(is_public=True)
+
+        api.nova.flavor_delete(request, flavors[0].id)
+        request = self.mock_rest_request()
+        request.user = self.request.user
+        api.nova.flavor_list(request)
+        self.assertEqual(2, novaclient.flavors.list.call_count)
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_flavor_list_not_shared_between_tokens(self, mock_novaclient):
+        memoized._get_shared_cache().clear()
+        novaclient = mock_novaclient.return_value
+        novaclient.flavors.list.return_value = self.flavors.list()
+
+        api.nova.flavor_list(self.request, is_public=False)
+        # An admin and a member of the same project do not see the same
+        # flavors.
+        request = self.mock_rest_request()
+        user = self.request.user
+        request.user = mock.Mock(
+            is_authenticated=True, endpoint=user.endpoint,
+            services_region=user.services_region,
+            project_id=user.project_id, id=user.id,
+            token=mock.Mock(id='another token'))
+        api.nova.flavor_list(request, is_public=False)
+
+        self.assertEqual(2, novaclient.flavors.list.call_count)
+
+    @override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_flavor_extra_set_invalidates_after_update(self, mock_novaclient):
+        memoized._get_shared_cache().clear()
+        flavor = mock.Mock()
+        novaclient = mock_novaclient.return_value
+        novaclient.flavors.list.return_value = self.flavors.list()
+        novaclient.flavors.get.return_value = flavor
+
+        def list_flavors_concurrently(metadata):
+            # Another request lists the flavors while the update is sent.
+            request = self.mock_rest_request()
+            request.user = self.request.user
+            api.nova.flavor_list(request)
+        flavor.set_keys.side_effect = list_flavors_concurrently
+
+        api.nova.flavor_extra_set(self.request, 'flavor', {'k': 'v'})
+        request = self.mock_rest_request()
+        request.user = self.request.user
+        api.nova.flavor_list(request)
+
+        self.assertEqual(2, novaclient.flavors.list.call_count)
+
+    @mock.patch.object(memoized, 'invalidate_shared')
+    @mock.patch.object(api._nova, 'novaclient')
+    def test_interface_attach_detach_invalidate_addresses(
+            self, mock_novaclient, mock_invalidate_shared):
+        server = self.servers.first()
+        port = self.ports.first()
+        servers_api = mock_novaclient.return_value.servers
+
+        api.nova.interface_attach(self.request, server.id, port_id=port.id)
+        api.nova.interface_detach(self.request, server.id, port.id)
+
+        servers_api.interface_attach.assert_called_once_with(
+            server.id, port.id, None, None)
+        servers_api.interface_detach.assert_called_once_with(server.id,
+                                                             port.id)
+        mock_invalidate_shared.assert_has_calls(
+            [mock.call(api.neutron._SERVER_ADDRESSES_CACHE)] * 2)
+
     @mock.patch.object(api._nova, 'novaclient')
     def test_flavor_get_no_extras(self, mock_novaclient):
         flavor = self.flavors.list()[1]
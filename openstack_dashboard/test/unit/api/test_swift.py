@@ -18,6 +18,10 @@
 
 from __future__ import absolute_import
 
+import json
+import threading
+
+from django.test.utils import override_settings
 import mock
 
 from horizon import exceptions
@@ -25,6 +29,9 @@ from horizon import exceptions
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
+SEGMENTED_UPLOAD = {'enabled': True, 'segment_size': 4, 'concurrency': 2}
+SERIAL_SEGMENTED_UPLOAD = dict(SEGMENTED_UPLOAD, concurrency=1)
+
 
 @mock.patch('swiftclient.client.Connection')
 class SwiftApiTests(test.APIMockTestCase):
@@ -39,7 +46,36 @@ class SwiftApiTests(test.APIMockTestCase):
         self.assertEqual(len(containers), len(conts))
         self.assertFalse(more)
         swift_api.get_account.assert_called_once_with(
-            limit=1001, marker=None, prefix=None, full_listing=True)
+            limit=1001, marker=None, prefix=None)
+
+    def test_swift_get_containers_limit(self, mock_swiftclient):
+        containers = self.containers.list()
+        cont_data = [c._apidict for c in containers]
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_account.return_value = [{}, cont_data[:2]]
+
+        (conts, more) = api.swift.swift_get_containers(self.request,
+                                                       marker='container',
+                                                       limit=1)
+
+        self.assertEqual(1, len(conts))
+        self.assertTrue(more)
+        swift_api.get_account.assert_called_once_with(
+            limit=2, marker='container', prefix=None)
+
+    def test_swift_get_containers_full_listing(self, mock_swiftclient):
+        containers = self.containers.list()
+        cont_data = [c._apidict for c in containers]
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_account.return_value = [{}, cont_data]
+
+        (conts, more) = api.swift.swift_get_containers(self.request,
+                                                       full_listing=True)
+
+        self.assertEqual(len(containers), len(conts))
+        self.assertFalse(more)
+        swift_api.get_account.assert_called_once_with(
+            marker=None, prefix=None, full_listing=True)
 
     def test_swift_get_container_with_data(self, mock_swiftclient):
         container = self.containers.first()
@@ -127,9 +163,80 @@ class SwiftApiTests(test.APIMockTestCase):
             limit=1001,
             marker=None,
             prefix=None,
+            delimiter='/')
+
+    def test_swift_get_objects_full_listing(self, mock_swiftclient):
+        container = self.containers.first()
+        objects = self.objects.list()
+
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_container.return_value = [{}, objects]
+
+        (objs, more) = api.swift.swift_get_objects(self.request,
+                                                   container.name,
+                                                   full_listing=True)
+
+        self.assertEqual(len(objects), len(objs))
+        self.assertFalse(more)
+        swift_api.get_container.assert_called_once_with(
+            container.name,
+            prefix=None,
+            marker=None,
             delimiter='/',
             full_listing=True)
 
+    def test_swift_iter_objects(self, mock_swiftclient):
+        container = self.containers.first()
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_container.side_effect = [
+            ({}, [{'name': 'object0'}, {'name': 'object1'}]),
+            ({}, [{'name': 'object2'}, {'subdir': 'object3/'}]),
+            ({}, [{'name': 'object4'}]),
+        ]
+
+        objs = api.swift.swift_iter_objects(self.request, container.name,
+                                            page_size=2)
+        # Pages are only retrieved as the objects are consumed.
+        self.assertEqual('object0', next(objs).name)
+        self.assertEqual(1, swift_api.get_container.call_count)
+
+        self.assertEqual(['object1', 'object2', 'object3', 'object4'],
+                         [obj.name for obj in objs])
+        # The third page is not full, so it is the last one.
+        swift_api.get_container.assert_has_calls([
+            mock.call(container.name, prefix=None, marker=None, limit=2,
+                      delimiter='/'),
+            mock.call(container.name, prefix=None, marker='object1',
+                      limit=2, delimiter='/'),
+            mock.call(container.name, prefix=None, marker='object3/',
+                      limit=2, delimiter='/'),
+        ])
+        self.assertEqual(3, swift_api.get_container.call_count)
+
+    def test_swift_filter_objects(self, mock_swiftclient):
+        container = self.containers.first()
+        names = ['report-2020.txt', 'Report-2019.csv', 'image.png',
+                 'old/report.txt']
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_container.return_value = (
+            {}, [{'name': name} for name in names])
+
+        objs = api.swift.swift_filter_objects(self.request, 'REPORT*.txt',
+                                              container.name)
+
+        self.assertEqual(['report-2020.txt', 'old/report.txt'],
+                         [obj.name for obj in objs])
+
+    def test_wildcard_search(self, mock_swiftclient):
+        self.assertTrue(api.swift.wildcard_search('abcdef', ''))
+        self.assertTrue(api.swift.wildcard_search('abcdef', '**'))
+        self.assertTrue(api.swift.wildcard_search('abcdef', 'cd'))
+        self.assertTrue(api.swift.wildcard_search('abcdef', 'a*d*f'))
+        self.assertTrue(api.swift.wildcard_search('a.b', 'a.*'))
+        self.assertFalse(api.swift.wildcard_search('abcdef', 'd*c'))
+        self.assertFalse(api.swift.wildcard_search('abc', 'a.c'))
+        self.assertFalse(api.swift.wildcard_search('ab', 'abc*'))
+
     def test_swift_get_object_with_data_non_chunked(self, mock_swiftclient):
         container = self.containers.first()
         object = self.objects.first()
@@ -257,6 +364,144 @@ class SwiftApiTests(test.APIMockTestCase):
             content_length=0,
             headers={})
 
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=SEGMENTED_UPLOAD)
+    def test_swift_segmented_upload_small(self, mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+        swift_api.put_object.return_value = 'etag'
+        headers = {'X-Object-Meta-Orig-Filename': 'small.txt'}
+
+        upload = api.swift.SegmentedUpload(self.request, 'cont', 'obj',
+                                           headers=headers)
+        upload.write(b'ab')
+        upload.write(b'c')
+        obj = upload.close()
+
+        self.assertEqual(3, obj.bytes)
+        self.assertEqual('etag', obj.etag)
+        swift_api.put_container.assert_not_called()
+        swift_api.put_object.assert_called_once_with(
+            'cont', 'obj', b'abc', content_length=3, headers=headers)
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=SEGMENTED_UPLOAD)
+    def test_swift_segmented_upload_slo(self, mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_capabilities.return_value = {'slo': {}}
+        swift_api.put_object.side_effect = (
+            lambda container, name, data, **kwargs: 'etag-%s' % len(data))
+
+        upload = api.swift.SegmentedUpload(self.request, 'cont', 'obj')
+        upload.write(b'0123456')
+        upload.write(b'789')
+        obj = upload.close()
+
+        self.assertEqual(10, obj.bytes)
+        swift_api.put_container.assert_called_once_with('cont_segments')
+        segment_calls = [c for c in swift_api.put_object.call_args_list
+                         if c[0][0] == 'cont_segments']
+        self.assertEqual([b'0123', b'4567', b'89'],
+                         [c[0][2] for c in segment_calls])
+        names = [c[0][1] for c in segment_calls]
+        self.assertEqual(['00000000', '00000001', '00000002'],
+                         [name.rsplit('/', 1)[1] for name in names])
+        manifest_call = swift_api.put_object.call_args_list[-1]
+        self.assertEqual(('cont', 'obj'), manifest_call[0][:2])
+        self.assertEqual('multipart-manifest=put',
+                         manifest_call[1]['query_string'])
+        self.assertEqual(
+            [{'path': '/cont_segments/%s' % name, 'etag': 'etag-%s' % size,
+              'size_bytes': size}
+             for name, size in zip(names, (4, 4, 2))],
+            json.loads(manifest_call[0][2]))
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=SEGMENTED_UPLOAD)
+    def test_swift_segmented_upload_dlo(self, mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_capabilities.return_value = {}
+
+        upload = api.swift.SegmentedUpload(self.request, 'cont', 'obj')
+        upload.write(b'012345')
+        upload.close()
+
+        self.assertEqual(3, swift_api.put_object.call_count)
+        manifest_call = swift_api.put_object.call_args_list[-1]
+        self.assertEqual(('cont', 'obj', b''), manifest_call[0])
+        segment_name = swift_api.put_object.call_args_list[0][0][1]
+        self.assertEqual(
+            'cont_segments/' + segment_name.rsplit('/', 1)[0] + '/',
+            manifest_call[1]['headers']['X-Object-Manifest'])
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=SERIAL_SEGMENTED_UPLOAD)
+    def test_swift_segmented_upload_failure(self, mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_capabilities.return_value = {'slo': {}}
+        swift_api.put_object.side_effect = ['etag', self.exceptions.swift]
+
+        upload = api.swift.SegmentedUpload(self.request, 'cont', 'obj')
+        upload.write(b'01234567')
+        self.assertRaises(type(self.exceptions.swift), upload.close)
+
+        # The segment which was uploaded is deleted.
+        first_segment = swift_api.put_object.call_args_list[0][0][1]
+        swift_api.delete_object.assert_called_once_with('cont_segments',
+                                                        first_segment)
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD=dict(SEGMENTED_UPLOAD,
+                                                   max_workers=1))
+    def test_swift_segmented_upload_executor(self, mock_swiftclient):
+        api.swift._upload_executor = None
+        self.addCleanup(setattr, api.swift, '_upload_executor', None)
+        executor = api.swift._get_upload_executor()
+        self.addCleanup(executor.shutdown)
+        self.assertIs(executor, api.swift._get_upload_executor())
+        swift_api = mock_swiftclient.return_value
+        swift_api.get_capabilities.return_value = {'slo': {}}
+        threads = set()
+
+        def put_object(container, name, data, **kwargs):
+            if container == 'cont_segments':
+                threads.add(threading.current_thread())
+            return 'etag'
+        swift_api.put_object.side_effect = put_object
+
+        upload = api.swift.SegmentedUpload(self.request, 'cont', 'obj')
+        upload.write(b'012345678')
+        upload.close()
+
+        # The segments are uploaded by the single thread of the executor
+        # of the uploads.
+        self.assertEqual(4, swift_api.put_object.call_count)
+        self.assertEqual(1, len(threads))
+        self.assertIn(threads.pop(), executor._workers)
+
+        swift_api = mock_swiftclient.return_value
+        swift_api.head_object.return_value = {'x-static-large-object': 'True'}
+
+        api.swift.swift_delete_object(self.request, 'cont', 'obj')
+
+        swift_api.delete_object.assert_called_once_with(
+            'cont', 'obj', query_string='multipart-manifest=delete')
+        swift_api.get_container.assert_not_called()
+
+    @override_settings(SWIFT_SEGMENTED_UPLOAD={'enabled': True})
+    def test_swift_delete_object_dlo_segments(self, mock_swiftclient):
+        swift_api = mock_swiftclient.return_value
+        swift_api.head_object.return_value = {
+            'x-object-manifest': 'cont_segments/obj%20a/1.000000/4/'}
+        swift_api.get_container.return_value = ({}, [
+            {'name': 'obj a/1.000000/4/00000000'},
+            {'name': 'obj a/1.000000/4/00000001'}])
+
+        api.swift.swift_delete_object(self.request, 'cont', 'obj a')
+
+        swift_api.get_container.assert_called_once_with(
+            'cont_segments', prefix='obj a/1.000000/4/', full_listing=True)
+        swift_api.delete_object.assert_has_calls([
+            mock.call('cont', 'obj a',
+                      query_string='multipart-manifest=delete'),
+            mock.call('cont_segments', 'obj a/1.000000/4/00000000'),
+            mock.call('cont_segments', 'obj a/1.000000/4/00000001')])
+        self.assertEqual(3, swift_api.delete_object.call_count)
+
     def test_swift_object_exists(self, mock_swiftclient):
         container = self.containers.first()
         obj = self.objects.first()
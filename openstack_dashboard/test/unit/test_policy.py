@@ -31,6 +31,32 @@ class PolicyTestCase(test.TestCase):
                              request=self.request)
         self.assertTrue(value)
 
+    @override_settings(POLICY_CHECK_FUNCTION='openstack_auth.policy.check')
+    def test_policy_check_batch(self):
+        values = policy.check_batch(
+            [((("identity", "admin_required"),), None),
+             ((("identity", "i_dont_exist"),), {})],
+            request=self.request)
+        self.assertEqual([False, True], values)
+
+    @override_settings(POLICY_CHECK_FUNCTION=None)
+    def test_policy_check_batch_not_set(self):
+        values = policy.check_batch(
+            [((("identity", "admin_required"),), None)],
+            request=self.request)
+        self.assertEqual([True], values)
+
+    def test_policy_check_batch_without_batch_support(self):
+        def policy_check(actions, request, target):
+            return actions[0][1] != "admin_required"
+
+        with override_settings(POLICY_CHECK_FUNCTION=policy_check):
+            values = policy.check_batch(
+                [((("identity", "admin_required"),), None),
+                 ((("identity", "identity:default"),), None)],
+                request=self.request)
+        self.assertEqual([False, True], values)
+
 
 class PolicyBackendTestCase(test.TestCase):
     def test_policy_file_load(self):
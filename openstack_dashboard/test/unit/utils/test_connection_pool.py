@@ -0,0 +1,143 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from http import server
+import threading
+
+from django.test.utils import override_settings
+import mock
+from urllib3.connection import HTTPConnection
+
+from openstack_dashboard import api
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import connection_pool
+
+
+class _Handler(server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.tokens.append(self.headers.get('X-Auth-Token'))
+        self.server.cookies.append(self.headers.get('Cookie'))
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Set-Cookie', 'session=%s; Path=/' %
+                         self.headers.get('X-Auth-Token'))
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(OPENSTACK_CONNECTION_POOL={'enabled': True,
+                                              'pool_maxsize': 2,
+                                              'tcp_keepalive': True})
+class ConnectionPoolTests(test.APIMockTestCase):
+
+    def setUp(self):
+        super(ConnectionPoolTests, self).setUp()
+        connection_pool._sessions.clear()
+        self.addCleanup(connection_pool._sessions.clear)
+
+    def _start_server(self):
+        httpd = server.HTTPServer(('127.0.0.1', 0), _Handler)
+        httpd.tokens = []
+        httpd.cookies = []
+        thread = threading.Thread(target=httpd.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        return httpd, 'http://127.0.0.1:%d' % httpd.server_port
+
+    def test_requests_session_shared_per_endpoint(self):
+        session = connection_pool.get_requests_session(
+            'https://nova.example.com:8774/v2.1')
+        self.assertIs(session, connection_pool.get_requests_session(
+            'https://nova.example.com:8774/compute'))
+        self.assertIsNot(session, connection_pool.get_requests_session(
+            'https://nova.example.com:9292'))
+        self.assertIsNot(session, connection_pool.get_requests_session(
+            'https://nova.example.com:8774', default_headers=False))
+
+    def test_shared_requests_session_not_closed(self):
+        shared = connection_pool.get_shared_requests_session(
+            'https://swift.example.com:8080')
+        shared.close()
+        self.assertIs(connection_pool.get_requests_session(
+            'https://swift.example.com:8080'), shared._session)
+
+    def test_connections_reused(self):
+        httpd, url = self._start_server()
+        # Allow connections to the local test server. The patch is undone
+        # before tearDown() restores the connect method.
+        with mock.patch.object(HTTPConnection, 'connect',
+                               self._real_conn_request):
+            for token in ('token1', 'token2'):
+                request = self.mock_rest_request()
+                request.user = self.request.user
+                session = connection_pool.get_session(request, url, token)
+                for i in range(3):
+                    session.get(url + '/resources')
+
+        self.assertEqual(['token1'] * 3 + ['token2'] * 3, httpd.tokens)
+        self.assertEqual({url: {'requests': 6, 'connections': 1,
+                                'reused': 5}},
+                         connection_pool.get_statistics())
+
+    def test_cookies_not_shared(self):
+        httpd, url = self._start_server()
+        with mock.patch.object(HTTPConnection, 'connect',
+                               self._real_conn_request):
+            for token in ('token1', 'token2'):
+                request = self.mock_rest_request()
+                request.user = self.request.user
+                session = connection_pool.get_session(request, url, token)
+                session.get(url + '/resources')
+
+        self.assertEqual([None, None], httpd.cookies)
+
+    def test_clients_use_shared_session(self):
+        neutron_session = api.neutron.neutronclient(
+            self.request).httpclient.session
+        cinder_session = api.cinder.cinderclient(self.request).client.session
+        glance_session = api.glance.glanceclient(
+            self.request).http_client.session
+        for session in (neutron_session, cinder_session, glance_session):
+            self.assertEqual(self.request.user.token.id,
+                             session.get_token())
+        self.assertIs(
+            neutron_session.session,
+            connection_pool.get_requests_session(
+                api.base.url_for(self.request, 'network')))
+        self.assertIs(
+            glance_session.session,
+            connection_pool.get_requests_session(
+                api.base.url_for(self.request, 'image')))
+
+    def test_swift_connection_uses_shared_session(self):
+        conn = api.swift.swift_api(self.request)
+        parsed, http_conn = conn.http_connection()
+        http_conn.close()
+        self.assertIs(
+            connection_pool.get_requests_session(
+                api.base.url_for(self.request, 'object-store'),
+                default_headers=False),
+            http_conn.request_session._session)
+
+    @override_settings(OPENSTACK_CONNECTION_POOL={'enabled': False})
+    def test_disabled(self):
+        api.neutron.neutronclient(self.request)
+        self.assertEqual({}, connection_pool.get_statistics())
@@ -10,8 +10,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 import unittest
 
+from django.test.utils import override_settings
+import futurist
+import mock
+
 from openstack_dashboard.utils import futurist_utils
 
 
@@ -58,3 +63,131 @@ class FuturistUtilsTests(unittest.TestCase):
             (func2, [], {'a': 10, 'b': 20}),
             func3)
         self.assertEqual(ret, (5, 30, 3))
+
+    def test_call_functions_parallel_reuses_executor(self):
+        futurist_utils.call_functions_parallel(lambda: 1)
+        executor = futurist_utils.get_executor()
+        futurist_utils.call_functions_parallel(lambda: 2)
+        self.assertIs(executor, futurist_utils.get_executor())
+        self.assertEqual(0, futurist_utils.get_statistics()['queue_depth'])
+
+    def test_call_functions_parallel_exception(self):
+        def func1():
+            return 1
+
+        def func2():
+            raise ValueError('failed')
+
+        self.assertRaises(ValueError,
+                          futurist_utils.call_functions_parallel,
+                          func1, func2)
+
+    def test_call_functions_parallel_timeout(self):
+        event = threading.Event()
+        try:
+            self.assertRaises(futurist.TimeoutError,
+                              futurist_utils.call_functions_parallel,
+                              event.wait, timeout=0.01)
+        finally:
+            event.set()
+
+    def test_call_functions_parallel_nested(self):
+        def outer():
+            return futurist_utils.call_functions_parallel(
+                lambda: threading.current_thread(),
+                lambda: threading.current_thread())
+
+        threads = futurist_utils.call_functions_parallel(outer)[0]
+        # Nested calls are run in the worker thread of the outer call.
+        self.assertEqual(1, len(set(threads)))
+        self.assertIsNot(threading.current_thread(), threads[0])
+
+    @override_settings(PARALLEL_API_CALLS={'max_workers': 1,
+                                           'max_backlog': 1,
+                                           'timeout': None})
+    def test_call_functions_parallel_backlog_full(self):
+        started = threading.Event()
+        event = threading.Event()
+        caller = threading.current_thread()
+        futurist_utils._executor = None
+        executor = futurist_utils.get_executor()
+        try:
+            # Occupy the only worker.
+            executor.submit(lambda: (started.set(), event.wait()))
+            started.wait()
+            # The first function fills the backlog, so the second is run
+            # in the calling thread.
+            ret = futurist_utils.call_functions_parallel(
+                lambda: threading.current_thread(),
+                lambda: (event.set(), threading.current_thread())[1])
+        finally:
+            event.set()
+            executor.shutdown()
+            futurist_utils._executor = None
+        self.assertIsNot(caller, ret[0])
+        self.assertIs(caller, ret[1])
+
+    def test_submit(self):
+        future = futurist_utils.submit(lambda x, y=0: (
+            x + y, threading.current_thread()), 1, y=2)
+        result, thread = future.result()
+        self.assertEqual(3, result)
+        self.assertIsNot(threading.current_thread(), thread)
+
+    @override_settings(PARALLEL_API_CALLS={'max_workers': 1,
+                                           'max_backlog': 1,
+                                           'timeout': None})
+    def test_submit_cancelled(self):
+        started = threading.Event()
+        event = threading.Event()
+        futurist_utils._executor = None
+        executor = futurist_utils.get_executor()
+        try:
+            # Occupy the only worker.
+            executor.submit(lambda: (started.set(), event.wait()))
+            started.wait()
+            queued = futurist_utils.submit(threading.current_thread)
+            self.assertEqual(1, futurist_utils._pending)
+            self.assertTrue(queued.cancel())
+            # The cancelled function no longer fills the backlog.
+            self.assertEqual(0, futurist_utils._pending)
+            future = futurist_utils.submit(threading.current_thread)
+            self.assertFalse(future.done())
+        finally:
+            event.set()
+            executor.shutdown()
+            futurist_utils._executor = None
+        self.assertIsNot(threading.current_thread(), future.result())
+        self.assertEqual(0, futurist_utils._pending)
+
+    def test_submit_nested(self):
+        def outer():
+            return futurist_utils.submit(threading.current_thread)
+
+        inner = futurist_utils.submit(outer).result()
+        # The nested function was run inline in the worker thread.
+        self.assertTrue(inner.done())
+        self.assertIsNot(threading.current_thread(), inner.result())
+
+    def test_submit_background_nested(self):
+        event = threading.Event()
+
+        def outer():
+            inner = futurist_utils.submit_background(event.wait, 10)
+            return inner, inner.done()
+
+        try:
+            inner, done = futurist_utils.submit(outer).result()
+        finally:
+            event.set()
+        # Nothing waits for the function, so it is not run inline.
+        self.assertFalse(done)
+        self.assertTrue(inner.result())
+
+    @override_settings(PARALLEL_API_CALLS={'max_workers': 1,
+                                           'max_backlog': 1,
+                                           'timeout': None})
+    def test_submit_background_backlog_full(self):
+        with mock.patch.object(futurist_utils, '_pending', 1):
+            self.assertIsNone(futurist_utils.submit_background(
+                threading.current_thread))
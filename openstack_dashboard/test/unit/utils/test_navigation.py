@@ -0,0 +1,82 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+import mock
+
+from openstack_auth import user
+
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import navigation
+
+
+class NavigationFingerprintTests(test.TestCase):
+
+    def _get_request(self, user_id='1', roles=None, tenant_id='1',
+                     session=None):
+        if roles is None:
+            roles = [self.roles.member._info]
+        request_user = user.User(
+            id=user_id, token=self.token, user='user%s' % user_id,
+            domain_id=self.domain.id, tenant_id=tenant_id,
+            service_catalog=self.service_catalog, roles=roles,
+            endpoint=settings.OPENSTACK_KEYSTONE_URL)
+        return mock.Mock(user=request_user, session=session or {})
+
+    def _get_fingerprint(self, **kwargs):
+        return navigation.get_fingerprint(self._get_request(**kwargs))
+
+    def test_same_roles_share_fingerprint(self):
+        fingerprint = self._get_fingerprint()
+        self.assertIsNotNone(fingerprint)
+        hash(fingerprint)
+        self.assertEqual(fingerprint,
+                         self._get_fingerprint(user_id='2', tenant_id='2'))
+
+    def test_fingerprint_depends_on_roles_and_scope(self):
+        fingerprint = self._get_fingerprint()
+        self.assertNotEqual(
+            fingerprint, self._get_fingerprint(roles=[self.roles.admin._info]))
+        self.assertNotEqual(
+            fingerprint, self._get_fingerprint(
+                session={'domain_context': self.domain.id}))
+
+    def test_no_fingerprint_for_anonymous_user(self):
+        self.assertIsNone(navigation.get_fingerprint(
+            mock.Mock(user=AnonymousUser(), session={})))
+
+    def test_fingerprint_computed_once_per_request(self):
+        request = self._get_request()
+        with mock.patch.object(navigation, '_get_endpoints',
+                               wraps=navigation._get_endpoints) as endpoints:
+            fingerprint = navigation.get_fingerprint(request)
+            self.assertIsNotNone(fingerprint)
+            self.assertEqual(fingerprint, navigation.get_fingerprint(request))
+        endpoints.assert_called_once_with(request.user)
+
+    @mock.patch.object(navigation, '_read_policy_files_mtimes')
+    def test_policy_files_mtimes_cached(self, mock_read_mtimes):
+        navigation._policy_mtimes.clear()
+        self.addCleanup(navigation._policy_mtimes.clear)
+        mock_read_mtimes.side_effect = [(('policy.json', 1),),
+                                        (('policy.json', 2),)]
+        with mock.patch('time.time', return_value=1000):
+            self.assertEqual((('policy.json', 1),),
+                             navigation._get_policy_files_mtimes())
+        with mock.patch('time.time', return_value=1004):
+            self.assertEqual((('policy.json', 1),),
+                             navigation._get_policy_files_mtimes())
+        with mock.patch('time.time', return_value=1006):
+            self.assertEqual((('policy.json', 2),),
+                             navigation._get_policy_files_mtimes())
+        self.assertEqual(2, mock_read_mtimes.call_count)
@@ -0,0 +1,149 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.test.utils import override_settings
+import futurist
+import mock
+
+from horizon.utils import memoized
+from openstack_dashboard.api import cinder
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import quota_usages
+
+
+@override_settings(MEMOIZED_SHARED_CACHE={'enabled': True})
+class QuotaUsagesTests(test.APITestCase):
+
+    def setUp(self):
+        super(QuotaUsagesTests, self).setUp()
+        memoized._get_shared_cache().clear()
+        self.fetch = mock.Mock(return_value={'volumes': (20, 4),
+                                             'gigabytes': (1000, 400)})
+
+    def test_snapshot_shared(self):
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+        usages = quota_usages.get_quota_usages(self.request, 'volume',
+                                               self.request.user.project_id,
+                                               self.fetch)
+
+        self.assertEqual({'volumes': (20, 4), 'gigabytes': (1000, 400)},
+                         usages)
+        self.fetch.assert_called_once_with(self.request, None)
+
+    def test_snapshot_updated(self):
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+        quota_usages.update_quota_usages(self.request, 'volume',
+                                         {'volumes': 1, 'gigabytes': 10})
+        usages = quota_usages.get_quota_usages(self.request, 'volume', None,
+                                               self.fetch)
+
+        self.assertEqual({'volumes': (20, 5), 'gigabytes': (1000, 410)},
+                         usages)
+        self.assertEqual(1, self.fetch.call_count)
+
+    def test_snapshot_invalidated(self):
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+        quota_usages.get_quota_usages(self.request, 'volume', 'other',
+                                      self.fetch)
+        quota_usages.get_quota_usages(self.request, 'compute', None,
+                                      self.fetch)
+        quota_usages.invalidate_quota_usages(self.request, 'volume')
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+
+        self.assertEqual(4, self.fetch.call_count)
+        # Only the snapshot of the project of the user for the service is
+        # dropped.
+        quota_usages.get_quota_usages(self.request, 'volume', 'other',
+                                      self.fetch)
+        quota_usages.get_quota_usages(self.request, 'compute', None,
+                                      self.fetch)
+        self.assertEqual(4, self.fetch.call_count)
+
+    @mock.patch.object(futurist_utils, 'get_executor')
+    @mock.patch.object(quota_usages, '_REFRESH_AFTER', -1)
+    def test_snapshot_refreshed(self, mock_get_executor):
+        mock_get_executor.return_value = futurist.SynchronousExecutor()
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+        self.fetch.return_value = {'volumes': (20, 6),
+                                   'gigabytes': (1000, 500)}
+
+        # The old snapshot is returned while it is refreshed.
+        usages = quota_usages.get_quota_usages(self.request, 'volume', None,
+                                               self.fetch)
+        self.assertEqual({'volumes': (20, 4), 'gigabytes': (1000, 400)},
+                         usages)
+        self.assertEqual(2, self.fetch.call_count)
+        # The refresh does not keep the request, only its user.
+        refresh_request = self.fetch.call_args[0][0]
+        self.assertIsNot(self.request, refresh_request)
+        self.assertIs(self.request.user, refresh_request.user)
+        self.assertEqual(0, futurist_utils._pending)
+
+        usages = quota_usages.get_quota_usages(self.request, 'volume', None,
+                                               self.fetch)
+        self.assertEqual({'volumes': (20, 6), 'gigabytes': (1000, 500)},
+                         usages)
+
+    @override_settings(PARALLEL_API_CALLS={'max_workers': 1,
+                                           'max_backlog': 1,
+                                           'timeout': None})
+    @mock.patch.object(futurist_utils, '_pending', 1)
+    @mock.patch.object(futurist_utils, 'get_executor')
+    @mock.patch.object(quota_usages, '_REFRESH_AFTER', -1)
+    def test_snapshot_refresh_backlog_full(self, mock_get_executor):
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+
+        # The refresh is skipped, and left to a later request.
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+        mock_get_executor.return_value.submit.assert_not_called()
+        self.assertEqual(1, self.fetch.call_count)
+        self.assertEqual(set(), quota_usages._refreshing)
+
+    @mock.patch.object(cinder, 'cinderclient')
+    def test_volume_create_updates_snapshot(self, mock_cinderclient):
+        volume = self.cinder_volumes.first()
+        mock_cinderclient.return_value.volumes.create.return_value = volume
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+
+        with mock.patch.object(cinder, '_cinderclient_with_generic_groups',
+                               mock_cinderclient):
+            cinder.volume_create(self.request, 10, 'vol', '', '')
+        usages = quota_usages.get_quota_usages(self.request, 'volume', None,
+                                               self.fetch)
+
+        self.assertEqual({'volumes': (20, 5), 'gigabytes': (1000, 410)},
+                         usages)
+
+    @mock.patch.object(cinder, 'cinderclient')
+    def test_volume_delete_invalidates_snapshot(self, mock_cinderclient):
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+        quota_usages.get_quota_usages(self.request, 'volume', 'other',
+                                      self.fetch)
+
+        cinder.volume_delete(self.request, 'volume-id')
+        quota_usages.get_quota_usages(self.request, 'volume', None,
+                                      self.fetch)
+        quota_usages.get_quota_usages(self.request, 'volume', 'other',
+                                      self.fetch)
+
+        self.assertEqual(3, self.fetch.call_count)
+        self.fetch.assert_called_with(self.request, None)
@@ -25,6 +25,7 @@ from openstack_dashboard.api import neutron
 from openstack_dashboard.api import nova
 from openstack_dashboard.contrib.developer.profiler import api as profiler
 from openstack_dashboard.utils import futurist_utils
+from openstack_dashboard.utils import quota_usages
 
 
 LOG = logging.getLogger(__name__)
@@ -313,21 +314,29 @@ def _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id):
         return
 
     try:
-        limits = nova.tenant_absolute_limits(request, reserved=True,
-                                             tenant_id=tenant_id)
+        limits = quota_usages.get_quota_usages(request, 'compute',
+                                               tenant_id,
+                                               _fetch_compute_usages)
     except nova.nova_exceptions.ClientException:
         msg = _("Unable to retrieve compute limit information.")
         exceptions.handle(request, msg)
 
+    for quota_name, (limit, usage) in limits.items():
+        _add_limit_and_usage(usages, quota_name, limit, usage,
+                             disabled_quotas)
+
+
+def _fetch_compute_usages(request, tenant_id):
+    limits = nova.tenant_absolute_limits(request, reserved=True,
+                                         tenant_id=tenant_id)
+    usages = {}
     for quota_name, limit_keys in NOVA_QUOTA_LIMIT_MAP.items():
         if limit_keys['usage']:
             usage = limits[limit_keys['usage']]
         else:
             usage = None
-        _add_limit_and_usage(usages, quota_name,
-                             limits[limit_keys['limit']],
-                             usage,
-                             disabled_quotas)
+        usages[quota_name] = (limits[limit_keys['limit']], usage)
+    return usages
 
 
 @profiler.trace
@@ -337,18 +346,28 @@ def _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id):
         return
 
     if neutron.is_extension_supported(request, 'quota_details'):
-        details = neutron.tenant_quota_detail_get(request, tenant_id)
+        details = quota_usages.get_quota_usages(request, 'network',
+                                                tenant_id,
+                                                _fetch_network_usages)
         for quota_name in NEUTRON_QUOTA_FIELDS:
             if quota_name in disabled_quotas:
                 continue
-            detail = details[quota_name]
-            usages.add_quota(base.Quota(quota_name, detail['limit']))
-            usages.tally(quota_name, detail['used'] + detail['reserved'])
+            limit, usage = details[quota_name]
+            usages.add_quota(base.Quota(quota_name, limit))
+            usages.tally(quota_name, usage)
     else:
         _get_tenant_network_usages_legacy(
             request, usages, disabled_quotas, tenant_id)
 
 
+def _fetch_network_usages(request, tenant_id):
+    details = neutron.tenant_quota_detail_get(request, tenant_id)
+    return dict((quota_name, (detail['limit'],
+                              detail['used'] + detail['reserved']))
+                for quota_name, detail in details.items()
+                if quota_name in NEUTRON_QUOTA_FIELDS)
+
+
 def _get_neutron_quota_data(request, qs, disabled_quotas, tenant_id):
     tenant_id = tenant_id or request.user.tenant_id
     neutron_quotas = neutron.tenant_quota_get(request, tenant_id)
@@ -414,18 +433,25 @@ def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
         return
 
     try:
-        limits = cinder.tenant_absolute_limits(request, tenant_id)
+        limits = quota_usages.get_quota_usages(request, 'volume',
+                                               tenant_id,
+                                               _fetch_volume_usages)
     except cinder.cinder_exception.ClientException:
         msg = _("Unable to retrieve volume limit information.")
         exceptions.handle(request, msg)
 
-    for quota_name, limit_keys in CINDER_QUOTA_LIMIT_MAP.items():
-        _add_limit_and_usage(usages, quota_name,
-                             limits[limit_keys['limit']],
-                             limits[limit_keys['usage']],
+    for quota_name, (limit, usage) in limits.items():
+        _add_limit_and_usage(usages, quota_name, limit, usage,
                              disabled_quotas)
 
 
+def _fetch_volume_usages(request, tenant_id):
+    limits = cinder.tenant_absolute_limits(request, tenant_id)
+    return dict((quota_name, (limits[limit_keys['limit']],
+                              limits[limit_keys['usage']]))
+                for quota_name, limit_keys in CINDER_QUOTA_LIMIT_MAP.items())
+
+
 @profiler.trace
 @memoized
 def tenant_quota_usages(request, tenant_id=None, targets=None):
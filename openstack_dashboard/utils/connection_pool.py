@@ -0,0 +1,171 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""HTTP connections to OpenStack services shared between requests.
+
+API clients are created for each request because they carry the token of
+the user. When the OPENSTACK_CONNECTION_POOL setting is enabled, the clients
+send their HTTP requests through a ``requests`` session shared by all
+requests of the process for each service endpoint (scheme, host and port),
+so the TCP and TLS connections are kept open and reused.
+"""
+
+from http import cookiejar
+import os
+import socket
+import threading
+from urllib import parse
+
+from django.conf import settings
+from keystoneauth1 import token_endpoint
+import requests
+from requests import adapters
+from urllib3 import connection
+
+from openstack_auth import utils as auth_utils
+
+_sessions = {}
+_sessions_pid = None
+_lock = threading.Lock()
+
+
+class _HTTPAdapter(adapters.HTTPAdapter):
+    """HTTPAdapter which sets socket options of the new connections."""
+
+    def __init__(self, socket_options=None, **kwargs):
+        self._socket_options = socket_options
+        super(_HTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._socket_options:
+            kwargs['socket_options'] = self._socket_options
+        super(_HTTPAdapter, self).init_poolmanager(*args, **kwargs)
+
+
+class _SharedRequestsSession(object):
+    """Proxy to a shared requests session which cannot be closed.
+
+    It is used for clients which close their requests session once they
+    are done with it, such as swiftclient.
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    def request(self, *args, **kwargs):
+        return self._session.request(*args, **kwargs)
+
+    def close(self):
+        # The connections are kept open for other requests.
+        pass
+
+
+def _get_config():
+    return settings.OPENSTACK_CONNECTION_POOL
+
+
+def is_enabled():
+    return bool(_get_config().get('enabled'))
+
+
+def _get_pool_key(url):
+    parsed = parse.urlparse(url)
+    return '%s://%s/' % (parsed.scheme, parsed.netloc)
+
+
+def _create_requests_session(prefix, default_headers):
+    config = _get_config()
+    socket_options = None
+    if config.get('tcp_keepalive'):
+        socket_options = (connection.HTTPConnection.default_socket_options +
+                          [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)])
+    session = requests.Session()
+    # The session is shared by all users, so cookies set by a service or a
+    # load balancer must not be sent with the requests of other users.
+    session.cookies.set_policy(cookiejar.DefaultCookiePolicy(
+        allowed_domains=[]))
+    if not default_headers:
+        session.headers = None
+    session.mount(prefix, _HTTPAdapter(socket_options=socket_options,
+                                       pool_connections=1,
+                                       pool_maxsize=config.get('pool_maxsize',
+                                                               10)))
+    return session
+
+
+def get_requests_session(url, default_headers=True):
+    """Return the requests session shared by all requests to ``url``.
+
+    :param url: the endpoint of the service. Services with the same scheme,
+        host and port share the same session.
+    :param default_headers: whether the default headers of ``requests``
+        (User-Agent, Accept-Encoding, ...) are sent. Some clients, such as
+        swiftclient, expect them not to be.
+    """
+    global _sessions_pid
+    key = (_get_pool_key(url), default_headers)
+    with _lock:
+        # Sockets must not be shared with a forked child process.
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        session = _sessions.get(key)
+        if session is None:
+            session = _create_requests_session(key[0], default_headers)
+            _sessions[key] = session
+        return session
+
+
+def get_shared_requests_session(url, default_headers=True):
+    """Like get_requests_session() but closing the session does nothing."""
+    return _SharedRequestsSession(get_requests_session(url, default_headers))
+
+
+def get_session(request, url, token_id=None, **kwargs):
+    """Return a keystoneauth session to call the service at ``url``.
+
+    The session authenticates with the token of the user of ``request``
+    (or ``token_id``) and sends the HTTP requests through the shared
+    requests session of ``url``. Additional keyword arguments are passed to
+    the keystoneauth session.
+    """
+    token_auth = token_endpoint.Token(
+        endpoint=url, token=token_id or request.user.token.id)
+    return auth_utils.get_session(auth=token_auth,
+                                  session=get_requests_session(url),
+                                  **kwargs)
+
+
+def get_statistics():
+    """Return statistics about the shared connections.
+
+    :returns: a dict mapping each endpoint (scheme, host and port) to a dict
+        with the number of HTTP requests sent ("requests"), the number of
+        connections opened ("connections") and the number of requests sent
+        through an already open connection ("reused").
+    """
+    with _lock:
+        sessions = list(_sessions.items())
+    statistics = {}
+    for (prefix, _default_headers), session in sessions:
+        stats = statistics.setdefault(
+            prefix.rstrip('/'),
+            {'requests': 0, 'connections': 0, 'reused': 0})
+        pools = session.get_adapter(prefix).poolmanager.pools
+        for pool_key in pools.keys():
+            pool = pools.get(pool_key)
+            if pool is None:
+                continue
+            stats['requests'] += pool.num_requests
+            stats['connections'] += pool.num_connections
+            stats['reused'] = max(stats['requests'] - stats['connections'], 0)
+    return statistics
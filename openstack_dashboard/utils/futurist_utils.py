@@ -10,14 +10,191 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures as concurrent_futures
 import functools
+import logging
+import os
+import threading
+import time
 
+from django.conf import settings
 import futurist
+from osprofiler import profiler
 
+LOG = logging.getLogger(__name__)
 
-def call_functions_parallel(*worker_defs):
+_executor = None
+_executor_pid = None
+_lock = threading.Lock()
+_local = threading.local()
+_pending = 0
+_DEFAULT_TIMEOUT = object()
+
+
+def _get_config(key):
+    return settings.PARALLEL_API_CALLS.get(key)
+
+
+def get_executor():
+    """Return the process-wide executor used to call functions in parallel.
+
+    The executor is created lazily, and created again in a forked child
+    process, because threads do not survive a fork.
+    """
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = futurist.ThreadPoolExecutor(
+                max_workers=_get_config('max_workers'))
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def get_statistics():
+    """Return statistics about the shared executor.
+
+    :returns: a dict with the number of calls waiting for a worker
+        ("queue_depth") and the statistics gathered by futurist
+        ("executed", "failures", "cancelled", "runtime" and
+        "average_runtime").
+    """
+    stats = get_executor().statistics
+    return {
+        'queue_depth': _pending,
+        'executed': stats.executed,
+        'failures': stats.failures,
+        'cancelled': stats.cancelled,
+        'runtime': stats.runtime,
+        'average_runtime': stats.average_runtime,
+    }
+
+
+def _in_worker():
+    return getattr(_local, 'in_worker', False)
+
+
+def _run_task(func, submitted, timings, index, trace_info):
+    global _pending
+    with _lock:
+        _pending -= 1
+    started = time.time()
+    _local.in_worker = True
+    try:
+        if trace_info is None:
+            return func()
+        # Attach the task to the trace of the calling request, because the
+        # profiler state is thread local.
+        hmac_key, base_id, parent_id = trace_info
+        profiler.init(hmac_key, base_id=base_id, parent_id=parent_id)
+        try:
+            with profiler.Trace('parallel_call',
+                                info={'function': repr(func.func)}):
+                return func()
+        finally:
+            profiler.clean()
+    finally:
+        _local.in_worker = False
+        timings[index] = (started - submitted, time.time() - started)
+
+
+def _forget_cancelled(future):
+    # A cancelled call never runs, so it is not waiting any more.
+    global _pending
+    if future.cancelled():
+        with _lock:
+            _pending -= 1
+
+
+def _submit(executor, func, timings, index, trace_info):
+    """Submit func to executor, or run it inline if the backlog is full.
+
+    A future is returned in both cases.
+    """
+    global _pending
+    max_backlog = _get_config('max_backlog')
+    submitted = time.time()
+    with _lock:
+        inline = bool(max_backlog) and _pending >= max_backlog
+        if not inline:
+            _pending += 1
+    if not inline:
+        future = executor.submit(_run_task, func, submitted, timings, index,
+                                 trace_info)
+        future.add_done_callback(_forget_cancelled)
+        return future
+    future = _call_inline(func)
+    timings[index] = (0, time.time() - submitted)
+    return future
+
+
+def _call_inline(func):
+    """Call func in the calling thread and return a future of its result."""
+    future = futurist.Future()
+    try:
+        future.set_result(func())
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def _get_trace_info():
+    profiler_instance = profiler.get()
+    if profiler_instance is None:
+        return None
+    return (profiler_instance.hmac_key,
+            profiler_instance.get_base_id(),
+            profiler_instance.get_id())
+
+
+def submit(func, *args, **kwargs):
+    """Call a function on the shared thread pool.
+
+    Unlike call_functions_parallel(), the caller waits for the result
+    itself, which allows it to give up waiting for slow functions. It is
+    the PARALLEL_SUBMIT_FUNCTION used by horizon. The function is run in
+    the calling thread in the same cases as with call_functions_parallel().
+
+    :returns: a future of the value returned by ``func(*args, **kwargs)``.
+    """
+    func = functools.partial(func, *args, **kwargs)
+    if _in_worker():
+        return _call_inline(func)
+    return _submit(get_executor(), func, [(0, 0)], 0, _get_trace_info())
+
+
+def submit_background(func, *args, **kwargs):
+    """Call a function on the shared thread pool without waiting for it.
+
+    Unlike submit(), the function is submitted from the workers of the pool
+    too, since nothing waits for it, and it is not called at all when too
+    many calls are already waiting for a worker.
+
+    :returns: a future of the value returned by ``func(*args, **kwargs)``,
+        or None if the function is not called.
+    """
+    global _pending
+    max_backlog = _get_config('max_backlog')
+    submitted = time.time()
+    with _lock:
+        if max_backlog and _pending >= max_backlog:
+            return None
+        _pending += 1
+    future = get_executor().submit(
+        _run_task, functools.partial(func, *args, **kwargs), submitted,
+        [(0, 0)], 0, None)
+    future.add_done_callback(_forget_cancelled)
+    return future
+
+
+def call_functions_parallel(*worker_defs, timeout=_DEFAULT_TIMEOUT):
     """Call specified functions in parallel.
 
+    The functions are run on a thread pool shared by all requests in the
+    process (see the PARALLEL_API_CALLS setting). Functions are run in the
+    calling thread instead when it is itself a worker of the pool, which
+    avoids deadlocks with nested calls, or when too many calls are already
+    waiting for a worker.
+
     :param *worker_defs: Each positional argument can be either of
         a function to be called or a tuple which consists of a function,
         a list of positional arguments) and keyword arguments (optional).
@@ -27,24 +204,51 @@ def call_functions_parallel(*worker_defs):
            call_functions_parallel(func1, (func2, [1, 2]))
            call_functions_parallel((func1, [], {'a': 1}),
                                    (func2, [], {'a': 2, 'b': 10}))
+    :param timeout: (keyword only) the number of seconds to wait for all
+        functions to complete, or None to wait without limit.
+        It defaults to PARALLEL_API_CALLS['timeout'].
+        futurist.TimeoutError is raised when it expires.
     :returns: a tuple of values returned from individual functions.
         None is returned if a corresponding function does not return.
         It is better to return values other than None from individual
         functions.
+
+    If a function raises an exception, functions which have not started
+    yet are cancelled and the exception is raised.
     """
-    # TODO(amotoki): Needs to figure out what max_workers can be specified.
-    # According to e0ne, the apache default configuration in devstack  allows
-    # only 10 threads. What happens if max_worker=11 is specified?
-    max_workers = len(worker_defs)
-    # Prepare a list with enough length.
-    futures = [None] * len(worker_defs)
-    with futurist.ThreadPoolExecutor(max_workers=max_workers) as e:
-        for index, func_def in enumerate(worker_defs):
-            if callable(func_def):
-                func_def = [func_def]
-            args = func_def[1] if len(func_def) > 1 else []
-            kwargs = func_def[2] if len(func_def) > 2 else {}
-            func = functools.partial(func_def[0], *args, **kwargs)
-            futures[index] = e.submit(fn=func)
+    if timeout is _DEFAULT_TIMEOUT:
+        timeout = _get_config('timeout')
+
+    funcs = []
+    for func_def in worker_defs:
+        if callable(func_def):
+            func_def = [func_def]
+        args = func_def[1] if len(func_def) > 1 else []
+        func_kwargs = func_def[2] if len(func_def) > 2 else {}
+        funcs.append(functools.partial(func_def[0], *args, **func_kwargs))
+
+    if _in_worker():
+        return tuple(func() for func in funcs)
+
+    trace_info = _get_trace_info()
+    executor = get_executor()
+    timings = [(0, 0)] * len(funcs)
+    futures = [_submit(executor, func, timings, index, trace_info)
+               for index, func in enumerate(funcs)]
 
+    done, not_done = concurrent_futures.wait(
+        futures, timeout=timeout,
+        return_when=concurrent_futures.FIRST_EXCEPTION)
+    LOG.debug("Called %d functions in parallel: queue depth %d, "
+              "max wait %.3fs, max latency %.3fs", len(futures), _pending,
+              max(t[0] for t in timings), max(t[1] for t in timings))
+    if not_done:
+        for future in not_done:
+            future.cancel()
+        for future in futures:
+            if future in done and future.exception() is not None:
+                raise future.exception()
+        raise futurist.TimeoutError(
+            "%d of %d functions did not complete in %s seconds" %
+            (len(not_done), len(futures), timeout))
     return tuple(f.result() for f in futures)
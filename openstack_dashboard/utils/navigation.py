@@ -0,0 +1,120 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Navigation fingerprint of the users of OpenStack Dashboard.
+
+The dashboards and panels a user can access depend on the roles of the
+user, the scope of the token, the services of the region and the policy
+files, but not on the identity of the user. Users with the same
+fingerprint see the same navigation, which allows horizon to share it
+between them (see the NAVIGATION_CACHE setting).
+"""
+
+import os
+import threading
+import time
+
+from django.conf import settings
+
+from horizon.utils import memoized
+
+# The modification times of the policy files are checked again after this
+# number of seconds, rather than for each fingerprint.
+_POLICY_MTIMES_TIMEOUT = 5
+_policy_mtimes = {}
+_policy_mtimes_lock = threading.Lock()
+
+
+def _read_policy_files_mtimes():
+    policy_path = settings.POLICY_FILES_PATH
+    paths = [os.path.join(policy_path, policy_file)
+             for policy_file in settings.POLICY_FILES.values()]
+    for policy_dirs in settings.POLICY_DIRS.values():
+        for policy_dir in policy_dirs:
+            policy_dir = os.path.join(policy_path, policy_dir)
+            if os.path.isdir(policy_dir):
+                paths.extend(os.path.join(policy_dir, name)
+                             for name in os.listdir(policy_dir))
+    mtimes = []
+    for path in sorted(paths):
+        try:
+            mtimes.append((path, os.path.getmtime(path)))
+        except OSError:
+            pass
+    return tuple(mtimes)
+
+
+def _get_policy_files_mtimes():
+    key = (settings.POLICY_FILES_PATH,
+           tuple(sorted(settings.POLICY_FILES.items())),
+           tuple(sorted((service, tuple(policy_dirs)) for service, policy_dirs
+                        in settings.POLICY_DIRS.items())))
+    now = time.time()
+    with _policy_mtimes_lock:
+        entry = _policy_mtimes.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+    mtimes = _read_policy_files_mtimes()
+    with _policy_mtimes_lock:
+        _policy_mtimes.clear()
+        _policy_mtimes[key] = (now + _POLICY_MTIMES_TIMEOUT, mtimes)
+    return mtimes
+
+
+def _get_endpoints(user):
+    region = user.services_region
+    endpoints = set()
+    for service in user.service_catalog or []:
+        for endpoint in service.get('endpoints', []):
+            if 'interface' in endpoint:
+                # Keystone V3
+                if endpoint.get('region_id', endpoint.get('region')) in (
+                        region, None):
+                    endpoints.add((service.get('type'),
+                                   endpoint['interface'], endpoint['url']))
+            elif endpoint.get('region') in (region, None):
+                # Keystone V2
+                endpoints.update(
+                    (service.get('type'), key, value)
+                    for key, value in endpoint.items()
+                    if key.endswith('URL'))
+    return tuple(sorted(endpoints))
+
+
+@memoized.memoized
+def get_fingerprint(request):
+    """Return the navigation fingerprint of the user of ``request``.
+
+    None is returned when the navigation of the user cannot be shared. The
+    fingerprint is computed once per request.
+    """
+    user = getattr(request, 'user', None)
+    token = getattr(user, 'token', None)
+    if token is None or not user.is_authenticated:
+        return None
+    domain_token = request.session.get('domain_token')
+    domain = None
+    if domain_token:
+        domain = (domain_token.domain_id, tuple(sorted(
+            domain_token.role_names)))
+    return (
+        tuple(sorted(role['name'] for role in user.roles)),
+        user.user_domain_id,
+        user.project_id is not None,
+        token.project.get('domain_id'),
+        token.project.get('is_admin_project'),
+        domain,
+        request.session.get('domain_context'),
+        user.services_region,
+        _get_endpoints(user),
+        _get_policy_files_mtimes(),
+    )
@@ -0,0 +1,141 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Snapshots of the quota limits and usages of the projects.
+
+They are kept by service ("compute", "network" or "volume") and project in
+the shared cache tier of horizon.utils.memoized, and refreshed in the
+background once they are older than ``_REFRESH_AFTER`` seconds. This module
+only depends on horizon.utils.memoized so that the API modules can update
+the snapshots when they create resources.
+"""
+
+import logging
+import threading
+import time
+
+from horizon.utils import memoized
+from openstack_dashboard.utils import futurist_utils
+
+LOG = logging.getLogger(__name__)
+
+_CACHE = 'openstack_dashboard.utils.quota_usages.get_quota_usages'
+_TIMEOUT = 30
+_REFRESH_AFTER = 10
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+class _DetachedRequest(object):
+    """The part of a request used to call the services in the background.
+
+    A snapshot may be refreshed after the response to the request which
+    found it old has been sent, so the refresh only keeps the user of the
+    request: its token, service catalog, region and project.
+    """
+
+    def __init__(self, request):
+        self.user = request.user
+
+
+def _set_quota_usages(request, key, usages, fetched):
+    memoized.set_shared_entries(_CACHE, request, 'region',
+                                {key: (fetched, usages)}, timeout=_TIMEOUT)
+
+
+def _refresh_quota_usages(request, key, tenant_id, fetch):
+    try:
+        fetched = time.time()
+        _set_quota_usages(request, key, fetch(request, tenant_id), fetched)
+    except Exception as e:
+        LOG.info("Unable to refresh the %(service)s quota usages of "
+                 "project %(tenant)s: %(e)s",
+                 {'service': key[0], 'tenant': key[1], 'e': e})
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def get_quota_usages(request, service, tenant_id, fetch):
+    """Return the quota limits and usages of a project for a service.
+
+    ``fetch(request, tenant_id)`` retrieves them from the service, as a dict
+    mapping the quota names to (limit, usage) pairs. When the shared cache
+    tier of :func:`horizon.utils.memoized.shared_memoized` is enabled, the
+    result is shared by all requests for the same project, updated by
+    :func:`update_quota_usages` when resources are created through Horizon,
+    and refreshed in the background when it gets old, so that most requests
+    do not call the service at all.
+    """
+    key = (service, tenant_id or request.user.project_id)
+    entry = memoized.get_shared_entries(_CACHE, request, 'region',
+                                        [key]).get(key)
+    if entry is None:
+        fetched = time.time()
+        usages = fetch(request, tenant_id)
+        _set_quota_usages(request, key, usages, fetched)
+        return usages
+    fetched, usages = entry
+    if fetched + _REFRESH_AFTER < time.time():
+        with _refreshing_lock:
+            refresh = key not in _refreshing
+            _refreshing.add(key)
+        if refresh and futurist_utils.submit_background(
+                _refresh_quota_usages, _DetachedRequest(request), key,
+                tenant_id, fetch) is None:
+            # The refresh is left to a later request when the shared
+            # thread pool is busy.
+            with _refreshing_lock:
+                _refreshing.discard(key)
+    return usages
+
+
+def update_quota_usages(request, service, deltas, tenant_id=None):
+    """Add ``deltas`` to the usages of the quota usages snapshot of a project.
+
+    It is called when resources are created through Horizon so that the
+    shared snapshot stays accurate until it is refreshed.
+
+    :param deltas: a dict mapping quota names to the change of their usage.
+    :param tenant_id: the project of the resources. It defaults to the
+        project of the user.
+    """
+    key = (service, tenant_id or request.user.project_id)
+    entry = memoized.get_shared_entries(_CACHE, request, 'region',
+                                        [key]).get(key)
+    if entry is None:
+        return
+    fetched, usages = entry
+    usages = dict(usages)
+    for name, delta in deltas.items():
+        if name in usages and usages[name][1] is not None:
+            limit, usage = usages[name]
+            usages[name] = (limit, max(usage + delta, 0))
+    _set_quota_usages(request, key, usages, fetched)
+
+
+def invalidate_quota_usages(request, service, tenant_id=None):
+    """Drop the quota usages snapshot of a project for a service.
+
+    It is called when resources are deleted or resized through Horizon,
+    whose quota usages are not known without asking the service again. The
+    snapshots of the other projects are kept.
+
+    :param tenant_id: the project of the resources. It defaults to the
+        project of the user; the snapshot of another project whose
+        resources are deleted by an administrator is only refreshed when it
+        gets old.
+    """
+    if not memoized.shared_cache_enabled():
+        return
+    key = (service, tenant_id or request.user.project_id)
+    memoized.delete_shared_entries(_CACHE, request, 'region', [key])